@@ -0,0 +1,137 @@
+# (c) 2025, NetApp, Inc
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+DOCUMENTATION = '''
+name: ontap
+short_description: HttpApi plugin for NetApp ONTAP REST API
+author: NetApp Ansible Team (@carchi8py) <ng-ansibleteam@netapp.com>
+version_added: 22.15.0
+description:
+  - Used with C(ansible_connection=ansible.netcommon.httpapi) and C(ansible_network_os=netapp.ontap.ontap).
+  - The connection is established once per host, in the persistent connection process on the controller.
+    All ONTAP modules running against this host send their REST requests through this connection.
+  - Basic authentication uses C(ansible_user) and C(ansible_httpapi_password), the Authorization header is sent preemptively.
+  - The ONTAP version, REST availability and cluster vserver name are cached in the connection, and shared by all tasks for the host.
+  - The connection is only used when the task does not set C(username), C(password), C(cert_filepath) or C(key_filepath),
+    these tasks connect directly with their own credentials.
+  - Without credentials, C(hostname) must match the connection host, C(ansible_host), and ZAPI and file uploads are not supported.
+notes:
+  - Requires the ansible.netcommon collection.
+  - C(ansible_httpapi_use_ssl=true) is expected, as ONTAP only supports REST over HTTPS.
+'''
+
+EXAMPLES = '''
+# inventory
+# [ontap]
+# cluster1 ansible_host=10.10.10.10
+#
+# [ontap:vars]
+# ansible_connection=ansible.netcommon.httpapi
+# ansible_network_os=netapp.ontap.ontap
+# ansible_httpapi_use_ssl=true
+# ansible_httpapi_validate_certs=false
+# ansible_user=admin
+# ansible_httpapi_password=netapp123
+
+- name: Create volume
+  netapp.ontap.na_ontap_volume:
+    hostname: "{{ ansible_host }}"
+    use_rest: always
+    state: present
+    name: ansibleVolume
+    vserver: ansibleVServer
+    aggregate_name: aggr1
+    size: 10
+    size_unit: gb
+'''
+
+import base64
+import json
+
+from ansible.errors import AnsibleConnectionFailure
+from ansible.module_utils._text import to_bytes, to_native, to_text
+from ansible.module_utils.six.moves.urllib.error import HTTPError
+from ansible.module_utils.six.moves.urllib.parse import urlencode
+from ansible.plugins.httpapi import HttpApiBase
+
+BASE_HEADERS = {
+    'Accept': 'application/json',
+    'Content-Type': 'application/json',
+}
+
+
+class HttpApi(HttpApiBase):
+    ''' send REST requests to ONTAP, and keep information shared by all tasks for the host '''
+    def __init__(self, connection):
+        super(HttpApi, self).__init__(connection)
+        self.cache = {}
+
+    def login(self, username, password):
+        ''' ONTAP does not issue a session token, send the credentials with each request without waiting for a challenge '''
+        if username is not None and password is not None:
+            credentials = base64.b64encode(to_bytes('%s:%s' % (username, password))).decode()
+            self.connection._auth = {'Authorization': 'Basic %s' % credentials}
+
+    def update_auth(self, response, response_text):
+        ''' keep the Authorization header '''
+        return None
+
+    def handle_httperror(self, exc):
+        ''' retry once on 401 if credentials were sent, otherwise report the ONTAP error as a response '''
+        handled = super(HttpApi, self).handle_httperror(exc)
+        return exc if handled is False else handled
+
+    def send_request(self, data, method='GET', api='', params=None, headers=None):
+        ''' data is a dict or None, api is relative to /api/
+            return status_code, json_dict, error_details as in OntapRestAPI.send_request
+        '''
+        path = '/api/%s' % api
+        if params:
+            path += '?%s' % urlencode(params, doseq=True)
+        all_headers = dict(BASE_HEADERS)
+        all_headers.update(headers or {})
+        body = json.dumps(data) if data is not None else None
+        try:
+            response, response_data = self.connection.send(path, body, method=method, headers=all_headers)
+        except HTTPError as exc:
+            return exc.code, None, to_native(exc)
+        except AnsibleConnectionFailure as exc:
+            return None, None, to_native(exc)
+        return self.parse_response(method, response, response_data.getvalue())
+
+    @staticmethod
+    def parse_response(method, response, contents):
+        status_code = response.getcode()
+        json_dict, error_details = None, None
+        try:
+            json_dict = json.loads(to_text(contents)) if contents else None
+        except ValueError:
+            if method == 'GET':
+                error_details = 'Expecting json, got: %s' % to_text(contents)
+        if isinstance(json_dict, dict):
+            error_details = json_dict.get('error')
+        if error_details is None and status_code >= 400:
+            error_details = '%s Error: %s' % (status_code, getattr(response, 'reason', None) or getattr(response, 'msg', ''))
+        if error_details is not None and status_code >= 400:
+            json_dict = None
+        if not error_details and not json_dict:
+            json_dict = {}
+            headers = getattr(response, 'headers', None) or {}
+            if method == 'OPTIONS':
+                # OPTIONS provides the list of supported verbs
+                json_dict['Allow'] = headers.get('Allow')
+            if (headers.get('Content-Type') or '').startswith('multipart/form-data'):
+                json_dict['text'] = to_text(contents)
+        return status_code, json_dict, error_details
+
+    def get_cached(self, name):
+        ''' return None if name is not cached '''
+        return self.cache.get(name)
+
+    def set_cached(self, name, value):
+        self.cache[name] = value
+        return True
@@ -36,12 +36,17 @@ from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
 import base64
+import collections
 import logging
 import os
 import ssl
 import time
 from ansible.module_utils.basic import missing_required_lib
 from ansible.module_utils._text import to_native
+from ansible.module_utils.connection import Connection, ConnectionError as AnsibleConnectionError
+from ansible_collections.netapp.ontap.plugins.module_utils.netapp_cache import HttpApiCache, OntapCache
+from ansible_collections.netapp.ontap.plugins.module_utils import netapp_keep_alive
+from ansible_collections.netapp.ontap.plugins.module_utils.netapp_metrics import ApiMetrics
 
 try:
     from ansible.module_utils.ansible_release import __version__ as ANSIBLE_VERSION
@@ -49,6 +54,7 @@ except ImportError:
     ANSIBLE_VERSION = 'unknown'
 
 COLLECTION_VERSION = "22.15.0"
+DEFAULT_CACHE_DIR = '~/.ansible/tmp/netapp_ontap_cache'
 CLIENT_APP_VERSION = "%s/%s" % ("%s", COLLECTION_VERSION)
 IMPORT_EXCEPTION = None
 
@@ -108,6 +114,8 @@ ERROR_MSG = dict(
 
 LOG = logging.getLogger(__name__)
 LOG_FILE = '/tmp/ontap_apis.log'
+DEBUG_LOG_LEVELS = ('debug', 'error', 'none')
+DEBUG_LOG_CONTENT_SIZE = 4096       # response contents are truncated in debug_logs, use trace_apis to log them in full
 ZAPI_DEPRECATION_MESSAGE = "With version 22.0.0 ONTAPI (ZAPI) has been deprecated. The final ONTAP version to support ZAPI is ONTAP 9.13.1.  "\
                            "ZAPI calls in these modules will continue to work for ONTAP versions that supports ZAPI.  "\
                            "You can update your playbook to use REST by adding use_rest: always to your playbook.  "\
@@ -226,7 +234,22 @@ def get_feature(module, feature_name):
         svm_allowable_protocols_zapi=['cifs', 'fcp', 'iscsi', 'nvme', 'nfs', 'ndmp', 'http'],
         max_files_change_threshold=1,           # percentage of increase/decrease required to trigger a modify action
         warn_or_fail_on_fabricpool_backend_change='fail',
-        no_cserver_ems=False                    # when True, don't attempt to find cserver and don't send cserver EMS
+        no_cserver_ems=False,                   # when True, don't attempt to find cserver and don't send cserver EMS
+        rest_session=True,                      # when True, REST requests share a pooled requests.Session for the whole module run
+        rest_pool_maxsize=10,                   # maximum number of connections kept in the REST session pool
+        rest_keep_alive=True,                   # when False, ask ONTAP to close the connection after each REST request
+        rest_prefetch_next_page=True,           # when True, the next page of records is requested while the current page is processed
+        job_adaptive_polling=True,              # when True, poll jobs fast at first, then back off exponentially up to increment
+        job_initial_poll_interval=1,            # first polling interval in seconds, when job_adaptive_polling is True
+        ontap_cache=False,                      # when True, share ONTAP version, REST availability and cserver name between module runs
+        ontap_cache_ttl=300,                    # in seconds, cache entries are ignored after this delay
+        ontap_cache_dir=None,                   # defaults to ~/.ansible/tmp/netapp_ontap_cache
+        zapi_keep_alive=True,                   # when True, ZAPI calls share keep-alive connections for the whole module run
+        api_metrics=False,                      # when True, report per API request count, latency percentiles and bytes as api_metrics
+        api_metrics_file=None,                  # when set, append each REST and ZAPI request to this file as a JSON line
+        debug_log_size=100,                     # maximum number of REST records kept in memory for debug_logs, older records are dropped
+        debug_log_level='debug',                # debug: requests, responses and errors, error: errors only, none: nothing is kept
+        rest_httpapi=True,                      # when True and ansible_connection is httpapi, REST requests are sent through the persistent connection
     )
 
     if module.params['feature_flags'] is not None and feature_name in module.params['feature_flags']:
@@ -236,6 +259,30 @@ def get_feature(module, feature_name):
     module.fail_json(msg="Internal error: unexpected feature flag: %s" % feature_name)
 
 
+class LazyRepr(object):
+    ''' defer repr(value) until the object is formatted, when a trace flag is on, or when debug_logs are written '''
+    def __init__(self, value):
+        self.value = value
+
+    def __repr__(self):
+        return repr(self.value)
+
+    __str__ = __repr__
+
+
+def get_debug_logs(module):
+    ''' return a bounded buffer for (status_code, message) records, and the debug_log_level '''
+    size = get_feature(module, 'debug_log_size')
+    level = get_feature(module, 'debug_log_level')
+    if level not in DEBUG_LOG_LEVELS:
+        module.fail_json(msg="Error: expected one of %s for feature flag: debug_log_level, got: %s" % (', '.join(DEBUG_LOG_LEVELS), level))
+    if size is not None and (not isinstance(size, int) or isinstance(size, bool) or size < 0):
+        module.fail_json(msg="Error: expected a positive integer or None for feature flag: debug_log_size, got: %s" % repr(size))
+    if level == 'none':
+        size = 0
+    return collections.deque(maxlen=size), level
+
+
 def create_sf_connection(module, port=None, host_options=None):
     if not HAS_SF_SDK:
         module.fail_json(msg="the python SolidFire SDK module is required")
@@ -327,6 +374,46 @@ def set_zapi_port_and_transport(server, https, port, validate_certs):
     server.set_port(port)
 
 
+def get_ontap_cache(module, host_options=None):
+    ''' return None if the cache is disabled
+        the cache is keyed by hostname, port, and user, as the information may depend on the user role
+    '''
+    if not has_feature(module, 'ontap_cache'):
+        return None
+    if host_options is None:
+        host_options = module.params
+    key = ':'.join(str(host_options.get(option)) for option in ('hostname', 'http_port', 'username', 'cert_filepath'))
+    directory = get_feature(module, 'ontap_cache_dir') or os.path.expanduser(DEFAULT_CACHE_DIR)
+    return OntapCache(directory, key, get_feature(module, 'ontap_cache_ttl'))
+
+
+def get_httpapi_connection(module):
+    ''' return None unless the module runs with a persistent connection, as with ansible_connection=httpapi
+        the netapp.ontap.ontap httpapi plugin authenticates once, and caches information for all tasks targeting the host
+    '''
+    socket_path = getattr(module, '_socket_path', None)
+    if not socket_path or not has_feature(module, 'rest_httpapi'):
+        return None
+    return Connection(socket_path)
+
+
+def get_api_metrics(module, host_options=None):
+    ''' return None if metrics are disabled
+        metrics are shared by all REST and ZAPI connections in a module run, and reported when the module exits
+    '''
+    if not has_feature(module, 'api_metrics'):
+        return None
+    metrics = getattr(module, '_netapp_api_metrics', None)
+    if metrics is None:
+        if host_options is None:
+            host_options = module.params
+        labels = dict(module=module._name, hostname=host_options.get('hostname'))
+        metrics = ApiMetrics(labels, get_feature(module, 'api_metrics_file'))
+        metrics.add_summary_to_results(module)
+        module._netapp_api_metrics = metrics
+    return metrics
+
+
 def setup_na_ontap_zapi(module, vserver=None, wrap_zapi=False, host_options=None):
     module.warn(ZAPI_DEPRECATION_MESSAGE)
     if host_options is None:
@@ -366,6 +453,8 @@ def setup_na_ontap_zapi(module, vserver=None, wrap_zapi=False, host_options=None
     else:
         # legacy netapp-lib
         server = zapi.NaServer(hostname, username=username, password=password, trace=trace)
+    if isinstance(server, OntapZAPICx):
+        server.api_metrics = get_api_metrics(module, host_options)
     if vserver:
         server.set_vserver(vserver)
     if host_options.get('use_rest') == 'always':
@@ -375,6 +464,7 @@ def setup_na_ontap_zapi(module, vserver=None, wrap_zapi=False, host_options=None
     set_zapi_port_and_transport(server, https, port, validate_certs)
     server.set_api_version(major=1, minor=(version or 110))
     server.set_server_type('FILER')
+    server.ontap_cache = get_ontap_cache(module, host_options)
     return server
 
 
@@ -429,6 +519,37 @@ def get_cserver_zapi(server):
     return None
 
 
+def zapi_get_iter_pages(server, build_request, enable_tunneling=True):
+    ''' generator for *-get-iter ZAPIs, yield each response page as soon as it is received, following next-tag
+
+        build_request(tag) returns the NaElement to send, tag is None for the first page.
+        Only one page is referenced at a time, so memory usage is bounded by max-records rather than by the
+        total number of records, as long as the caller releases each page before asking for the next one.
+        NaApiError is not caught.
+    '''
+    tag = None
+    while True:
+        result = server.invoke_successfully(build_request(tag), enable_tunneling=enable_tunneling)
+        tag = result.get_child_content('next-tag')
+        yield result
+        # release the page before fetching the next one
+        del result
+        if tag is None:
+            return
+
+
+def zapi_get_iter_records(server, build_request, attributes_list_tag='attributes-list', enable_tunneling=True):
+    ''' generator for *-get-iter ZAPIs, yield each record page by page, see zapi_get_iter_pages '''
+    for result in zapi_get_iter_pages(server, build_request, enable_tunneling):
+        num_records = result.get_child_content('num-records')
+        if num_records is not None and int(num_records) == 0:
+            continue
+        attributes_list = result.get_child_by_name(attributes_list_tag)
+        if attributes_list is not None:
+            for record in attributes_list.get_children():
+                yield record
+
+
 def classify_zapi_exception(error):
     ''' return type of error '''
     try:
@@ -449,9 +570,17 @@ def classify_zapi_exception(error):
 
 
 def get_cserver(connection, is_rest=False):
-    if not is_rest:
-        return get_cserver_zapi(connection)
+    cache = getattr(connection, 'ontap_cache', None)
+    cserver = cache.get('cserver') if cache is not None else None
+    if cserver is not None:
+        return cserver
+    cserver = get_cserver_rest(connection) if is_rest else get_cserver_zapi(connection)
+    if cache is not None and cserver is not None:
+        cache.set('cserver', cserver)
+    return cserver
 
+
+def get_cserver_rest(connection):
     params = {'fields': 'type'}
     api = "private/cli/vserver"
     json, error = connection.get(api, params)
@@ -469,8 +598,11 @@ def get_cserver(connection, is_rest=False):
     return None
 
 
-def generate_result(changed, actions=None, modify=None, response=None, extra_responses=None):
+def generate_result(changed, actions=None, modify=None, response=None, extra_responses=None, rest_api=None):
     result = dict(changed=changed)
+    if rest_api is not None and rest_api.job_stats:
+        # latency statistics for each job waited on
+        result['job_stats'] = rest_api.job_stats
     if response is not None:
         result['response'] = response
     if modify:
@@ -488,6 +620,7 @@ if HAS_NETAPP_LIB:
         - enable SSL certificate authentication
         - ignore invalid XML characters in ONTAP output (when using CLI module)
         - add Authorization header when using basic authentication
+        - reuse keep-alive connections, see zapi_keep_alive feature flag
         '''
         def __init__(self, hostname=None, server_type=zapi.NaServer.SERVER_TYPE_FILER,
                      transport_type=zapi.NaServer.TRANSPORT_TYPE_HTTP,
@@ -504,6 +637,8 @@ if HAS_NETAPP_LIB:
             self.key_filepath = key_filepath
             self.validate_certs = validate_certs
             self.module = module
+            # see api_metrics feature flag, set by setup_na_ontap_zapi
+            self.api_metrics = None
             self.base64_creds = None
             if auth_method == 'speedy_basic_auth':
                 auth = '%s:%s' % (username, password)
@@ -523,8 +658,27 @@ if HAS_NETAPP_LIB:
             except IOError as exc:
                 self._fail_with_exc_info('Cannot load SSL certificate, check files exist.', exc)
 
+            if has_feature(self.module, 'zapi_keep_alive'):
+                # connections are authenticated with the certificate, so they can only be shared for the same certificate
+                key = ('https', self.cert_filepath, self.key_filepath, self.validate_certs)
+                return netapp_keep_alive.get_shared_handler(key, lambda: netapp_keep_alive.KeepAliveHTTPSHandler(context=context))
             return zapi.urllib.request.HTTPSHandler(context=context)
 
+        def _build_opener(self):
+            ''' with zapi_keep_alive, connections are kept open and reused by all ZAPI calls in the module run '''
+            if not has_feature(self.module, 'zapi_keep_alive'):
+                return super(OntapZAPICx, self)._build_opener()
+            handlers = [netapp_keep_alive.get_shared_handler(('http',), netapp_keep_alive.KeepAliveHTTPHandler)]
+            if self._auth_style == zapi.NaServer.STYLE_LOGIN_PASSWORD:
+                # with basic authentication, credentials are sent with each request
+                handlers.append(self._create_basic_auth_handler())
+                handlers.append(netapp_keep_alive.get_shared_handler(('https',), netapp_keep_alive.KeepAliveHTTPSHandler))
+            else:
+                handlers.append(self._create_certificate_auth_handler())
+            self._opener = zapi.urllib.request.build_opener(*handlers)
+            # netapp-lib never resets this flag, and would build a new opener for every call
+            self._refresh_conn = False
+
         def _fail_with_exc_info(self, arg0, exc):
             msg = arg0
             msg += '  More info: %s' % repr(exc)
@@ -588,14 +742,17 @@ if HAS_NETAPP_LIB:
             if not hasattr(self, '_opener') or not self._opener \
                     or self._refresh_conn:
                 self._build_opener()
+            start_time = time.time()
             try:
                 if hasattr(self, '_timeout'):
                     response = self._opener.open(request, timeout=self._timeout)
                 else:
                     response = self._opener.open(request)
             except zapi.urllib.error.HTTPError as exc:
+                self.record_metrics(na_element, request, start_time, status=exc.code)
                 raise zapi.NaApiError(exc.code, exc.reason)
             except zapi.urllib.error.URLError as exc:
+                self.record_metrics(na_element, request, start_time)
                 msg = 'URL error'
                 error = repr(exc)
                 try:
@@ -607,16 +764,33 @@ if HAS_NETAPP_LIB:
                     pass
                 raise zapi.NaApiError(msg, error)
             except Exception as exc:
+                self.record_metrics(na_element, request, start_time)
                 raise zapi.NaApiError('Unexpected error', repr(exc))
 
             response_xml = response.read()
-            response_element = self._get_result(response_xml)
+            try:
+                response_element = self._get_result(response_xml)
+            except Exception:
+                self.record_metrics(na_element, request, start_time, response, response_xml)
+                raise
+            self.record_metrics(na_element, request, start_time, response, response_xml, response_element)
 
             if self._trace:
                 zapi.LOG.debug("Response: %s", response_element.to_string(pretty=True))
 
             return response_element
 
+        def record_metrics(self, na_element, request, start_time, response=None, response_xml=None, response_element=None, status=None):
+            ''' see api_metrics feature flag, an error is reported unless the ZAPI status is passed '''
+            if self.api_metrics is None:
+                return
+            if response is not None:
+                status = response.getcode()
+            passed = response_element is not None and response_element.get_attr('status') == 'passed'
+            self.api_metrics.record('ZAPI', None, na_element.get_name(), status, not passed,
+                                    len(request.data or b''), len(response_xml or b''), time.time() - start_time,
+                                    getattr(response, 'retries', 0))
+
 
 class OntapRestAPI(object):
     ''' wrapper to send requests to ONTAP REST APIs '''
@@ -648,13 +822,37 @@ class OntapRestAPI(object):
             valid=False
         )
         self.errors = []
-        self.debug_logs = []
-        self.auth_method = set_auth_method(self.module, self.username, self.password, self.cert_filepath, self.key_filepath)
+        self.debug_logs, self.debug_log_level = get_debug_logs(module)
+        # the peer options, or a task with its own credentials, connect directly
+        self.connection = get_httpapi_connection(module) if host_options is None else None
+        if self.connection is not None and any((self.username, self.password, self.cert_filepath, self.key_filepath)):
+            self.connection = None
+        if self.connection is not None:
+            # the connection is already authenticated
+            self.auth_method = 'httpapi'
+            self.check_httpapi_host()
+        else:
+            self.auth_method = set_auth_method(self.module, self.username, self.password, self.cert_filepath, self.key_filepath)
         self.check_required_library()
         if has_feature(module, 'trace_apis'):
             logging.basicConfig(filename=LOG_FILE, level=logging.DEBUG, format='%(asctime)s %(levelname)-8s %(message)s')
         self.log_headers = has_feature(module, 'trace_headers')
         self.log_auth_args = has_feature(module, 'trace_auth_args')
+        self.use_session = has_feature(module, 'rest_session')
+        self.session = None
+        self.job_stats = []
+        self.ontap_cache = get_ontap_cache(module) if self.connection is None else HttpApiCache(self.connection)
+        self.api_metrics = get_api_metrics(module, self.host_options)
+
+    def check_httpapi_host(self):
+        ''' the connection is authenticated as ansible_user, for the inventory host, the task must target the same cluster '''
+        try:
+            connection_host = self.connection.get_option('host')
+        except AnsibleConnectionError as exc:
+            self.module.fail_json(msg='Error: unable to read the host for ansible_connection=httpapi: %s.' % to_native(exc))
+        if str(connection_host).lower() != self.hostname.lower():
+            self.module.fail_json(msg='Error: hostname %s does not match the httpapi connection host %s.  '
+                                      'Set username and password, or SSL certificate file(s), to connect directly.' % (self.hostname, connection_host))
 
     def requires_ontap_9_6(self, module_name):
         return self.requires_ontap_version(module_name)
@@ -716,8 +914,27 @@ class OntapRestAPI(object):
             headers['X-Dot-SVM-UUID'] = vserver_uuid
         return headers
 
+    def get_session(self):
+        ''' return the requests Session shared by all REST calls for this object, create it on first use
+            connections are kept alive in a pool, so that each call does not pay for a TCP and TLS handshake
+            as with the ZAPI keep-alive handlers, the connections are closed when the module process exits
+        '''
+        if self.session is None:
+            pool_maxsize = get_feature(self.module, 'rest_pool_maxsize')
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+            self.session = requests.Session()
+            self.session.mount('https://', adapter)
+            self.session.mount('http://', adapter)
+            if not has_feature(self.module, 'rest_keep_alive'):
+                self.session.headers['Connection'] = 'close'
+        return self.session
+
     def send_request(self, method, api, params, json=None, headers=None, files=None):
         ''' send http request and process reponse, including error conditions '''
+        if self.connection is not None and files is None:
+            return self._send_request_httpapi(method, api, params, json, headers)
+        if self.connection is not None:
+            return None, None, 'Error: file upload requires username/password or SSL certificate file(s) with ansible_connection=httpapi.'
         url = self.url + api
 
         def get_auth_args():
@@ -763,13 +980,16 @@ class OntapRestAPI(object):
                 return None, None
             return json, json.get('error')
 
-        self.log_debug('sending', repr(dict(method=method, url=url, verify=self.verify, params=params,
-                                            timeout=self.timeout, json=json,
-                                            headers=headers if self.log_headers else 'redacted',
-                                            auth_args=auth_args if self.log_auth_args else 'redacted')))
+        self.log_debug('sending', LazyRepr(dict(method=method, url=url, verify=self.verify, params=params,
+                                                timeout=self.timeout, json=json,
+                                                headers=headers if self.log_headers else 'redacted',
+                                                auth_args=auth_args if self.log_auth_args else 'redacted')))
+        response = None
+        start_time = time.time()
         try:
-            response = requests.request(method, url, verify=self.verify, params=params,
-                                        timeout=self.timeout, json=json, headers=headers, files=files, **auth_args)
+            request = self.get_session().request if self.use_session else requests.request
+            response = request(method, url, verify=self.verify, params=params,
+                               timeout=self.timeout, json=json, headers=headers, files=files, **auth_args)
             status_code = response.status_code
             self.log_debug(status_code, response.content)
             # If the response was successful, no Exception will be raised
@@ -794,6 +1014,8 @@ class OntapRestAPI(object):
         if json_error is not None:
             self.log_error(status_code, 'Endpoint error: %d: %s' % (status_code, json_error))
             error_details = json_error
+        if self.api_metrics is not None:
+            self.record_metrics(method, url, status_code, error_details, response, time.time() - start_time)
         if not error_details and not json_dict:
             if json_dict is None:
                 json_dict = {}
@@ -804,6 +1026,38 @@ class OntapRestAPI(object):
                 json_dict['text'] = response.text
         return status_code, json_dict, error_details
 
+    def _send_request_httpapi(self, method, api, params, json, headers):
+        ''' the request is sent by the httpapi plugin in the persistent connection process '''
+        if headers is None:
+            headers = self.build_headers()
+        self.log_debug('sending', LazyRepr(dict(method=method, api=api, connection='httpapi', params=params, json=json,
+                                                headers=headers if self.log_headers else 'redacted')))
+        start_time = time.time()
+        try:
+            status_code, json_dict, error_details = self.connection.send_request(json, method=method, api=api, params=params, headers=headers)
+        except AnsibleConnectionError as exc:
+            status_code, json_dict, error_details = None, None, to_native(exc)
+        if error_details:
+            self.log_error(status_code, 'httpapi error: %s' % error_details)
+        else:
+            self.log_debug(status_code, json_dict)
+        if self.api_metrics is not None:
+            self.api_metrics.record('REST', method, api, status_code, error_details, 0, 0, time.time() - start_time, 0)
+        return status_code, json_dict, error_details
+
+    def record_metrics(self, method, url, status_code, error, response, latency):
+        ''' see api_metrics feature flag, response is None if the request could not be sent '''
+        bytes_out, bytes_in, retries = 0, 0, 0
+        if response is not None:
+            body = getattr(getattr(response, 'request', None), 'body', None)
+            bytes_out = len(body) if body else 0
+            bytes_in = len(response.content or b'')
+            # requests does not retry by default, but an adapter may be configured to do so
+            history = getattr(getattr(getattr(response, 'raw', None), 'retries', None), 'history', None)
+            retries = len(history) if history else 0
+        api = url[len(self.url):] if url.startswith(self.url) else url
+        self.api_metrics.record('REST', method, api, status_code, error, bytes_out, bytes_in, latency, retries)
+
     def _is_job_done(self, job_json, job_state, job_error, timed_out):
         """ return (done, message, error)
             done is True to indicate that the job is complete, or failed, or timed out
@@ -865,14 +1119,28 @@ class OntapRestAPI(object):
         retries = 0
         max_retries = 3
         done = False
+        # with adaptive polling, start fast and back off exponentially, up to increment.
+        # return_timeout asks ONTAP to hold the GET until the job completes or the timeout expires,
+        # so completion is seen as soon as it happens.
+        adaptive = has_feature(self.module, 'job_adaptive_polling')
+        interval = min(get_feature(self.module, 'job_initial_poll_interval'), increment) if adaptive else increment
+        long_poll = adaptive
+        polls = 0
+        job_state = None
+        start_time = time.time()
         while not done:
-            # Will run every <increment> seconds for <timeout> seconds
-            job_json, job_error = self.get(url, None)
+            # Will run every <interval> seconds for <timeout> seconds
+            poll_start_time = time.time()
+            params = {'return_timeout': min(max(int(interval), 1), 120)} if long_poll else None
+            job_json, job_error = self.get(url, params)
+            polls += 1
             job_state = job_json.get('state', None) if job_json else None
             # ignore error if status is provided in the job
             if job_error and job_state is None:
                 errors.append(str(job_error))
                 retries += 1
+                # older ONTAP versions may not support return_timeout for jobs
+                long_poll = False
                 if retries > max_retries:
                     error = " - ".join(errors)
                     self.log_error(0, 'Job error: Reached max retries.')
@@ -881,10 +1149,85 @@ class OntapRestAPI(object):
                 retries = 0
                 done, message, error = self._is_job_done(job_json, job_state, job_error, runtime >= timeout)
             if not done:
-                time.sleep(increment)
-                runtime += increment
+                # the GET may already have waited for return_timeout seconds
+                delay = interval - (time.time() - poll_start_time) if long_poll else interval
+                if delay > 0:
+                    time.sleep(delay)
+                runtime += interval
+                if adaptive:
+                    interval = min(interval * 2, increment)
+        self.job_stats.append(dict(
+            uuid=job.get('uuid'),
+            state=job_state,
+            polls=polls,
+            elapsed_seconds=round(time.time() - start_time, 3)))
         return message, error
 
+    def wait_on_jobs(self, jobs, timeout=600, increment=60):
+        """ generator, wait for several jobs at once, and yield (uuid, message, error) as each job completes
+
+            all running jobs are polled with a single cluster/jobs query per tick.
+            The caller may stop iterating at any time, for instance after the first error.
+        """
+        pending = {}
+        for job in jobs:
+            if not isinstance(job, dict) or not job.get('uuid'):
+                self.log_error(0, 'Job UUID not found - Job: %s' % job)
+                yield None, None, 'Job UUID not found - Job: %s' % job
+                continue
+            pending[job['uuid']] = dict(polls=0, state=None)
+        errors = []
+        runtime = 0
+        retries = 0
+        max_retries = 3
+        adaptive = has_feature(self.module, 'job_adaptive_polling')
+        interval = min(get_feature(self.module, 'job_initial_poll_interval'), increment) if adaptive else increment
+        start_time = time.time()
+        while pending:
+            params = {'uuid': '|'.join(pending), 'fields': 'uuid,state,message,code,error'}
+            response, error = self.get('cluster/jobs', params)
+            records = {}
+            if error:
+                errors.append(str(error))
+                retries += 1
+            else:
+                retries = 0
+                for record in response.get('records', []) if response else []:
+                    records[record.get('uuid')] = record
+            for uuid in list(pending):
+                stats = pending[uuid]
+                stats['polls'] += 1
+                if retries > max_retries:
+                    done, message, job_error = True, None, " - ".join(errors)
+                else:
+                    record = records.get(uuid)
+                    stats['state'] = record.get('state') if record else None
+                    job_error = self.get_job_error(record)
+                    done, message, job_error = self._is_job_done(record, stats['state'], job_error, runtime >= timeout)
+                if done:
+                    del pending[uuid]
+                    self.job_stats.append(dict(
+                        uuid=uuid,
+                        state=stats['state'],
+                        polls=stats['polls'],
+                        elapsed_seconds=round(time.time() - start_time, 3)))
+                    yield uuid, message, job_error
+            if retries > max_retries:
+                self.log_error(0, 'Job error: Reached max retries.')
+            if pending:
+                time.sleep(interval)
+                runtime += interval
+                if adaptive:
+                    interval = min(interval * 2, increment)
+
+    @staticmethod
+    def get_job_error(record):
+        """ error is reported as a dict in a job record """
+        error = record.get('error') if record else None
+        if isinstance(error, dict):
+            return error.get('message') or str(error)
+        return error
+
     def get(self, api, params=None, headers=None):
         method = 'GET'
         dummy, message, error = self.send_request(method, api, params, json=None, headers=headers)
@@ -995,7 +1338,11 @@ class OntapRestAPI(object):
         method = 'GET'
         api = 'cluster'
         params = {'fields': ['version']}
-        status_code, message, error = self.send_request(method, api, params=params)
+        cached = self.ontap_cache.get('rest_version') if self.ontap_cache is not None else None
+        if cached is not None:
+            status_code, message, error = cached['status_code'], cached['message'], cached['error']
+        else:
+            status_code, message, error = self.send_request(method, api, params=params)
         try:
             if error and 'are available in precluster.' in error.get('message', ''):
                 # in precluster mode, version is not available :(
@@ -1005,6 +1352,10 @@ class OntapRestAPI(object):
         except AttributeError:
             pass
         self.set_version(message)
+        if cached is None and self.ontap_cache is not None and (
+                (status_code == 200 and not error and self.ontap_version['valid']) or status_code == 404):
+            # only cache a definite answer: a valid version, or REST is not available
+            self.ontap_cache.set('rest_version', dict(status_code=status_code, message=message, error=error))
         if error:
             self.log_error(status_code, str(error))
         if self.force_ontap_version:
@@ -1115,7 +1466,14 @@ class OntapRestAPI(object):
         self.debug_logs.append((status_code, message))
 
     def log_debug(self, status_code, content):
+        ''' content is only formatted if logging is enabled with trace_apis, or when debug_logs are written
+            debug_logs is a ring buffer, and response contents are truncated, see debug_log_size and debug_log_level
+        '''
         LOG.debug("%s: %s", status_code, content)
+        if self.debug_log_level != 'debug':
+            return
+        if isinstance(content, (bytes, str)) and len(content) > DEBUG_LOG_CONTENT_SIZE:
+            content = content[:DEBUG_LOG_CONTENT_SIZE]
         self.debug_logs.append((status_code, content))
 
     def write_to_file(self, tag, data=None, filepath=None, append=True):
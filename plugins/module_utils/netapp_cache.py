@@ -0,0 +1,120 @@
+# This code is part of Ansible, but is an independent component.
+# This particular file snippet, and this file snippet only, is BSD licensed.
+# Modules you write using this snippet, which is embedded dynamically by Ansible
+# still belong to the author of the module, and may assign their own license
+# to the complete work.
+#
+# Copyright (c) 2025, NetApp, Inc
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#    * Redistributions in binary form must reproduce the above copyright notice,
+#      this list of conditions and the following disclaimer in the documentation
+#      and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+# USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+""" Support functions for NetApp ansible modules
+
+    Provides a small on-disk cache, so that information that rarely changes, like the ONTAP version
+    or the cluster vserver name, can be shared between module runs targeting the same cluster.
+    There is one JSON file per entry, so that concurrent forks updating different entries do not
+    overwrite each other.  Updates are written to a temporary file and renamed, so that concurrent
+    forks never read a partial file.  The cache is best effort: I/O errors are ignored.
+
+    With ansible_connection=httpapi, entries are kept in the persistent connection process instead.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from ansible.module_utils.connection import ConnectionError as AnsibleConnectionError
+
+
+class OntapCache:
+    """ key identifies the cluster and the user, entries expire after ttl seconds """
+    def __init__(self, directory, key, ttl):
+        self.directory = directory
+        self.ttl = ttl
+        self.key = key
+
+    def get_path(self, name):
+        """ one file for each entry, an update only replaces this entry """
+        digest = hashlib.sha256(('%s\n%s' % (self.key, name)).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, '%s.json' % digest)
+
+    def _read(self, name):
+        try:
+            with open(self.get_path(name)) as afile:
+                entry = json.load(afile)
+        except (IOError, OSError, ValueError):
+            return {}
+        return entry if isinstance(entry, dict) else {}
+
+    def get(self, name):
+        """ return None if the entry is not present or expired """
+        entry = self._read(name)
+        if 'time' not in entry:
+            return None
+        if time.time() - entry['time'] > self.ttl:
+            return None
+        return entry.get('value')
+
+    def set(self, name, value):
+        entry = dict(time=time.time(), value=value)
+        try:
+            os.makedirs(self.directory, 0o700)
+        except OSError:
+            # already created, possibly by another fork
+            pass
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'w') as afile:
+                json.dump(entry, afile)
+            # atomic on POSIX, readers see the old or the new file
+            os.rename(tmp_path, self.get_path(name))
+        except (IOError, OSError, TypeError, ValueError):
+            # it's only a cache
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+        return True
+
+
+class HttpApiCache:
+    """ same interface as OntapCache, entries are kept by the netapp.ontap.ontap httpapi plugin, for the lifetime of the connection """
+    def __init__(self, connection):
+        self.connection = connection
+
+    def get(self, name):
+        """ return None if the entry is not present """
+        try:
+            return self.connection.get_cached(name)
+        except AnsibleConnectionError:
+            return None
+
+    def set(self, name, value):
+        try:
+            return self.connection.set_cached(name, value)
+        except AnsibleConnectionError:
+            # it's only a cache
+            return False
@@ -0,0 +1,165 @@
+# This code is part of Ansible, but is an independent component.
+# This particular file snippet, and this file snippet only, is BSD licensed.
+# Modules you write using this snippet, which is embedded dynamically by Ansible
+# still belong to the author of the module, and may assign their own license
+# to the complete work.
+#
+# Copyright (c) 2025, NetApp, Inc
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#    * Redistributions in binary form must reproduce the above copyright notice,
+#      this list of conditions and the following disclaimer in the documentation
+#      and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+# USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+""" Support functions for NetApp ansible modules
+
+    Provides a bounded thread pool to issue independent API calls concurrently.
+    Results are always returned in submission order, so that output and error reporting are deterministic.
+    Provides a poller, so that threads waiting on different resources share a single query per polling cycle.
+    Provides a topological sort by levels, so that objects with dependencies can be processed level by level.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import threading
+import time
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+    HAS_FUTURES = True
+except ImportError:
+    # python 2.7 without the futures backport - run sequentially
+    HAS_FUTURES = False
+
+
+def run_concurrently(function, args_list, max_workers):
+    """ call function(*args) for each args in args_list, using at most max_workers threads
+
+        return a list of (result, exception) tuples, in the same order as args_list.
+        Exceptions are captured rather than raised, it is up to the caller to report them.
+        Note: module.fail_json must not be called from function, as it would only exit the worker thread.
+    """
+    def call(args):
+        try:
+            return function(*args), None
+        except Exception as exc:
+            return None, exc
+
+    args_list = list(args_list)
+    max_workers = min(max_workers or 1, len(args_list))
+    if max_workers <= 1 or not HAS_FUTURES:
+        return [call(args) for args in args_list]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(call, args_list))
+
+
+def dependency_levels(keys, get_dependencies):
+    """ return a list of levels, each level is a list of keys that only depend on keys in previous levels
+
+        get_dependencies(key) returns the keys that must be processed before key.  Dependencies that are not in keys are ignored.
+        Keys are kept in their original order within a level.
+        Raises ValueError on a circular dependency.
+    """
+    keys = list(keys)
+    known = set(keys)
+    levels = {}
+
+    def get_level(key, path):
+        if key in path:
+            raise ValueError('circular dependency: %s' % ' -> '.join(str(item) for item in path + [key]))
+        if key not in levels:
+            dependencies = [dependency for dependency in get_dependencies(key) if dependency in known]
+            levels[key] = 1 + max([get_level(dependency, path + [key]) for dependency in dependencies] or [-1])
+        return levels[key]
+
+    for key in keys:
+        get_level(key, [])
+    keys_by_level = [[] for dummy in range(1 + max(levels.values() or [-1]))]
+    for key in keys:
+        keys_by_level[levels[key]].append(key)
+    return keys_by_level
+
+
+class BatchPoller:
+    """ let several threads wait for a condition on different resources, with a single query per polling cycle
+
+        fetch(keys) is called with the keys for all waiting threads, and returns a dict of records indexed by key, and an error.
+        A key is absent from the dict if the resource is not found.
+        One of the waiting threads sleeps for interval seconds, calls fetch, and wakes up the threads whose condition is met,
+        or that ran out of polls.  When it is done, another waiting thread takes over the polling.
+    """
+    def __init__(self, fetch, interval):
+        self.fetch = fetch
+        self.interval = interval
+        self.lock = threading.Condition()
+        self.waiters = []
+        self.polling = False
+        # number of calls to fetch, for reporting
+        self.polls = 0
+
+    def wait(self, key, condition, max_polls):
+        """ return record, met, error - when condition(record) is met, or after max_polls polling cycles, or on error
+            record is the last record read for key, or None if the resource is not found.
+        """
+        waiter = dict(key=key, condition=condition, polls_left=max_polls, done=False, record=None, met=False, error=None)
+        self.lock.acquire()
+        try:
+            self.waiters.append(waiter)
+            while not waiter['done']:
+                if self.polling:
+                    # another thread is polling on our behalf
+                    self.lock.wait()
+                    continue
+                self.polling = True
+                self.lock.release()
+                try:
+                    self.poll()
+                finally:
+                    self.lock.acquire()
+                    self.polling = False
+                    self.lock.notify_all()
+        finally:
+            self.lock.release()
+        return waiter['record'], waiter['met'], waiter['error']
+
+    def poll(self):
+        """ one polling cycle for all the threads waiting at this time """
+        time.sleep(self.interval)
+        with self.lock:
+            waiters = list(self.waiters)
+        keys = []
+        for waiter in waiters:
+            if waiter['key'] not in keys:
+                keys.append(waiter['key'])
+        records, error = self.fetch(keys)
+        with self.lock:
+            self.polls += 1
+            for waiter in waiters:
+                if error:
+                    waiter['error'] = error
+                    waiter['done'] = True
+                    continue
+                waiter['record'] = records.get(waiter['key'])
+                waiter['polls_left'] -= 1
+                if waiter['condition'](waiter['record']):
+                    waiter['met'] = True
+                    waiter['done'] = True
+                elif waiter['polls_left'] <= 0:
+                    waiter['done'] = True
+            self.waiters = [waiter for waiter in self.waiters if not waiter['done']]
@@ -0,0 +1,229 @@
+# This code is part of Ansible, but is an independent component.
+# This particular file snippet, and this file snippet only, is BSD licensed.
+# Modules you write using this snippet, which is embedded dynamically by Ansible
+# still belong to the author of the module, and may assign their own license
+# to the complete work.
+#
+# Copyright (c) 2025, NetApp, Inc
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#    * Redistributions in binary form must reproduce the above copyright notice,
+#      this list of conditions and the following disclaimer in the documentation
+#      and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+# USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+""" Support functions for NetApp ansible modules
+
+    Provides urllib handlers that keep HTTP and HTTPS connections open, so that ZAPI calls do not pay for
+    a TCP and TLS handshake on every call.  urllib closes the connection after each request.
+    Handlers are shared by all ZAPI servers in the process, that is for the whole module run.
+    An idle connection closed by ONTAP is replaced transparently.
+    With https_proxy, the connection is a tunnel through the proxy, as with the stock urllib handlers.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import io
+import select
+import socket
+import threading
+
+from ansible.module_utils.six.moves import http_client
+from ansible.module_utils.six.moves.urllib.error import URLError
+from ansible.module_utils.six.moves.urllib.request import HTTPHandler, HTTPSHandler
+from ansible.module_utils.six.moves.urllib.response import addinfourl
+
+# idle connections kept per host, in excess they are closed
+MAX_IDLE_CONNECTIONS = 10
+
+_HANDLERS = {}
+_HANDLERS_LOCK = threading.Lock()
+
+
+def get_shared_handler(key, create):
+    """ return the handler for key, create it on first use
+        key should identify how connections are authenticated, eg a client certificate.
+    """
+    with _HANDLERS_LOCK:
+        if key not in _HANDLERS:
+            _HANDLERS[key] = create()
+        return _HANDLERS[key]
+
+
+def close_shared_handlers():
+    with _HANDLERS_LOCK:
+        for handler in _HANDLERS.values():
+            handler.close_all()
+        _HANDLERS.clear()
+
+
+def is_connection_dropped(connection):
+    """ an idle connection is readable when it is closed by the peer """
+    if connection.sock is None:
+        return True
+    try:
+        readable, dummy, dummy = select.select([connection.sock], [], [], 0)
+    except (ValueError, select.error):
+        return True
+    return bool(readable)
+
+
+class StaleConnectionError(Exception):
+    """ nothing was received on the connection, the request was not processed and can be sent again """
+
+
+class KeepAliveMixin(object):
+    """ keep connections open after a request, and reuse them for the next requests to the same host """
+
+    def init_pool(self):
+        self.idle_connections = {}
+        self.pool_lock = threading.Lock()
+        # for reporting
+        self.connections_created = 0
+
+    def get_idle_connection(self, key):
+        with self.pool_lock:
+            connections = self.idle_connections.get(key)
+            while connections:
+                connection = connections.pop()
+                if not is_connection_dropped(connection):
+                    return connection
+                connection.close()
+        return None
+
+    def release_connection(self, key, connection):
+        with self.pool_lock:
+            connections = self.idle_connections.setdefault(key, [])
+            if len(connections) < MAX_IDLE_CONNECTIONS:
+                connections.append(connection)
+                return
+        connection.close()
+
+    def close_all(self):
+        with self.pool_lock:
+            for connections in self.idle_connections.values():
+                for connection in connections:
+                    connection.close()
+            self.idle_connections = {}
+
+    def do_open_keep_alive(self, request):
+        host = request.host
+        if not host:
+            raise URLError('no host given')
+        headers = self.get_headers(request)
+        # set by ProxyHandler for https, host is the proxy
+        tunnel_host = getattr(request, '_tunnel_host', None)
+        tunnel_headers = {}
+        if tunnel_host and 'Proxy-Authorization' in headers:
+            # only sent to the proxy
+            tunnel_headers['Proxy-Authorization'] = headers.pop('Proxy-Authorization')
+        key = (host, tunnel_host)
+        connection = self.get_idle_connection(key)
+        retries = 0
+        if connection is not None:
+            try:
+                return self.send(key, connection, request, headers)
+            except StaleConnectionError:
+                # the connection was closed by ONTAP, most likely after an idle timeout, use a new connection
+                connection.close()
+                retries = 1
+            except (socket.error, http_client.HTTPException) as exc:
+                # the request may have been processed, do not send it again
+                connection.close()
+                raise URLError(exc)
+        connection = self.create_connection(host, request.timeout)
+        if tunnel_host:
+            connection.set_tunnel(tunnel_host, headers=tunnel_headers)
+        with self.pool_lock:
+            self.connections_created += 1
+        try:
+            response = self.send(key, connection, request, headers)
+        except StaleConnectionError as exc:
+            connection.close()
+            raise URLError(exc.args[0])
+        except (socket.error, http_client.HTTPException) as exc:
+            connection.close()
+            raise URLError(exc)
+        # for reporting, see api_metrics feature flag
+        response.retries = retries
+        return response
+
+    @staticmethod
+    def get_headers(request):
+        headers = dict(request.unredirected_hdrs)
+        headers.update(dict((name, value) for name, value in request.headers.items() if name not in headers))
+        headers = dict((name.title(), value) for name, value in headers.items())
+        headers['Connection'] = 'keep-alive'
+        return headers
+
+    def send(self, key, connection, request, headers):
+        """ send the request and read the whole response, so that the connection can be reused
+            key identifies the host, and the proxy if any
+            StaleConnectionError is raised if the connection failed before a status line was received,
+            any later error is raised as is, as the request may have been processed
+        """
+        if connection.sock is not None and isinstance(request.timeout, (int, float)):
+            connection.sock.settimeout(request.timeout)
+        try:
+            connection.request(request.get_method(), request.selector, request.data, headers)
+        except socket.timeout:
+            raise
+        except (socket.error, http_client.HTTPException) as exc:
+            raise StaleConnectionError(exc)
+        try:
+            response = connection.getresponse()
+        except http_client.BadStatusLine as exc:
+            # including RemoteDisconnected, the connection was closed without a response
+            raise StaleConnectionError(exc)
+        body = response.read()
+        if response.will_close:
+            connection.close()
+        else:
+            self.release_connection(key, connection)
+        result = addinfourl(io.BytesIO(body), response.msg, request.get_full_url(), response.status)
+        result.msg = response.reason
+        return result
+
+
+class KeepAliveHTTPHandler(KeepAliveMixin, HTTPHandler):
+    def __init__(self, debuglevel=0):
+        HTTPHandler.__init__(self, debuglevel)
+        self.init_pool()
+
+    def http_open(self, request):
+        return self.do_open_keep_alive(request)
+
+    @staticmethod
+    def create_connection(host, timeout):
+        return http_client.HTTPConnection(host, timeout=timeout)
+
+
+class KeepAliveHTTPSHandler(KeepAliveMixin, HTTPSHandler):
+    """ context is used for certificate validation and client certificate authentication
+        when None, python uses the default context when connecting
+    """
+    def __init__(self, debuglevel=0, context=None):
+        HTTPSHandler.__init__(self, debuglevel, context=context)
+        self.context = context
+        self.init_pool()
+
+    def https_open(self, request):
+        return self.do_open_keep_alive(request)
+
+    def create_connection(self, host, timeout):
+        return http_client.HTTPSConnection(host, timeout=timeout, context=self.context)
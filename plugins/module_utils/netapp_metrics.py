@@ -0,0 +1,135 @@
+# This code is part of Ansible, but is an independent component.
+# This particular file snippet, and this file snippet only, is BSD licensed.
+# Modules you write using this snippet, which is embedded dynamically by Ansible
+# still belong to the author of the module, and may assign their own license
+# to the complete work.
+#
+# Copyright (c) 2025, NetApp, Inc
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification,
+# are permitted provided that the following conditions are met:
+#
+#    * Redistributions of source code must retain the above copyright
+#      notice, this list of conditions and the following disclaimer.
+#    * Redistributions in binary form must reproduce the above copyright notice,
+#      this list of conditions and the following disclaimer in the documentation
+#      and/or other materials provided with the distribution.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND
+# ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO,
+# PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT
+# LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE
+# USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+""" Support functions for NetApp ansible modules
+
+    Provides per request metrics for REST and ZAPI calls: method, API, status, bytes sent and received,
+    latency, and retries.  Requests are aggregated per API, and the summary is reported in the module result.
+    Each request can also be appended to a file as a JSON line, so that slow calls can be found across many module runs.
+    Writing to the file is best effort: I/O errors are ignored.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import json
+import re
+import threading
+import time
+
+# path elements that identify a resource are replaced, so that requests are aggregated per API
+UUID_RE = re.compile(r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$')
+ID_RE = re.compile(r'^[0-9]+$')
+
+
+def api_template(api):
+    """ storage/volumes/<uuid>/snapshots/<uuid> becomes storage/volumes/{uuid}/snapshots/{uuid} """
+    elements = []
+    for element in api.split('?')[0].strip('/').split('/'):
+        if UUID_RE.match(element):
+            element = '{uuid}'
+        elif ID_RE.match(element):
+            element = '{id}'
+        elements.append(element)
+    return '/'.join(elements)
+
+
+def percentile(sorted_values, percent):
+    """ nearest rank percentile, sorted_values cannot be empty """
+    rank = int(len(sorted_values) * percent / 100.0 + 0.5)
+    return sorted_values[min(max(rank, 1), len(sorted_values)) - 1]
+
+
+class ApiMetrics:
+    """ record requests for a module run
+
+        labels are added to each JSON line, to identify the module and the cluster.
+        path is the file JSON lines are appended to, or None.
+    """
+    def __init__(self, labels=None, path=None):
+        self.labels = labels or {}
+        self.path = path
+        self.lock = threading.Lock()
+        self.requests = {}
+
+    def record(self, kind, method, api, status, error, bytes_out, bytes_in, latency, retries=0):
+        """ kind is REST or ZAPI, for ZAPI, method is None and api is the ZAPI name """
+        template = api_template(api) if kind == 'REST' else api
+        key = ' '.join(item for item in (kind, method, template) if item)
+        with self.lock:
+            stats = self.requests.setdefault(key, dict(latencies=[], errors=0, bytes_out=0, bytes_in=0, retries=0))
+            stats['latencies'].append(latency)
+            stats['errors'] += 1 if error else 0
+            stats['bytes_out'] += bytes_out
+            stats['bytes_in'] += bytes_in
+            stats['retries'] += retries
+        if self.path:
+            line = dict(self.labels)
+            line.update(time=time.time(), kind=kind, method=method, api=template, status=status, error=bool(error),
+                        bytes_out=bytes_out, bytes_in=bytes_in, latency=round(latency, 6), retries=retries)
+            self.write_line(line)
+
+    def write_line(self, line):
+        # a single write in append mode, so that lines from concurrent module runs are not interleaved
+        data = json.dumps(line, sort_keys=True) + '\n'
+        try:
+            with self.lock:
+                with open(self.path, 'a') as afile:
+                    afile.write(data)
+        except (IOError, OSError):
+            pass
+
+    def summary(self):
+        """ count, errors, latency percentiles in seconds, and totals for each API """
+        summary = {}
+        with self.lock:
+            for key, stats in self.requests.items():
+                latencies = sorted(stats['latencies'])
+                summary[key] = dict(
+                    count=len(latencies),
+                    errors=stats['errors'],
+                    retries=stats['retries'],
+                    bytes_out=stats['bytes_out'],
+                    bytes_in=stats['bytes_in'],
+                    total=round(sum(latencies), 6),
+                    p50=round(percentile(latencies, 50), 6),
+                    p95=round(percentile(latencies, 95), 6),
+                    max=round(latencies[-1], 6),
+                )
+        return summary
+
+    def add_summary_to_results(self, module):
+        """ report the summary as api_metrics when the module exits, whether it succeeds or fails """
+        def add_summary(method):
+            def exit_with_summary(*args, **kwargs):
+                kwargs.setdefault('api_metrics', self.summary())
+                return method(*args, **kwargs)
+            return exit_with_summary
+
+        module.exit_json = add_summary(module.exit_json)
+        module.fail_json = add_summary(module.fail_json)
@@ -31,7 +31,6 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
-from copy import deepcopy
 import re
 import traceback
 import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
@@ -63,6 +62,57 @@ def cmp(obj1, obj2):
     return (obj1 > obj2) - (obj1 < obj2)
 
 
+def canonical_key(item):
+    """
+    Return a hashable form of item, so that two items are equal if and only if their keys are equal.
+    Lists, tuples, sets and dicts are converted recursively, and tagged with their type, as [1] != (1,).
+    Raise TypeError if item, or an element in item, cannot be hashed.
+    """
+    if isinstance(item, dict):
+        return ('dict', frozenset((key, canonical_key(value)) for key, value in item.items()))
+    if isinstance(item, list):
+        return ('list', tuple(canonical_key(value) for value in item))
+    if isinstance(item, tuple):
+        return ('tuple', tuple(canonical_key(value) for value in item))
+    if isinstance(item, (set, frozenset)):
+        return ('set', frozenset(canonical_key(value) for value in item))
+    hash(item)
+    return item
+
+
+def multiset_diff(current, desired):
+    """
+    Compare two lists as multisets, in linear time.
+    Return the elements in desired that are not matched by an element in current, preserving order and duplicates,
+    and a boolean indicating whether some elements in current are not matched by an element in desired.
+    Raise TypeError if an element cannot be hashed.
+    """
+    counts = {}
+    for item in current:
+        key = canonical_key(item)
+        counts[key] = counts.get(key, 0) + 1
+    desired_diff_list = []
+    for item in desired:
+        key = canonical_key(item)
+        if counts.get(key):
+            counts[key] -= 1
+        else:
+            desired_diff_list.append(item)
+    return desired_diff_list, any(counts.values())
+
+
+def multiset_diff_by_scan(current, desired):
+    """ same as multiset_diff, for elements that cannot be hashed, in quadratic time """
+    current_copy = list(current)
+    desired_diff_list = []
+    for item in desired:
+        if item in current_copy:
+            current_copy.remove(item)
+        else:
+            desired_diff_list.append(item)
+    return desired_diff_list, bool(current_copy)
+
+
 class NetAppModule(object):
     '''
     Common class for NetApp modules
@@ -232,26 +282,13 @@ class NetAppModule(object):
             :return: list of attributes to be modified
             :rtype: list
         '''
-        current_copy = deepcopy(current)
-        desired_copy = deepcopy(desired)
-
-        # get what in desired and not in current
-        desired_diff_list = []
-        for item in desired:
-            if item in current_copy:
-                current_copy.remove(item)
-            else:
-                desired_diff_list.append(item)
-
-        # get what in current but not in desired
-        current_diff_list = []
-        for item in current:
-            if item in desired_copy:
-                desired_copy.remove(item)
-            else:
-                current_diff_list.append(item)
+        try:
+            desired_diff_list, has_current_diff = multiset_diff(current, desired)
+        except TypeError:
+            # some elements cannot be hashed, fall back to comparing each pair of elements
+            desired_diff_list, has_current_diff = multiset_diff_by_scan(current, desired)
 
-        if desired_diff_list or current_diff_list:
+        if desired_diff_list or has_current_diff:
             # there are changes
             return desired_diff_list if get_list_diff else desired
         else:
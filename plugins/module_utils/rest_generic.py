@@ -35,6 +35,7 @@ from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
 import ansible_collections.netapp.ontap.plugins.module_utils.rest_response_helpers as rrh
+from ansible_collections.netapp.ontap.plugins.module_utils import netapp_concurrency
 
 
 def build_query_with_fields(query, fields):
@@ -74,6 +75,42 @@ def get_0_or_more_records(rest_api, api, query=None, fields=None):
     return records, error
 
 
+def get_next_api(response):
+    ''' return the api for the next page of records, or None '''
+    if not isinstance(response, dict):
+        return None
+    next_link = response.get('_links', {}).get('next')
+    if not next_link:
+        return None
+    return next_link['href'].replace('/api', '')
+
+
+def iter_pages(rest_api, response, prefetch=True):
+    ''' generator, yield (page, error) for response, then for each page found by following _links.next
+
+        with prefetch, the request for the next page is sent from a background thread before the current
+        page is yielded, so that the network latency overlaps with the processing of the current page.
+        Only one request is in flight at any time, and pages are yielded in order.
+        Iteration stops after the first error.
+    '''
+    api = get_next_api(response)
+    if api is None or not prefetch or not netapp_concurrency.HAS_FUTURES:
+        yield response, None
+        while api is not None:
+            response, error = rest_api.get(api, {})
+            yield response, error
+            api = None if error else get_next_api(response)
+        return
+    with netapp_concurrency.ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(rest_api.get, api, {})
+        yield response, None
+        while future is not None:
+            response, error = future.result()
+            api = None if error else get_next_api(response)
+            future = None if api is None else executor.submit(rest_api.get, api, {})
+            yield response, error
+
+
 def post_async(rest_api, api, body, query=None, timeout=30, job_timeout=30, headers=None, raw_error=False, files=None):
     # see delete_async for async and sync operations and status codes
     response, error = rest_api.post(api, body=body, params=build_query_with_timeout(query, timeout), headers=headers, files=files)
@@ -135,3 +135,58 @@ def check_for_error_and_job_results(api, response, error, rest_api, **kwargs):
             else:
                 response['job_response'] = job_response
     return response, error
+
+
+def check_for_errors_and_jobs_results(api, responses, rest_api, fail_fast=False, **kwargs):
+    """same as check_for_error_and_job_results, for a list of (response, error) tuples
+       all jobs are waited on together, using a single query per polling cycle.
+       return a list of (response, error) tuples, in the same order.
+       with fail_fast, stop waiting after the first error, jobs that are still running are reported as errors.
+       api is used to format errors, it can be a list with one api per response.
+    """
+    format_error = not kwargs.pop('raw_error', False)
+    apis = api if isinstance(api, list) else [api] * len(responses)
+    results = []
+    jobs = {}
+    for index, (response, error) in enumerate(responses):
+        job = None
+        if error:
+            if format_error:
+                error = api_error(apis[index], error)
+        elif isinstance(response, dict):
+            if 'job' in response:
+                job = response['job']
+            elif 'jobs' in response:
+                if response['num_records'] > 1:
+                    error = "multiple jobs in progress, can't check status"
+                else:
+                    job = response['jobs'][0]
+        if job:
+            if job.get('uuid'):
+                jobs[job['uuid']] = index
+            else:
+                error = 'Job UUID not found - Job: %s' % job
+                if format_error:
+                    error = job_error(response, error)
+        results.append((response, error))
+    if not jobs or (fail_fast and any(error for dummy, error in results)):
+        return skip_jobs(results, jobs)
+    for uuid, job_response, error in rest_api.wait_on_jobs([dict(uuid=uuid) for uuid in jobs], **kwargs):
+        index = jobs.pop(uuid)
+        response = results[index][0]
+        if error:
+            if format_error:
+                error = job_error(response, error)
+        else:
+            response['job_response'] = job_response
+        results[index] = (response, error)
+        if error and fail_fast:
+            break
+    return skip_jobs(results, jobs)
+
+
+def skip_jobs(results, jobs):
+    """report an error for jobs that were not waited on"""
+    for uuid, index in jobs.items():
+        results[index] = (results[index][0], 'not waiting for job %s after an earlier error.' % uuid)
+    return results
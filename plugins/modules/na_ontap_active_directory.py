@@ -308,7 +308,7 @@ class NetAppOntapActiveDirectory:
                 self.delete_active_directory()
             elif modify:
                 self.modify_active_directory()
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
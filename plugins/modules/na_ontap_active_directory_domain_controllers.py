@@ -205,7 +205,7 @@ class NetAppOntapActiveDirectoryDC:
                 self.create_active_directory_preferred_domain_controllers_rest()
             elif cd_action == 'delete':
                 self.delete_active_directory_preferred_domain_controllers_rest()
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
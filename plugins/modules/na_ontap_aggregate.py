@@ -1107,7 +1107,7 @@ class NetAppOntapAggregate:
                 self.attach_object_store_to_aggr()
         if rename:
             modify['name'] = self.parameters['name']
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -438,7 +438,7 @@ reminder,max-http-size,max-smtp-size,remove-private-data,ondemand-server-url,sup
         sanitized_modify = self.idempotency_check(current, modify)
         if self.na_helper.changed and not self.module.check_mode:
             self.modify_autosupport_config(modify)
-        result = netapp_utils.generate_result(self.na_helper.changed, modify=sanitized_modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, modify=sanitized_modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -196,7 +196,7 @@ class NetAppOntapBgpConfiguration:
                 self.delete_bgp_config()
             elif modify:
                 self.modify_bgp_config(modify)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -361,7 +361,7 @@ class NetAppOntapBgpPeerGroup:
                 self.delete_bgp_peer_group()
             else:
                 self.modify_bgp_peer_group(modify)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -674,7 +674,7 @@ class NetAppOntapBroadcastDomain(object):
                 self.delete_broadcast_domain(current=current)
             elif modify:
                 self.modify_broadcast_domain_or_ports(modify, current)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
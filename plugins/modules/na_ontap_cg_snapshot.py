@@ -377,7 +377,7 @@ class NetAppONTAPCGSnapshot(object):
                 self.create_cg_snapshot_rest()
             elif cd_action == 'delete':
                 self.delete_cg_snapshot_rest(current)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
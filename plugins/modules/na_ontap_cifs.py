@@ -566,7 +566,7 @@ class NetAppONTAPCifsShare:
                 self.delete_cifs_share_rest()
             elif modify:
                 self.modify_cifs_share_rest(modify)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
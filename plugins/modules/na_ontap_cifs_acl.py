@@ -336,7 +336,7 @@ class NetAppONTAPCifsAcl:
                 self.delete_cifs_acl_rest(current)
             if modify:
                 self.modify_cifs_acl_permission_rest(current)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
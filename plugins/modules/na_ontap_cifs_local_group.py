@@ -219,7 +219,7 @@ class NetAppOntapCifsLocalGroup:
                 self.delete_cifs_local_group_rest()
             if modify or rename:
                 self.modify_cifs_local_group_rest(modify)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
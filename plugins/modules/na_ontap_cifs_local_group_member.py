@@ -276,7 +276,7 @@ class NetAppOntapCifsLocalGroupMember:
                     self.add_cifs_local_group_member()
                 elif cd_action == 'delete':
                     self.remove_cifs_local_group_member()
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
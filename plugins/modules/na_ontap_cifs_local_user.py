@@ -228,7 +228,7 @@ class NetAppOntapCifsLocalUser:
                 self.delete_cifs_local_user()
             elif modify:
                 self.modify_cifs_local_user(modify)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
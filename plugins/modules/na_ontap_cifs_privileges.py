@@ -196,7 +196,7 @@ class NetAppOntapCifsPrivileges:
                 self.modify_cifs_privileges(modify, reset=True)
             elif modify:
                 self.modify_cifs_privileges(modify)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
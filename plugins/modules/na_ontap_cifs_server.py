@@ -663,7 +663,7 @@ class NetAppOntapcifsServer:
                 # rename will enable the cifs server also, so disable it if service_state is stopped.
                 if 'cifs_server_name' in modify and self.parameters.get('service_state') == 'stopped':
                     self.modify_cifs_server_rest(current, {'service_state': 'stopped'})
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -275,7 +275,7 @@ class NetAppOntapCifsUnixSymlink:
                 self.delete_symlink_mapping_rest()
             elif modify:
                 self.modify_symlink_mapping_rest(modify)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
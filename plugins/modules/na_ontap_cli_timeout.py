@@ -110,7 +110,7 @@ class NetAppOntapCliTimeout:
         modify = self.na_helper.get_modified_attributes(current, self.parameters)
         if self.na_helper.changed and not self.module.check_mode:
             self.modify_timeout_value_rest(modify)
-        result = netapp_utils.generate_result(self.na_helper.changed, modify=modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, modify=modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
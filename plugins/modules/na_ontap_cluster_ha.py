@@ -135,7 +135,7 @@ class NetAppOntapClusterHA:
             elif cd_action == 'delete':
                 self.modify_cluster_ha("false")
 
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -458,7 +458,8 @@ class NetAppONTAPClusterPeer:
                 self.na_helper.changed = True
 
         result = netapp_utils.generate_result(self.na_helper.changed, modify=modify, extra_responses={'source_action': source_action,
-                                                                                                      'destination_action': destination_action})
+                                                                                                      'destination_action': destination_action},
+                                              rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -158,7 +158,7 @@ class NetAppOntapDiskOptions:
         if self.na_helper.changed and not self.module.check_mode:
             self.modify_disk_options(modify)
 
-        result = netapp_utils.generate_result(self.na_helper.changed, modify=modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, modify=modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -359,7 +359,7 @@ class NetAppOntapDns:
                 self.destroy_dns(dns_attrs)
             else:
                 self.modify_dns(dns_attrs)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -401,7 +401,7 @@ class NetAppOntapEfficiencyPolicy(object):
                 self.delete_efficiency_policy()
             elif modify:
                 self.modify_efficiency_policy(modify)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
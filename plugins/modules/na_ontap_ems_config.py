@@ -173,7 +173,7 @@ class NetAppOntapEmsConfig:
             password_changed = True
         if (self.na_helper.changed or password_changed) and not self.module.check_mode:
             self.modify_ems_config_rest(modify)
-        result = netapp_utils.generate_result(changed=self.na_helper.changed | password_changed, modify=modify)
+        result = netapp_utils.generate_result(changed=self.na_helper.changed | password_changed, modify=modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
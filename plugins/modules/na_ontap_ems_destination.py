@@ -357,7 +357,7 @@ class NetAppOntapEmsDestination:
                 self.create_ems_destination()
             else:
                 self.delete_ems_destination(name)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, saved_modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, saved_modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -259,7 +259,7 @@ class NetAppOntapEMSFilters:
                 self.delete_ems_filter()
             if modify:
                 self.modify_ems_filter(desired_rules)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -260,7 +260,7 @@ class NetAppONTAPExportPolicy():
                 self.create_export_policy()
             elif cd_action == 'delete':
                 self.delete_export_policy(current)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -143,6 +143,32 @@ options:
       - With REST, supported from ONTAP 9.9.1 version.
     type: bool
     version_added: 22.0.0
+
+  rules:
+    description:
+      - Manage the whole rule table of the export policy in a single task, mutually exclusive with C(client_match), C(rule_index),
+        and C(from_rule_index).
+      - Each entry is a dictionary accepting C(client_match), C(ro_rule), C(rw_rule), C(protocol), C(super_user_security),
+        C(anonymous_user_id), C(allow_suid), C(ntfs_unix_security), C(chown_mode), and C(allow_device_creation).
+      - C(client_match), C(ro_rule), and C(rw_rule) are required in each entry, other options default to the values set at the module level.
+      - With state set to present, the policy is created if needed, and its rules are made to match the list exactly.
+        The index of a rule is its position in the list, starting at 1.  Existing rules that do not match any entry are deleted.
+      - With state set to absent, a rule with an exact match is deleted for each entry, other rules are left untouched.
+      - All the rules of the policy are read with a single query, and matched in memory using C(client_match), ignoring order and case.
+        A rule with the same C(client_match) but different attributes is modified rather than deleted and created again.
+      - Rules are then modified, deleted, and created concurrently, see C(max_concurrent_jobs).  Lastly they are reindexed, one at a time.
+      - Only supported with REST.
+    type: list
+    elements: dict
+    version_added: 22.15.0
+
+  max_concurrent_jobs:
+    description:
+      - When C(rules) is set, maximum number of rules being changed at the same time.
+      - Should not exceed the C(rest_pool_maxsize) feature flag, as each rule uses its own connection.
+    type: int
+    default: 5
+    version_added: 22.15.0
 '''
 
 EXAMPLES = """
@@ -207,20 +233,87 @@ EXAMPLES = """
     hostname: "{{ netapp_hostname }}"
     username: "{{ netapp_username }}"
     password: "{{ netapp_password }}"
+
+- name: Set all the rules of an export policy
+  netapp.ontap.na_ontap_export_policy_rule:
+    state: present
+    name: default123
+    vserver: ci_dev
+    protocol: nfs
+    super_user_security: sys
+    rules:
+      - client_match: 10.10.0.0/16
+        ro_rule: sys
+        rw_rule: sys
+      - client_match: 10.20.0.0/16,10.30.0.0/16
+        ro_rule: sys
+        rw_rule: none
+      - client_match: 0.0.0.0/0
+        ro_rule: none
+        rw_rule: none
+        protocol: any
+    max_concurrent_jobs: 10
+    hostname: "{{ netapp_hostname }}"
+    username: "{{ netapp_username }}"
+    password: "{{ netapp_password }}"
 """
 
 RETURN = """
-
-
+rules:
+  description:
+    - When C(rules) is set, the client_match, rule_index, action, and modify for each entry.
+    - from_rule_index is set when the rule is reindexed, error is set when a change failed.
+  returned: always, when C(rules) is set
+  type: list
+  elements: dict
+deleted_rules:
+  description: When C(rules) is set, the rule_index and client_match of each rule that was deleted.
+  returned: always, when C(rules) is set
+  type: list
+  elements: dict
+reindex:
+  description:
+    - When C(rules) is set, the from_rule_index and rule_index for each reindexing call, in order.
+    - A rule may be moved to a temporary index first, to break a cycle.
+    - In check mode, the indexes of new rules are estimated.
+  returned: always, when C(rules) is set
+  type: list
+  elements: dict
 """
+import copy
 import traceback
 
 from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.arg_spec import ArgumentSpecValidator
 from ansible.module_utils._text import to_native
 import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
+from ansible_collections.netapp.ontap.plugins.module_utils import netapp_concurrency
 from ansible_collections.netapp.ontap.plugins.module_utils import rest_generic
 from ansible_collections.netapp.ontap.plugins.module_utils.netapp_module import NetAppModule
 
+# options accepted in each rules entry
+EXPORT_RULE_OPTIONS = ['client_match', 'ro_rule', 'rw_rule', 'protocol', 'super_user_security', 'anonymous_user_id',
+                       'allow_suid', 'ntfs_unix_security', 'chown_mode', 'allow_device_creation']
+EXPORT_RULE_OPTIONS_9_9_1 = ['allow_suid', 'ntfs_unix_security', 'chown_mode', 'allow_device_creation']
+
+
+class ExportRuleError(Exception):
+    pass
+
+
+class ExportRuleModule:
+    """ stands for the AnsibleModule when managing one rule in a rules list
+        fail_json raises an exception, so that errors can be collected from worker threads
+    """
+    def __init__(self, module):
+        self._module = module
+
+    def fail_json(self, **kwargs):
+        raise ExportRuleError(kwargs.get('msg'))
+
+    def __getattr__(self, name):
+        return getattr(self._module, name)
+
 
 class NetAppontapExportRule:
     ''' object initialize and class methods '''
@@ -254,10 +347,19 @@ class NetAppontapExportRule:
             chown_mode=dict(required=False, type='str', choices=['restricted', 'unrestricted']),
             allow_device_creation=dict(required=False, type='bool'),
         ))
+        # each entry in rules accepts the rule options, and defaults to the module level values
+        self.export_rule_argument_spec = dict(
+            (key, dict((attr, value) for attr, value in self.argument_spec[key].items() if attr not in ('required', 'default')))
+            for key in EXPORT_RULE_OPTIONS)
+        self.argument_spec.update(dict(
+            rules=dict(required=False, type='list', elements='dict'),
+            max_concurrent_jobs=dict(required=False, type='int', default=5),
+        ))
 
         self.module = AnsibleModule(
             argument_spec=self.argument_spec,
-            supports_check_mode=True
+            supports_check_mode=True,
+            mutually_exclusive=[('rules', 'client_match'), ('rules', 'rule_index'), ('rules', 'from_rule_index')]
         )
 
         self.na_helper = NetAppModule()
@@ -269,6 +371,12 @@ class NetAppontapExportRule:
         partially_supported_rest_properties = [['ntfs_unix_security', (9, 9, 1)], ['allow_suid', (9, 9, 1)],
                                                ['allow_device_creation', (9, 9, 1)], ['chown_mode', (9, 9, 1)]]
         self.use_rest = self.rest_api.is_rest_supported_properties(self.parameters, None, partially_supported_rest_properties)
+        if self.parameters.get('rules') is not None:
+            if not self.use_rest:
+                self.module.fail_json(msg='Error: rules option requires REST.  use_rest: %s.' % self.parameters['use_rest'])
+            if self.parameters['max_concurrent_jobs'] < 1:
+                self.module.fail_json(msg='Error: max_concurrent_jobs must be 1 or more, got: %d.' % self.parameters['max_concurrent_jobs'])
+            return
         if not self.use_rest:
             if not netapp_utils.has_netapp_lib():
                 self.module.fail_json(msg=netapp_utils.netapp_lib_is_required())
@@ -630,6 +738,7 @@ class NetAppontapExportRule:
             self.module.fail_json(msg="Error on creating export policy rule, returned response is invalid: %s" % response)
         if self.parameters.get('rule_index'):
             self.modify_export_policy_rule_rest({}, rule_index, True)
+        return rule_index
 
     def client_match_format(self, client_match):
         return [{'match': each} for each in client_match]
@@ -692,8 +801,210 @@ class NetAppontapExportRule:
         if error:
             self.module.fail_json(msg="Error on modifying export policy Rule: %s" % error)
 
+    def reindex_export_policy_rule_rest(self, rule_index, new_index):
+        api = 'protocols/nfs/export-policies/%s/rules' % self.policy_id
+        dummy, error = rest_generic.patch_async(self.rest_api, api, rule_index, {}, {'new_index': new_index})
+        if error:
+            self.module.fail_json(msg="Error on reindexing export policy rule %s to %s: %s" % (rule_index, new_index, error))
+
+    def build_export_rule_parameters(self, rule):
+        """ validate a rules entry, and use module level values as defaults """
+        result = ArgumentSpecValidator(self.export_rule_argument_spec).validate(rule)
+        if result.error_messages:
+            raise ExportRuleError('Error in rules entry %s: %s' % (rule, ', '.join(result.error_messages)))
+        parameters = dict((key, value) for key, value in self.parameters.items() if key not in ('rules', 'max_concurrent_jobs'))
+        for key, value in result.validated_parameters.items():
+            if value is not None:
+                parameters[key] = value
+        missing_keys = [key for key in ('client_match', 'ro_rule', 'rw_rule') if parameters.get(key) is None]
+        if missing_keys:
+            raise ExportRuleError('Error: client_match, ro_rule, and rw_rule are required in each rules entry, missing %s in: %s'
+                                  % (', '.join(missing_keys), rule))
+        if not self.rest_api.meets_rest_minimum_version(self.use_rest, 9, 9, 1):
+            unsupported = [key for key in EXPORT_RULE_OPTIONS_9_9_1 if parameters.get(key) is not None]
+            if unsupported:
+                raise ExportRuleError('Error: %s in rules entry %s requires ONTAP 9.9.1 or later.' % (', '.join(unsupported), rule))
+        return parameters
+
+    def create_export_rule_worker(self, parameters):
+        """ return a copy of self to manage a single rule, errors are raised as ExportRuleError """
+        worker = copy.copy(self)
+        worker.module = ExportRuleModule(self.module)
+        worker.na_helper = NetAppModule()
+        worker.parameters = worker.na_helper.set_parameters(parameters)
+        return worker
+
+    @staticmethod
+    def get_client_match_key(client_match):
+        """ identify a rule, the order and case of clients do not matter """
+        return tuple(sorted(client.strip().lower() for client in client_match))
+
+    def get_export_policy_rules_rest(self):
+        """ all the rules for the policy, in a single query """
+        if not self.policy_id:
+            return []
+        query = {'fields': 'anonymous_user,clients,index,protocols,ro_rule,rw_rule,superuser'}
+        if self.rest_api.meets_rest_minimum_version(self.use_rest, 9, 9, 1):
+            query['fields'] += ',ntfs_unix_security,allow_suid,chown_mode,allow_device_creation'
+        api = 'protocols/nfs/export-policies/%s/rules' % self.policy_id
+        records, error = rest_generic.get_0_or_more_records(self.rest_api, api, query)
+        if error:
+            self.module.fail_json(msg="Error on fetching export policy rules: %s" % error)
+        return [self.filter_get_results(record) for record in records or []]
+
+    def match_export_rules(self, entries, records):
+        """ match each entry with an existing rule, in a single pass over the rule table indexed by client_match
+            exact matches are preferred to rules that need to be modified, and rules already at the right index to other rules
+            return a list of (record, modify) for each entry, record is None if the rule needs to be created,
+            and the list of records that were not matched
+        """
+        by_client = {}
+        for record in records:
+            by_client.setdefault(self.get_client_match_key(record['client_match']), []).append(record)
+        matches = [None] * len(entries)
+        passes = [(True, True), (True, False), (False, True), (False, False)] if self.parameters['state'] == 'present' else [(True, False)]
+        for exact, same_index in passes:
+            for position, parameters in enumerate(entries):
+                if matches[position] is not None:
+                    continue
+                candidates = by_client.get(self.get_client_match_key(parameters['client_match']), [])
+                for record in candidates:
+                    if same_index and record['rule_index'] != position + 1:
+                        continue
+                    modify = NetAppModule().get_modified_attributes(record, parameters)
+                    modify.pop('rule_index', None)
+                    modify.pop('client_match', None)
+                    if exact and modify:
+                        continue
+                    matches[position] = (record, modify)
+                    candidates.remove(record)
+                    break
+        unmatched = [record for candidates in by_client.values() for record in candidates]
+        return [match or (None, None) for match in matches], sorted(unmatched, key=lambda record: record['rule_index'])
+
+    @staticmethod
+    def plan_reindex(indexes):
+        """ indexes is a list of current rule indexes, the target index for a rule is its position in the list, starting at 1
+            return a list of (from_index, to_index) moves, so that a rule is only moved to a free index
+            when all target indexes are taken, a rule is moved to a temporary free index to break the cycle
+        """
+        occupied = dict((index, position) for position, index in enumerate(indexes))
+        indexes = list(indexes)
+        pending = [position for position, index in enumerate(indexes) if index != position + 1]
+        next_free = max(list(occupied) + [len(indexes)]) + 1
+        moves = []
+        while pending:
+            moved = False
+            for position in list(pending):
+                if position + 1 not in occupied:
+                    moves.append((indexes[position], position + 1))
+                    del occupied[indexes[position]]
+                    occupied[position + 1] = position
+                    indexes[position] = position + 1
+                    pending.remove(position)
+                    moved = True
+            if not moved:
+                position = pending[0]
+                moves.append((indexes[position], next_free))
+                del occupied[indexes[position]]
+                occupied[next_free] = position
+                indexes[position] = next_free
+                next_free += 1
+        return moves
+
+    def apply_rules(self):
+        """ read all rules for the policy, compare them in memory, then apply the changes concurrently
+            rules are reindexed last, as indexes are only known after rules are created
+        """
+        workers = []
+        try:
+            for rule in self.parameters['rules']:
+                workers.append(self.create_export_rule_worker(self.build_export_rule_parameters(rule)))
+        except ExportRuleError as exc:
+            self.module.fail_json(msg=str(exc))
+
+        self.set_export_policy_id_rest()
+        records = self.get_export_policy_rules_rest()
+        matches, unmatched = self.match_export_rules([worker.parameters for worker in workers], records)
+        present = self.parameters['state'] == 'present'
+        if present:
+            deletes = unmatched
+            creates = [position for position, (record, dummy) in enumerate(matches) if record is None]
+            modifies = [position for position, (record, modify) in enumerate(matches) if modify]
+        else:
+            deletes = [record for record, dummy in matches if record is not None]
+            creates, modifies = [], []
+        create_policy = present and bool(workers) and not self.policy_id
+
+        rules = []
+        for worker, (record, modify) in zip(workers, matches):
+            action = 'delete' if record is not None and not present else 'create' if record is None and present else None
+            rules.append(dict(client_match=worker.parameters['client_match'], action=action, modify=modify or None,
+                              rule_index=record['rule_index'] if record is not None else None))
+        deleted_rules = [dict(rule_index=record['rule_index'], client_match=record['client_match']) for record in deletes]
+        # in check mode, ONTAP is assumed to append new rules at the end of the table
+        next_index = max([record['rule_index'] for record in records] + [0]) + 1
+        for count, position in enumerate(creates):
+            rules[position]['rule_index'] = next_index + count
+
+        errors = []
+        if not self.module.check_mode:
+            if create_policy:
+                self.create_export_policy_rest()
+                self.set_export_policy_id_rest()
+            deleter = self.create_export_rule_worker(self.parameters)
+            for worker in workers:
+                worker.policy_id = self.policy_id
+            results = netapp_concurrency.run_concurrently(
+                lambda position: workers[position].modify_export_policy_rule_rest(matches[position][1], matches[position][0]['rule_index']),
+                [(position,) for position in modifies], self.parameters['max_concurrent_jobs'])
+            errors.extend(self.collect_rule_errors(rules, modifies, results, 'modifying'))
+            if not errors:
+                results = netapp_concurrency.run_concurrently(
+                    lambda record: deleter.delete_export_policy_rule_rest(record['rule_index']),
+                    [(record,) for record in deletes], self.parameters['max_concurrent_jobs'])
+                for record, (dummy, exc) in zip(deletes, results):
+                    if exc is not None:
+                        errors.append('deleting rule %s: %s' % (record['rule_index'], exc))
+            if not errors:
+                results = netapp_concurrency.run_concurrently(lambda position: workers[position].create_export_policy_rule_rest(),
+                                                              [(position,) for position in creates], self.parameters['max_concurrent_jobs'])
+                for position, (rule_index, dummy) in zip(creates, results):
+                    rules[position]['rule_index'] = rule_index
+                errors.extend(self.collect_rule_errors(rules, creates, results, 'creating'))
+        if errors:
+            self.module.fail_json(msg='Error managing export policy rules: %s' % '  '.join(errors), changed=True,
+                                  rules=rules, deleted_rules=deleted_rules, reindex=[])
+
+        reindex = []
+        if present:
+            reindex = [dict(from_rule_index=from_index, rule_index=to_index)
+                       for from_index, to_index in self.plan_reindex([rule['rule_index'] for rule in rules])]
+            for position, rule in enumerate(rules, 1):
+                if rule['rule_index'] != position:
+                    rule['from_rule_index'] = rule['rule_index']
+                    rule['rule_index'] = position
+        if not self.module.check_mode:
+            for move in reindex:
+                self.reindex_export_policy_rule_rest(move['from_rule_index'], move['rule_index'])
+        changed = bool(create_policy or deletes or creates or modifies or reindex)
+        result = netapp_utils.generate_result(changed, extra_responses={'rules': rules, 'deleted_rules': deleted_rules, 'reindex': reindex},
+                                              rest_api=self.rest_api)
+        self.module.exit_json(**result)
+
+    @staticmethod
+    def collect_rule_errors(rules, positions, results, action):
+        errors = []
+        for position, (dummy, exc) in zip(positions, results):
+            if exc is not None:
+                rules[position]['error'] = str(exc)
+                errors.append('%s rule %s: %s' % (action, ','.join(rules[position]['client_match']), exc))
+        return errors
+
     def apply(self):
         ''' Apply required action from the play'''
+        if self.parameters.get('rules') is not None:
+            return self.apply_rules()
         current = self.get_export_policy_rule(self.parameters.get('rule_index'))
         cd_action, rename, modify = None, None, None
         cd_action = self.na_helper.get_cd_action(current, self.parameters)
@@ -732,7 +1043,7 @@ class NetAppontapExportRule:
             elif modify:
                 self.modify_export_policy_rule(modify, current['rule_index'])
 
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
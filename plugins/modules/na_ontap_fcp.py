@@ -242,7 +242,7 @@ class NetAppOntapFCP:
         current = self.get_fcp()
         if not self.use_rest:
             changed = self.zapi_apply(current)
-            result = netapp_utils.generate_result(changed)
+            result = netapp_utils.generate_result(changed, rest_api=self.rest_api)
         else:
             cd_action = self.na_helper.get_cd_action(current, self.parameters)
             modify = self.na_helper.get_modified_attributes(current, self.parameters)
@@ -259,7 +259,7 @@ class NetAppOntapFCP:
                     if current['status'] == 'up':
                         self.start_stop_fcp_rest(False, current)
                     self.destroy_fcp_rest(current)
-            result = netapp_utils.generate_result(changed, cd_action, modify)
+            result = netapp_utils.generate_result(changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
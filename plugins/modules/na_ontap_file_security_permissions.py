@@ -414,8 +414,10 @@ class NetAppOntapFileSecurityPermissions:
                 }
                 }
                 acl.update(apply_to)
-            # error if identical acls are set.
-            self.match_acl_with_acls(acl, self.parameters['acls'])
+        # error if identical acls are set.
+        acls_index = self.index_acls(self.parameters['acls'])
+        for acl in self.parameters['acls']:
+            self.match_acl_in_index(acl, acls_index)
         for option in ('access_control', 'ignore_paths', 'propagation_mode'):
             value = self.parameters.get(option)
             if value is not None:
@@ -573,31 +575,47 @@ class NetAppOntapFileSecurityPermissions:
             self.module.fail_json(msg='Error modifying file security permissions %s: %s' % (self.parameters['path'], to_native(error)),
                                   exception=traceback.format_exc())
 
-    def match_acl_with_acls(self, acl, acls):
-        """ return acl if user and access and apply_to are matched, otherwiese None """
-        matches = []
-        for an_acl in acls:
-            # with 9.9.1, access_control is not supported.  It will be set to None in received ACLs, and omitted in desired ACLs
-            # but we can assume the user would like to see file_directory.
-            # We can't modify inherited ACLs.  But we can create a new one at a lower scope.
-            inherited = an_acl['inherited'] if 'inherited' in an_acl else False and (acl['inherited'] if 'inherited' in acl else False)
-            if (acl['user'] == an_acl['user']
-                    and acl['access'] == an_acl['access']
-                    and acl.get('access_control', 'file_directory') == an_acl.get('access_control', 'file_directory')
-                    and acl.get('apply_to') == an_acl.get('apply_to')
-                    and not inherited):
-                matches.append(an_acl)
+    @staticmethod
+    def acl_key(acl):
+        """ ACLs are matched on user, access, access_control and apply_to """
+        # with 9.9.1, access_control is not supported.  It will be set to None in received ACLs, and omitted in desired ACLs
+        # but we can assume the user would like to see file_directory.
+        apply_to = acl.get('apply_to')
+        if isinstance(apply_to, dict):
+            apply_to = tuple(sorted(apply_to.items()))
+        return acl['user'], acl['access'], acl.get('access_control', 'file_directory'), apply_to
+
+    def index_acls(self, acls):
+        """ return a dict of lists of ACLs, keyed by user, access, access_control and apply_to
+            We can't modify inherited ACLs.  But we can create a new one at a lower scope, so they are not indexed.
+        """
+        index = {}
+        for acl in acls:
+            if not acl.get('inherited'):
+                index.setdefault(self.acl_key(acl), []).append(acl)
+        return index
+
+    def match_acl_in_index(self, acl, index):
+        """ return acl if user and access and apply_to are matched, otherwise None """
+        matches = index.get(self.acl_key(acl), [])
         if len(matches) > 1:
             self.module.fail_json(msg='Error: found more than one desired ACLs with same user, access, access_control and apply_to  %s' % matches)
         return matches[0] if matches else None
 
+    def match_acl_with_acls(self, acl, acls):
+        """ return acl if user and access and apply_to are matched, otherwise None """
+        return self.match_acl_in_index(acl, self.index_acls(acls))
+
     def get_acl_actions_on_modify(self, modify, current):
         acl_actions = {'patch-acls': [], 'post-acls': [], 'delete-acls': []}
         if not self.has_acls(current):
             acl_actions['post-acls'] = modify['acls']
             return acl_actions
+        # index both lists once, so that matching is linear rather than quadratic
+        current_index = self.index_acls(current['acls'])
+        desired_index = self.index_acls(self.parameters['acls'])
         for acl in modify['acls']:
-            current_acl = self.match_acl_with_acls(acl, current['acls'])
+            current_acl = self.match_acl_in_index(acl, current_index)
             if current_acl:
                 # if exact match of 2 acl found, look for modify in that matched desired and current acl.
                 if self.is_modify_acl_required(acl, current_acl):
@@ -606,7 +624,7 @@ class NetAppOntapFileSecurityPermissions:
                 acl_actions['post-acls'].append(acl)
         # Ignore inherited ACLs
         for acl in current['acls']:
-            desired_acl = self.match_acl_with_acls(acl, self.parameters['acls'])
+            desired_acl = self.match_acl_in_index(acl, desired_index)
             if not desired_acl and not acl.get('inherited') and self.parameters.get('access_control') in (None, acl.get('access_control')):
                 # only delete ACLs that matches the desired access_control, or all ACLs if not set
                 acl_actions['delete-acls'].append(acl)
@@ -732,7 +750,7 @@ class NetAppOntapFileSecurityPermissions:
             changed = self.na_helper.changed
             self.validate_changes(cd_action, modify)
             self.na_helper.changed = changed
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
     def validate_changes(self, cd_action, modify):
@@ -466,7 +466,7 @@ class NetAppOntapFileSecurityPermissionsACL:
             if modify:
                 self.modify_file_security_permissions_acl()
             self.validate_changes(cd_action, modify)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
     def validate_changes(self, cd_action, modify):
@@ -800,7 +800,7 @@ class NetAppONTAPFlexCache:
                     self.rest_mount_volume(current, mount_unmount)
                 if modify:
                     response = self.flexcache_rest_modify(current['uuid'], modify)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, response)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, response, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
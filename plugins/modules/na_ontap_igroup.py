@@ -114,6 +114,17 @@ options:
     default: false
     aliases: ['allow_delete_while_mapped']
 
+  max_concurrent_jobs:
+    description:
+      - With REST, maximum number of requests sent at the same time when removing initiators or igroups, or when updating comments.
+      - Initiators and igroups are added with a single request.
+      - With ZAPI, initiators are always added or removed one at a time.
+      - When some requests fail, the other requests are still sent, and all errors are reported together.
+      - Should not exceed the C(rest_pool_maxsize) feature flag, as each request uses its own connection.
+    type: int
+    default: 5
+    version_added: 22.15.0
+
   vserver:
     description:
     - The name of the vserver to use.
@@ -211,6 +222,7 @@ import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_ut
 from ansible_collections.netapp.ontap.plugins.module_utils.netapp_module import NetAppModule
 from ansible_collections.netapp.ontap.plugins.module_utils.netapp import OntapRestAPI
 from ansible_collections.netapp.ontap.plugins.module_utils import rest_generic
+from ansible_collections.netapp.ontap.plugins.module_utils import netapp_concurrency
 
 
 class NetAppOntapIgroup:
@@ -234,7 +246,8 @@ class NetAppOntapIgroup:
             )),
             vserver=dict(required=True, type='str'),
             force_remove_initiator=dict(required=False, type='bool', default=False, aliases=['allow_delete_while_mapped']),
-            bind_portset=dict(required=False, type='str')
+            bind_portset=dict(required=False, type='str'),
+            max_concurrent_jobs=dict(required=False, type='int', default=5),
         ))
 
         self.module = AnsibleModule(
@@ -245,6 +258,8 @@ class NetAppOntapIgroup:
 
         self.na_helper = NetAppModule()
         self.parameters = self.na_helper.set_parameters(self.module.params)
+        if self.parameters['max_concurrent_jobs'] < 1:
+            self.module.fail_json(msg='Error: max_concurrent_jobs must be 1 or more, got: %d.' % self.parameters['max_concurrent_jobs'])
         self.rest_modify_zapi_to_rest = dict(
             # initiator_group_type (protocol) cannot be changed after create
             bind_portset='portset',
@@ -420,13 +435,33 @@ class NetAppOntapIgroup:
         dummy, error = rest_generic.post_async(self.rest_api, api, body)
         self.fail_on_error(error)
 
+    def modify_initiator_rest(self, uuid, initiator):
+        api = "protocols/san/igroups/%s/initiators" % uuid
+        body = dict(comment=initiator['comment'])
+        dummy, error = rest_generic.patch_async(self.rest_api, api, initiator['name'], body)
+        return error
+
     def modify_initiators_rest(self, uuid, initiator_objects):
-        for initiator in initiator_objects:
-            if 'comment' in initiator:
-                api = "protocols/san/igroups/%s/initiators" % uuid
-                body = dict(comment=initiator['comment'])
-                dummy, error = rest_generic.patch_async(self.rest_api, api, initiator['name'], body)
-                self.fail_on_error(error)
+        initiator_objects = [initiator for initiator in initiator_objects if 'comment' in initiator]
+        self.run_requests(self.modify_initiator_rest, [(uuid, initiator) for initiator in initiator_objects],
+                          [initiator['name'] for initiator in initiator_objects], 'updating comment for')
+
+    def run_requests(self, function, args_list, names, context):
+        """ call function(*args) for each args in args_list, function returns an error or None
+            with REST, requests are sent concurrently.  All requests are sent, and all errors are reported together.
+            names identifies the initiator or igroup for each request in error messages.
+        """
+        max_workers = self.parameters['max_concurrent_jobs'] if self.use_rest else 1
+        errors = []
+        for name, (error, exc) in zip(names, netapp_concurrency.run_concurrently(function, args_list, max_workers)):
+            if exc is not None:
+                error = to_native(exc)
+            if error:
+                errors.append('%s %s: %s' % (context, name, error))
+        if len(errors) == 1:
+            self.fail_on_error(errors[0])
+        if errors:
+            self.fail_on_error('%d requests failed out of %d: %s' % (len(errors), len(args_list), ' - '.join(errors)))
 
     def add_initiators_or_igroups(self, uuid, option, current_names):
         """
@@ -437,19 +472,20 @@ class NetAppOntapIgroup:
         # don't add if initiator_names/igroups is empty string
         if self.parameters.get(option) == [''] or self.parameters.get(option) is None:
             return
+        current_names = set(current_names)
         names_to_add = [name for name in self.parameters[option] if name not in current_names]
         if self.use_rest and names_to_add:
+            # a single request for all names
             self.add_initiators_or_igroups_rest(uuid, option, names_to_add)
         else:
-            for name in names_to_add:
-                self.modify_initiator(name, 'igroup-add')
+            self.run_requests(self.modify_initiator, [(name, 'igroup-add') for name in names_to_add], names_to_add, 'adding')
 
     def delete_initiator_or_igroup_rest(self, uuid, option, name_or_uuid):
         self.check_option_is_valid(option)
         api = "protocols/san/igroups/%s/%s" % (uuid, self.get_rest_name_for_option(option))
         query = {'allow_delete_while_mapped': True} if self.parameters['force_remove_initiator'] else None
         dummy, error = rest_generic.delete_async(self.rest_api, api, name_or_uuid, query=query)
-        self.fail_on_error(error)
+        return error
 
     def remove_initiators_or_igroups(self, uuid, option, current_names, mapping):
         """
@@ -457,16 +493,18 @@ class NetAppOntapIgroup:
         :return: None
         """
         self.check_option_is_valid(option)
-        for name in current_names:
-            if name not in self.parameters.get(option, list()):
-                if self.use_rest:
-                    self.delete_initiator_or_igroup_rest(uuid, option, mapping[name])
-                else:
-                    self.modify_initiator(name, 'igroup-remove')
+        desired_names = set(self.parameters.get(option, list()))
+        names_to_remove = [name for name in current_names if name not in desired_names]
+        if self.use_rest:
+            args_list = [(uuid, option, mapping[name]) for name in names_to_remove]
+            self.run_requests(self.delete_initiator_or_igroup_rest, args_list, names_to_remove, 'removing')
+        else:
+            self.run_requests(self.modify_initiator, [(name, 'igroup-remove') for name in names_to_remove], names_to_remove, 'removing')
 
     def modify_initiator(self, initiator, zapi):
         """
         Add or remove an initiator to/from an igroup
+        return an error message or None
         """
         options = {'initiator-group-name': self.parameters['name'],
                    'initiator': initiator}
@@ -478,9 +516,8 @@ class NetAppOntapIgroup:
         try:
             self.server.invoke_successfully(igroup_modify, enable_tunneling=True)
         except netapp_utils.zapi.NaApiError as error:
-            self.module.fail_json(msg='Error modifying igroup initiator %s: %s' % (self.parameters['name'],
-                                                                                   to_native(error)),
-                                  exception=traceback.format_exc())
+            return 'Error modifying igroup initiator %s: %s' % (self.parameters['name'], to_native(error))
+        return None
 
     def create_igroup_rest(self):
         api = "protocols/san/igroups"
@@ -684,7 +721,7 @@ class NetAppOntapIgroup:
                 self.delete_igroup(uuid)
             if modify:
                 self.modify_igroup(uuid, current, modify)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify=saved_modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify=saved_modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
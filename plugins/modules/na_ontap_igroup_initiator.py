@@ -208,7 +208,7 @@ class NetAppOntapIgroupInitiator(object):
                     self.modify_initiator(initiator, 'igroup-add')
                 elif cd_action == 'delete':
                     self.modify_initiator(initiator, 'igroup-remove')
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -219,6 +219,16 @@ options:
         type: list
         elements: str
         default: never
+    max_concurrent_subsets:
+        description:
+        - Maximum number of subsets gathered in parallel, using a pool of threads.
+        - The default, 1, gathers subsets one after the other.
+        - Each thread uses its own ZAPI connection.
+        - A subset that depends on another subset, like net_ifgrp_info on net_port_info, is gathered after it.
+        - Results are reported in the same way, and the first error is reported in the same order, as when subsets are gathered sequentially.
+        type: int
+        default: 1
+        version_added: '22.15.0'
 '''
 
 EXAMPLES = '''
@@ -249,6 +259,13 @@ EXAMPLES = '''
       - missing_vserver_api_error
       - rpc_error
 
+- name: Get all NetApp info, with up to 4 subsets gathered in parallel
+  netapp.ontap.na_ontap_info:
+    hostname: "na-vsim"
+    username: "admin"
+    password: "admins_password"
+    max_concurrent_subsets: 4
+
 - name: Limit Info Gathering to Aggregate Information as Cluster Admin
   netapp.ontap.na_ontap_info:
     hostname: "na-vsim"
@@ -374,29 +391,21 @@ ontap_info:
 
 import codecs
 import copy
+import threading
 import traceback
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils._text import to_bytes, to_native, to_text
+from ansible.module_utils.six.moves import queue
 import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
-
-IMPORT_ERRORS = []
-try:
-    import xmltodict
-    HAS_XMLTODICT = True
-except ImportError as exc:
-    HAS_XMLTODICT = False
-    IMPORT_ERRORS.append(str(exc))
-
-try:
-    import json
-    HAS_JSON = True
-except ImportError as exc:
-    HAS_JSON = False
-    IMPORT_ERRORS.append(str(exc))
+from ansible_collections.netapp.ontap.plugins.module_utils import netapp_concurrency
 
 HAS_NETAPP_LIB = netapp_utils.has_netapp_lib()
 
 
+class SubsetError(Exception):
+    ''' raised by a worker thread, in place of fail_json, with the fail_json msg and kwargs as args '''
+
+
 class NetAppONTAPGatherInfo:
     '''Class with gather info methods'''
 
@@ -421,6 +430,7 @@ class NetAppONTAPGatherInfo:
             use_native_zapi_tags=dict(type='bool', required=False, default=False),
             continue_on_error=dict(type='list', required=False, elements='str', default=['never']),
             query=dict(type='dict', required=False),
+            max_concurrent_subsets=dict(type='int', required=False, default=1),
         ))
 
         self.module = AnsibleModule(
@@ -430,10 +440,13 @@ class NetAppONTAPGatherInfo:
 
         if not HAS_NETAPP_LIB:
             self.module.fail_json(msg=netapp_utils.netapp_lib_is_required())
-        if not HAS_XMLTODICT:
-            self.module.fail_json(msg="the python xmltodict module is required.  Import error: %s" % str(IMPORT_ERRORS))
-        if not HAS_JSON:
-            self.module.fail_json(msg="the python json module is required.  Import error: %s" % str(IMPORT_ERRORS))
+        self.max_concurrent_subsets = self.module.params['max_concurrent_subsets']
+        if self.max_concurrent_subsets < 1:
+            self.module.fail_json(msg="Error: max_concurrent_subsets must be 1 or more, got: %d." % self.max_concurrent_subsets)
+        # set when running in a worker thread
+        self.worker_context = threading.local()
+        # additional ZAPI connections for worker threads
+        self.worker_servers = []
 
         self.max_records = str(self.module.params['max_records'])
         volume_move_target_aggr_info = self.module.params.get('volume_move_target_aggr_info', dict())
@@ -453,6 +466,7 @@ class NetAppONTAPGatherInfo:
         # for starting this
         # min_version identifies the ontapi version which supports this ZAPI
         # use 0 if it is supported since 9.1
+        # depends_on lists the subsets which are required to gather this subset, their results are passed as keyword arguments
         self.info_subsets = {
             'cluster_identity_info': {
                 'method': self.get_generic_get_iter,
@@ -703,6 +717,7 @@ class NetAppONTAPGatherInfo:
             'net_ifgrp_info': {
                 'method': self.get_ifgrp_info,
                 'kwargs': {},
+                'depends_on': ['net_port_info'],
                 'min_version': '0',
             },
             'ontap_system_version': {
@@ -1435,77 +1450,84 @@ class NetAppONTAPGatherInfo:
         api = 'system-get-ontapi-version'
         api_call = netapp_utils.zapi.NaElement(api)
         try:
-            results = self.server.invoke_successfully(api_call, enable_tunneling=True)
+            results = self.get_server().invoke_successfully(api_call, enable_tunneling=True)
             ontapi_version = results.get_child_content('minor-version')
             return ontapi_version if ontapi_version is not None else '0'
         except netapp_utils.zapi.NaApiError as error:
-            self.module.fail_json(msg="Error calling API %s: %s" %
-                                  (api, to_native(error)), exception=traceback.format_exc())
-
-    def call_api(self, call, attributes_list_tag='attributes-list', query=None, fail_on_error=True):
-        '''Main method to run an API call'''
+            self.fail_json(msg="Error calling API %s: %s" % (api, to_native(error)), exception=traceback.format_exc())
 
+    def build_api_request(self, call, query=None, tag=None):
+        '''build the request for the first page, or for a next page when tag is set'''
         api_call = netapp_utils.zapi.NaElement(call)
-        initial_result = None
-        result = None
-
         if query:
             for key, val in query.items():
                 # Can val be nested?
                 api_call.add_new_child(key, val)
-
+        if tag is not None:
+            api_call.add_new_child("tag", tag, True)
+            return api_call
         if self.desired_attributes is not None:
             api_call.translate_struct(self.desired_attributes)
         if self.query is not None:
             api_call.translate_struct(self.query)
-        try:
-            initial_result = self.server.invoke_successfully(api_call, enable_tunneling=True)
-            next_tag = initial_result.get_child_by_name('next-tag')
-            result = copy.copy(initial_result)
-
-            while next_tag:
-                next_tag_call = netapp_utils.zapi.NaElement(call)
-                if query:
-                    for key, val in query.items():
-                        next_tag_call.add_new_child(key, val)
-
-                next_tag_call.add_new_child("tag", next_tag.get_content(), True)
-                next_result = self.server.invoke_successfully(next_tag_call, enable_tunneling=True)
-
-                next_tag = next_result.get_child_by_name('next-tag')
-                if attributes_list_tag is None:
-                    self.module.fail_json(msg="Error calling API %s: %s" %
-                                          (api_call.to_string(), "'next-tag' is not expected for this API"))
+        return api_call
+
+    def get_api_pages(self, call, attributes_list_tag='attributes-list', query=None):
+        '''generator, yield each page as it is received, following next-tag'''
+        first_request = self.build_api_request(call, query)
+
+        def build_request(tag):
+            return first_request if tag is None else self.build_api_request(call, query, tag)
+
+        first_page = True
+        for page in netapp_utils.zapi_get_iter_pages(self.get_server(), build_request, enable_tunneling=True):
+            if not first_page and attributes_list_tag is None:
+                self.fail_json(msg="Error calling API %s: %s" %
+                               (first_request.to_string(), "'next-tag' is not expected for this API"))
+            first_page = False
+            yield page
+            # release the page before fetching the next one
+            del page
+
+    def process_api_error(self, call, error, result, fail_on_error):
+        '''to be called when handling a NaApiError, return result, error_message'''
+        if call in ['security-key-manager-key-get-iter']:
+            return result, None
+        kind, error_message = netapp_utils.classify_zapi_exception(error)
+        if kind == 'missing_vserver_api_error':
+            # for missing_vserver_api_error, the API is already in error_message
+            error_message = "Error invalid API.  %s" % error_message
+        else:
+            error_message = "Error calling API %s: %s" % (call, error_message)
+        if self.error_flags[kind] and fail_on_error:
+            self.fail_json(msg=error_message, exception=traceback.format_exc())
+        return None, error_message
 
+    def call_api(self, call, attributes_list_tag='attributes-list', query=None, fail_on_error=True):
+        '''Main method to run an API call, records from all pages are merged into the first page'''
+        result = None
+        try:
+            for page in self.get_api_pages(call, attributes_list_tag, query):
+                if result is None:
+                    result = page
+                    continue
                 result_attr = result.get_child_by_name(attributes_list_tag)
-                new_records = next_result.get_child_by_name(attributes_list_tag)
+                new_records = page.get_child_by_name(attributes_list_tag)
                 if new_records:
                     for record in new_records.get_children():
                         result_attr.add_child_elem(record)
-
             return result, None
 
         except netapp_utils.zapi.NaApiError as error:
-            if call in ['security-key-manager-key-get-iter']:
-                return result, None
-            kind, error_message = netapp_utils.classify_zapi_exception(error)
-            if kind == 'missing_vserver_api_error':
-                # for missing_vserver_api_error, the API is already in error_message
-                error_message = "Error invalid API.  %s" % error_message
-            else:
-                error_message = "Error calling API %s: %s" % (call, error_message)
-            if self.error_flags[kind] and fail_on_error:
-                self.module.fail_json(msg=error_message, exception=traceback.format_exc())
-            return None, error_message
+            return self.process_api_error(call, error, result, fail_on_error)
 
-    def get_ifgrp_info(self):
-        '''Method to get network port ifgroups info'''
+    def get_ifgrp_info(self, net_port_info=None):
+        '''Method to get network port ifgroups info
+           net_port_info is provided by run_subsets, as a dependency
+        '''
 
-        try:
-            net_port_info = self.netapp_info['net_port_info']
-        except KeyError:
-            net_port_info_calls = self.info_subsets['net_port_info']
-            net_port_info = net_port_info_calls['method'](**net_port_info_calls['kwargs'])
+        if net_port_info is None:
+            net_port_info = self.run_subset('net_port_info', {})
         interfaces = net_port_info.keys()
 
         ifgrps = []
@@ -1521,28 +1543,13 @@ class NetAppONTAPGatherInfo:
             tmp = self.get_generic_get_iter('net-port-ifgrp-get', key_fields=('node', 'ifgrp-name'),
                                             attribute='net-ifgrp-info', query=query,
                                             attributes_list_tag='attributes')
-            net_ifgrp_info = net_ifgrp_info.copy()
             net_ifgrp_info.update(tmp)
         return net_ifgrp_info
 
     def get_generic_get_iter(self, call, attribute=None, key_fields=None, query=None, attributes_list_tag='attributes-list', fail_on_error=True):
-        '''Method to run a generic get-iter call'''
-
-        generic_call, error = self.call_api(call, attributes_list_tag, query, fail_on_error=fail_on_error)
-
-        if error is not None:
-            return {'error': error}
-
-        if generic_call is None:
-            return None
-
-        if attributes_list_tag is None:
-            attributes_list = generic_call
-        else:
-            attributes_list = generic_call.get_child_by_name(attributes_list_tag)
-
-        if attributes_list is None:
-            return None
+        '''Method to run a generic get-iter call
+           records are converted page by page, as each page is received
+        '''
 
         if key_fields is None:
             out = []
@@ -1550,43 +1557,27 @@ class NetAppONTAPGatherInfo:
             out = {}
 
         iteration = 0
-        for child in attributes_list.get_children():
-            iteration += 1
-            dic = xmltodict.parse(child.to_string(), xml_attribs=False)
-
-            if attribute is not None:
-                try:
-                    dic = dic[attribute]
-                except KeyError as exc:
-                    error_message = 'Error: attribute %s not found for %s, got: %s' % (str(exc), call, dic)
-                    self.module.fail_json(msg=error_message, exception=traceback.format_exc())
-
-            info = json.loads(json.dumps(dic))
-            if self.translate_keys:
-                info = convert_keys(info)
-            if isinstance(key_fields, str):
-                try:
-                    unique_key = _finditem(dic, key_fields)
-                except KeyError as exc:
-                    error_message = 'Error: key %s not found for %s, got: %s' % (str(exc), call, repr(info))
-                    if self.error_flags['key_error']:
-                        self.module.fail_json(msg=error_message, exception=traceback.format_exc())
-                    unique_key = 'Error_%d_key_not_found_%s' % (iteration, exc.args[0])
-            elif isinstance(key_fields, tuple):
-                try:
-                    unique_key = ':'.join([_finditem(dic, el) for el in key_fields])
-                except KeyError as exc:
-                    error_message = 'Error: key %s not found for %s, got: %s' % (str(exc), call, repr(info))
-                    if self.error_flags['key_error']:
-                        self.module.fail_json(msg=error_message, exception=traceback.format_exc())
-                    unique_key = 'Error_%d_key_not_found_%s' % (iteration, exc.args[0])
-            else:
-                unique_key = None
-            if unique_key is not None:
-                out = out.copy()
-                out.update({unique_key: info})
-            else:
-                out.append(info)
+        records_found = False
+        try:
+            for page in self.get_api_pages(call, attributes_list_tag, query):
+                if attributes_list_tag is None:
+                    attributes_list = page
+                else:
+                    attributes_list = page.get_child_by_name(attributes_list_tag)
+                if attributes_list is None:
+                    if not records_found:
+                        return None
+                    continue
+                records_found = True
+                iteration = self.add_records(out, attributes_list, call, attribute, key_fields, iteration)
+                # release the page before fetching the next one
+                del attributes_list, page
+        except netapp_utils.zapi.NaApiError as error:
+            dummy, error_message = self.process_api_error(call, error, None, fail_on_error)
+            if error_message is not None:
+                return {'error': error_message}
+            if not records_found:
+                return None
 
         if attributes_list_tag is None and key_fields is None:
             if len(out) == 1:
@@ -1610,6 +1601,51 @@ class NetAppONTAPGatherInfo:
 
         return out
 
+    def add_records(self, out, attributes_list, call, attribute, key_fields, iteration):
+        '''convert the records from a page, and add them to out, in place
+           return the updated record count
+        '''
+        for child in attributes_list.get_children():
+            iteration += 1
+            self.add_record(out, child, call, attribute, key_fields, iteration)
+        return iteration
+
+    def add_record(self, out, child, call, attribute, key_fields, iteration):
+        '''convert a record, and add it to out, in place'''
+        # single pass conversion, keys are translated during the walk
+        tag, info = zapi_to_dict(child._element, self.translate_keys)     # pylint: disable=protected-access
+
+        if attribute is not None:
+            if tag != attribute:
+                error_message = 'Error: attribute %s not found for %s, got: %s' % (repr(attribute), call, {tag: info})
+                self.fail_json(msg=error_message)
+        else:
+            info = {translate_key(tag) if self.translate_keys else tag: info}
+
+        if isinstance(key_fields, str):
+            try:
+                unique_key = _finditem_native(info, key_fields, self.translate_keys)
+            except KeyError as exc:
+                error_message = 'Error: key %s not found for %s, got: %s' % (str(exc), call, repr(info))
+                if self.error_flags['key_error']:
+                    self.fail_json(msg=error_message, exception=traceback.format_exc())
+                unique_key = 'Error_%d_key_not_found_%s' % (iteration, exc.args[0])
+        elif isinstance(key_fields, tuple):
+            try:
+                unique_key = ':'.join([_finditem_native(info, el, self.translate_keys) for el in key_fields])
+            except KeyError as exc:
+                error_message = 'Error: key %s not found for %s, got: %s' % (str(exc), call, repr(info))
+                if self.error_flags['key_error']:
+                    self.fail_json(msg=error_message, exception=traceback.format_exc())
+                unique_key = 'Error_%d_key_not_found_%s' % (iteration, exc.args[0])
+        else:
+            unique_key = None
+        if unique_key is not None:
+            # records are added in place, copying the dict for each record is quadratic
+            out[unique_key] = info
+        else:
+            out.append(info)
+
     def augment_subset(self, subset, info):
         if subset == 'lun_info' and info:
             for lun_info in info.values():
@@ -1643,16 +1679,97 @@ class NetAppONTAPGatherInfo:
                 if len(run_subset) > 1:
                     self.module.fail_json(msg="query option is only supported with a single subset")
                 self.sanitize_query()
+            results = self.run_subsets(run_subset)
             for subset in run_subset:
-                call = self.info_subsets[subset]
-                self.netapp_info[subset] = call['method'](**call['kwargs'])
-                self.augment_subset(subset, self.netapp_info[subset])
+                self.netapp_info[subset] = results[subset]
 
         if self.warnings:
             self.netapp_info['module_warnings'] = self.warnings
 
         return self.netapp_info
 
+    def get_dependency_levels(self, run_subset):
+        '''return a list of levels, each level is a list of subsets that only depend on subsets in previous levels
+           dependencies are added even if they were not requested
+        '''
+        subsets = []
+        pending = list(run_subset)
+        while pending:
+            subset = pending.pop(0)
+            if subset not in subsets:
+                subsets.append(subset)
+                pending.extend(self.info_subsets[subset].get('depends_on', []))
+        try:
+            return netapp_concurrency.dependency_levels(subsets, lambda subset: self.info_subsets[subset].get('depends_on', []))
+        except ValueError as exc:
+            self.module.fail_json(msg='Internal error: %s' % exc)
+
+    def run_subset(self, subset, results):
+        '''gather a subset, results contains the results for its dependencies'''
+        call = self.info_subsets[subset]
+        kwargs = dict(call['kwargs'])
+        for dependency in call.get('depends_on', []):
+            kwargs[dependency] = results[dependency]
+        return self.augment_subset(subset, call['method'](**kwargs))
+
+    def run_subsets(self, run_subset):
+        '''gather all subsets and their dependencies, level by level
+           return a dict of results indexed by subset
+        '''
+        results = {}
+        for level in self.get_dependency_levels(run_subset):
+            if self.max_concurrent_subsets > 1 and len(level) > 1:
+                results.update(self.run_subsets_concurrently(level, results))
+                continue
+            for subset in level:
+                results[subset] = self.run_subset(subset, results)
+        return results
+
+    def fail_json(self, msg, **kwargs):
+        ''' fail_json only exits the current thread when called from a worker
+            in a worker, the error is reported to the main thread, which calls fail_json
+        '''
+        if getattr(self.worker_context, 'active', False):
+            raise SubsetError(msg, kwargs)
+        self.module.fail_json(msg=msg, **kwargs)
+
+    def get_server(self):
+        ''' each worker thread uses its own connection '''
+        return getattr(self.worker_context, 'server', None) or self.server
+
+    def run_subset_in_worker(self, subset, results, servers):
+        self.worker_context.active = True
+        self.worker_context.server = servers.get()
+        try:
+            return self.run_subset(subset, results)
+        finally:
+            servers.put(self.worker_context.server)
+            self.worker_context.server = None
+            self.worker_context.active = False
+
+    def run_subsets_concurrently(self, subsets, results):
+        ''' gather independent subsets in parallel, with at most max_concurrent_subsets in flight
+            the first error, in the order of subsets, is reported with fail_json
+        '''
+        max_workers = min(self.max_concurrent_subsets, len(subsets))
+        while len(self.worker_servers) < max_workers:
+            # same settings as the main connection, without repeating the ZAPI deprecation warning
+            server = copy.copy(self.server)
+            server._opener = None       # pylint: disable=protected-access
+            self.worker_servers.append(server)
+        servers = queue.Queue()
+        for server in self.worker_servers[:max_workers]:
+            servers.put(server)
+        args_list = [(subset, results, servers) for subset in subsets]
+        subset_results = {}
+        for subset, (info, exc) in zip(subsets, netapp_concurrency.run_concurrently(self.run_subset_in_worker, args_list, max_workers)):
+            if isinstance(exc, SubsetError):
+                self.module.fail_json(msg=exc.args[0], **exc.args[1])
+            if exc is not None:
+                self.module.fail_json(msg="Error: unexpected exception gathering %s: %s" % (subset, repr(exc)))
+            subset_results[subset] = info
+        return subset_results
+
     def get_subset(self, gather_subset, version):
         '''Method to get a single subset'''
 
@@ -1801,18 +1918,62 @@ def _finditem(obj, keys):
     raise KeyError(str(keys))
 
 
-def convert_keys(d_param):
-    '''Method to convert hyphen to underscore'''
+def _finditem_native(obj, keys, translated):
+    ''' keys use ZAPI native tags, while obj keys may have been translated
+        KeyError reports the native keys '''
+    if not translated:
+        return _finditem(obj, keys)
+    try:
+        return _finditem(obj, translate_key_fields(keys))
+    except KeyError:
+        raise KeyError(str(keys))
 
-    if isinstance(d_param, dict):
-        out = {}
-        for key, val in d_param.items():
-            val = convert_keys(val)
-            out[key.replace('-', '_')] = val
-        return out
-    elif isinstance(d_param, list):
-        return [convert_keys(val) for val in d_param]
-    return d_param
+
+def translate_key(key):
+    return key.replace('-', '_')
+
+
+def translate_key_fields(keys):
+    if isinstance(keys, str):
+        return translate_key(keys)
+    if isinstance(keys, tuple):
+        return tuple(translate_key_fields(key) for key in keys)
+    return keys
+
+
+def zapi_to_dict(element, translate_keys=False):
+    ''' convert a ZAPI element (an lxml element) to a (tag, value) tuple in a single pass,
+        rather than serializing it to XML and parsing it back with xmltodict.
+
+        value matches xmltodict.parse(xml, xml_attribs=False)[tag] converted to plain dicts:
+        - None for an empty element, a string for a leaf element,
+        - a dict for an element with children, repeated children are grouped in a list, mixed text is reported as '#text'.
+        When translate_keys is True, hyphens are replaced with underscores in children keys, at every level.
+        The tag of element itself, and values, are not translated.
+    '''
+    tag = element.tag.rsplit('}', 1)[-1]
+    # comments and processing instructions do not have a string tag, but they can have a tail
+    text = ''.join([element.text or ''] + [child.tail or '' for child in element]).strip()
+    value = None
+    for child in element:
+        if not isinstance(child.tag, str):
+            continue
+        key, child_value = zapi_to_dict(child, translate_keys)
+        if translate_keys:
+            key = translate_key(key)
+        if value is None:
+            value = {}
+        if key not in value:
+            value[key] = child_value
+        elif isinstance(value[key], list):
+            value[key].append(child_value)
+        else:
+            value[key] = [value[key], child_value]
+    if value is None:
+        return tag, text or None
+    if text:
+        value['#text'] = text
+    return tag, value
 
 
 def main():
@@ -32,7 +32,7 @@ options:
   interface_name:
     description:
       - Specifies the logical interface (LIF) name.
-    required: true
+      - Required unless C(interfaces) is set.
     type: str
 
   home_node:
@@ -278,6 +278,32 @@ options:
       - Requires ONTAP 9.10.1 or later.
     type: int
     version_added: 22.1.0
+
+  interfaces:
+    description:
+      - Manage several interfaces in a single task, mutually exclusive with C(interface_name) and C(from_name).
+      - Each entry is a dictionary accepting C(state), C(interface_name), C(interface_type), C(vserver), C(ipspace), C(broadcast_domain),
+        C(home_node), C(home_port), C(current_node), C(current_port), C(address), C(netmask), C(subnet_name), C(fail_if_subnet_conflicts),
+        C(service_policy), C(role), C(protocols), C(data_protocol), C(admin_status), C(failover_policy), C(failover_scope), C(is_auto_revert),
+        C(dns_domain_name), C(is_dns_update_enabled), and C(probe_port).
+      - C(interface_name) is required in each entry, other options default to the values set at the module level.
+      - A snapshot of the cluster topology is read once, with a single query for each of nodes, ethernet ports, broadcast domains, IPspaces,
+        subnets, IP interfaces and FC interfaces, as needed by the entries.
+      - Nodes, ports, broadcast domains, IPspaces and subnets are validated against the snapshot, and the create, modify, or migrate action
+        for each entry is computed against it, before any change is made.
+      - Interfaces are then created, modified, migrated, or deleted concurrently, see C(max_concurrent_jobs).
+      - Only supported with REST.
+    type: list
+    elements: dict
+    version_added: 22.15.0
+
+  max_concurrent_jobs:
+    description:
+      - When C(interfaces) is set, maximum number of interfaces being changed at the same time.
+      - Should not exceed the C(rest_pool_maxsize) feature flag, as each interface uses its own connection.
+    type: int
+    default: 5
+    version_added: 22.15.0
 notes:
   - REST support requires ONTAP 9.7 or later.
   - Support check_mode.
@@ -396,25 +422,87 @@ EXAMPLES = '''
     hostname: "{{ netapp_hostname }}"
     username: "{{ netapp_username }}"
     password: "{{ netapp_password }}"
+
+- name: Create several data interfaces - REST
+  netapp.ontap.na_ontap_interface:
+    state: present
+    vserver: svm1
+    interface_type: ip
+    service_policy: default-data-files
+    netmask: 255.255.255.0
+    interfaces:
+      - interface_name: data1
+        home_node: node1
+        home_port: e0d
+        address: 10.10.10.11
+      - interface_name: data2
+        home_node: node2
+        home_port: e0d
+        address: 10.10.10.12
+    max_concurrent_jobs: 10
+    hostname: "{{ netapp_hostname }}"
+    username: "{{ netapp_username }}"
+    password: "{{ netapp_password }}"
 '''
 
 RETURN = """
-
+interfaces:
+  description:
+    - When C(interfaces) is set, the interface_name, vserver, action, modify, and migrate for each interface.
+    - error is set when a change failed.
+  returned: always, when C(interfaces) is set
+  type: list
+  elements: dict
 """
 
+import copy
 import time
 import traceback
 from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.arg_spec import ArgumentSpecValidator
 from ansible.module_utils._text import to_native
 from ansible_collections.netapp.ontap.plugins.module_utils.netapp_module import NetAppModule
 import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
 from ansible_collections.netapp.ontap.plugins.module_utils.netapp import OntapRestAPI
-from ansible_collections.netapp.ontap.plugins.module_utils import rest_generic, netapp_ipaddress
+from ansible_collections.netapp.ontap.plugins.module_utils import netapp_concurrency, rest_generic, netapp_ipaddress
 
 FAILOVER_POLICIES = ['disabled', 'system-defined', 'local-only', 'sfo-partner-only', 'broadcast-domain-wide']
 FAILOVER_SCOPES = ['home_port_only', 'default', 'home_node_only', 'sfo_partners_only', 'broadcast_domain_only']
 REST_UNSUPPORTED_OPTIONS = ['is_ipv4_link_local']
 REST_IGNORABLE_OPTIONS = ['failover_group', 'force_subnet_association', 'listen_for_dns_query']
+REST_PARTIALLY_SUPPORTED_OPTIONS = [['dns_domain_name', (9, 9, 0)], ['is_dns_update_enabled', (9, 9, 1)], ['probe_port', (9, 10, 1)],
+                                    ['subnet_name', (9, 11, 1)], ['fail_if_subnet_conflicts', (9, 11, 1)]]
+# options accepted in each interfaces entry
+INTERFACE_OPTIONS = ['state', 'interface_name', 'interface_type', 'vserver', 'ipspace', 'broadcast_domain', 'home_node', 'home_port',
+                     'current_node', 'current_port', 'address', 'netmask', 'subnet_name', 'fail_if_subnet_conflicts', 'service_policy', 'role',
+                     'protocols', 'data_protocol', 'admin_status', 'failover_policy', 'failover_scope', 'is_auto_revert', 'dns_domain_name',
+                     'is_dns_update_enabled', 'probe_port']
+INTERFACE_MUTUALLY_EXCLUSIVE = [
+    ['subnet_name', 'address'],
+    ['subnet_name', 'netmask'],
+    ['is_ipv4_link_local', 'address'],
+    ['is_ipv4_link_local', 'netmask'],
+    ['is_ipv4_link_local', 'subnet_name'],
+    ['failover_policy', 'failover_scope'],
+]
+
+
+class InterfaceError(Exception):
+    pass
+
+
+class InterfaceModule:
+    """ stands for the AnsibleModule when managing one interface in an interfaces list
+        fail_json raises an exception, so that errors can be collected from worker threads
+    """
+    def __init__(self, module):
+        self._module = module
+
+    def fail_json(self, **kwargs):
+        raise InterfaceError(kwargs.get('msg'))
+
+    def __getattr__(self, name):
+        return getattr(self._module, name)
 
 
 class NetAppOntapInterface:
@@ -426,7 +514,7 @@ class NetAppOntapInterface:
         self.argument_spec.update(dict(
             state=dict(required=False, choices=[
                 'present', 'absent'], default='present'),
-            interface_name=dict(required=True, type='str'),
+            interface_name=dict(required=False, type='str'),
             interface_type=dict(type='str', choices=['fc', 'ip']),
             ipspace=dict(type='str'),
             broadcast_domain=dict(type='str'),
@@ -462,17 +550,22 @@ class NetAppOntapInterface:
             probe_port=dict(required=False, type='int'),
             fail_if_subnet_conflicts=dict(required=False, type='bool'),
         ))
+        # each entry in interfaces accepts the interface options, and defaults to the module level values
+        self.interface_argument_spec = dict(
+            (key, dict((attr, value) for attr, value in self.argument_spec[key].items() if attr not in ('required', 'default')))
+            for key in INTERFACE_OPTIONS)
+        self.argument_spec.update(dict(
+            interfaces=dict(required=False, type='list', elements='dict'),
+            max_concurrent_jobs=dict(required=False, type='int', default=5),
+        ))
 
         self.module = AnsibleModule(
             argument_spec=self.argument_spec,
-            mutually_exclusive=[
-                ['subnet_name', 'address'],
-                ['subnet_name', 'netmask'],
-                ['is_ipv4_link_local', 'address'],
-                ['is_ipv4_link_local', 'netmask'],
-                ['is_ipv4_link_local', 'subnet_name'],
-                ['failover_policy', 'failover_scope'],
+            mutually_exclusive=INTERFACE_MUTUALLY_EXCLUSIVE + [
+                ['interface_name', 'interfaces'],
+                ['from_name', 'interfaces'],
             ],
+            required_one_of=[['interface_name', 'interfaces']],
             supports_check_mode=True
         )
         self.na_helper = NetAppModule()
@@ -482,22 +575,26 @@ class NetAppOntapInterface:
         unsupported_rest_properties.extend(REST_UNSUPPORTED_OPTIONS)
         if self.na_helper.safe_get(self.parameters, ['address']):
             self.parameters['address'] = netapp_ipaddress.validate_and_compress_ip_address(self.parameters['address'], self.module)
-        partially_supported_rest_properties = [['dns_domain_name', (9, 9, 0)], ['is_dns_update_enabled', (9, 9, 1)], ['probe_port', (9, 10, 1)],
-                                               ['subnet_name', (9, 11, 1)], ['fail_if_subnet_conflicts', (9, 11, 1)]]
-        self.use_rest = self.rest_api.is_rest_supported_properties(self.parameters, unsupported_rest_properties, partially_supported_rest_properties)
+        self.use_rest = self.rest_api.is_rest_supported_properties(self.parameters, unsupported_rest_properties, REST_PARTIALLY_SUPPORTED_OPTIONS)
         if self.use_rest and not self.rest_api.meets_rest_minimum_version(self.use_rest, 9, 7, 0):
             msg = 'REST requires ONTAP 9.7 or later for interface APIs.'
             self.use_rest = self.na_helper.fall_back_to_zapi(self.module, msg, self.parameters)
+        if self.parameters.get('interfaces') is not None:
+            if not self.use_rest:
+                self.module.fail_json(msg='Error: interfaces option requires REST.  use_rest: %s.' % self.parameters['use_rest'])
+            if self.parameters['max_concurrent_jobs'] < 1:
+                self.module.fail_json(msg='Error: max_concurrent_jobs must be 1 or more, got: %d.' % self.parameters['max_concurrent_jobs'])
 
         if self.use_rest:
             self.cluster_nodes = None       # cached value to limit number of API calls.
             self.home_node = None           # cached value to limit number of API calls.
-            self.map_failover_policy()
-            self.validate_rest_input_parameters()
-            # REST supports both netmask and cidr for ipv4 but cidr only for ipv6.
-            if self.parameters.get('netmask'):
-                self.parameters['netmask'] = str(netapp_ipaddress.netmask_to_netmask_length(self.parameters.get('address'),
-                                                                                            self.parameters['netmask'], self.module))
+            # all the IP and FC interfaces, read in a single query for each type, when interfaces is set
+            self.prefetched_interfaces = None
+            if self.parameters.get('interfaces') is None:
+                self.prepare_rest_parameters()
+            else:
+                # module level values are only defaults, each entry is validated on its own
+                self.map_failover_policy()
         elif netapp_utils.has_netapp_lib() is False:
             self.module.fail_json(msg=netapp_utils.netapp_lib_is_required())
         else:
@@ -512,6 +609,14 @@ class NetAppOntapInterface:
                 self.parameters['netmask'] = netapp_ipaddress.netmask_length_to_netmask(self.parameters.get('address'),
                                                                                         self.parameters['netmask'], self.module)
 
+    def prepare_rest_parameters(self):
+        self.map_failover_policy()
+        self.validate_rest_input_parameters()
+        # REST supports both netmask and cidr for ipv4 but cidr only for ipv6.
+        if self.parameters.get('netmask'):
+            self.parameters['netmask'] = str(netapp_ipaddress.netmask_to_netmask_length(self.parameters.get('address'),
+                                                                                        self.parameters['netmask'], self.module))
+
     def map_failover_policy(self):
         if self.use_rest and 'failover_policy' in self.parameters:
             mapping = dict(zip(FAILOVER_POLICIES, FAILOVER_SCOPES))
@@ -597,6 +702,8 @@ class NetAppOntapInterface:
                 query['ipspace.name'] = self.parameters['ipspace']
             else:
                 self.module.warn("ipspace is ignored for FC interfaces.")
+        if self.prefetched_interfaces is not None:
+            return self.filter_prefetched_interfaces(if_type, query)
         records, error = rest_generic.get_0_or_more_records(self.rest_api, self.get_net_int_api(if_type), query, fields)
         if error and 'are available in precluster.' in error:
             # in precluster mode, network APIs are not available!
@@ -604,6 +711,29 @@ class NetAppOntapInterface:
                                   % error)
         return records, error
 
+    def filter_prefetched_interfaces(self, if_type, query):
+        """ apply a get_interface_rest query to the interfaces in the topology snapshot
+            a name starting with '*' matches any name ending with the rest of the name
+        """
+        records, error = self.prefetched_interfaces.get(if_type, ([], None))
+        if error:
+            return None, error
+
+        def match(record):
+            name = query['name']
+            if name.startswith('*') and not record['name'].endswith(name[1:]):
+                return False
+            if not name.startswith('*') and record['name'] != name:
+                return False
+            if 'svm.name' in query and self.na_helper.safe_get(record, ['svm', 'name']) != query['svm.name']:
+                return False
+            if 'scope' in query and record.get('scope') != query['scope']:
+                return False
+            return 'ipspace.name' not in query or self.na_helper.safe_get(record, ['ipspace', 'name']) == query['ipspace.name']
+
+        records = [record for record in records if match(record)]
+        return records or None, None
+
     def get_net_int_api(self, if_type=None):
         if if_type is None:
             if_type = self.parameters.get('interface_type')
@@ -1417,33 +1547,215 @@ class NetAppOntapInterface:
                 migrate_body = None
         return uuid, body, migrate_body
 
+    def take_action(self, cd_action, modify, rename, current, uuid, body, migrate_body):
+        if rename and not self.use_rest:
+            self.rename_interface()
+            modify.pop('interface_name')
+        if cd_action == 'create':
+            records = self.create_interface(body)
+            if records:
+                # needed for migrate after creation
+                uuid = records['records'][0]['uuid']
+        elif cd_action == 'delete':
+            # interface type returned in REST but not in ZAPI.
+            interface_type = current['interface_type'] if self.use_rest else None
+            self.delete_interface(current['admin_status'], interface_type, uuid)
+        elif modify:
+            self.modify_interface(modify, uuid, body)
+        if migrate_body:
+            # for 9.7 or earlier, allow modify current node/port for fc interface.
+            if self.parameters.get('interface_type') == 'fc' and self.use_rest and self.rest_api.meets_rest_minimum_version(self.use_rest, 9, 8, 0):
+                self.module.fail_json(msg="Error: cannot migrate FC interface")
+            self.migrate_interface_rest(uuid, migrate_body)
+
+    def build_interface_parameters(self, interface):
+        """ validate an interfaces entry, and use module level values as defaults
+            a module level value is not used when the entry sets a mutually exclusive option
+        """
+        result = ArgumentSpecValidator(self.interface_argument_spec, mutually_exclusive=INTERFACE_MUTUALLY_EXCLUSIVE).validate(interface)
+        if result.error_messages:
+            raise InterfaceError('Error in interfaces entry %s: %s' % (interface, ', '.join(result.error_messages)))
+        entry = dict((key, value) for key, value in result.validated_parameters.items() if value is not None)
+        parameters = dict((key, value) for key, value in self.parameters.items()
+                          if key not in ('interfaces', 'max_concurrent_jobs', 'interface_name'))
+        for option1, option2 in INTERFACE_MUTUALLY_EXCLUSIVE:
+            for option, other in ((option1, option2), (option2, option1)):
+                if option in entry and other not in entry:
+                    parameters.pop(other, None)
+        # failover_scope may have been derived from failover_policy at the module level
+        if 'failover_policy' in entry and 'failover_scope' not in entry:
+            parameters.pop('failover_scope', None)
+        parameters.update(entry)
+        # a module level netmask only applies to entries with an address
+        if 'address' not in parameters and 'netmask' not in entry:
+            parameters.pop('netmask', None)
+        if parameters.get('interface_name') is None:
+            raise InterfaceError('Error: interface_name is required in each interfaces entry, got: %s' % interface)
+        unsupported = ['%s requires ONTAP %s or later' % (option, '.'.join(str(x) for x in version))
+                       for option, version in REST_PARTIALLY_SUPPORTED_OPTIONS
+                       if option in entry and not self.rest_api.meets_rest_minimum_version(self.use_rest, *version)]
+        if unsupported:
+            raise InterfaceError('Error in interfaces entry %s: %s.' % (interface, ', '.join(unsupported)))
+        return parameters
+
+    def create_interface_worker(self, parameters):
+        """ return a copy of self to manage a single interface, errors are raised as InterfaceError """
+        worker = copy.copy(self)
+        worker.module = InterfaceModule(self.module)
+        worker.na_helper = NetAppModule()
+        worker.parameters = worker.na_helper.set_parameters(parameters)
+        worker.home_node = None
+        if worker.parameters.get('address'):
+            worker.parameters['address'] = netapp_ipaddress.validate_and_compress_ip_address(worker.parameters['address'], worker.module)
+        worker.prepare_rest_parameters()
+        worker.derive_interface_type()
+        return worker
+
+    def get_topology_rest(self, workers):
+        """ read a snapshot of the cluster topology, with a single query for each collection used by the interfaces
+            collections are read concurrently
+        """
+        present = [worker.parameters for worker in workers if worker.parameters['state'] == 'present']
+        ip_workers = [worker.parameters for worker in workers if worker.parameters.get('interface_type') in (None, 'ip')]
+        fc_workers = [worker.parameters for worker in workers
+                      if worker.parameters.get('interface_type') in (None, 'fc') and 'vserver' in worker.parameters]
+        fields = 'name,location,uuid,enabled,svm.name'
+        fields_ip = fields + ',ip,service_policy,scope,ipspace.name'
+        for option, field in (('dns_domain_name', 'dns_zone'), ('probe_port', 'probe_port'),
+                              ('is_dns_update_enabled', 'ddns_enabled'), ('subnet_name', 'subnet')):
+            if any(parameters.get(option) is not None for parameters in ip_workers):
+                fields_ip += ',' + field
+        queries = [('nodes', 'cluster/nodes', 'name,uuid,cluster_interfaces')]
+        if ip_workers:
+            queries.append(('ip', 'network/ip/interfaces', fields_ip))
+        if fc_workers:
+            queries.append(('fc', 'network/fc/interfaces', fields + ',data_protocol'))
+        if any('home_port' in parameters or 'current_port' in parameters for parameters in present):
+            queries.append(('ports', 'network/ethernet/ports', 'name,node.name'))
+        if any('broadcast_domain' in parameters for parameters in present):
+            queries.append(('broadcast_domains', 'network/ethernet/broadcast-domains', 'name,ipspace.name'))
+        if any('ipspace' in parameters for parameters in present):
+            queries.append(('ipspaces', 'network/ipspaces', 'name'))
+        if any('subnet_name' in parameters for parameters in present):
+            queries.append(('subnets', 'network/ip/subnets', 'name,ipspace.name'))
+        results = netapp_concurrency.run_concurrently(lambda api, fields: rest_generic.get_0_or_more_records(self.rest_api, api, fields=fields),
+                                                      [(api, fields) for dummy, api, fields in queries], self.parameters['max_concurrent_jobs'])
+        topology = {'interfaces': {}}
+        for (key, api, dummy), (response, exc) in zip(queries, results):
+            records, error = response if exc is None else (None, exc)
+            if key in ('ip', 'fc'):
+                if error and 'are available in precluster.' in str(error):
+                    self.module.fail_json(msg="This module cannot use REST in precluster mode, ZAPI can be forced with use_rest: never.  Error: %s"
+                                          % error)
+                # errors are reported when looking for an interface of this type
+                topology['interfaces'][key] = (records or [], error)
+                continue
+            if error:
+                self.module.fail_json(msg='Error fetching %s: %s' % (api, to_native(error)))
+            topology[key] = records or []
+        return topology
+
+    def validate_topology(self, topology):
+        """ check that the nodes, ports, broadcast domain, ipspace, and subnet used to create or modify the interface exist
+            return a list of errors
+        """
+        if self.parameters['state'] != 'present':
+            return []
+        errors = []
+        nodes = [record['name'] for record in topology['nodes']]
+        for option in ('home_node', 'current_node'):
+            node = self.parameters.get(option)
+            if node not in (None, 'localhost') and nodes and node not in nodes:
+                errors.append('%s %s not found' % (option, node))
+        if self.parameters.get('interface_type') != 'ip':
+            return errors
+        default_node = nodes[0] if nodes else None
+        ports = set((self.na_helper.safe_get(record, ['node', 'name']), record['name']) for record in topology.get('ports', []))
+        for option, node in (('home_port', self.parameters.get('home_node') or default_node),
+                             ('current_port', self.parameters.get('current_node') or self.parameters.get('home_node') or default_node)):
+            port = self.parameters.get(option)
+            if port is not None and node not in (None, 'localhost') and (node, port) not in ports:
+                errors.append('%s %s not found on node %s' % (option, port, node))
+        ipspace = self.parameters.get('ipspace')
+        if ipspace is not None and ipspace not in [record['name'] for record in topology.get('ipspaces', [])]:
+            errors.append('ipspace %s not found' % ipspace)
+        for option, key in (('broadcast_domain', 'broadcast_domains'), ('subnet_name', 'subnets')):
+            name = self.parameters.get(option)
+            if name is None:
+                continue
+            records = [record for record in topology.get(key, []) if record['name'] == name
+                       and ipspace in (None, self.na_helper.safe_get(record, ['ipspace', 'name']))]
+            if not records:
+                errors.append('%s %s not found%s' % (option, name, ' in ipspace %s' % ipspace if ipspace else ''))
+        return errors
+
+    def apply_interfaces(self):
+        """ read a snapshot of the cluster topology, compute the action for each interface in memory,
+            then apply the changes concurrently
+        """
+        workers = []
+        keys = set()
+        try:
+            for interface in self.parameters['interfaces']:
+                worker = self.create_interface_worker(self.build_interface_parameters(interface))
+                key = (worker.parameters.get('vserver'), worker.parameters['interface_name'])
+                if key in keys:
+                    raise InterfaceError('Error: duplicate entry in interfaces for interface_name: %s, vserver: %s.' % (key[1], key[0]))
+                keys.add(key)
+                workers.append(worker)
+        except InterfaceError as exc:
+            self.module.fail_json(msg=str(exc))
+
+        topology = self.get_topology_rest(workers)
+        errors = []
+        plans = []
+        for worker in workers:
+            name = worker.parameters['interface_name']
+            worker.cluster_nodes = topology['nodes']
+            worker.prefetched_interfaces = topology['interfaces']
+            errors.extend('interface %s: %s.' % (name, error) for error in worker.validate_topology(topology))
+            try:
+                cd_action, modify, rename, current = worker.get_action()
+                # build the payloads even in check_mode, to perform validations
+                plans.append((cd_action, modify, rename, current) + worker.build_rest_payloads(cd_action, modify, current))
+            except InterfaceError as exc:
+                errors.append('interface %s: %s' % (name, exc))
+                plans.append(None)
+        if errors:
+            self.module.fail_json(msg='Error validating interfaces: %s' % '  '.join(errors))
+
+        changed = any(worker.na_helper.changed for worker in workers)
+        results = [None] * len(workers)
+        if changed and not self.module.check_mode:
+            args = [(position,) for position, worker in enumerate(workers) if worker.na_helper.changed]
+            action_results = netapp_concurrency.run_concurrently(lambda position: workers[position].take_action(*plans[position]),
+                                                                 args, self.parameters['max_concurrent_jobs'])
+            for (position,), result in zip(args, action_results):
+                results[position] = result
+        interfaces = []
+        for worker, plan, result in zip(workers, plans, results):
+            interfaces.append(dict(interface_name=worker.parameters['interface_name'], vserver=worker.parameters.get('vserver'),
+                                   changed=worker.na_helper.changed, action=plan[0], modify=plan[1] or None, migrate=plan[6] is not None))
+            exc = result[1] if result is not None else None
+            if exc is not None:
+                interfaces[-1]['error'] = str(exc)
+                errors.append('interface %s: %s' % (worker.parameters['interface_name'], exc))
+        if errors:
+            self.module.fail_json(msg='Error managing interfaces: %s' % '  '.join(errors), changed=changed, interfaces=interfaces)
+        result = netapp_utils.generate_result(changed, extra_responses={'interfaces': interfaces}, rest_api=self.rest_api)
+        self.module.exit_json(**result)
+
     def apply(self):
         ''' calling all interface features '''
+        if self.parameters.get('interfaces') is not None:
+            return self.apply_interfaces()
         cd_action, modify, rename, current = self.get_action()
         # build the payloads even in check_mode, to perform validations
         uuid, body, migrate_body = self.build_rest_payloads(cd_action, modify, current)
         if self.na_helper.changed and not self.module.check_mode:
-            if rename and not self.use_rest:
-                self.rename_interface()
-                modify.pop('interface_name')
-            if cd_action == 'create':
-                records = self.create_interface(body)
-                if records:
-                    # needed for migrate after creation
-                    uuid = records['records'][0]['uuid']
-            elif cd_action == 'delete':
-                # interface type returned in REST but not in ZAPI.
-                interface_type = current['interface_type'] if self.use_rest else None
-                self.delete_interface(current['admin_status'], interface_type, uuid)
-            elif modify:
-                self.modify_interface(modify, uuid, body)
-            if migrate_body:
-                # for 9.7 or earlier, allow modify current node/port for fc interface.
-                if self.parameters.get('interface_type') == 'fc' and self.use_rest and self.rest_api.meets_rest_minimum_version(self.use_rest, 9, 8, 0):
-                    self.module.fail_json(msg="Error: cannot migrate FC interface")
-                self.migrate_interface_rest(uuid, migrate_body)
-
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+            self.take_action(cd_action, modify, rename, current, uuid, body, migrate_body)
+
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -269,7 +269,7 @@ class NetAppOntapIpspace(object):
                 self.create_ipspace()
             elif cd_action == 'delete':
                 self.delete_ipspace()
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -316,7 +316,7 @@ class NetAppOntapISCSI:
             elif modify:
                 self.modify_iscsi_service_rest(modify, current)
         # TODO: include other details about the lun (size, etc.)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
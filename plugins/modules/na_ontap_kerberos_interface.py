@@ -205,7 +205,7 @@ class NetAppOntapKerberosInterface:
         modify = self.na_helper.get_modified_attributes(self.get_kerberos_interface(), self.parameters)
         if self.na_helper.changed and not self.module.check_mode:
             self.modify_kerberos_interface()
-        result = netapp_utils.generate_result(self.na_helper.changed, modify=modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, modify=modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
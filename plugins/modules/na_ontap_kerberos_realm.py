@@ -463,7 +463,7 @@ class NetAppOntapKerberosRealm:
                 self.delete_krbrealm()
             elif modify:
                 self.modify_krbrealm(modify)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
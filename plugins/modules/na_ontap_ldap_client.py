@@ -535,7 +535,7 @@ class NetAppOntapLDAPClient:
                 self.delete_ldap_client_rest(current)
             elif modify:
                 self.modify_ldap_client_rest(current, modify)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -293,7 +293,7 @@ class NetAppOntapLoginMessages:
                     self.modify_banner(modify)
                 if modify.get('show_cluster_motd') is not None or modify.get('motd_message') is not None:
                     self.modify_motd(modify)
-        result = netapp_utils.generate_result(self.na_helper.changed, modify=modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, modify=modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
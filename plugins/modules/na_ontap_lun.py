@@ -446,9 +446,6 @@ class NetAppOntapLUN:
         """
         if self.use_rest:
             return self.get_luns_rest(lun_path)
-        luns = []
-        tag = None
-
         query_details = netapp_utils.zapi.NaElement('lun-info')
         query_details.add_new_child('vserver', self.parameters['vserver'])
         if lun_path is not None:
@@ -458,25 +455,19 @@ class NetAppOntapLUN:
         query = netapp_utils.zapi.NaElement('query')
         query.add_child_elem(query_details)
 
-        while True:
+        def build_request(tag):
             lun_info = netapp_utils.zapi.NaElement('lun-get-iter')
             lun_info.add_child_elem(query)
             if tag:
                 lun_info.add_new_child('tag', tag, True)
+            return lun_info
 
-            try:
-                result = self.server.invoke_successfully(lun_info, enable_tunneling=True)
-            except netapp_utils.zapi.NaApiError as exc:
-                self.module.fail_json(msg="Error fetching luns for %s: %s" %
-                                      (self.parameters['flexvol_name'] if lun_path is None else lun_path, to_native(exc)),
-                                      exception=traceback.format_exc())
-
-            if result.get_child_by_name('num-records') and int(result.get_child_content('num-records')) >= 1:
-                attr_list = result.get_child_by_name('attributes-list')
-                luns.extend(attr_list.get_children())
-            tag = result.get_child_content('next-tag')
-            if tag is None:
-                break
+        try:
+            luns = list(netapp_utils.zapi_get_iter_records(self.server, build_request))
+        except netapp_utils.zapi.NaApiError as exc:
+            self.module.fail_json(msg="Error fetching luns for %s: %s" %
+                                  (self.parameters['flexvol_name'] if lun_path is None else lun_path, to_native(exc)),
+                                  exception=traceback.format_exc())
         return luns
 
     def get_lun_details(self, lun):
@@ -1271,7 +1262,7 @@ class NetAppOntapLUN:
         if app_modify_warning:
             self.module.warn(app_modify_warning)
         result = netapp_utils.generate_result(self.na_helper.changed, actions,
-                                              extra_responses={'debug': self.debug} if self.debug else None)
+                                              extra_responses={'debug': self.debug} if self.debug else None, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -341,7 +341,7 @@ class NetAppOntapLUNMap:
                 self.create_lun_map()
             if cd_action == 'delete':
                 self.delete_lun_map()
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, extra_responses=self.lun_info)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, extra_responses=self.lun_info, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -266,7 +266,7 @@ class NetAppOntapLUNMapReportingNodes:
                     self.remove_lun_map_reporting_nodes(nodes_to_delete)
         result = netapp_utils.generate_result(changed, cd_action, extra_responses={'reporting_nodes': reporting_nodes,
                                                                                    'nodes_to_add': nodes_to_add,
-                                                                                   'nodes_to_delete': nodes_to_delete})
+                                                                                   'nodes_to_delete': nodes_to_delete}, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -187,7 +187,7 @@ class NetAppOntapMAVApprovalGroup:
                 self.delete_approval_group()
             elif modify:
                 self.modify_approval_group(modify)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -149,7 +149,7 @@ class NetAppONTAPMetroCluster(object):
                 # Since there is no modify or delete, we will return no change
                 else:
                     self.module.fail_json(msg="Modify and Delete currently not support in API")
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -206,7 +206,7 @@ class NetAppONTAPMetroClusterDRGroup(object):
                 self.create_dr_group()
             if cd_action == 'delete':
                 self.delete_dr_groups(delete_ids)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
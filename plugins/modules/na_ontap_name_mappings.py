@@ -276,7 +276,7 @@ class NetAppOntapNameMappings:
                 if reindex:
                     modify['new_index'] = self.parameters.get('index')
                     modify['from_index'] = self.parameters['from_index']
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
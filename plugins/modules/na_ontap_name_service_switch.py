@@ -236,7 +236,7 @@ class NetAppONTAPNsswitch:
                 self.delete_name_service_switch()
             elif modify:
                 self.modify_name_service_switch(modify)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -535,7 +535,7 @@ class NetAppOntapIfGrp:
                     self.modify_ports_rest(modify, uuid)
                 else:
                     self.modify_ports(current_ports['ports'])
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, response=response)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, response=response, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -338,7 +338,7 @@ class NetAppOntapNetRoutes:
                 self.delete_net_route(current)
             elif rename or modify:
                 self.recreate_net_route(current)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, extra_responses={'rename': rename})
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, extra_responses={'rename': rename}, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
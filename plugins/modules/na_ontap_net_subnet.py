@@ -412,7 +412,7 @@ class NetAppOntapSubnet:
                 self.delete_subnet()
             elif modify:
                 self.modify_subnet(modify)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -351,7 +351,7 @@ class NetAppOntapVlan:
                 self.delete_vlan(current)
             if modify:
                 self.modify_vlan(current, modify)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
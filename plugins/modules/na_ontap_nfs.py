@@ -689,7 +689,7 @@ class NetAppONTAPNFS:
                 self.delete_nfs_service()
             elif modify:
                 self.modify_nfs_service(modify)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -258,7 +258,7 @@ class NetAppOntapNTPServer:
                 self.delete_ntp_server()
             elif modify:
                 self.modify_ntp_server(modify)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -146,7 +146,7 @@ class NetAppOntapNTPKey:
                 self.delete_ntp_key()
             elif modify:
                 self.modify_ntp_key(modify)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -235,7 +235,7 @@ class NetAppONTAPNVMe:
                 self.delete_nvme()
             elif modify:
                 self.modify_nvme()
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -229,7 +229,7 @@ class NetAppONTAPNVMENamespace:
                 self.create_namespace()
             elif cd_action == 'delete':
                 self.delete_namespace()
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
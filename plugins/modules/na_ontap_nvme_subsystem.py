@@ -447,7 +447,7 @@ class NetAppONTAPNVMESubsystem:
                 self.delete_subsystem()
             elif cd_action is None:
                 self.modify_host_map(add_host_map, remove_host_map)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -342,7 +342,7 @@ class NetAppOntapObjectStoreConfig():
                 self.delete_aggr_object_store(uuid)
             elif modify:
                 self.modify_aggr_object_store(body, uuid)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
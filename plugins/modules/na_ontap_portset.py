@@ -407,7 +407,7 @@ class NetAppONTAPPortset:
                 else:
                     self.add_ports(add_ports)
                     self.remove_ports(remove_ports)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
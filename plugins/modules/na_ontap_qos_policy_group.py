@@ -603,7 +603,7 @@ class NetAppOntapQosPolicyGroup:
                 self.delete_policy_group()
             elif modify:
                 self.modify_helper(modify)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -452,7 +452,7 @@ class NetAppOntapQTree:
                     self.rename_qtree()
                 if modify:
                     self.modify_qtree()
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
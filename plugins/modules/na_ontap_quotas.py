@@ -41,6 +41,7 @@ options:
     description:
       - The quota target of the type specified.
       - Required to create or modify a rule.
+      - Mutually exclusive with C(quota_rules).
       - users and group takes quota_target value in REST.
       - For default user and group quota rules, the quota_target must be specified as "".
     type: str
@@ -116,6 +117,29 @@ options:
     choices: ['resize', 'reinitialize', 'none']
     type: str
     version_added: 20.12.0
+  quota_rules:
+    description:
+      - Manage several quota rules in a single task, mutually exclusive with C(quota_target).
+      - Each entry is a dictionary accepting C(state), C(volume), C(quota_target), C(qtree), C(type), C(perform_user_mapping),
+        C(file_limit), C(disk_limit), C(soft_file_limit), and C(soft_disk_limit).
+      - C(quota_target) and C(type) are required in each entry, C(state), C(volume), and C(qtree) default to the values set at the module level.
+      - All the rules for a volume are read with a single query, and compared with the desired rules.
+      - Rules are then created, modified or deleted concurrently, see C(max_concurrent_jobs).
+      - C(set_quota_status) and C(activate_quota_on_change) are applied once for each volume with a changed rule,
+        so that a volume is reinitialized only once.
+      - With C(activate_quota_on_change=reinitialize), the quota state is polled until quota is off, before turning it back on.
+      - If a rule fails, quota status is left unchanged for its volume, other volumes are still updated, and all errors are reported.
+      - Only supported with REST.
+    type: list
+    elements: dict
+    version_added: 22.15.0
+  max_concurrent_jobs:
+    description:
+      - When C(quota_rules) is set, maximum number of rules or volumes being changed at the same time.
+      - Should not exceed the C(rest_pool_maxsize) feature flag, as each rule uses its own connection.
+    type: int
+    default: 5
+    version_added: 22.15.0
 
 '''
 
@@ -245,22 +269,99 @@ EXAMPLES = """
     hostname: "{{ netapp_hostname }}"
     username: "{{ netapp_username }}"
     password: "{{ netapp_password }}"
+- name: Add/Set several quota rules, with a single reinitialize in REST.
+  netapp.ontap.na_ontap_quotas:
+    state: present
+    vserver: ansible
+    volume: ansible
+    quota_rules:
+      - quota_target: user1
+        type: user
+        disk_limit: 10GB
+      - quota_target: user2
+        type: user
+        qtree: qtree
+        disk_limit: 20GB
+      - quota_target: qtree1
+        type: tree
+        state: absent
+    activate_quota_on_change: reinitialize
+    max_concurrent_jobs: 10
+    hostname: "{{ netapp_hostname }}"
+    username: "{{ netapp_username }}"
+    password: "{{ netapp_password }}"
 """
 
 RETURN = """
-
+quota_rules:
+  description: When C(quota_rules) is set, the volume, type, qtree, quota_target, action, and modify for each rule.
+  returned: always, when C(quota_rules) is set
+  type: list
+  elements: dict
+modify_quota_status:
+  description:
+    - Quota status action, if any.
+    - When C(quota_rules) is set, a dictionary of actions indexed by volume name.
+  returned: always
+  type: raw
+skipped_volumes:
+  description: When C(quota_rules) is set and a rule failed, the volumes where the quota status action was not applied.
+  returned: on failure, when C(quota_rules) is set
+  type: list
+  elements: str
 """
 
+import copy
 import time
 import traceback
 import re
 from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.arg_spec import ArgumentSpecValidator
 from ansible.module_utils._text import to_native
 import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
 from ansible_collections.netapp.ontap.plugins.module_utils.netapp_module import NetAppModule
+from ansible_collections.netapp.ontap.plugins.module_utils import netapp_concurrency
 from ansible_collections.netapp.ontap.plugins.module_utils import rest_generic
 import ansible_collections.netapp.ontap.plugins.module_utils.rest_response_helpers as rrh
 
+QUOTA_RULE_FIELDS = 'svm.uuid,'\
+                    'svm.name,'\
+                    'space.hard_limit,'\
+                    'files.hard_limit,'\
+                    'user_mapping,'\
+                    'qtree.name,'\
+                    'type,'\
+                    'space.soft_limit,'\
+                    'files.soft_limit,'\
+                    'volume.uuid,'\
+                    'users.name,'\
+                    'users.id,'\
+                    'group.name,'
+# options accepted in each quota_rules entry
+QUOTA_RULE_OPTIONS = ['state', 'volume', 'quota_target', 'qtree', 'type', 'perform_user_mapping',
+                      'file_limit', 'disk_limit', 'soft_file_limit', 'soft_disk_limit']
+# with activate_quota_on_change=reinitialize, wait for quota to be off before turning it on
+QUOTA_STATE_POLL_INTERVAL = 2
+QUOTA_STATE_MAX_POLLS = 30
+
+
+class QuotaError(Exception):
+    pass
+
+
+class QuotaModule:
+    """ stands for the AnsibleModule when managing one rule in a quota_rules list
+        fail_json raises an exception, so that errors can be collected from worker threads
+    """
+    def __init__(self, module):
+        self._module = module
+
+    def fail_json(self, **kwargs):
+        raise QuotaError(kwargs.get('msg'))
+
+    def __getattr__(self, name):
+        return getattr(self._module, name)
+
 
 class NetAppONTAPQuotas:
     '''Class with quotas methods'''
@@ -285,6 +386,14 @@ class NetAppONTAPQuotas:
             threshold=dict(required=False, type='str'),
             activate_quota_on_change=dict(required=False, type='str', choices=['resize', 'reinitialize', 'none'])
         ))
+        # each entry in quota_rules accepts the rule options, and defaults to the module level values
+        self.quota_rule_argument_spec = dict(
+            (key, dict((attr, value) for attr, value in self.argument_spec[key].items() if attr not in ('required', 'default')))
+            for key in QUOTA_RULE_OPTIONS)
+        self.argument_spec.update(dict(
+            quota_rules=dict(required=False, type='list', elements='dict'),
+            max_concurrent_jobs=dict(required=False, type='int', default=5),
+        ))
 
         self.module = AnsibleModule(
             argument_spec=self.argument_spec,
@@ -298,7 +407,8 @@ class NetAppONTAPQuotas:
                 'soft_disk_limit': ['quota_target', 'type'],
                 'threshold': ['quota_target', 'type'],
             },
-            required_together=[('quota_target', 'type')]
+            required_together=[('quota_target', 'type')],
+            mutually_exclusive=[('quota_target', 'quota_rules')]
         )
 
         self.na_helper = NetAppModule()
@@ -310,6 +420,13 @@ class NetAppONTAPQuotas:
         self.volume_uuid = None   # volume UUID after quota rule creation, used for on or off quota status
         self.quota_uuid = None
         self.warn_msg = None
+        # all the rules for the volume, read in a single query, when quota_rules is set
+        self.prefetched_rules = None
+        if self.parameters.get('quota_rules') is not None:
+            if not self.use_rest:
+                self.module.fail_json(msg='Error: quota_rules option requires REST.  use_rest: %s.' % self.parameters['use_rest'])
+            if self.parameters['max_concurrent_jobs'] < 1:
+                self.module.fail_json(msg='Error: max_concurrent_jobs must be 1 or more, got: %d.' % self.parameters['max_concurrent_jobs'])
         self.validate_parameters_ZAPI_REST()
 
         if not self.use_rest:
@@ -580,73 +697,39 @@ class NetAppONTAPQuotas:
         """
         if not self.use_rest:
             return self.get_quotas()
-        query = {'svm.name': self.parameters.get('vserver'),
-                 'volume.name': self.parameters.get('volume'),
-                 'type': self.parameters.get('type'),
-                 'fields': 'svm.uuid,'
-                           'svm.name,'
-                           'space.hard_limit,'
-                           'files.hard_limit,'
-                           'user_mapping,'
-                           'qtree.name,'
-                           'type,'
-                           'space.soft_limit,'
-                           'files.soft_limit,'
-                           'volume.uuid,'
-                           'users.name,'
-                           'users.id,'
-                           'group.name,'}
-
-        # set qtree name in query for type user and group if not ''.
-        if self.parameters['qtree']:
-            query['qtree.name'] = self.parameters['qtree']
-        users_names, users_ids = [], []
-        if self.parameters.get('quota_target'):
-            type = self.parameters['type']
-            if type == 'user':
-                users_names = [target for target in self.parameters['quota_target'].split(',') if not target.isdigit()]
-                users_ids = [target for target in self.parameters['quota_target'].split(',') if target.isdigit()]
-                if users_names:
-                    query['users.name'] = ",".join(users_names)
-                if users_ids:
-                    query['users.id'] = ",".join(users_ids)
-            else:
-                field_name = 'group.name' if type == 'group' else 'qtree.name'
-                query[field_name] = self.parameters['quota_target']
+        users_names, users_ids = self.get_users_names_and_ids()
+        if self.prefetched_rules is not None:
+            # all the rules for the volume, read with a single query
+            records = self.prefetched_rules
+        else:
+            query = {'svm.name': self.parameters.get('vserver'),
+                     'volume.name': self.parameters.get('volume'),
+                     'type': self.parameters.get('type'),
+                     'fields': QUOTA_RULE_FIELDS}
 
-        api = 'storage/quota/rules'
-        # If type: user, get quota rules api returns users which has name starts with input target user names.
-        # Example of users list in a record:
-        # users: [{'name': 'quota_user'}], users: [{'name': 'quota_user'}, {'name': 'quota'}]
-        records, error = rest_generic.get_0_or_more_records(self.rest_api, api, query)
-        if error:
-            self.module.fail_json(msg="Error on getting quota rule info: %s" % error)
+            # set qtree name in query for type user and group if not ''.
+            if self.parameters['qtree']:
+                query['qtree.name'] = self.parameters['qtree']
+            if self.parameters.get('quota_target'):
+                type = self.parameters['type']
+                if type == 'user':
+                    if users_names:
+                        query['users.name'] = ",".join(users_names)
+                    if users_ids:
+                        query['users.id'] = ",".join(users_ids)
+                else:
+                    field_name = 'group.name' if type == 'group' else 'qtree.name'
+                    query[field_name] = self.parameters['quota_target']
+
+            api = 'storage/quota/rules'
+            # If type: user, get quota rules api returns users which has name starts with input target user names.
+            # Example of users list in a record:
+            # users: [{'name': 'quota_user'}], users: [{'name': 'quota_user'}, {'name': 'quota'}]
+            records, error = rest_generic.get_0_or_more_records(self.rest_api, api, query)
+            if error:
+                self.module.fail_json(msg="Error on getting quota rule info: %s" % error)
         if records:
-            record = None
-            for item in records:
-                # along with user/group, qtree should also match to get current quota.
-                # for type user/group if qtree is not set in create, its not returned in GET, make desired qtree None if ''.
-                desired_qtree = self.parameters['qtree'] if self.parameters.get('qtree') else None
-                current_qtree = self.na_helper.safe_get(item, ['qtree', 'name'])
-                type = self.parameters.get('type')
-                if type in ['user', 'group']:
-                    if desired_qtree != current_qtree:
-                        continue
-                    if type == 'user':
-                        current_users = {}
-                        current_users['names'] = [user['name'] for user in item['users'] if user.get('name')]
-                        current_users['ids'] = [user['id'] for user in item['users'] if user.get('id')]
-                        if set(current_users['names']) == set(users_names) and \
-                                set(current_users['ids']) == set(users_ids):
-                            record = item
-                            break
-                    elif item['group']['name'] == self.parameters['quota_target']:
-                        record = item
-                        break
-                # for type tree, desired quota_target should match current tree.
-                elif type == 'tree' and current_qtree == self.parameters['quota_target']:
-                    record = item
-                    break
+            record = self.find_quota_rule(records, users_names, users_ids)
             if record:
                 self.volume_uuid = record['volume']['uuid']
                 self.quota_uuid = record['uuid']
@@ -665,6 +748,42 @@ class NetAppONTAPQuotas:
                 return current
         return None
 
+    def get_users_names_and_ids(self):
+        """ a user quota_target is a comma separated list of user names and ids """
+        users_names, users_ids = [], []
+        if self.parameters.get('quota_target') and self.parameters['type'] == 'user':
+            users_names = [target for target in self.parameters['quota_target'].split(',') if not target.isdigit()]
+            users_ids = [target for target in self.parameters['quota_target'].split(',') if target.isdigit()]
+        return users_names, users_ids
+
+    def find_quota_rule(self, records, users_names, users_ids):
+        """ return the record matching type, qtree, and quota_target, or None """
+        type = self.parameters.get('type')
+        for item in records:
+            if item.get('type', type) != type:
+                # when prefetched, records of all types are present
+                continue
+            # along with user/group, qtree should also match to get current quota.
+            # for type user/group if qtree is not set in create, its not returned in GET, make desired qtree None if ''.
+            desired_qtree = self.parameters['qtree'] if self.parameters.get('qtree') else None
+            current_qtree = self.na_helper.safe_get(item, ['qtree', 'name'])
+            if type in ['user', 'group']:
+                if desired_qtree != current_qtree:
+                    continue
+                if type == 'user':
+                    current_users = {}
+                    current_users['names'] = [user['name'] for user in item['users'] if user.get('name')]
+                    current_users['ids'] = [user['id'] for user in item['users'] if user.get('id')]
+                    if set(current_users['names']) == set(users_names) and \
+                            set(current_users['ids']) == set(users_ids):
+                        return item
+                elif item['group']['name'] == self.parameters['quota_target']:
+                    return item
+            # for type tree, desired quota_target should match current tree.
+            elif type == 'tree' and current_qtree == self.parameters['quota_target']:
+                return item
+        return None
+
     def quota_entry_set_rest(self):
         """
         quota_entry_set with rest API.
@@ -819,6 +938,8 @@ class NetAppONTAPQuotas:
         """
         Apply action to quotas
         """
+        if self.parameters.get('quota_rules') is not None:
+            return self.apply_quota_rules()
         cd_action = None
         modify_quota_status = None
         modify_quota = None
@@ -860,7 +981,190 @@ class NetAppONTAPQuotas:
             # if warn message and quota not reinitialize, throw warnings to reinitialize in REST.
             if self.warn_msg and modify_quota_status != 'reinitialize':
                 self.module.warn(self.warn_msg)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify_quota, extra_responses={'modify_quota_status': modify_quota_status})
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify_quota, extra_responses={'modify_quota_status': modify_quota_status},
+                                              rest_api=self.rest_api)
+        self.module.exit_json(**result)
+
+    def build_quota_rule_parameters(self, rule):
+        """ validate a quota_rules entry, and use module level values as defaults """
+        result = ArgumentSpecValidator(self.quota_rule_argument_spec).validate(rule)
+        if result.error_messages:
+            raise QuotaError('Error in quota_rules entry %s: %s' % (rule, ', '.join(result.error_messages)))
+        parameters = dict((key, value) for key, value in self.parameters.items()
+                          if key not in ('quota_rules', 'max_concurrent_jobs', 'quota_target', 'type'))
+        for key, value in result.validated_parameters.items():
+            if value is not None:
+                parameters[key] = value
+        if parameters.get('quota_target') is None or parameters.get('type') is None:
+            raise QuotaError('Error: quota_target and type are required in each quota_rules entry, got: %s' % rule)
+        return parameters
+
+    def create_quota_rule_worker(self, parameters):
+        """ return a copy of self to manage a single rule or volume, errors are raised as QuotaError """
+        worker = copy.copy(self)
+        worker.module = QuotaModule(self.module)
+        worker.na_helper = NetAppModule()
+        worker.parameters = worker.na_helper.set_parameters(parameters)
+        worker.volume_uuid = None
+        worker.quota_uuid = None
+        worker.warn_msg = None
+        worker.validate_parameters_ZAPI_REST()
+        return worker
+
+    @staticmethod
+    def get_quota_rule_key(parameters):
+        """ identify a rule, the order of users does not matter """
+        target = parameters['quota_target']
+        if parameters['type'] == 'user':
+            target = tuple(sorted(target.split(',')))
+        return parameters['volume'], parameters['type'], parameters['qtree'], target
+
+    def get_quota_rules_rest(self, volume):
+        """ all the rules for a volume, in a single query """
+        query = {'svm.name': self.parameters['vserver'],
+                 'volume.name': volume,
+                 'fields': QUOTA_RULE_FIELDS}
+        records, error = rest_generic.get_0_or_more_records(self.rest_api, 'storage/quota/rules', query)
+        if error:
+            self.module.fail_json(msg="Error on getting quota rules info for volume %s: %s" % (volume, error))
+        return records or []
+
+    def take_quota_rule_action(self, cd_action, modify):
+        if cd_action == 'create':
+            self.quota_entry_set_rest()
+        elif cd_action == 'delete':
+            self.quota_entry_delete_rest()
+        elif modify:
+            self.quota_entry_modify_rest(modify)
+
+    def get_volume_quota_status_action(self, quota_status, rules_changed):
+        """ same logic as apply, for a volume with one or more rules """
+        modify_quota_status = None
+        if 'set_quota_status' in self.parameters and quota_status is not None:
+            set_quota_status = quota_status in ('on', 'resizing', 'initializing')
+            if set_quota_status != self.parameters['set_quota_status']:
+                modify_quota_status = 'quota-on' if self.parameters['set_quota_status'] else 'quota-off'
+        if (self.parameters.get('activate_quota_on_change') in ['resize', 'reinitialize']
+                and rules_changed
+                and modify_quota_status is None
+                and quota_status in ('on', None)):
+            modify_quota_status = self.parameters['activate_quota_on_change']
+        return modify_quota_status
+
+    def wait_for_quota_state(self, states):
+        """ poll the volume quota state, rather than waiting for a fixed delay """
+        state = None
+        for dummy in range(QUOTA_STATE_MAX_POLLS):
+            state = self.get_quota_status_or_volume_id_rest()
+            if state in states:
+                return
+            time.sleep(QUOTA_STATE_POLL_INTERVAL)
+        self.module.fail_json(msg='Error: timeout waiting for quota state %s for %s, current state: %s'
+                              % (' or '.join(states), self.parameters['volume'], state))
+
+    def take_volume_quota_status_action(self, modify_quota_status):
+        """ a single quota on, off, or reinitialize for a volume, whatever the number of rules changed """
+        if modify_quota_status in ['quota-off', 'quota-on']:
+            self.on_or_off_quota_rest(modify_quota_status)
+        elif modify_quota_status == 'reinitialize':
+            self.on_or_off_quota_rest('quota-off')
+            self.wait_for_quota_state(['off'])
+            self.on_or_off_quota_rest('quota-on')
+
+    def apply_quota_rules(self):
+        """ read all rules for each volume, compare them in memory, then apply the changes concurrently
+            quota status and activation are applied once per volume
+        """
+        workers = []
+        keys = set()
+        try:
+            for rule in self.parameters['quota_rules']:
+                worker = self.create_quota_rule_worker(self.build_quota_rule_parameters(rule))
+                key = self.get_quota_rule_key(worker.parameters)
+                if key in keys:
+                    raise QuotaError('Error: duplicate entry in quota_rules for volume: %s, type: %s, qtree: %s, quota_target: %s.'
+                                     % (key[0], key[1], key[2], worker.parameters['quota_target']))
+                keys.add(key)
+                workers.append(worker)
+        except QuotaError as exc:
+            self.module.fail_json(msg=str(exc))
+
+        volumes = []
+        for worker in workers:
+            if worker.parameters['volume'] not in volumes:
+                volumes.append(worker.parameters['volume'])
+        rules = dict((volume, self.get_quota_rules_rest(volume)) for volume in volumes)
+        plans = []
+        for worker in workers:
+            worker.prefetched_rules = rules[worker.parameters['volume']]
+            current = worker.get_quotas_rest()
+            cd_action = worker.na_helper.get_cd_action(current, worker.parameters)
+            modify = worker.na_helper.get_modified_attributes(current, worker.parameters) if cd_action is None else None
+            plans.append((cd_action, modify))
+
+        volume_workers = []
+        modify_quota_status = {}
+        for volume in volumes:
+            # quota status and volume uuid for the volume
+            volume_worker = self.create_quota_rule_worker(dict(self.parameters, volume=volume))
+            volume_worker.volume_uuid = next((record['volume']['uuid'] for record in rules[volume] if 'volume' in record), None)
+            rules_changed = any(worker.na_helper.changed for worker in workers if worker.parameters['volume'] == volume)
+            quota_status = None
+            if rules_changed or 'set_quota_status' in self.parameters:
+                quota_status = volume_worker.get_quota_status_or_volume_id_rest()
+            modify_quota_status[volume] = volume_worker.get_volume_quota_status_action(quota_status, rules_changed)
+            volume_workers.append(volume_worker)
+        changed = any(worker.na_helper.changed for worker in workers) or any(modify_quota_status.values())
+
+        errors = []
+        rule_results = [None] * len(workers)
+        if changed and not self.module.check_mode:
+            rule_results = netapp_concurrency.run_concurrently(lambda worker, plan: worker.take_quota_rule_action(*plan),
+                                                               zip(workers, plans), self.parameters['max_concurrent_jobs'])
+        quota_rules = []
+        for worker, (cd_action, modify), result in zip(workers, plans, rule_results):
+            quota_rules.append(dict(volume=worker.parameters['volume'], type=worker.parameters['type'], qtree=worker.parameters['qtree'],
+                                    quota_target=worker.parameters['quota_target'], changed=worker.na_helper.changed,
+                                    action=cd_action, modify=modify))
+            exc = result[1] if result is not None else None
+            if exc is not None:
+                quota_rules[-1]['error'] = str(exc)
+                errors.append('rule %s %s in volume %s: %s' % (worker.parameters['type'], worker.parameters['quota_target'],
+                                                               worker.parameters['volume'], exc))
+        # do not activate quota on a partially updated volume, but update the other volumes
+        failed_volumes = [volume for volume in volumes if any('error' in rule for rule in quota_rules if rule['volume'] == volume)]
+        skipped_volumes = [volume for volume in failed_volumes if modify_quota_status[volume]]
+        status_errors = []
+        if changed and not self.module.check_mode:
+            volume_args = [(volume_worker, modify_quota_status[volume_worker.parameters['volume']])
+                           for volume_worker in volume_workers
+                           if modify_quota_status[volume_worker.parameters['volume']] and volume_worker.parameters['volume'] not in failed_volumes]
+            results = netapp_concurrency.run_concurrently(lambda volume_worker, action: volume_worker.take_volume_quota_status_action(action),
+                                                          volume_args, self.parameters['max_concurrent_jobs'])
+            for (volume_worker, dummy), (dummy, exc) in zip(volume_args, results):
+                if exc is not None:
+                    status_errors.append('volume %s: %s' % (volume_worker.parameters['volume'], exc))
+            # if warn message and quota not reinitialize, throw warnings to reinitialize in REST, once per volume.
+            warnings = []
+            for worker in workers:
+                volume = worker.parameters['volume']
+                if worker.warn_msg and (modify_quota_status[volume] != 'reinitialize' or volume in skipped_volumes) and worker.warn_msg not in warnings:
+                    warnings.append(worker.warn_msg)
+            for warning in warnings:
+                self.module.warn(warning)
+        if errors or status_errors:
+            messages = []
+            if errors:
+                messages.append('Error managing quota rules: %s' % '  '.join(errors))
+            if skipped_volumes:
+                messages.append('Quota status not changed for volume%s with failed rules: %s.'
+                                % ('s' if len(skipped_volumes) > 1 else '', ', '.join(skipped_volumes)))
+            if status_errors:
+                messages.append('Error managing quota status: %s' % '  '.join(status_errors))
+            self.module.fail_json(msg='  '.join(messages), changed=changed, quota_rules=quota_rules,
+                                  modify_quota_status=modify_quota_status, skipped_volumes=skipped_volumes)
+        result = netapp_utils.generate_result(changed, extra_responses={'quota_rules': quota_rules, 'modify_quota_status': modify_quota_status},
+                                              rest_api=self.rest_api)
         self.module.exit_json(**result)
 
     def convert_to_kb_or_bytes(self, option):
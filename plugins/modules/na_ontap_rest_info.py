@@ -315,6 +315,15 @@ options:
       - if false, HAL-encoded links are disabled in the REST calls.
     default: true
     type: bool
+  max_concurrent_subsets:
+    description:
+      - Maximum number of subsets gathered in parallel against the cluster, using a pool of threads.
+      - The default, 1, gathers subsets one after the other.
+      - Results are reported in the same order, and errors are reported in the same way, as when subsets are gathered sequentially.
+      - Each thread uses its own connection, the number of connections kept open is limited by the C(rest_pool_maxsize) feature flag.
+    type: int
+    default: 1
+    version_added: '22.15.0'
 '''
 
 EXAMPLES = '''
@@ -379,6 +388,16 @@ EXAMPLES = '''
       volume_name: volume_name
       svm_name: svm_name
 
+- name: Gather all subsets, with up to 4 subsets fetched in parallel
+  netapp.ontap.na_ontap_rest_info:
+    hostname: "{{ netapp_hostname }}"
+    username: "{{ netapp_username }}"
+    password: "{{ netapp_password }}"
+    validate_certs: false
+    gather_subset:
+      - all
+    max_concurrent_subsets: 4
+
 - name: Run ONTAP gather facts for volume info with query on name and state
   netapp.ontap.na_ontap_rest_info:
     hostname: "{{ netapp_hostname }}"
@@ -442,12 +461,17 @@ EXAMPLES = '''
 '''
 
 import codecs
+import threading
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils._text import to_text, to_bytes
 import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
 from ansible_collections.netapp.ontap.plugins.module_utils.netapp_module import NetAppModule
 from ansible_collections.netapp.ontap.plugins.module_utils.netapp import OntapRestAPI
-from ansible_collections.netapp.ontap.plugins.module_utils import rest_owning_resource, rest_vserver
+from ansible_collections.netapp.ontap.plugins.module_utils import netapp_concurrency, rest_generic, rest_owning_resource, rest_vserver
+
+
+class SubsetError(Exception):
+    ''' raised by a worker thread, in place of fail_json '''
 
 
 class NetAppONTAPGatherInfo(object):
@@ -469,6 +493,7 @@ class NetAppONTAPGatherInfo(object):
             owning_resource=dict(type='dict', required=False),
             ignore_api_errors=dict(type='list', elements='str', required=False),
             hal_linking=dict(required=False, type='bool', default=True),
+            max_concurrent_subsets=dict(required=False, type='int', default=1),
         ))
 
         self.module = AnsibleModule(
@@ -480,6 +505,10 @@ class NetAppONTAPGatherInfo(object):
         self.na_helper = NetAppModule()
         self.parameters = self.na_helper.set_parameters(self.module.params)
         self.fields = ''
+        if self.parameters['max_concurrent_subsets'] < 1:
+            self.module.fail_json(msg="Error: max_concurrent_subsets must be 1 or more, got: %d." % self.parameters['max_concurrent_subsets'])
+        # set when running in a worker thread
+        self.worker_context = threading.local()
 
         self.rest_api = OntapRestAPI(self.module)
         self.rest_api.fail_if_not_rest_minimum_version('na_ontap_rest_info', 9, 6, 0)
@@ -534,7 +563,7 @@ class NetAppONTAPGatherInfo(object):
             # Fail the module if error occurs from REST APIs call
             if int(error.get('code', 0)) == 6:
                 error = "Error: %s user is not authorized to make %s api call" % (self.parameters.get('username'), api)
-        self.module.fail_json(msg=error)
+        self.fail_json(error)
 
     @staticmethod
     def strip_dacls(response):
@@ -566,22 +595,7 @@ class NetAppONTAPGatherInfo(object):
         dummy, error = self.rest_api.wait_on_job(post_return['job'], increment=5)
         if error:
             # TODO: Handle errors that are not errors
-            self.module.fail_json(msg="%s" % error)
-
-    def get_next_records(self, api):
-        """
-            Gather next set of ONTAP information for the specified api
-            Input for REST APIs call : (api, data)
-            return gather_subset_info
-        """
-
-        data = {}
-        gather_subset_info, error = self.rest_api.get(api, data)
-
-        if error:
-            self.module.fail_json(msg=error)
-
-        return gather_subset_info
+            self.fail_json("%s" % error)
 
     def private_cli_fields(self, api):
         '''
@@ -767,13 +781,16 @@ class NetAppONTAPGatherInfo(object):
                     lun['serial_hex'] = to_text(hexlify(to_bytes(lun['serial_number']))[0])
                     lun['naa_id'] = 'naa.600a0980' + lun['serial_hex']
 
+    def augment_page(self, subset, page):
+        ''' called for each page of records, while the next page is being fetched '''
+        if subset == 'storage/luns':
+            # mutates the existing dicts
+            self.add_naa_id(page)
+
     def augment_subset_info(self, subset, subset_info):
         if subset == 'private/cli/vserver/security/file-directory':
             # creates a new list of dicts
             subset_info = self.strip_dacls(subset_info)
-        if subset == 'storage/luns':
-            # mutates the existing dicts
-            self.add_naa_id(subset_info)
         return subset_info
 
     def get_ontap_subset_info_all(self, subset, default_fields, get_ontap_subset_info):
@@ -782,29 +799,69 @@ class NetAppONTAPGatherInfo(object):
             # Verify whether the supported subset passed
             specified_subset = get_ontap_subset_info[subset]
         except KeyError:
-            self.module.fail_json(msg="Specified subset %s is not found, supported subsets are %s" %
-                                  (subset, list(get_ontap_subset_info.keys())))
+            self.fail_json("Specified subset %s is not found, supported subsets are %s" %
+                           (subset, list(get_ontap_subset_info.keys())))
         if 'api_call' not in specified_subset:
             specified_subset['api_call'] = subset
         subset_info = self.get_subset_info(specified_subset, default_fields)
 
         if subset_info is not None and isinstance(subset_info, dict) and '_links' in subset_info:
-            while subset_info['_links'].get('next'):
-                # Get all the set of records if next link found in subset_info for the specified subset
-                next_api = subset_info['_links']['next']['href']
-                gathered_subset_info = self.get_next_records(next_api.replace('/api', ''))
-
-                # Update the subset info for the specified subset
-                subset_info['_links'] = gathered_subset_info['_links']
-                subset_info['records'].extend(gathered_subset_info['records'])
+            # Get all the set of records if next link found in subset_info for the specified subset
+            # the next page is fetched while the current page is merged and augmented
+            prefetch = netapp_utils.has_feature(self.module, 'rest_prefetch_next_page')
+            for page, error in rest_generic.iter_pages(self.rest_api, subset_info, prefetch):
+                if error:
+                    self.fail_json(error)
+                if page is not subset_info:
+                    # Update the subset info for the specified subset
+                    subset_info['_links'] = page['_links']
+                    subset_info['records'].extend(page['records'])
+                self.augment_page(subset, page)
 
             # metrocluster doesn't have a records field, so we need to skip this
             if subset_info.get('records') is not None:
                 # Getting total number of records
                 subset_info['num_records'] = len(subset_info['records'])
+        else:
+            self.augment_page(subset, subset_info)
 
         return self.augment_subset_info(subset, subset_info)
 
+    def fail_json(self, msg):
+        ''' fail_json only exits the current thread when called from a worker
+            in a worker, the error is reported to the main thread, which calls fail_json
+        '''
+        if getattr(self.worker_context, 'active', False):
+            raise SubsetError(msg)
+        self.module.fail_json(msg=msg)
+
+    def get_ontap_subset_info_in_worker(self, subset, default_fields, get_ontap_subset_info):
+        self.worker_context.active = True
+        try:
+            return self.get_ontap_subset_info_all(subset, default_fields, get_ontap_subset_info)
+        finally:
+            self.worker_context.active = False
+
+    def get_ontap_subsets_info_concurrently(self, converted_subsets, get_ontap_subset_info):
+        ''' fetch independent subsets in parallel, with at most max_concurrent_subsets in flight
+            subsets are reported in the requested order, and the first error, in that same order, is reported with fail_json,
+            so that the results and errors are the same as when fetching subsets one after the other
+        '''
+        args_list = []
+        for subset in converted_subsets:
+            subset, default_fields = subset if isinstance(subset, list) else (subset, None)
+            args_list.append((subset, default_fields, get_ontap_subset_info))
+        results = netapp_concurrency.run_concurrently(
+            self.get_ontap_subset_info_in_worker, args_list, self.parameters['max_concurrent_subsets'])
+        result_message = {}
+        for args, (subset_info, exc) in zip(args_list, results):
+            if isinstance(exc, SubsetError):
+                self.module.fail_json(msg=exc.args[0])
+            if exc is not None:
+                self.module.fail_json(msg="Error: unexpected exception gathering %s: %s" % (args[0], repr(exc)))
+            result_message[args[0]] = subset_info
+        return result_message
+
     def apply(self):
         """
         Perform pre-checks, call functions and exit
@@ -1042,9 +1099,12 @@ class NetAppONTAPGatherInfo(object):
         converted_subsets = self.convert_subsets()
 
         result_message = {}
-        for subset in converted_subsets:
-            subset, default_fields = subset if isinstance(subset, list) else (subset, None)
-            result_message[subset] = self.get_ontap_subset_info_all(subset, default_fields, get_ontap_subset_info)
+        if self.parameters['max_concurrent_subsets'] > 1:
+            result_message = self.get_ontap_subsets_info_concurrently(converted_subsets, get_ontap_subset_info)
+        else:
+            for subset in converted_subsets:
+                subset, default_fields = subset if isinstance(subset, list) else (subset, None)
+                result_message[subset] = self.get_ontap_subset_info_all(subset, default_fields, get_ontap_subset_info)
         for subset in unsupported_subsets:
             result_message[subset] = '%s requires ONTAP %s' % (subset, get_ontap_subset_info[subset]['version'])
 
@@ -589,7 +589,7 @@ class NetAppOntapS3Buckets:
                 self.delete_s3_bucket()
             if modify:
                 self.modify_s3_bucket(modify)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
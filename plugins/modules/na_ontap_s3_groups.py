@@ -221,7 +221,7 @@ class NetAppOntapS3Groups:
                 self.delete_s3_groups()
             if modify:
                 self.modify_s3_groups(modify)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
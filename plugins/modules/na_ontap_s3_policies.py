@@ -232,7 +232,7 @@ class NetAppOntapS3Policies:
                 self.delete_s3_policies()
             if modify:
                 self.modify_s3_policies(modify)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
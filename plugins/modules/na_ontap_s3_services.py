@@ -306,7 +306,7 @@ class NetAppOntapS3Services:
                 self.modify_s3_service(modify)
                 response = self.get_s3_service(True)
         message = self.parse_response(response)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, extra_responses={'s3_service_info': message})
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, extra_responses={'s3_service_info': message}, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -217,7 +217,7 @@ class NetAppOntapS3Users:
                 self.modify_s3_user(modify)
         secret_key, access_key = self.parse_response(response)
         result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, extra_responses={'secret_key': secret_key,
-                                                                                                          'access_key': access_key})
+                                                                                                          'access_key': access_key}, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -281,7 +281,7 @@ class NetAppOntapSecurityConfig:
             self.modify_security_config(modify)
             if 'supported_cipher_suites' in modify:
                 self.cipher_suites_warning_rest(modify)
-        result = netapp_utils.generate_result(self.na_helper.changed, modify=modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, modify=modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -114,7 +114,7 @@ class NetAppOntapSecurityIPsecConfig:
         modify = self.na_helper.get_modified_attributes(self.get_security_ipsec_config(), self.parameters)
         if self.na_helper.changed and not self.module.check_mode:
             self.modify_security_ipsec_config(modify)
-        result = netapp_utils.generate_result(self.na_helper.changed, modify=modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, modify=modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
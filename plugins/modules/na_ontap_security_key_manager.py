@@ -626,7 +626,7 @@ class NetAppOntapSecurityKeyManager:
                 self.modify_key_manager_rest(modify_passphrase)
             elif modify_sync:
                 self.modify_key_manager_rest(modify_sync)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
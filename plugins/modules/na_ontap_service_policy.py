@@ -326,7 +326,7 @@ class NetAppOntapServicePolicy:
                 self.delete_service_policy(current)
             elif modify:
                 self.modify_service_policy(current, modify)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, extra_responses={'scope': self.module.params})
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, extra_responses={'scope': self.module.params}, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -374,7 +374,7 @@ class NetAppOntapServiceProcessorNetwork:
             self.validate_rest(modify) if self.use_rest else self.validate_zapi(modify)
         if self.na_helper.changed and not self.module.check_mode:
             self.modify_service_processor_network(modify)
-        result = netapp_utils.generate_result(self.na_helper.changed, modify=modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, modify=modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -327,6 +327,28 @@ options:
     type: str
     choices: ['full', 'exclude_network_config', 'exclude_network_and_protocol_config']
     version_added: '22.4.0'
+  relationships:
+    description:
+      - Manage several relationships in a single task, mutually exclusive with the source and destination options.
+      - Each entry is a dictionary accepting the same options as the module, except for the connection and peer options.
+      - C(destination_endpoint) and C(source_endpoint), or C(destination_path) and C(source_path), or their vserver and volume
+        equivalents, are required in each entry.  Other options default to the values set at the module level.
+      - The current state of all the relationships is read with a single query, and actions are computed for all relationships
+        before any change is made.
+      - Changes are then applied concurrently, see C(max_concurrent_jobs).
+      - When waiting for relationships to quiesce or for transfers to complete, a single query is used for all the relationships
+        in each polling cycle.
+      - Only supported with REST, and with C(connection_type=ontap_ontap).
+    type: list
+    elements: dict
+    version_added: 22.15.0
+  max_concurrent_jobs:
+    description:
+      - When C(relationships) is set, maximum number of relationships being changed at the same time.
+      - Should not exceed the C(rest_pool_maxsize) feature flag, as each relationship uses its own connection.
+    type: int
+    default: 5
+    version_added: 22.15.0
 
 short_description: "NetApp ONTAP or ElementSW Manage SnapMirror"
 version_added: 2.7.0
@@ -481,20 +503,46 @@ EXAMPLES = """
     password: "{{ password }}"
     https: true
     validate_certs: false
+
+- name: Break several relationships
+  netapp.ontap.na_ontap_snapmirror:
+    state: present
+    relationship_state: broken
+    relationships:
+      - source_endpoint:
+          path: "svm_src:vol1"
+        destination_endpoint:
+          path: "svm_dst:vol1_dst"
+      - source_endpoint:
+          path: "svm_src:vol2"
+        destination_endpoint:
+          path: "svm_dst:vol2_dst"
+    max_concurrent_jobs: 10
+    hostname: "{{ destination_hostname }}"
+    username: "{{ username }}"
+    password: "{{ password }}"
 """
 
 RETURN = """
+relationships:
+  description: When C(relationships) is set, the destination path, changed status and actions for each relationship.
+  returned: always, when C(relationships) is set
+  type: list
+  elements: dict
 """
 
+import copy
 import re
 import time
 import traceback
 from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.arg_spec import ArgumentSpecValidator
 from ansible.module_utils._text import to_native
 import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
 from ansible_collections.netapp.ontap.plugins.module_utils.netapp_elementsw_module import NaElementSWModule
 from ansible_collections.netapp.ontap.plugins.module_utils.netapp_module import NetAppModule
 from ansible_collections.netapp.ontap.plugins.module_utils import rest_generic
+from ansible_collections.netapp.ontap.plugins.module_utils import netapp_concurrency
 
 HAS_SF_SDK = netapp_utils.has_sf_sdk()
 try:
@@ -503,6 +551,29 @@ except ImportError:
     HAS_SF_SDK = False
 
 
+class RelationshipError(Exception):
+    pass
+
+
+class RelationshipModule:
+    """ stands for the AnsibleModule when managing one relationship in a relationships list
+        fail_json raises an exception, so that errors can be collected from worker threads
+        warnings are prefixed with the relationship name
+    """
+    def __init__(self, module, name):
+        self._module = module
+        self.name = name
+
+    def fail_json(self, **kwargs):
+        raise RelationshipError(kwargs.get('msg'))
+
+    def warn(self, warning):
+        self._module.warn('%s: %s' % (self.name, warning))
+
+    def __getattr__(self, name):
+        return getattr(self._module, name)
+
+
 class NetAppONTAPSnapmirror(object):
     """
     Class with SnapMirror methods
@@ -575,6 +646,16 @@ class NetAppONTAPSnapmirror(object):
             clean_up_failure=dict(required=False, type='bool', default=False),
             validate_source_path=dict(required=False, type='bool', default=True)
         ))
+        # each entry in relationships accepts the relationship options, and defaults to the module level values
+        not_in_entries = list(netapp_utils.na_ontap_host_argument_spec()) + [
+            'connection_type', 'peer_options', 'source_hostname', 'source_username', 'source_password']
+        self.relationship_argument_spec = dict(
+            (key, dict((attr, value) for attr, value in spec.items() if attr not in ('required', 'default')))
+            for key, spec in self.argument_spec.items() if key not in not_in_entries)
+        self.argument_spec.update(dict(
+            relationships=dict(required=False, type='list', elements='dict'),
+            max_concurrent_jobs=dict(required=False, type='int', default=5),
+        ))
 
         self.module = AnsibleModule(
             argument_spec=self.argument_spec,
@@ -590,8 +671,9 @@ class NetAppONTAPSnapmirror(object):
                 ('peer_options', 'source_hostname'),
                 ('peer_options', 'source_username'),
                 ('peer_options', 'source_password'),
-                ('identity_preserve', 'identity_preservation')
-            ],
+                ('identity_preserve', 'identity_preservation'),
+            ] + [('relationships', option) for option in ('source_endpoint', 'source_path', 'source_volume', 'source_vserver',
+                                                          'destination_endpoint', 'destination_path', 'destination_volume', 'destination_vserver')],
             required_together=(['source_volume', 'destination_volume'],
                                ['source_vserver', 'destination_vserver'],
                                ['source_endpoint', 'destination_endpoint'],
@@ -617,6 +699,20 @@ class NetAppONTAPSnapmirror(object):
         self.rest_api, self.use_rest = self.setup_rest()
         if not self.use_rest:
             self.server = self.setup_zapi()
+        # current records read in a single query, when relationships is set
+        self.prefetched_records = {}
+        # pollers shared by all relationships, when relationships is set
+        self.pollers = None
+        # SVM peers, indexed by source SVM and destination SVM, shared by all relationships when relationships is set
+        self.svm_peers = None
+        if self.parameters.get('relationships'):
+            if not self.use_rest:
+                self.module.fail_json(msg='Error: relationships option requires REST.  use_rest: %s.' % self.parameters['use_rest'])
+            if self.parameters['connection_type'] != 'ontap_ontap':
+                self.module.fail_json(msg='Error: relationships option requires connection_type: ontap_ontap, got: %s.'
+                                      % self.parameters['connection_type'])
+            if self.parameters['max_concurrent_jobs'] < 1:
+                self.module.fail_json(msg='Error: max_concurrent_jobs must be 1 or more, got: %d.' % self.parameters['max_concurrent_jobs'])
 
     def set_source_peer(self):
         if self.parameters.get('source_hostname') is None and self.parameters.get('peer_options') is None:
@@ -639,28 +735,36 @@ class NetAppONTAPSnapmirror(object):
                 netapp_utils.na_ontap_host_argument_spec_peer().keys())
 
     def setup_rest(self):
-        unsupported_rest_properties = ['identity_preserve', 'max_transfer_rate']
         host_options = self.parameters['peer_options'] if self.parameters.get('connection_type') == 'ontap_elementsw' else None
         rest_api = netapp_utils.OntapRestAPI(self.module, host_options=host_options)
-        rtype = self.parameters.get('relationship_type')
+        use_rest, error = self.check_rest_properties(rest_api, self.parameters)
+        if error is not None:
+            self.module.fail_json(msg=error)
+        return rest_api, use_rest
+
+    @staticmethod
+    def check_rest_properties(rest_api, parameters):
+        """ return use_rest, error """
+        unsupported_rest_properties = ['identity_preserve', 'max_transfer_rate']
+        rtype = parameters.get('relationship_type')
         if rtype not in (None, 'extended_data_protection', 'restore'):
             unsupported_rest_properties.append('relationship_type')
-        used_unsupported_rest_properties = [x for x in unsupported_rest_properties if x in self.parameters]
+        used_unsupported_rest_properties = [x for x in unsupported_rest_properties if x in parameters]
         ontap_97_options = ['create_destination', 'source_cluster', 'destination_cluster']
         partially_supported_rest_properties = [(property, (9, 7)) for property in ontap_97_options]
         partially_supported_rest_properties.extend([('schedule', (9, 11, 1)), ('identity_preservation', (9, 11, 1))])
         use_rest, error = rest_api.is_rest_supported_properties(
-            self.parameters, used_unsupported_rest_properties, partially_supported_rest_properties, report_error=True)
+            parameters, used_unsupported_rest_properties, partially_supported_rest_properties, report_error=True)
         if error is not None:
             if 'relationship_type' in error:
                 error = error.replace('relationship_type', 'relationship_type: %s' % rtype)
             if 'schedule' in error:
                 error += ' - With REST use the policy option to define a schedule.'
-            self.module.fail_json(msg=error)
+            return use_rest, error
 
-        if not use_rest and any(x in self.parameters for x in ontap_97_options):
-            self.module.fail_json(msg='Error: %s' % rest_api.options_require_ontap_version(ontap_97_options, version='9.7', use_rest=use_rest))
-        return rest_api, use_rest
+        if not use_rest and any(x in parameters for x in ontap_97_options):
+            return use_rest, 'Error: %s' % rest_api.options_require_ontap_version(ontap_97_options, version='9.7', use_rest=use_rest)
+        return use_rest, None
 
     def setup_zapi(self):
         if self.parameters.get('identity_preservation'):
@@ -739,6 +843,13 @@ class NetAppONTAPSnapmirror(object):
         increment = 30
         if transferring_time_out <= 0:
             return self.snapmirror_get()
+        if self.pollers is not None:
+            # shared with the other relationships
+            current = self.wait_for_shared_poller('idle', lambda current: current and current['status'] != 'transferring',
+                                                  len(range(0, transferring_time_out, increment)))
+            if not current or current['status'] == 'transferring':
+                self.module.warn('SnapMirror relationship is still transferring after %d seconds.' % transferring_time_out)
+            return current
         for __ in range(0, transferring_time_out, increment):
             time.sleep(increment)
             current = self.snapmirror_get()
@@ -751,13 +862,34 @@ class NetAppONTAPSnapmirror(object):
         # sleep for a maximum of X seconds (with a default of 5 minutes), in 10 seconds increments
         quiesced_time_out = self.parameters['quiesced_time_out']
         increment = 10
-        for __ in range(0, quiesced_time_out, increment):
-            time.sleep(increment)
-            sm_info = self.snapmirror_get()
-            if sm_info and (sm_info['status'] == 'quiesced' or sm_info['mirror_state'] == 'paused'):
+        if self.pollers is not None and quiesced_time_out > 0:
+            # shared with the other relationships
+            sm_info = self.wait_for_shared_poller('quiesced', self.is_quiesced, len(range(0, quiesced_time_out, increment)))
+            if self.is_quiesced(sm_info):
                 return
+        else:
+            for __ in range(0, quiesced_time_out, increment):
+                time.sleep(increment)
+                sm_info = self.snapmirror_get()
+                if self.is_quiesced(sm_info):
+                    return
         self.module.fail_json(msg='Taking a long time to quiesce SnapMirror relationship after %d seconds, try again later' % quiesced_time_out)
 
+    @staticmethod
+    def is_quiesced(sm_info):
+        return bool(sm_info and (sm_info['status'] == 'quiesced' or sm_info['mirror_state'] == 'paused'))
+
+    def wait_for_shared_poller(self, kind, condition, max_polls):
+        """ wait until condition(current) is met, using a single query for all the relationships waiting at the same time
+            return current, or None if the relationship is not found
+        """
+        destination = self.parameters['destination_path']
+        record, dummy, error = self.pollers[kind].wait(
+            destination, lambda record: condition(self.format_snapmirror_record_rest(record, update_parameters=False)), max_polls)
+        if error:
+            self.module.fail_json(msg="Error getting SnapMirror %s: %s" % (destination, to_native(error)))
+        return self.format_snapmirror_record_rest(record)
+
     def check_if_remote_volume_exists(self):
         """
         Validate existence of source volume
@@ -1327,7 +1459,9 @@ class NetAppONTAPSnapmirror(object):
         """
         if self.parameters.get('connection_type') == 'ontap_elementsw':
             return
-        current = self.snapmirror_get()
+        self.report_health(self.snapmirror_get())
+
+    def report_health(self, current):
         if current is not None and not current.get('is_healthy', True):
             msg = ['SnapMirror relationship exists but is not healthy.']
             if 'unhealthy_reason' in current:
@@ -1500,25 +1634,40 @@ class NetAppONTAPSnapmirror(object):
             # check_param get the value if it's given in other format like destination_endpoint etc..
             destination = self.parameters['destination_path']
 
+        if destination in self.prefetched_records:
+            # read with all the other relationships in the relationships list, only used once
+            return self.format_snapmirror_record_rest(self.prefetched_records.pop(destination))
         api = 'snapmirror/relationships'
-        fields = 'uuid,state,transfer.state,transfer.uuid,policy.name,policy.type,unhealthy_reason.message,healthy,source'
-        if 'schedule' in self.parameters:
-            fields += ',transfer_schedule'
-        options = {'destination.path': destination, 'fields': fields}
+        options = {'destination.path': destination, 'fields': self.get_snapmirror_fields_rest()}
         record, error = rest_generic.get_one_record(self.rest_api, api, options)
         if error:
             self.module.fail_json(msg="Error getting SnapMirror %s: %s" % (destination, to_native(error)),
                                   exception=traceback.format_exc())
+        return self.format_snapmirror_record_rest(record)
+
+    def get_snapmirror_fields_rest(self, parameters=None):
+        if parameters is None:
+            parameters = self.parameters
+        fields = 'uuid,state,transfer.state,transfer.uuid,policy.name,policy.type,unhealthy_reason.message,healthy,source'
+        if 'schedule' in parameters:
+            fields += ',transfer_schedule'
+        return fields
+
+    def format_snapmirror_record_rest(self, record, update_parameters=True):
+        """ return the current snapmirror info, or None if record is None
+            when update_parameters is set, record the uuids and current state for later actions
+        """
         if record is not None:
             snap_info = {}
-            self.parameters['uuid'] = self.na_helper.safe_get(record, ['uuid'])
-            self.parameters['transfer_uuid'] = self.na_helper.safe_get(record, ['transfer', 'uuid'])
-            self.parameters['current_mirror_state'] = self.na_helper.safe_get(record, ['state'])
+            if update_parameters:
+                self.parameters['uuid'] = self.na_helper.safe_get(record, ['uuid'])
+                self.parameters['transfer_uuid'] = self.na_helper.safe_get(record, ['transfer', 'uuid'])
+                self.parameters['current_mirror_state'] = self.na_helper.safe_get(record, ['state'])
+                self.parameters['current_transfer_status'] = self.na_helper.safe_get(record, ['transfer', 'state'])
+                self.policy_type = self.na_helper.safe_get(record, ['policy', 'type'])
             snap_info['mirror_state'] = self.na_helper.safe_get(record, ['state'])
             snap_info['status'] = self.na_helper.safe_get(record, ['transfer', 'state'])
-            self.parameters['current_transfer_status'] = self.na_helper.safe_get(record, ['transfer', 'state'])
             snap_info['policy'] = self.na_helper.safe_get(record, ['policy', 'name'])
-            self.policy_type = self.na_helper.safe_get(record, ['policy', 'type'])
             # REST API supports only Extended Data Protection (XDP) SnapMirror relationship
             snap_info['relationship_type'] = 'extended_data_protection'
             # initialized to avoid name keyerror
@@ -1598,13 +1747,20 @@ class NetAppONTAPSnapmirror(object):
 
     def get_svm_peer(self, source_svm, destination_svm):
         if self.use_rest:
+            if self.svm_peers is not None and (source_svm, destination_svm) in self.svm_peers:
+                # many relationships share the same SVMs
+                return self.svm_peers[(source_svm, destination_svm)]
             api = 'svm/peers'
             query = {'name': source_svm, 'svm.name': destination_svm}
             record, error = rest_generic.get_one_record(self.rest_api, api, query, fields='peer')
             if error:
                 self.module.fail_json(msg='Error retrieving SVM peer: %s' % error)
+            peer = (None, None)
             if record:
-                return self.na_helper.safe_get(record, ['peer', 'svm', 'name']), self.na_helper.safe_get(record, ['peer', 'cluster', 'name'])
+                peer = self.na_helper.safe_get(record, ['peer', 'svm', 'name']), self.na_helper.safe_get(record, ['peer', 'cluster', 'name'])
+            if self.svm_peers is not None:
+                self.svm_peers[(source_svm, destination_svm)] = peer
+            return peer
         else:
             query = {
                 'query': {
@@ -1721,10 +1877,7 @@ class NetAppONTAPSnapmirror(object):
         if 'resync' in actions:
             self.snapmirror_resync()
 
-    def apply(self):
-        """
-        Apply action to SnapMirror
-        """
+    def check_connection_parameters(self):
         # source is ElementSW
         if self.parameters['state'] == 'present' and self.parameters.get('connection_type') == 'elementsw_ontap':
             self.check_elementsw_parameters()
@@ -1738,17 +1891,157 @@ class NetAppONTAPSnapmirror(object):
                 self.module.fail_json(msg='Error: creating an ONTAP to ElementSW snapmirror relationship requires an '
                                           'established SnapMirror relation from ElementSW to ONTAP cluster')
 
-        actions, current, modify = self.get_actions()
-        if self.na_helper.changed and not self.module.check_mode:
-            self.take_actions(actions, current, modify)
+    def check_for_update(self, actions, current=None):
+        """ update the relationship if it is snapmirrored, current is read again if not provided """
         if 'check_for_update' in actions:
-            current = self.snapmirror_get()
+            if current is None:
+                current = self.snapmirror_get()
             if current['mirror_state'] == 'snapmirrored':
                 actions.append('update')
                 if not self.module.check_mode:
                     self.snapmirror_update(current['relationship_type'])
                 self.na_helper.changed = True
 
+    def build_relationship_parameters(self, relationship):
+        """ validate a relationships entry, and use module level values as defaults """
+        result = ArgumentSpecValidator(self.relationship_argument_spec).validate(relationship)
+        if result.error_messages:
+            raise RelationshipError('Error in relationships entry %s: %s' % (relationship, ', '.join(result.error_messages)))
+        parameters = dict((key, value) for key, value in self.parameters.items() if key not in ('relationships', 'max_concurrent_jobs'))
+        for key, value in result.validated_parameters.items():
+            if value is not None:
+                parameters[key] = value
+        return parameters
+
+    def create_relationship_worker(self, parameters, index):
+        """ return a copy of self to manage a single relationship, errors are raised as RelationshipError """
+        worker = copy.copy(self)
+        worker.module = RelationshipModule(self.module, 'relationships[%d]' % index)
+        worker.parameters = parameters
+        worker.na_helper = NetAppModule()
+        worker.policy_type = None
+        worker.new_style = False
+        worker.previous_errors = []
+        worker.prefetched_records = {}
+        dummy, error = self.check_rest_properties(self.rest_api, parameters)
+        if error:
+            raise RelationshipError(error)
+        worker.check_parameters()
+        if not parameters.get('destination_path'):
+            raise RelationshipError('Error: a destination is required in each relationships entry, got: %s' % parameters)
+        worker.module.name = parameters['destination_path']
+        return worker
+
+    def get_relationships_rest(self, destinations):
+        """ read all relationships in a single query, 100 destinations at a time
+            return a dict indexed by destination path, the record is None if the relationship does not exist, and an error
+            called from worker threads, so errors are returned rather than reported.
+        """
+        records = dict((destination, None) for destination in destinations)
+        fields = self.get_snapmirror_fields_rest(dict(schedule=None)) + ',destination.path'
+        for index in range(0, len(destinations), 100):
+            params = {'destination.path': '|'.join(destinations[index:index + 100]),
+                      'fields': fields}
+            response, error = self.rest_api.get('snapmirror/relationships', params)
+            pages = [(None, error)] if error else rest_generic.iter_pages(self.rest_api, response)
+            for page, error in pages:
+                if error:
+                    return records, error
+                for record in page.get('records') or []:
+                    destination = self.na_helper.safe_get(record, ['destination', 'path'])
+                    if destination in records:
+                        records[destination] = record
+        return records, None
+
+    def prefetch_relationships_rest(self, workers):
+        destinations = [worker.parameters['destination_path'] for worker in workers]
+        records, error = self.get_relationships_rest(destinations)
+        if error:
+            self.module.fail_json(msg='Error getting SnapMirror relationships: %s' % to_native(error))
+        for worker in workers:
+            destination = worker.parameters['destination_path']
+            worker.prefetched_records = {destination: records[destination]}
+
+    def run_workers(self, function, workers, args_list):
+        """ call function(worker, *args) concurrently, return a list of errors, None for a success """
+        results = netapp_concurrency.run_concurrently(function, [(worker,) + tuple(args) for worker, args in zip(workers, args_list)],
+                                                      self.parameters['max_concurrent_jobs'])
+        return [None if exc is None else to_native(exc) for dummy, exc in results]
+
+    def apply_relationships(self):
+        """ plan all relationships sequentially, then apply the changes concurrently
+            pollers let all relationships share a single query when waiting for a state
+        """
+        self.pollers = dict(idle=netapp_concurrency.BatchPoller(self.get_relationships_rest, 30),
+                            quiesced=netapp_concurrency.BatchPoller(self.get_relationships_rest, 10))
+        self.svm_peers = {}
+        workers = []
+        destinations = set()
+        try:
+            for index, relationship in enumerate(self.parameters['relationships']):
+                worker = self.create_relationship_worker(self.build_relationship_parameters(relationship), index)
+                destination = worker.parameters['destination_path']
+                if destination in destinations:
+                    raise RelationshipError('Error: duplicate entry in relationships for destination: %s.' % destination)
+                destinations.add(destination)
+                workers.append(worker)
+        except RelationshipError as exc:
+            self.module.fail_json(msg=str(exc))
+        self.prefetch_relationships_rest(workers)
+        plans = []
+        for worker in workers:
+            try:
+                plans.append(worker.get_actions())
+            except RelationshipError as exc:
+                self.module.fail_json(msg='Error with relationship %s: %s' % (worker.parameters['destination_path'], exc))
+
+        def take_actions(worker, actions, current, modify):
+            if worker.na_helper.changed and not self.module.check_mode:
+                worker.take_actions(actions, current, modify)
+
+        errors = self.run_workers(take_actions, workers, plans)
+        # read the state of all relationships again, to check for updates and health
+        self.prefetch_relationships_rest(workers)
+
+        def check_for_update_and_health(worker, actions, dummy_current, dummy_modify):
+            current = worker.snapmirror_get()
+            if 'check_for_update' in actions:
+                worker.check_for_update(actions, current)
+            worker.report_health(current)
+
+        ok_workers = [(worker, plan) for worker, plan, error in zip(workers, plans, errors) if error is None]
+        update_errors = iter(self.run_workers(check_for_update_and_health, [worker for worker, dummy in ok_workers],
+                                              [plan for dummy, plan in ok_workers]))
+        errors = [error if error is not None else next(update_errors) for error in errors]
+
+        relationship_results = []
+        for worker, plan, error in zip(workers, plans, errors):
+            relationship_results.append(dict(destination_path=worker.parameters['destination_path'], changed=worker.na_helper.changed,
+                                             actions=plan[0]))
+            if error is not None:
+                relationship_results[-1]['error'] = error
+            if worker.previous_errors:
+                self.module.warn('%s: Ignored error(s): %s' % (worker.parameters['destination_path'], ' -- '.join(worker.previous_errors)))
+        changed = any(result['changed'] for result in relationship_results)
+        failed = [result for result in relationship_results if 'error' in result]
+        if failed:
+            self.module.fail_json(msg='Error managing relationships: %s' % '  '.join('relationship %s: %s' % (result['destination_path'], result['error'])
+                                                                                     for result in failed),
+                                  changed=changed, relationships=relationship_results)
+        self.module.exit_json(changed=changed, relationships=relationship_results)
+
+    def apply(self):
+        """
+        Apply action to SnapMirror
+        """
+        if self.parameters.get('relationships'):
+            return self.apply_relationships()
+        self.check_connection_parameters()
+        actions, current, modify = self.get_actions()
+        if self.na_helper.changed and not self.module.check_mode:
+            self.take_actions(actions, current, modify)
+        self.check_for_update(actions)
+
         self.check_health()
         if self.previous_errors:
             self.module.warn('Ignored error(s): %s' % ' -- '.join(self.previous_errors))
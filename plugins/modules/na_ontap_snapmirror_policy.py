@@ -1021,7 +1021,7 @@ class NetAppOntapSnapMirrorPolicy:
                 self.modify_snapmirror_policy(uuid, body)
                 self.modify_snapmirror_policy_rules(current, uuid)
 
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -417,7 +417,7 @@ class NetAppOntapSnapshot:
                 self.delete_snapshot(volume_id=volume_id, uuid=uuid)
             elif modify:
                 self.modify_snapshot(volume_id=volume_id, uuid=uuid, rename=rename)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -787,7 +787,7 @@ class NetAppOntapSnapshotPolicy(object):
             if modify:
                 self.modify_snapshot_policy_rest(modify, current)
                 self.modify_snapshot_policy_schedule_rest(modify, current)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
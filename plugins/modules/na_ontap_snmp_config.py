@@ -129,7 +129,7 @@ class NetAppOntapSNMPConfig:
 
         if self.na_helper.changed and not self.module.check_mode:
             self.modify_snmp_config_rest(modify)
-        result = netapp_utils.generate_result(changed=self.na_helper.changed, modify=modify)
+        result = netapp_utils.generate_result(changed=self.na_helper.changed, modify=modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
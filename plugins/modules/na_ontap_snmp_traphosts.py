@@ -112,7 +112,7 @@ class NetAppONTAPSnmpTraphosts:
                 self.create_snmp_traphost()
             elif cd_action == 'delete':
                 self.delete_snmp_traphost()
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
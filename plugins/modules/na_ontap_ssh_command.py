@@ -18,6 +18,7 @@ description:
   - Output is returned in C(stdout) and C(stderr), and also as C(stdout_lines), C(stdout_lines_filtered), C(stderr_lines).
   - Note that the module can succeed even though the command failed.  You need to analyze stdout and check the results.
   - If the SSH host key is unknown and accepted, C(warnings) is updated.
+  - With C(commands), several commands are run over a single authenticated SSH session.
   - Options related to ZAPI or REST APIs are ignored.
 extends_documentation_fragment:
   - netapp.ontap.netapp.na_ontap
@@ -28,8 +29,18 @@ options:
     command:
         description:
           - a string containing the command and arguments.
-        required: true
+          - one of C(command) or C(commands) is required.
         type: str
+    commands:
+        description:
+          - a list of commands, each a string containing the command and arguments.
+          - the commands are run in order, over a single SSH session, so that the connection and authentication are done only once.
+          - each command is run in a new channel, C(privilege) applies to every command.
+          - the output for each command is reported in C(results).
+          - a reusable connection across tasks, like OpenSSH ControlMaster, is not supported.
+        type: list
+        elements: str
+        version_added: 22.15.0
     privilege:
         description:
           - privilege level at which to run the command, eg admin, advanced.
@@ -97,6 +108,17 @@ EXAMPLES = """
     privilege: diag
     sp: true
     register: result
+
+- name: run several ontap cli commands over a single SSH session
+  netapp.ontap.na_ontap_ssh_command:
+    hostname: "{{ netapp_hostname }}"
+    username: "{{ netapp_username }}"
+    password: "{{ netapp_password }}"
+    commands:
+      - version
+      - node show -fields node,health,uptime,model
+      - storage aggregate show -fields aggregate,state
+    privilege: admin
 """
 
 RETURN = """
@@ -106,6 +128,15 @@ stdout_lines_filtered:
     - The list can be further refined using the include_lines and exclude_lines filters.
   returned: always
   type: list
+results:
+  description:
+    - with C(commands), a list with an entry for each command, in the same order.
+    - each entry reports C(command), C(stdout), C(stdout_lines_filtered), and C(stderr).
+    - C(stdout), C(stdout_lines_filtered), and C(stderr) at the top level aggregate the outputs of all commands.
+  returned: with commands
+  type: list
+  elements: dict
+  version_added: 22.15.0
 """
 
 import traceback
@@ -127,7 +158,8 @@ class NetAppONTAPSSHCommand(object):
     def __init__(self):
         self.argument_spec = netapp_utils.na_ontap_host_argument_spec()
         self.argument_spec.update(dict(
-            command=dict(required=True, type='str'),
+            command=dict(required=False, type='str'),
+            commands=dict(required=False, type='list', elements='str'),
             privilege=dict(required=False, type='str'),
             accept_unknown_host_keys=dict(required=False, type='bool', default=False),
             include_lines=dict(required=False, type='str', default=''),
@@ -136,11 +168,14 @@ class NetAppONTAPSSHCommand(object):
         ))
         self.module = AnsibleModule(
             argument_spec=self.argument_spec,
+            mutually_exclusive=[('command', 'commands')],
+            required_one_of=[('command', 'commands')],
             supports_check_mode=True
         )
         parameters = self.module.params
         # set up state variables
         self.command = parameters['command']
+        self.commands = parameters['commands']
         self.privilege = parameters['privilege']
         self.include_lines = parameters['include_lines']
         self.exclude_lines = parameters['exclude_lines']
@@ -217,9 +252,10 @@ class NetAppONTAPSSHCommand(object):
 
         return result
 
-    def run_command(self):
-        ''' calls SSH '''
-        command = self.command
+    def run_command(self, command=None):
+        ''' calls SSH, the SSH session is reused for each command '''
+        if command is None:
+            command = self.command
         if self.privilege is not None:
             if self.service_processor:
                 command = "priv set %s;%s" % (self.privilege, command)
@@ -230,15 +266,32 @@ class NetAppONTAPSSHCommand(object):
         stdout_filtered = self.filter_output(stdout_string)
         return stdout_string, stdout_filtered, self.parse_output(stderr)
 
+    def run_commands(self):
+        ''' run each command in turn, and aggregate the outputs '''
+        results = []
+        for command in self.commands:
+            stdout, filtered, stderr = self.run_command(command)
+            results.append(dict(command=command, stdout=stdout, stdout_lines_filtered=filtered, stderr=stderr))
+        stdout = b''.join(result['stdout'] for result in results)
+        filtered = [line for result in results for line in result['stdout_lines_filtered']]
+        stderr = b''.join(result['stderr'] for result in results)
+        return stdout, filtered, stderr, results
+
     def apply(self):
         ''' calls the command and returns raw output '''
         changed = True
         stdout, filtered, stderr = '', '', ''
+        extra_results = {}
         if not self.module.check_mode:
-            stdout, filtered, stderr = self.run_command()
+            if self.commands is not None:
+                stdout, filtered, stderr, extra_results['results'] = self.run_commands()
+            else:
+                stdout, filtered, stderr = self.run_command()
             if stderr:
                 self.failed = True
-        self.module.exit_json(changed=changed, failed=self.failed, stdout=stdout, stdout_lines_filtered=filtered, stderr=stderr, warnings=self.warnings)
+        self.client.close()
+        self.module.exit_json(changed=changed, failed=self.failed, stdout=stdout, stdout_lines_filtered=filtered, stderr=stderr, warnings=self.warnings,
+                              **extra_results)
 
 
 def main():
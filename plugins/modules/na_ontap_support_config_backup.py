@@ -156,7 +156,7 @@ class NetAppOntapSupportConfigBackup:
         if self.na_helper.changed and not self.module.check_mode:
             if modify:
                 self.modify_support_config_backup(modify)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
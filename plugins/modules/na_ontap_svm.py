@@ -944,7 +944,7 @@ class NetAppOntapSVM():
                 self.modify_vserver(modify, current)
             if modify and 'aggr_list' in modify and '*' in modify['aggr_list']:
                 self.module.warn("na_ontap_svm: changed always 'True' when aggr_list is '*'.")
-        results = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        results = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**results)
 
 
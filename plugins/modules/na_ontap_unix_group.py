@@ -445,7 +445,7 @@ class NetAppOntapUnixGroup:
                 self.delete_unix_group_rest(current)
             else:
                 self.modify_unix_group_rest(modify, current)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -314,7 +314,7 @@ class NetAppOntapUnixUser:
                 self.delete_unix_user_rest(current)
             else:
                 self.modify_unix_user_rest(modify, current)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
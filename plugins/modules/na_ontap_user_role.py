@@ -504,7 +504,7 @@ class NetAppOntapUserRole:
                     modify = {}
                 else:
                     self.validate_create_modify_required(current, modify)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
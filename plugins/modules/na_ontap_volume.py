@@ -30,8 +30,8 @@ options:
   name:
     description:
       - The name of the volume to manage.
+      - Required, unless C(volumes) is set.
     type: str
-    required: true
 
   vserver:
     description:
@@ -760,6 +760,28 @@ options:
     type: bool
     version_added: 22.13.0
 
+  volumes:
+    description:
+      - Manage several volumes in a single task, mutually exclusive with C(name).
+      - Each entry is a dictionary accepting the same options as the module, except for the connection options.
+      - C(name) is required in each entry, other options default to the values set at the module level.
+      - The current state of all the volumes is read with a single query per vserver.
+      - Create, modify and delete actions are computed for all volumes before any change is made.
+      - Changes are then applied concurrently, see C(max_concurrent_jobs).
+      - Create and delete jobs are started for all volumes, then waited on together, with a single query per polling cycle.
+      - Only supported with REST.
+    type: list
+    elements: dict
+    version_added: 22.15.0
+
+  max_concurrent_jobs:
+    description:
+      - When C(volumes) is set, maximum number of volumes being changed at the same time.
+      - Should not exceed the C(rest_pool_maxsize) feature flag, as each volume uses its own connection.
+    type: int
+    default: 5
+    version_added: 22.15.0
+
 notes:
   - supports REST and ZAPI.  REST requires ONTAP 9.6 or later.  Efficiency with REST requires ONTAP 9.7 or later.
   - REST is enabled when C(use_rest) is set to always.
@@ -1007,6 +1029,24 @@ EXAMPLES = """
         prefix: "my_prefix"
     wait_for_completion: true
 
+- name: Create or modify several volumes - REST
+  netapp.ontap.na_ontap_volume:
+    state: present
+    vserver: ansibleVServer
+    aggregate_name: "{{ aggr }}"
+    size: 10
+    size_unit: gb
+    volumes:
+      - name: vol1
+      - name: vol2
+        size: 20
+      - name: vol3
+        state: absent
+    max_concurrent_jobs: 10
+    hostname: "{{ netapp_hostname }}"
+    username: "{{ netapp_username }}"
+    password: "{{ netapp_password }}"
+
 - name: Modify volume - REST
   netapp.ontap.na_ontap_volume:
     state: present
@@ -1019,17 +1059,44 @@ EXAMPLES = """
 """
 
 RETURN = """
+volumes:
+  description: When C(volumes) is set, the name, vserver, actions and modify for each volume.
+  returned: always, when C(volumes) is set
+  type: list
+  elements: dict
 """
 
+import copy
 import time
 import traceback
 from ansible.module_utils.basic import AnsibleModule
+from ansible.module_utils.common.arg_spec import ArgumentSpecValidator
 from ansible.module_utils._text import to_native
 import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
 from ansible_collections.netapp.ontap.plugins.module_utils.netapp_module import NetAppModule
 from ansible_collections.netapp.ontap.plugins.module_utils.rest_application import RestApplication
 from ansible_collections.netapp.ontap.plugins.module_utils import rest_generic
+from ansible_collections.netapp.ontap.plugins.module_utils import rest_response_helpers as rrh
 from ansible_collections.netapp.ontap.plugins.module_utils import rest_vserver
+from ansible_collections.netapp.ontap.plugins.module_utils import netapp_concurrency
+
+
+class VolumeError(Exception):
+    pass
+
+
+class VolumeModule:
+    """ stands for the AnsibleModule when managing one volume in a volumes list
+        fail_json raises an exception, so that errors can be collected from worker threads
+    """
+    def __init__(self, module):
+        self._module = module
+
+    def fail_json(self, **kwargs):
+        raise VolumeError(kwargs.get('msg'))
+
+    def __getattr__(self, name):
+        return getattr(self._module, name)
 
 
 class NetAppOntapVolume:
@@ -1040,7 +1107,7 @@ class NetAppOntapVolume:
         self.argument_spec = netapp_utils.na_ontap_host_argument_spec()
         self.argument_spec.update(dict(
             state=dict(required=False, type='str', choices=['present', 'absent'], default='present'),
-            name=dict(required=True, type='str'),
+            name=dict(required=False, type='str'),
             vserver=dict(required=True, type='str'),
             from_name=dict(required=False, type='str'),
             is_infinite=dict(required=False, type='bool', default=False),
@@ -1148,18 +1215,30 @@ class NetAppOntapVolume:
             snapshot_locking=dict(required=False, type='bool'),
             granular_data=dict(required=False, type='bool'),
         ))
+        # each entry in volumes accepts the volume options, and defaults to the module level values
+        host_options = netapp_utils.na_ontap_host_argument_spec()
+        self.volume_argument_spec = dict(
+            (key, dict((attr, value) for attr, value in spec.items() if attr not in ('required', 'default')))
+            for key, spec in self.argument_spec.items() if key not in host_options)
+        self.argument_spec.update(dict(
+            volumes=dict(required=False, type='list', elements='dict'),
+            max_concurrent_jobs=dict(required=False, type='int', default=5),
+        ))
 
         self.module = AnsibleModule(
             argument_spec=self.argument_spec,
             mutually_exclusive=[
-                ['space_guarantee', 'space_slo'], ['auto_remap_luns', 'force_unmap_luns']
+                ['space_guarantee', 'space_slo'], ['auto_remap_luns', 'force_unmap_luns'], ['name', 'volumes']
             ],
+            required_one_of=[['name', 'volumes']],
             supports_check_mode=True
         )
         self.na_helper = NetAppModule(self)
         self.parameters = self.na_helper.check_and_set_parameters(self.module)
         self.volume_style = None
         self.volume_created = False
+        # create or delete job started by apply_volumes, see start_volume_job_rest
+        self.started_job = None
         self.issues = []
         self.sis_keys2zapi_get = dict(
             efficiency_policy='policy',
@@ -1193,14 +1272,26 @@ class NetAppOntapVolume:
                                             'analytics', 'activity_tracking', 'tags', 'vol_nearly_full_threshold_percent',
                                             'vol_full_threshold_percent', 'large_size_enabled', 'snapshot_locking', 'granular_data']
         self.use_rest = self.rest_api.is_rest_supported_properties(self.parameters, unsupported_rest_properties, partially_supported_rest_properties)
-
+        self.unsupported_rest_properties = unsupported_rest_properties
+        self.partially_supported_rest_properties = partially_supported_rest_properties
+        # current records read in a single query, when volumes is set
+        self.prefetched_records = {}
+        # vservers already known to exist
+        self.checked_vservers = set()
+
+        if self.parameters.get('volumes'):
+            if not self.use_rest:
+                self.module.fail_json(msg='Error: volumes option requires REST.  use_rest: %s.' % self.parameters['use_rest'])
+            if self.parameters['max_concurrent_jobs'] < 1:
+                self.module.fail_json(msg='Error: max_concurrent_jobs must be 1 or more, got: %d.' % self.parameters['max_concurrent_jobs'])
         if not self.use_rest:
             self.setup_zapi()
         if self.use_rest:
             self.rest_errors()
 
         # REST API for application/applications if needed - will report an error when REST is not supported
-        self.rest_app = self.setup_rest_application()
+        # with volumes, each volume sets up its own application
+        self.rest_app = self.setup_rest_application() if self.parameters.get('name') else None
 
     def setup_zapi(self):
         if netapp_utils.has_netapp_lib() is False:
@@ -1357,6 +1448,10 @@ class NetAppOntapVolume:
         if vol_name is None:
             vol_name = self.parameters['name']
         if self.use_rest:
+            if vol_name in self.prefetched_records:
+                # read with all the other volumes in the volumes list, only used once
+                record = self.prefetched_records.pop(vol_name)
+                return self.format_get_volume_rest(record) if record else None
             return self.get_volume_rest(vol_name)
         volume_info = self.volume_get_iter(vol_name)
         if self.na_helper.zapi_get_value(volume_info, ['num-records'], convert_to=int, default=0) > 0:
@@ -1620,8 +1715,12 @@ class NetAppOntapVolume:
         uuid = self.parameters['uuid']
         if uuid is None:
             self.module.fail_json(msg='Could not read UUID for volume %s in delete.' % self.parameters['name'])
-        unmount_error = self.volume_unmount_rest(fail_on_error=False) if current.get('junction_path') else None
-        dummy, error = rest_generic.delete_async(self.rest_api, 'storage/volumes', uuid, job_timeout=self.parameters['time_out'])
+        if self.started_job is not None:
+            # the job was started by apply_volumes, and waited on with the jobs of the other volumes
+            unmount_error, error = self.started_job['unmount_error'], self.started_job['error']
+        else:
+            unmount_error = self.volume_unmount_rest(fail_on_error=False) if current.get('junction_path') else None
+            dummy, error = rest_generic.delete_async(self.rest_api, 'storage/volumes', uuid, job_timeout=self.parameters['time_out'])
         self.na_helper.fail_on_error(error, previous_errors=(['Error unmounting volume: %s' % unmount_error] if unmount_error else None))
         if unmount_error:
             self.module.warn('Volume was successfully deleted though unmount failed with: %s' % unmount_error)
@@ -2538,63 +2637,68 @@ class NetAppOntapVolume:
         api = 'storage/volumes'
         params = {'name': vol_name,
                   'svm.name': self.parameters['vserver'],
-                  'fields': 'encryption.enabled,'
-                            'tiering.policy,'
-                            'nas.export_policy.name,'
-                            'aggregates.name,'
-                            'aggregates.uuid,'
-                            'uuid,'
-                            'nas.path,'
-                            'style,'
-                            'type,'
-                            'comment,'
-                            'qos.policy.name,'
-                            'nas.security_style,'
-                            'nas.gid,'
-                            'nas.unix_permissions,'
-                            'nas.uid,'
-                            'snapshot_policy,'
-                            'space.snapshot.reserve_percent,'
-                            'space.size,'
-                            'guarantee.type,'
-                            'state,'
-                            'efficiency.compression,'
-                            'snaplock,'
-                            'files.maximum,'
-                            'space.logical_space.enforcement,'
-                            'space.logical_space.reporting,'}
-        if self.parameters.get('efficiency_policy'):
-            params['fields'] += 'efficiency.policy.name,'
-        if self.parameters.get('tiering_minimum_cooling_days'):
-            params['fields'] += 'tiering.min_cooling_days,'
-        if self.parameters.get('analytics'):
-            params['fields'] += 'analytics,'
-        if self.parameters.get('activity_tracking'):
-            params['fields'] += 'activity_tracking,'
-        if self.parameters.get('tags'):
-            params['fields'] += '_tags,'
-        if self.parameters.get('atime_update') is not None:
-            params['fields'] += 'access_time_enabled,'
-        if self.parameters.get('snapdir_access') is not None:
-            params['fields'] += 'snapshot_directory_access_enabled,'
-        if self.parameters.get('snapshot_auto_delete') is not None:
-            params['fields'] += 'space.snapshot.autodelete,'
-        if self.parameters.get('vol_nearly_full_threshold_percent') is not None:
-            params['fields'] += 'space.nearly_full_threshold_percent,'
-        if self.parameters.get('vol_full_threshold_percent') is not None:
-            params['fields'] += 'space.full_threshold_percent,'
-        if self.parameters.get('large_size_enabled') is not None:
-            params['fields'] += 'space.large_size_enabled,'
-        if self.parameters.get('snapshot_locking') is not None:
-            params['fields'] += 'snapshot_locking_enabled,'
-        if self.parameters.get('granular_data') is not None:
-            params['fields'] += 'granular_data,'
-
+                  'fields': self.get_volume_fields_rest()}
         record, error = rest_generic.get_one_record(self.rest_api, api, params)
         if error:
             self.module.fail_json(msg=error)
         return self.format_get_volume_rest(record) if record else None
 
+    def get_volume_fields_rest(self, parameters=None):
+        if parameters is None:
+            parameters = self.parameters
+        fields = ('encryption.enabled,'
+                  'tiering.policy,'
+                  'nas.export_policy.name,'
+                  'aggregates.name,'
+                  'aggregates.uuid,'
+                  'uuid,'
+                  'nas.path,'
+                  'style,'
+                  'type,'
+                  'comment,'
+                  'qos.policy.name,'
+                  'nas.security_style,'
+                  'nas.gid,'
+                  'nas.unix_permissions,'
+                  'nas.uid,'
+                  'snapshot_policy,'
+                  'space.snapshot.reserve_percent,'
+                  'space.size,'
+                  'guarantee.type,'
+                  'state,'
+                  'efficiency.compression,'
+                  'snaplock,'
+                  'files.maximum,'
+                  'space.logical_space.enforcement,'
+                  'space.logical_space.reporting,')
+        if parameters.get('efficiency_policy'):
+            fields += 'efficiency.policy.name,'
+        if parameters.get('tiering_minimum_cooling_days'):
+            fields += 'tiering.min_cooling_days,'
+        if parameters.get('analytics'):
+            fields += 'analytics,'
+        if parameters.get('activity_tracking'):
+            fields += 'activity_tracking,'
+        if parameters.get('tags'):
+            fields += '_tags,'
+        if parameters.get('atime_update') is not None:
+            fields += 'access_time_enabled,'
+        if parameters.get('snapdir_access') is not None:
+            fields += 'snapshot_directory_access_enabled,'
+        if parameters.get('snapshot_auto_delete') is not None:
+            fields += 'space.snapshot.autodelete,'
+        if parameters.get('vol_nearly_full_threshold_percent') is not None:
+            fields += 'space.nearly_full_threshold_percent,'
+        if parameters.get('vol_full_threshold_percent') is not None:
+            fields += 'space.full_threshold_percent,'
+        if parameters.get('large_size_enabled') is not None:
+            fields += 'space.large_size_enabled,'
+        if parameters.get('snapshot_locking') is not None:
+            fields += 'snapshot_locking_enabled,'
+        if parameters.get('granular_data') is not None:
+            fields += 'granular_data,'
+        return fields
+
     def rename_volume_rest(self):
         # volume-rename-async and volume-rename are the same in rest
         # Zapi you had to give the old and new name to change a volume.
@@ -2623,8 +2727,12 @@ class NetAppOntapVolume:
                 to_native(error)), exception=traceback.format_exc())
 
     def create_volume_rest(self):
-        body = self.create_volume_body_rest()
-        dummy, error = rest_generic.post_async(self.rest_api, 'storage/volumes', body, job_timeout=self.parameters['time_out'])
+        if self.started_job is not None:
+            # the job was started by apply_volumes, and waited on with the jobs of the other volumes
+            error = self.started_job['error']
+        else:
+            body = self.create_volume_body_rest()
+            dummy, error = rest_generic.post_async(self.rest_api, 'storage/volumes', body, job_timeout=self.parameters['time_out'])
         if error:
             self.module.fail_json(msg='Error creating volume %s: %s' % (self.parameters['name'], to_native(error)),
                                   exception=traceback.format_exc())
@@ -3041,8 +3149,9 @@ class NetAppOntapVolume:
             return ['delete'] if cd_action == 'delete' else [], current, modify
         if cd_action == 'create':
             # report an error if the vserver does not exist (it can be also be a cluster or node vserver with REST)
-            if self.use_rest:
+            if self.use_rest and self.parameters['vserver'] not in self.checked_vservers:
                 rest_vserver.get_vserver_uuid(self.rest_api, self.parameters['vserver'], self.module, True)
+                self.checked_vservers.add(self.parameters['vserver'])
             actions = ['create']
             if self.parameters.get('from_name'):
                 # create by renaming
@@ -3089,9 +3198,183 @@ class NetAppOntapVolume:
                 self.module.warn('Modifying an app is not supported at present: ignoring: %s' % str(modify_app))
         return actions, current, modify
 
+    def build_volume_parameters(self, volume):
+        """ validate a volumes entry, and use module level values as defaults """
+        result = ArgumentSpecValidator(self.volume_argument_spec).validate(volume)
+        if result.error_messages:
+            raise VolumeError('Error in volumes entry %s: %s' % (volume, ', '.join(result.error_messages)))
+        parameters = dict((key, value) for key, value in self.parameters.items() if key not in ('volumes', 'max_concurrent_jobs'))
+        # size was converted to bytes using the module level size_unit
+        parameters.pop('size', None)
+        if self.module.params.get('size') is not None:
+            parameters['size'] = self.module.params['size']
+        for key, value in result.validated_parameters.items():
+            if value is not None:
+                parameters[key] = value
+        if not parameters.get('name'):
+            raise VolumeError('Error: name is required in each volumes entry, got: %s' % volume)
+        if parameters.get('size'):
+            parameters['size'] *= netapp_utils.POW2_BYTE_MAP[parameters['size_unit']]
+        return parameters
+
+    def create_volume_worker(self, parameters, prefetched_records):
+        """ return a copy of self to manage a single volume, errors are raised as VolumeError """
+        worker = copy.copy(self)
+        worker.module = VolumeModule(self.module)
+        worker.parameters = parameters
+        worker.na_helper = NetAppModule(worker)
+        worker.na_helper.parameters = parameters
+        worker.volume_style = None
+        worker.volume_created = False
+        worker.started_job = None
+        worker.issues = []
+        worker.prefetched_records = prefetched_records
+        worker.validate_snapshot_auto_delete()
+        use_rest, error = self.rest_api.is_rest_supported_properties(
+            parameters, self.unsupported_rest_properties, self.partially_supported_rest_properties, report_error=True)
+        if error:
+            raise VolumeError(error)
+        if not use_rest:
+            raise VolumeError('Error: volumes option requires REST, options for this volume require ZAPI.')
+        worker.rest_errors()
+        worker.rest_app = worker.setup_rest_application()
+        return worker
+
+    def get_volumes_rest(self, volumes):
+        """ read all volumes in a single query per vserver, 100 names at a time
+            return a dict indexed by (vserver, name), the record is None if the volume does not exist
+        """
+        names_by_vserver = {}
+        for parameters in volumes:
+            names = names_by_vserver.setdefault(parameters['vserver'], [])
+            names.extend(name for name in (parameters['name'], parameters.get('from_name')) if name and name not in names)
+        fields = set()
+        for parameters in volumes:
+            # fields depends on the options set for each volume
+            fields.update(field for field in self.get_volume_fields_rest(parameters).split(',') if field)
+        records = {}
+        for vserver, names in names_by_vserver.items():
+            for index in range(0, len(names), 100):
+                chunk = names[index:index + 100]
+                for name in chunk:
+                    records[(vserver, name)] = None
+                params = {'name': '|'.join(chunk),
+                          'svm.name': vserver,
+                          'fields': ','.join(sorted(fields))}
+                response, error = self.rest_api.get('storage/volumes', params)
+                pages = [(None, error)] if error else rest_generic.iter_pages(self.rest_api, response)
+                for page, error in pages:
+                    if error:
+                        self.module.fail_json(msg='Error fetching volumes in vserver %s: %s' % (vserver, error))
+                    for record in page.get('records') or []:
+                        records[(vserver, record['name'])] = record
+        return records
+
+    def apply_volumes(self):
+        """ plan all volumes sequentially, then apply the changes concurrently """
+        workers = []
+        try:
+            volumes = []
+            keys = set()
+            for volume in self.parameters['volumes']:
+                parameters = self.build_volume_parameters(volume)
+                key = (parameters['vserver'], parameters['name'])
+                if key in keys:
+                    raise VolumeError('Error: duplicate entry in volumes for vserver: %s, name: %s.' % key)
+                keys.add(key)
+                volumes.append(parameters)
+        except VolumeError as exc:
+            self.module.fail_json(msg=str(exc))
+        records = self.get_volumes_rest(volumes)
+        plans = []
+        for parameters in volumes:
+            prefetched_records = dict((name, records[(parameters['vserver'], name)])
+                                      for name in (parameters['name'], parameters.get('from_name')) if name)
+            try:
+                worker = self.create_volume_worker(parameters, prefetched_records)
+                plans.append(worker.set_actions())
+            except VolumeError as exc:
+                self.module.fail_json(msg='Error with volume %s: %s' % (parameters['name'], exc))
+            workers.append(worker)
+
+        results = self.take_volumes_actions(workers, plans)
+        volume_results = []
+        errors = []
+        for worker, plan, (result, exc) in zip(workers, plans, results):
+            actions, modify, response = result if result is not None else (plan[0], plan[2], None)
+            volume_results.append(dict(name=worker.parameters['name'], vserver=worker.parameters['vserver'],
+                                       changed=worker.na_helper.changed, actions=actions, modify=modify, response=response))
+            if exc is not None:
+                volume_results[-1]['error'] = str(exc)
+                errors.append('volume %s: %s' % (worker.parameters['name'], exc))
+        changed = any(result['changed'] for result in volume_results)
+        if errors:
+            self.module.fail_json(msg='Error managing volumes: %s' % '  '.join(errors), changed=changed, volumes=volume_results)
+        result = netapp_utils.generate_result(changed, extra_responses={'volumes': volume_results}, rest_api=self.rest_api)
+        self.module.exit_json(**result)
+
+    def can_start_volume_job(self, actions, current, modify):
+        ''' a plain create or delete is a single job, the job can be started without waiting '''
+        if not self.na_helper.changed or self.module.check_mode or not self.use_rest:
+            return False
+        if actions == ['create']:
+            return self.rest_app is None
+        return actions == ['delete'] and current.get('uuid') is not None
+
+    def start_volume_job_rest(self, actions, current, modify):
+        ''' start the create or delete job without waiting for it
+            return the API and the (response, error) tuple, take_actions reports the job result when it completes
+        '''
+        if actions == ['create']:
+            self.started_job = dict(api='storage/volumes', unmount_error=None)
+            response = self.rest_api.post('storage/volumes', body=self.create_volume_body_rest())
+        else:
+            self.parameters['uuid'] = current['uuid']
+            unmount_error = self.volume_unmount_rest(fail_on_error=False) if current.get('junction_path') else None
+            self.started_job = dict(api='storage/volumes/%s' % current['uuid'], unmount_error=unmount_error)
+            response = self.rest_api.delete(self.started_job['api'])
+        return self.started_job['api'], response
+
+    def take_volumes_actions(self, workers, plans):
+        ''' create and delete jobs are started for all volumes, then waited on together, other actions are applied directly
+            return a list of (result, exception) tuples, as run_concurrently
+        '''
+        def start_or_take_actions(position):
+            worker = workers[position]
+            if worker.can_start_volume_job(*plans[position]):
+                return worker.start_volume_job_rest(*plans[position])
+            return worker.take_actions(*plans[position])
+
+        max_workers = self.parameters['max_concurrent_jobs']
+        positions = [(position,) for position in range(len(workers))]
+        results = netapp_concurrency.run_concurrently(start_or_take_actions, positions, max_workers)
+        started = [position for position, worker in enumerate(workers) if worker.started_job is not None and results[position][1] is None]
+        if not started:
+            return results
+        job_timeout = max(workers[position].parameters['time_out'] for position in started)
+        job_results = rrh.check_for_errors_and_jobs_results([results[position][0][0] for position in started],
+                                                            [results[position][0][1] for position in started],
+                                                            self.rest_api, timeout=job_timeout, increment=min(max(job_timeout / 6, 5), 60))
+        for position, (dummy, error) in zip(started, job_results):
+            workers[position].started_job['error'] = error
+        # report the job results, and complete the create with any modify
+        finished = netapp_concurrency.run_concurrently(lambda position: workers[position].take_actions(*plans[position]),
+                                                       [(position,) for position in started], max_workers)
+        for position, result in zip(started, finished):
+            results[position] = result
+        return results
+
     def apply(self):
         '''Call create/modify/delete operations'''
+        if self.parameters.get('volumes'):
+            return self.apply_volumes()
         actions, current, modify = self.set_actions()
+        actions, modify, response = self.take_actions(actions, current, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, actions, modify, response, rest_api=self.rest_api)
+        self.module.exit_json(**result)
+
+    def take_actions(self, actions, current, modify):
+        '''Call create/modify/delete operations, return the updated actions and modify, and the create response'''
         is_online = current.get('is_online') if current else None
         response = None
 
@@ -3156,9 +3439,7 @@ class NetAppOntapVolume:
             if 'modify' in actions:
                 self.parameters['uuid'] = current['uuid']
                 self.take_modify_actions(modify)
-
-        result = netapp_utils.generate_result(self.na_helper.changed, actions, modify, response)
-        self.module.exit_json(**result)
+        return actions, modify, response
 
 
 def main():
@@ -339,7 +339,7 @@ class NetAppONTAPVolumeClone:
                     self.modify_volume_clone()
             if modify:
                 self.modify_volume_clone()
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -699,7 +699,7 @@ class NetAppOntapVolumeEfficiency(object):
                 elif ve_status == 'idle':
                     self.stop_volume_efficiency()
 
-        result = netapp_utils.generate_result(self.na_helper.changed, modify=to_modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, modify=to_modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -508,7 +508,7 @@ class NetAppOntapVscanOnAccessPolicy:
             if modify:
                 self.modify_on_access_policy(modify)
         result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify,
-                                              extra_responses={'modify_policy_state': modify_policy_state})
+                                              extra_responses={'modify_policy_state': modify_policy_state}, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -391,7 +391,7 @@ class NetAppOntapVscanOnDemandTask:
                     self.create_demand_task()
                 elif cd_action == 'delete':
                     self.delete_demand_task()
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -384,7 +384,7 @@ class NetAppOntapVscanScannerPool(object):
                 self.modify_scanner_pool(modify)
                 if not self.use_rest and self.parameters.get('scanner_policy') is not None:
                     self.apply_policy()
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, modify, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
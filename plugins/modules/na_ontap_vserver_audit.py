@@ -465,7 +465,7 @@ class NetAppONTAPVserverAudit:
                 if modify:
                     # This method will be called to modify fields other than enabled
                     self.modify_vserver_audit_configuration_rest(modify)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -440,7 +440,7 @@ class NetAppONTAPVserverPeer:
                     self.vserver_peer_accept()
             elif cd_action == 'delete':
                 self.vserver_peer_delete(current)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -184,7 +184,7 @@ class NetAppONTAPVserverPeerPermissions:
                 self.delete_vserver_peer_permission_rest()
             elif modify:
                 self.modify_vserver_peer_permission_rest(modify)
-        result = netapp_utils.generate_result(self.na_helper.changed, cd_action)
+        result = netapp_utils.generate_result(self.na_helper.changed, cd_action, rest_api=self.rest_api)
         self.module.exit_json(**result)
 
 
@@ -0,0 +1,363 @@
+#!/usr/bin/python
+
+# (c) 2025, NetApp, Inc
+# GNU General Public License v3.0+
+# (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+from __future__ import absolute_import, division, print_function
+__metaclass__ = type
+
+DOCUMENTATION = """
+module: na_ontap_vserver_teardown
+short_description: NetApp ONTAP delete the objects owned by a vserver, in dependency order
+extends_documentation_fragment:
+  - netapp.ontap.netapp.na_ontap_rest
+version_added: 22.15.0
+author: NetApp Ansible Team (@carchi8py) <ng-ansibleteam@netapp.com>
+description:
+  - Discover the objects owned by a vserver with a single query per object type.
+  - Build the dependencies between these objects, and delete them level by level, each level in parallel.
+  - A volume is deleted after its FlexClone volumes, the volumes mounted below its junction path, its CIFS shares,
+    the maps for its LUNs, and the SnapMirror relationships where it is a source or a destination.
+  - An igroup is deleted after its LUN maps.
+  - When an object cannot be deleted, the objects depending on it are skipped, other objects are still deleted.
+  - All user data in the volumes is permanently deleted.
+  - The vserver itself, its root volume, and its CIFS server are not deleted, use M(netapp.ontap.na_ontap_svm)
+    and M(netapp.ontap.na_ontap_cifs_server).
+
+options:
+  state:
+    description:
+      - This module only supports deleting objects, hence only absent state is supported.
+    choices: ['absent']
+    type: str
+    default: absent
+
+  vserver:
+    description:
+      - Name of the vserver owning the objects.
+    type: str
+    required: true
+
+  object_types:
+    description:
+      - Types of objects to discover and delete.
+      - snapmirrors are the relationships where the source or destination path is in the vserver.
+        When the vserver is the source, the relationship is released.
+      - interfaces are IP interfaces.
+    type: list
+    elements: str
+    choices: ['snapmirrors', 'lun_maps', 'cifs_shares', 'volumes', 'igroups', 'interfaces']
+    default: ['snapmirrors', 'lun_maps', 'cifs_shares', 'volumes', 'igroups', 'interfaces']
+
+  max_concurrent_jobs:
+    description:
+      - Maximum number of objects being deleted at the same time.
+      - Should not exceed the C(rest_pool_maxsize) feature flag, as each request in flight uses its own connection.
+    type: int
+    default: 10
+
+  time_out:
+    description:
+      - Time to wait for each volume or SnapMirror delete job, in seconds.
+    type: int
+    default: 180
+
+notes:
+  - Only supported with REST.
+  - Supports check_mode, the objects that would be deleted are reported in C(deleted) and C(levels).
+"""
+
+EXAMPLES = """
+- name: Delete all volumes, clones, shares, LUN maps, igroups, and SnapMirror relationships for a vserver
+  netapp.ontap.na_ontap_vserver_teardown:
+    state: absent
+    vserver: ansibleSVM
+    object_types: ['snapmirrors', 'lun_maps', 'cifs_shares', 'volumes', 'igroups']
+    max_concurrent_jobs: 10
+    hostname: "{{ netapp_hostname }}"
+    username: "{{ netapp_username }}"
+    password: "{{ netapp_password }}"
+
+- name: Show what would be deleted
+  netapp.ontap.na_ontap_vserver_teardown:
+    vserver: ansibleSVM
+    hostname: "{{ netapp_hostname }}"
+    username: "{{ netapp_username }}"
+    password: "{{ netapp_password }}"
+  check_mode: true
+  register: teardown_plan
+"""
+
+RETURN = """
+deleted:
+  description:
+    - Names of the objects that were deleted, or would be deleted in check mode, indexed by object type.
+    - LUN maps are reported as igroup:lun_path.  SnapMirror relationships are reported using their destination path.
+  returned: always
+  type: dict
+levels:
+  description:
+    - Objects grouped by level, each level only depends on objects in previous levels, and is deleted in parallel.
+    - Each object is reported as a dict with type and name.
+  returned: always
+  type: list
+  elements: list
+skipped:
+  description: Objects that were not deleted as an object they depend on could not be deleted, with the reason.
+  returned: on error
+  type: list
+  elements: dict
+"""
+
+from ansible.module_utils.basic import AnsibleModule
+import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
+from ansible_collections.netapp.ontap.plugins.module_utils.netapp_module import NetAppModule
+from ansible_collections.netapp.ontap.plugins.module_utils import netapp_concurrency
+from ansible_collections.netapp.ontap.plugins.module_utils import rest_generic
+
+OBJECT_TYPES = ['snapmirrors', 'lun_maps', 'cifs_shares', 'volumes', 'igroups', 'interfaces']
+# administrative shares are created and deleted with the CIFS server
+CIFS_ADMIN_SHARES = ('admin$', 'c$', 'ipc$')
+
+
+class NetAppOntapVserverTeardown:
+    """ discover the objects owned by a vserver, and delete them in dependency order """
+    def __init__(self):
+        self.argument_spec = netapp_utils.na_ontap_rest_only_spec()
+        self.argument_spec.update(dict(
+            state=dict(required=False, type='str', choices=['absent'], default='absent'),
+            vserver=dict(required=True, type='str'),
+            object_types=dict(required=False, type='list', elements='str', choices=OBJECT_TYPES, default=OBJECT_TYPES),
+            max_concurrent_jobs=dict(required=False, type='int', default=10),
+            time_out=dict(required=False, type='int', default=180),
+        ))
+
+        self.module = AnsibleModule(
+            argument_spec=self.argument_spec,
+            supports_check_mode=True
+        )
+        self.na_helper = NetAppModule()
+        self.parameters = self.na_helper.set_parameters(self.module.params)
+        if self.parameters['max_concurrent_jobs'] < 1:
+            self.module.fail_json(msg='Error: max_concurrent_jobs must be at least 1, got: %d' % self.parameters['max_concurrent_jobs'])
+        self.rest_api = netapp_utils.OntapRestAPI(self.module)
+        self.use_rest = self.rest_api.is_rest()
+        if not self.use_rest:
+            self.module.fail_json(msg='Error: na_ontap_vserver_teardown is only supported with REST API')
+
+    def get_records(self, api, query, fields):
+        records, error = rest_generic.get_0_or_more_records(self.rest_api, api, query, fields)
+        return records or [], error
+
+    def get_snapmirrors(self):
+        """ relationships where the vserver is the destination, then relationships where the vserver is the source """
+        vserver = self.parameters['vserver']
+        fields = 'uuid,source.path,destination.path'
+        destinations, error = self.get_records('snapmirror/relationships', {'destination.path': '%s:*' % vserver}, fields)
+        if error:
+            return None, error
+        sources, error = self.get_records('snapmirror/relationships', {'source.path': '%s:*' % vserver, 'list_destinations_only': True}, fields)
+        if error:
+            return None, error
+        uuids = set(record['uuid'] for record in destinations)
+        nodes = [self.build_node('snapmirrors', record['destination']['path'], uuid=record['uuid'], source_only=False,
+                                 paths=[record['source']['path'], record['destination']['path']])
+                 for record in destinations]
+        nodes.extend(self.build_node('snapmirrors', record['destination']['path'], uuid=record['uuid'], source_only=True,
+                                     paths=[record['source']['path'], record['destination']['path']])
+                     for record in sources if record['uuid'] not in uuids)
+        return nodes, None
+
+    def get_lun_maps(self):
+        records, error = self.get_records('protocols/san/lun-maps', {'svm.name': self.parameters['vserver']},
+                                          'lun.name,lun.uuid,igroup.name,igroup.uuid')
+        return [self.build_node('lun_maps', '%s:%s' % (record['igroup']['name'], record['lun']['name']),
+                                lun=record['lun'], igroup=record['igroup'])
+                for record in records], error
+
+    def get_cifs_shares(self):
+        records, error = self.get_records('protocols/cifs/shares', {'svm.name': self.parameters['vserver']}, 'name,path,svm.uuid')
+        return [self.build_node('cifs_shares', record['name'], svm_uuid=record['svm']['uuid'], path=record.get('path'))
+                for record in records if record['name'].lower() not in CIFS_ADMIN_SHARES], error
+
+    def get_volumes(self):
+        records, error = self.get_records('storage/volumes', {'svm.name': self.parameters['vserver'], 'is_svm_root': False},
+                                          'name,uuid,nas.path,clone.is_flexclone,clone.parent_volume.name')
+        nodes = []
+        for record in records:
+            clone = record.get('clone') or {}
+            parent = clone.get('parent_volume', {}).get('name') if clone.get('is_flexclone') else None
+            nodes.append(self.build_node('volumes', record['name'], uuid=record['uuid'],
+                                         junction_path=record.get('nas', {}).get('path'), parent_volume=parent))
+        return nodes, error
+
+    def get_igroups(self):
+        records, error = self.get_records('protocols/san/igroups', {'svm.name': self.parameters['vserver']}, 'name,uuid')
+        return [self.build_node('igroups', record['name'], uuid=record['uuid']) for record in records], error
+
+    def get_interfaces(self):
+        records, error = self.get_records('network/ip/interfaces', {'svm.name': self.parameters['vserver']}, 'name,uuid')
+        return [self.build_node('interfaces', record['name'], uuid=record['uuid']) for record in records], error
+
+    @staticmethod
+    def build_node(object_type, name, **kwargs):
+        return dict(type=object_type, name=name, depends_on=[], **kwargs)
+
+    @staticmethod
+    def get_key(node):
+        return node['type'], node['name']
+
+    def discover_objects(self):
+        """ one query per object type, the queries are sent concurrently
+            return a list of nodes, in OBJECT_TYPES order
+        """
+        object_types = [object_type for object_type in OBJECT_TYPES if object_type in self.parameters['object_types']]
+        results = netapp_concurrency.run_concurrently(lambda object_type: getattr(self, 'get_%s' % object_type)(),
+                                                      [(object_type,) for object_type in object_types],
+                                                      self.parameters['max_concurrent_jobs'])
+        nodes = []
+        for object_type, (result, exc) in zip(object_types, results):
+            records, error = result if exc is None else (None, exc)
+            if error:
+                self.module.fail_json(msg='Error discovering %s in vserver %s: %s' % (object_type, self.parameters['vserver'], error))
+            nodes.extend(records)
+        return nodes
+
+    @staticmethod
+    def find_volume_for_path(path, junctions):
+        """ return the volume whose junction path is the longest prefix of path, junctions is a list of (junction_path, volume) """
+        found, found_junction = None, ''
+        for junction, volume in junctions:
+            if (path == junction or path.startswith(junction.rstrip('/') + '/')) and len(junction) > len(found_junction):
+                found, found_junction = volume, junction
+        return found
+
+    def add_dependencies(self, nodes):
+        """ node['depends_on'] lists the keys of the objects that need to be deleted before node """
+        vserver = self.parameters['vserver']
+        volumes = dict((node['name'], node) for node in nodes if node['type'] == 'volumes')
+        igroups = dict((node['name'], node) for node in nodes if node['type'] == 'igroups')
+        junctions = [(node['junction_path'], node) for node in volumes.values() if node['junction_path'] and node['junction_path'] != '/']
+        for node in nodes:
+            key = self.get_key(node)
+            if node['type'] == 'snapmirrors':
+                for path in node['paths']:
+                    svm, dummy, volume = path.partition(':')
+                    if svm == vserver and volume in volumes:
+                        volumes[volume]['depends_on'].append(key)
+            elif node['type'] == 'lun_maps':
+                # /vol/volume_name/lun_name
+                volume = node['lun']['name'].split('/')[2] if node['lun']['name'].count('/') >= 3 else None
+                if volume in volumes:
+                    volumes[volume]['depends_on'].append(key)
+                if node['igroup']['name'] in igroups:
+                    igroups[node['igroup']['name']]['depends_on'].append(key)
+            elif node['type'] == 'cifs_shares' and node['path']:
+                volume = self.find_volume_for_path(node['path'], junctions)
+                if volume is not None:
+                    volume['depends_on'].append(key)
+            elif node['type'] == 'volumes':
+                if node['parent_volume'] in volumes:
+                    # a FlexClone volume is deleted before its parent
+                    volumes[node['parent_volume']]['depends_on'].append(key)
+                if node['junction_path'] and node['junction_path'] != '/':
+                    # a volume cannot be unmounted while other volumes are mounted below its junction path
+                    parent_path = node['junction_path'].rstrip('/').rpartition('/')[0]
+                    volume = self.find_volume_for_path(parent_path, junctions) if parent_path else None
+                    if volume is not None and volume is not node:
+                        volume['depends_on'].append(key)
+
+    def build_levels(self, nodes):
+        nodes_by_key = dict((self.get_key(node), node) for node in nodes)
+        try:
+            levels = netapp_concurrency.dependency_levels([self.get_key(node) for node in nodes], lambda key: nodes_by_key[key]['depends_on'])
+        except ValueError as exc:
+            self.module.fail_json(msg='Error: cannot order the objects to delete in vserver %s: %s' % (self.parameters['vserver'], exc))
+        return [[nodes_by_key[key] for key in level] for level in levels]
+
+    def delete_snapmirrors(self, node):
+        query = {'source_only': True} if node['source_only'] else None
+        dummy, error = rest_generic.delete_async(self.rest_api, 'snapmirror/relationships', node['uuid'], query, job_timeout=self.parameters['time_out'])
+        return error
+
+    def delete_lun_maps(self, node):
+        dummy, error = rest_generic.delete_async(self.rest_api, 'protocols/san/lun-maps/%s' % node['lun']['uuid'], node['igroup']['uuid'])
+        return error
+
+    def delete_cifs_shares(self, node):
+        dummy, error = rest_generic.delete_async(self.rest_api, 'protocols/cifs/shares/%s' % node['svm_uuid'], node['name'])
+        return error
+
+    def delete_volumes(self, node):
+        unmount_error = None
+        if node['junction_path']:
+            dummy, unmount_error = rest_generic.patch_async(self.rest_api, 'storage/volumes', node['uuid'], {'nas.path': ''})
+        dummy, error = rest_generic.delete_async(self.rest_api, 'storage/volumes', node['uuid'], job_timeout=self.parameters['time_out'])
+        if error and unmount_error:
+            error = '%s - previous error unmounting volume: %s' % (error, unmount_error)
+        return error
+
+    def delete_igroups(self, node):
+        dummy, error = rest_generic.delete_async(self.rest_api, 'protocols/san/igroups', node['uuid'])
+        return error
+
+    def delete_interfaces(self, node):
+        dummy, error = rest_generic.delete_async(self.rest_api, 'network/ip/interfaces', node['uuid'])
+        return error
+
+    def delete_object(self, node):
+        return getattr(self, 'delete_%s' % node['type'])(node)
+
+    def delete_levels(self, levels):
+        """ delete each level in parallel, an object is skipped when an object it depends on was not deleted
+            return a list of errors, and a list of skipped objects
+        """
+        errors, skipped = [], []
+        not_deleted = set()
+        for level in levels:
+            nodes = []
+            for node in level:
+                blocking = [dependency for dependency in node['depends_on'] if dependency in not_deleted]
+                if blocking:
+                    not_deleted.add(self.get_key(node))
+                    skipped.append(dict(type=node['type'], name=node['name'],
+                                        reason='depends on %s' % ', '.join('%s %s' % dependency for dependency in blocking)))
+                else:
+                    nodes.append(node)
+            results = netapp_concurrency.run_concurrently(self.delete_object, [(node,) for node in nodes], self.parameters['max_concurrent_jobs'])
+            for node, (error, exc) in zip(nodes, results):
+                error = error or exc
+                if error:
+                    not_deleted.add(self.get_key(node))
+                    errors.append('%s %s: %s' % (node['type'], node['name'], error))
+        return errors, skipped, not_deleted
+
+    def apply(self):
+        nodes = self.discover_objects()
+        self.add_dependencies(nodes)
+        levels = self.build_levels(nodes)
+        if nodes:
+            self.na_helper.changed = True
+        errors, skipped, not_deleted = [], [], set()
+        if self.na_helper.changed and not self.module.check_mode:
+            errors, skipped, not_deleted = self.delete_levels(levels)
+        deleted = {}
+        for node in nodes:
+            if self.get_key(node) not in not_deleted:
+                deleted.setdefault(node['type'], []).append(node['name'])
+        result = netapp_utils.generate_result(self.na_helper.changed and bool(deleted), rest_api=self.rest_api, extra_responses=dict(
+            deleted=deleted, levels=[[dict(type=node['type'], name=node['name']) for node in level] for level in levels]))
+        if errors:
+            self.module.fail_json(msg='Error deleting objects in vserver %s: %s' % (self.parameters['vserver'], '  '.join(errors)),
+                                  skipped=skipped, **result)
+        self.module.exit_json(**result)
+
+
+def main():
+    teardown = NetAppOntapVserverTeardown()
+    teardown.apply()
+
+
+if __name__ == '__main__':
+    main()
@@ -58,7 +58,20 @@ options:
           - C(sp_upgrade), C(sp_version) require C(node).
           - C(sp_version) requires C(expected_version).
           - C(snapmirror_relationship) requires C(destination_path) and C(expected_state) or C(expected_transfer_state) to match the condition(s).
+          - with C(resources), C(node) and C(destination_path) are set in each resource rather than in C(attributes).
         type: dict
+    resources:
+        description:
+          - a list of resources to wait for, each resource is a dictionary with a single selector.
+          - C(node) for C(sp_upgrade) and C(sp_version), C(destination_path) for C(snapmirror_relationship).
+          - a selector can use a wildcard, for instance C(node=*) for all nodes, or C(destination_path=svm1:*) for all relationships in svm1.
+          - all resources are read with a single query in each polling cycle.
+          - the module exits when the conditions are satisfied for every resource, and reports the time it took for each resource.
+          - expected values, like C(expected_version), are still set in C(attributes).
+          - requires REST.
+        type: list
+        elements: dict
+        version_added: 22.15.0
 '''
 
 EXAMPLES = """
@@ -106,6 +119,23 @@ EXAMPLES = """
       expected_version: 3.9
     polling_interval: 30
     timeout: 1800
+
+- name: Wait for all relationships in svm1 and a relationship in svm2 to be snapmirrored
+  netapp.ontap.na_ontap_wait_for_condition:
+    hostname: "{{ netapp_hostname }}"
+    username: "{{ netapp_username }}"
+    password: "{{ netapp_password }}"
+    https: true
+    validate_certs: false
+    name: snapmirror_relationship
+    conditions: state
+    attributes:
+      expected_state: snapmirrored
+    resources:
+      - destination_path: "svm1:*"
+      - destination_path: "svm2:vol1_dst"
+    polling_interval: 30
+    timeout: 1800
 """
 
 RETURN = """
@@ -119,8 +149,18 @@ last_state:
   description: last observed state for event
   returned: always
   type: str
+resources:
+  description:
+    - status for each resource, indexed by node name or destination path.
+    - C(msg) is the matched condition, or null if the conditions are not met.
+    - C(match_time) is the time in seconds until the conditions were met, or null.
+    - C(states) and C(last_state) report the states observed for the resource.
+  returned: with resources
+  type: dict
+  version_added: 22.15.0
 """
 
+import fnmatch
 import time
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils._text import to_native
@@ -140,21 +180,27 @@ class NetAppONTAPWFC:
             conditions=dict(required=True, type='list', elements='str'),
             polling_interval=dict(required=False, type='int', default=5),
             timeout=dict(required=False, type='int', default=180),
-            attributes=dict(required=False, type='dict')
+            attributes=dict(required=False, type='dict'),
+            resources=dict(required=False, type='list', elements='dict'),
         ))
         self.module = AnsibleModule(
             argument_spec=self.argument_spec,
             required_if=[
-                ('name', 'sp_upgrade', ['attributes']),
+                ('name', 'sp_upgrade', ['attributes', 'resources'], True),
                 ('name', 'sp_version', ['attributes']),
             ],
             supports_check_mode=True
         )
         self.na_helper = NetAppModule()
         self.parameters = self.na_helper.set_parameters(self.module.params)
+        self.parameters.setdefault('attributes', {})
         self.states = []
+        # one extractor per key, built on first use
+        self.key_extractors = {}
         self.rest_api = netapp_utils.OntapRestAPI(self.module)
         self.use_rest = self.rest_api.is_rest()
+        if 'resources' in self.parameters and not self.use_rest:
+            self.module.fail_json(msg='Error: resources requires REST.')
 
         if not self.use_rest:
             if not netapp_utils.has_netapp_lib():
@@ -164,6 +210,7 @@ class NetAppONTAPWFC:
         self.resource_configuration = {
             'snapmirror_relationship': {
                 'required_attributes': ['destination_path'],
+                'selector': ('destination_path', 'destination.path'),
                 'conditions': {
                     'state': ('state' if self.use_rest else 'not_supported', None),
                     'transfer_state': ('transfer.state' if self.use_rest else 'not_supported', None)
@@ -171,12 +218,14 @@ class NetAppONTAPWFC:
             },
             'sp_upgrade': {
                 'required_attributes': ['node'],
+                'selector': ('node', 'name'),
                 'conditions': {
                     'is_in_progress': ('service_processor.state', 'updating') if self.use_rest else ('is-in-progress', 'true')
                 }
             },
             'sp_version': {
                 'required_attributes': ['node', 'expected_version'],
+                'selector': ('node', 'name'),
                 'conditions': {
                     'firmware_version': ('service_processor.firmware_version' if self.use_rest else 'firmware-version',
                                          self.parameters['attributes'].get('expected_version'))
@@ -203,20 +252,60 @@ class NetAppONTAPWFC:
         return ','.join([field for (field, dummy) in self.resource_configuration[name]['conditions'].values()])
 
     def get_key_value(self, record, key):
+        if key not in self.key_extractors:
+            self.key_extractors[key] = self.build_key_extractor(key)
+        return self.key_extractors[key](record)
+
+    def build_key_extractor(self, key):
+        ''' return a function extracting the value for key from a record
+            with REST, the key is split once, as we can have nested dictionaries.
+            with ZAPI, the path to the element is searched for on the first record, and reused for the next records.
+        '''
         if self.use_rest:
-            # with REST, we can have nested dictionaries
-            key = key.split('.')
-            return self.na_helper.safe_get(record, key)
-        return self.get_key_value_zapi(record, key)
-
-    def get_key_value_zapi(self, xml, key):
-        for child in xml.get_children():
-            value = xml.get_child_content(key)
-            if value is not None:
-                return value
-            value = self.get_key_value(child, key)
-            if value is not None:
+            keys = key.split('.')
+
+            def extract_rest(record):
+                value = record
+                for key in keys:
+                    try:
+                        value = value[key]
+                    except (KeyError, TypeError):
+                        return None
                 return value
+            return extract_rest
+
+        cached_path = []
+
+        def extract_zapi(xml):
+            if cached_path:
+                parent = xml
+                for name in cached_path[0]:
+                    parent = parent.get_child_by_name(name)
+                    if parent is None:
+                        break
+                value = None if parent is None else parent.get_child_content(key)
+                if value is not None:
+                    return value
+            path = self.find_path_zapi(xml, key)
+            if path is None:
+                return None
+            cached_path[:] = [path]
+            parent = xml
+            for name in path:
+                parent = parent.get_child_by_name(name)
+            return parent.get_child_content(key)
+        return extract_zapi
+
+    def find_path_zapi(self, xml, key):
+        ''' return the names of the elements leading to the parent of key, or None if key is not found '''
+        if not xml.get_children():
+            return None
+        if xml.get_child_content(key) is not None:
+            return []
+        for child in xml.get_children():
+            path = self.find_path_zapi(child, key)
+            if path is not None:
+                return [child.get_name()] + path
         return None
 
     def build_zapi(self, name):
@@ -233,23 +322,31 @@ class NetAppONTAPWFC:
             self.module.fail_json(msg='Error: event %s is not supported with ZAPI.  It requires REST.' % name)
         raise KeyError(name)
 
-    def build_rest_api_kwargs(self, name):
+    def build_rest_api_kwargs(self, name, selectors=None):
+        ''' with selectors, a single query returns the records for all the resources '''
         if name in ['sp_upgrade', 'sp_version']:
-            return {
-                'api': 'cluster/nodes',
-                'query': {'name': self.parameters['attributes']['node']},
-                'fields': self.get_fields(name)
-            }
-        if name == 'snapmirror_relationship':
-            return {
-                'api': 'snapmirror/relationships',
-                'query': {'destination.path': self.parameters['attributes']['destination_path']},
-                'fields': self.get_fields(name)
-            }
-        raise KeyError(name)
+            api = 'cluster/nodes'
+        elif name == 'snapmirror_relationship':
+            api = 'snapmirror/relationships'
+        else:
+            raise KeyError(name)
+        attribute, field = self.resource_configuration[name]['selector']
+        fields = self.get_fields(name)
+        if selectors is None:
+            value = self.parameters['attributes'][attribute]
+        else:
+            value = '|'.join(selectors)
+            # to identify each resource in the records
+            fields += ',%s' % field
+        return {
+            'api': api,
+            'query': {field: value},
+            'fields': fields
+        }
 
-    def extract_condition(self, name, results):
+    def extract_condition(self, name, results, states=None):
         ''' check if any of the conditions is present
+            observed states are appended to states, or self.states
             return:
                 None, error if key is not found
                 condition, None if a key is found with expected value
@@ -260,7 +357,7 @@ class NetAppONTAPWFC:
             if status is None and name == 'snapmirror_relationship' and results and condition == 'transfer_state':
                 # key is absent when not transferring.  We convert this to 'idle'
                 status = 'idle'
-            self.states.append(str(status))
+            (self.states if states is None else states).append(str(status))
             if status == str(value):
                 return condition, None
             if status is None:
@@ -276,15 +373,19 @@ class NetAppONTAPWFC:
         condition, error = self.extract_condition(name, record)
         if error is not None:
             return condition, error
+        return self.check_condition(condition), None
+
+    def check_condition(self, condition):
+        ''' return a message if the extracted condition satisfies state, or None '''
         if self.parameters['state'] == 'present':
             if condition in self.parameters['conditions']:
-                return 'matched condition: %s' % condition, None
+                return 'matched condition: %s' % condition
         else:
             if condition is None:
-                return 'conditions not matched', None
+                return 'conditions not matched'
             if condition not in self.parameters['conditions']:
-                return 'conditions not matched: found other condition: %s' % condition, None
-        return None, None
+                return 'conditions not matched: found other condition: %s' % condition
+        return None
 
     def get_record_zapi(self, name, zapi_obj):
         ''' calls the ZAPI and extract condition value'''
@@ -302,17 +403,43 @@ class NetAppONTAPWFC:
             return None, "no record for node: %s" % rest_api_kwargs['query']
         return record, None
 
-    def summarize_states(self):
+    def get_records_rest(self, name, rest_api_kwargs, selectors):
+        ''' return records indexed by selector field, and an error if a selector does not match any record '''
+        records, error = rest_generic.get_0_or_more_records(self.rest_api, **rest_api_kwargs)
+        if error:
+            return None, 'Error running command %s: %s' % (self.parameters['name'], error)
+        attribute, field = self.resource_configuration[name]['selector']
+        indexed = {}
+        for record in records or []:
+            key = self.get_key_value(record, field)
+            if key is not None:
+                indexed[key] = record
+        missing = [selector for selector in selectors if not self.selector_matches(selector, indexed)]
+        if missing:
+            return None, 'no record for %s: %s' % (attribute, ', '.join(missing))
+        return indexed, None
+
+    @staticmethod
+    def selector_matches(selector, keys):
+        ''' ONTAP supports * and ? as wildcards '''
+        if '*' not in selector and '?' not in selector:
+            return selector in keys
+        return any(fnmatch.fnmatchcase(key, selector) for key in keys)
+
+    def summarize_states(self, states=None):
         ''' replaces a long list of states with multipliers
             eg 'false*5' or 'false*2,true'
+            states defaults to self.states
             return:
                 state_list as str
                 last_state
         '''
+        if states is None:
+            states = self.states
         previous_state = None
         count = 0
         summaries = []
-        for state in self.states:
+        for state in states:
             if state == previous_state:
                 count += 1
             else:
@@ -322,7 +449,7 @@ class NetAppONTAPWFC:
                 previous_state = state
         if previous_state is not None:
             summaries.append('%s%s' % (previous_state, '' if count == 1 else '*%d' % count))
-        last_state = self.states[-1] if self.states else ''
+        last_state = states[-1] if states else ''
         return ','.join(summaries), last_state
 
     def wait_for_condition(self, name):
@@ -343,12 +470,70 @@ class NetAppONTAPWFC:
             time.sleep(self.parameters['polling_interval'])
             time_left -= self.parameters['polling_interval']
 
+        states, last_state = self.summarize_states()
+        self.module.fail_json(msg=self.timeout_error(name), states=states, last_state=last_state)
+
+    def timeout_error(self, name):
         conditions = ["%s==%s" % (condition, self.resource_configuration[name]['conditions'][condition][1]) for condition in self.parameters['conditions']]
-        error = 'Error: timeout waiting for condition%s: %s.' %\
-                ('s' if len(conditions) > 1 else '',
-                 ', '.join(conditions))
+        return 'Error: timeout waiting for condition%s: %s.' %\
+            ('s' if len(conditions) > 1 else '',
+             ', '.join(conditions))
+
+    def update_resources(self, name, records, resources, elapsed):
+        ''' record the states and check the conditions for each resource, a resource is done once its conditions are met
+            wildcard selectors may report new resources at any time
+            return an error if a key is not found in a record
+        '''
+        for key, record in records.items():
+            resource = resources.setdefault(key, dict(msg=None, match_time=None, states=[]))
+            if resource['msg'] is not None:
+                continue
+            count = len(resource['states'])
+            condition, error = self.extract_condition(name, record, resource['states'])
+            # states for all resources are also reported globally
+            self.states.extend(resource['states'][count:])
+            if error is not None:
+                return error
+            resource['msg'] = self.check_condition(condition)
+            if resource['msg'] is not None:
+                resource['match_time'] = round(elapsed, 1)
+        return None
+
+    def report_resources(self, resources):
+        report = {}
+        for key, resource in resources.items():
+            states, last_state = self.summarize_states(resource['states'])
+            report[key] = dict(msg=resource['msg'], match_time=resource['match_time'], states=states, last_state=last_state)
+        return report
+
+    def wait_for_resources(self, name):
+        ''' read all resources with a single REST query - loop until the conditions are met for every resource '''
+        time_left = self.parameters['timeout']
+        max_consecutive_error_count = 3
+        error_count = 0
+        attribute = self.resource_configuration[name]['selector'][0]
+        selectors = [str(resource[attribute]) for resource in self.parameters['resources']]
+        rest_api_kwargs = self.build_rest_api_kwargs(name, selectors)
+        resources = {}
+        start = time.time()
+
+        while time_left > 0:
+            records, error = self.get_records_rest(name, rest_api_kwargs, selectors)
+            if error is None:
+                error = self.update_resources(name, records, resources, time.time() - start)
+            if error is not None:
+                error_count += 1
+                if error_count >= max_consecutive_error_count:
+                    self.module.fail_json(msg='Error: %s - count: %d' % (error, error_count), resources=self.report_resources(resources))
+            elif all(resource['msg'] is not None for resource in resources.values()):
+                return 'conditions met for %d resource%s' % (len(resources), 's' if len(resources) > 1 else ''), resources
+            time.sleep(self.parameters['polling_interval'])
+            time_left -= self.parameters['polling_interval']
+
+        pending = sorted(key for key, resource in resources.items() if resource['msg'] is None)
+        error = '%s  Pending resources: %s.' % (self.timeout_error(name), ', '.join(pending))
         states, last_state = self.summarize_states()
-        self.module.fail_json(msg=error, states=states, last_state=last_state)
+        self.module.fail_json(msg=error, states=states, last_state=last_state, resources=self.report_resources(resources))
 
     def validate_resource(self, name):
         if name not in self.resource_configuration:
@@ -356,15 +541,30 @@ class NetAppONTAPWFC:
 
     def validate_attributes(self, name):
         required = self.resource_configuration[name].get('required_attributes', list())
+        if 'resources' in self.parameters:
+            # the selector is set in each resource
+            selector = self.resource_configuration[name]['selector'][0]
+            required = [attribute for attribute in required if attribute != selector]
         msgs = [
             'attributes: %s is required for resource name: %s' % (attribute, name)
             for attribute in required
             if attribute not in self.parameters['attributes']
         ]
+        if 'resources' in self.parameters:
+            msgs.extend(self.validate_resources(name, selector))
 
         if msgs:
             self.module.fail_json(msg='Error: %s' % ', '.join(msgs))
 
+    def validate_resources(self, name, selector):
+        msgs = []
+        if selector in self.parameters['attributes']:
+            msgs.append('attributes: %s cannot be used with resources' % selector)
+        for resource in self.parameters['resources']:
+            if list(resource) != [selector]:
+                msgs.append('resources: expecting a single key: %s for resource name: %s, got: %s' % (selector, name, resource))
+        return msgs
+
     def validate_conditions(self, name):
         conditions = self.resource_configuration[name].get('conditions')
         msgs = [
@@ -385,6 +585,10 @@ class NetAppONTAPWFC:
         self.validate_resource(name)
         self.validate_attributes(name)
         self.validate_conditions(name)
+        if 'resources' in self.parameters:
+            output, resources = self.wait_for_resources(name)
+            states, last_state = self.summarize_states()
+            self.module.exit_json(changed=changed, msg=output, states=states, last_state=last_state, resources=self.report_resources(resources))
         output = self.wait_for_condition(name)
         states, last_state = self.summarize_states()
         self.module.exit_json(changed=changed, msg=output, states=states, last_state=last_state)
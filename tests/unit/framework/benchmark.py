@@ -0,0 +1,555 @@
+# (c) 2025, NetApp, Inc
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+""" unit tests for Ansible modules for ONTAP:
+    benchmark harness, to measure how modules scale with the number of objects in a cluster
+
+    A SyntheticCluster replaces REST send_request and ZAPI invoke_elem.  It serves records from generated
+    collections, honoring simple queries, max_records/max-records and pagination, with an optional latency per request.
+
+    For each run, the harness reports:
+        wall_seconds        elapsed time, including the injected latency
+        cpu_seconds         CPU time used by the process, including the harness
+        harness_seconds     time spent by the harness to build responses, and to inject latency
+        module_seconds      wall_seconds - harness_seconds, an approximation of the time spent in the module
+        requests            number of REST and ZAPI requests
+        peak_rss_kb         peak RSS for the process, as reported by getrusage (never decreases)
+        peak_traced_kb      peak memory allocated while the module runs, as reported by tracemalloc
+
+    From the collection root, use as:
+        python -m ansible_collections.netapp.ontap.tests.unit.framework.benchmark --sizes 100,1000,10000 --latency 0.005
+
+    With --debug-logs, a large REST gather is sent through OntapRestAPI._send_request, to compare memory usage with the
+    unbounded debug_logs list used before 22.15.0, and with the bounded buffer.  Each variant runs in its own process,
+    so that peak_rss_kb can be compared:
+        python -m ansible_collections.netapp.ontap.tests.unit.framework.benchmark --debug-logs --sizes 10000,100000
+
+    The scenarios are also run with small sizes as unit tests, see test_benchmark.py.
+    Set NETAPP_ONTAP_BENCHMARK_SIZES (eg 100,10000,100000) to run them with larger sizes under pytest.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import argparse
+import copy
+import fnmatch
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+try:
+    import tracemalloc
+    HAS_TRACEMALLOC = True
+except ImportError:
+    # python 2.7
+    HAS_TRACEMALLOC = False
+
+try:
+    import resource
+    HAS_RESOURCE = True
+except ImportError:
+    # not available on Windows
+    HAS_RESOURCE = False
+
+from ansible.module_utils.six.moves.urllib.parse import parse_qsl, urlencode
+from ansible.module_utils.six.moves import xrange
+from xml.sax.saxutils import escape
+
+from ansible_collections.netapp.ontap.tests.unit.compat.mock import patch
+from ansible_collections.netapp.ontap.tests.unit.framework.ansible_mocks import \
+    set_module_args, AnsibleExitJson, AnsibleFailJson, exit_json, fail_json
+import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
+
+# time.sleep is patched by the mock framework, keep a reference to the real function to inject latency.
+_SLEEP = time.sleep
+
+REST_QUERY_KEYWORDS = ('fields', 'max_records', 'return_records', 'return_timeout', 'order_by', 'ignore_unknown_fields')
+ZAPI_PAGE_SIZE = 20         # ONTAP default for max-records
+ZAPI_NAMESPACE = 'http://www.netapp.com/filer/admin'
+BENCHMARK_MODULE = 'ansible_collections.netapp.ontap.tests.unit.framework.benchmark'
+
+
+def get_value(record, dotted_key):
+    for key in dotted_key.split('.'):
+        if not isinstance(record, dict):
+            return None
+        record = record.get(key)
+    return record
+
+
+def matches(record, key, pattern):
+    """ REST query semantics: | for OR, * as a wildcard, ! for NOT """
+    value = get_value(record, key)
+    value = str(value).lower() if isinstance(value, bool) else str(value)
+    for alternative in str(pattern).split('|'):
+        if alternative.startswith('!'):
+            if not fnmatch.fnmatchcase(value, alternative[1:]):
+                return True
+        elif fnmatch.fnmatchcase(value, alternative):
+            return True
+    return False
+
+
+class Collection:
+    """ a list of records, with an index on a key for fast lookups """
+    def __init__(self, records, key='name'):
+        self.records = records
+        self.key = key
+        self.index = dict((get_value(record, key), position) for position, record in enumerate(records))
+        # the same query is repeated for each page, (query, records) is replaced atomically as pages may be prefetched
+        self.last_selection = (None, None)
+
+    def select(self, query):
+        """ return the records matching all the conditions in query """
+        if not query:
+            return self.records
+        query_key = sorted(query.items())
+        last_query, records = self.last_selection
+        if query_key != last_query:
+            records = self.filter(query)
+            self.last_selection = (query_key, records)
+        return records
+
+    def filter(self, query):
+        records = None
+        key_pattern = query.get(self.key)
+        if key_pattern is not None and not any(char in str(key_pattern) for char in '*!'):
+            positions = sorted(self.index[name] for name in str(key_pattern).split('|') if name in self.index)
+            records = [self.records[position] for position in positions]
+        if records is None:
+            records = self.records
+        for key, pattern in query.items():
+            records = [record for record in records if matches(record, key, pattern)]
+        return records
+
+
+class SyntheticCluster:
+    """ serves REST and ZAPI requests from generated collections
+
+        rest_collections: dict api -> Collection
+        zapi_collections: dict zapi -> (attribute_name, Collection), for get-iter calls
+        zapi_responses: dict zapi -> xml string for the contents of <results>, for other calls
+        latency: seconds added to each request
+    """
+    def __init__(self, rest_collections=None, zapi_collections=None, zapi_responses=None, latency=0.0, version=(9, 14, 1)):
+        self.rest_collections = rest_collections or {}
+        self.zapi_collections = zapi_collections or {}
+        self.zapi_responses = zapi_responses or {}
+        self.latency = latency
+        self.version = version
+        self.lock = threading.Lock()
+        self.requests = []
+        self.harness_seconds = 0.0
+
+    def reset(self):
+        self.requests = []
+        self.harness_seconds = 0.0
+
+    def record(self, method, api, start):
+        if self.latency:
+            _SLEEP(self.latency)
+        with self.lock:
+            self.requests.append((method, api))
+            self.harness_seconds += time.time() - start
+
+    def send_request(self, method, api, params, json=None, headers=None, files=None):
+        start = time.time()
+        try:
+            return self.rest_response(method, api, params, json)
+        finally:
+            self.record(method, api.split('?')[0].lstrip('/'), start)
+
+    def rest_response(self, method, api, params, json):
+        if '?' in api:
+            # next link from a previous page
+            api, query_string = api.split('?', 1)
+            api = api.lstrip('/')
+            params = dict(parse_qsl(query_string), **(params or {}))
+        params = dict(params or {})
+        if api == 'cluster':
+            generation, major, minor = self.version
+            return 200, dict(version=dict(generation=generation, major=major, minor=minor, full='NetApp Release %d.%d.%d' % self.version)), None
+        if method != 'GET':
+            # accept all changes, synchronously
+            return 200, {}, None
+        if api not in self.rest_collections:
+            return 200, {'records': [], 'num_records': 0}, None
+        query = dict((key, value) for key, value in params.items() if key not in REST_QUERY_KEYWORDS and key != 'offset')
+        records = self.rest_collections[api].select(query)
+        offset = int(params.get('offset', 0))
+        max_records = int(params['max_records']) if 'max_records' in params else None
+        end = len(records) if max_records is None else min(offset + max_records, len(records))
+        # modules may update records in place, a real cluster returns new objects for each request
+        page = copy.deepcopy(records[offset:end])
+        response = {'records': page, 'num_records': len(page), '_links': {'self': {'href': '/api/%s' % api}}}
+        if end < len(records):
+            next_params = dict(params, offset=end)
+            response['_links']['next'] = {'href': '/api/%s?%s' % (api, urlencode(sorted(next_params.items())))}
+        return 200, response, None
+
+    def request(self, method, url, params=None, json=None, **kwargs):
+        """ replaces requests.Session.request, so that responses go through OntapRestAPI._send_request """
+        api = url.split('/api/', 1)[1]
+        status_code, response, error = self.send_request(method, api, params, json)
+        return RequestsResponse(status_code, response)
+
+    def invoke_elem(self, na_element, enable_tunneling=False):
+        start = time.time()
+        zapi = na_element.get_name()
+        try:
+            return self.zapi_response(zapi, na_element)
+        finally:
+            self.record('ZAPI', zapi, start)
+
+    def zapi_response(self, zapi, na_element):
+        if zapi in self.zapi_collections:
+            contents = self.zapi_get_iter(na_element, *self.zapi_collections[zapi])
+        else:
+            contents = self.zapi_responses.get(zapi, '')
+        xml = '<results xmlns="%s" status="passed">%s</results>' % (ZAPI_NAMESPACE, contents)
+        return netapp_utils.zapi.NaElement(netapp_utils.zapi.etree.XML(xml.encode()))
+
+    def zapi_get_iter(self, na_element, attribute_name, collection):
+        query = {}
+        query_element = na_element.get_child_by_name('query')
+        if query_element is not None:
+            for attributes in query_element.get_children():
+                for child in attributes.get_children():
+                    if child.get_content() is not None:
+                        query[child.get_name()] = child.get_content()
+        records = collection.select(query)
+        offset = int(na_element.get_child_content('tag') or 0)
+        max_records = int(na_element.get_child_content('max-records') or ZAPI_PAGE_SIZE)
+        end = min(offset + max_records, len(records))
+        contents = '<attributes-list>%s</attributes-list><num-records>%d</num-records>' % (
+            ''.join(zapi_record(attribute_name, record) for record in records[offset:end]), end - offset)
+        if end < len(records):
+            contents += '<next-tag>%d</next-tag>' % end
+        return contents
+
+
+class RequestsResponse:
+    """ the subset of requests.Response used by OntapRestAPI, the body is serialized as ONTAP would """
+    def __init__(self, status_code, response):
+        self.status_code = status_code
+        self.content = json.dumps(response).encode()
+        self.headers = {'Content-Type': 'application/json'}
+
+    def json(self):
+        return json.loads(self.content.decode())
+
+    def raise_for_status(self):
+        pass
+
+
+def zapi_record(name, record):
+    return '<%s>%s</%s>' % (name, ''.join(
+        zapi_record(key, value) if isinstance(value, dict) else '<%s>%s</%s>' % (key, escape(str(value)), key)
+        for key, value in record.items()), name)
+
+
+# synthetic objects
+
+def rest_volumes(count, vserver='svm1'):
+    return Collection([{
+        'uuid': 'vol_uuid_%d' % index,
+        'name': 'vol_%d' % index,
+        'svm': {'name': vserver},
+        'state': 'online',
+        'style': 'flexvol',
+        'type': 'rw',
+        'comment': '',
+        'aggregates': [{'name': 'aggr1', 'uuid': 'aggr1_uuid'}],
+        'encryption': {'enabled': False},
+        'efficiency': {'compression': 'none'},
+        'files': {'maximum': 10000},
+        'nas': {'path': '/vol_%d' % index, 'export_policy': {'name': 'default'}, 'security_style': 'unix',
+                'gid': 0, 'uid': 0, 'unix_permissions': 755},
+        'snapshot_policy': {'name': 'default'},
+        'space': {'size': 1073741824, 'snapshot': {'reserve_percent': 5},
+                  'logical_space': {'enforcement': False, 'reporting': False}},
+        'guarantee': {'type': 'none'},
+        'snaplock': {'type': 'non_snaplock'},
+        'tiering': {'policy': 'none'},
+        'qos': {},
+    } for index in xrange(count)])
+
+
+def rest_luns(count, vserver='svm1'):
+    return Collection([{
+        'uuid': 'lun_uuid_%d' % index,
+        'name': '/vol/vol_%d/lun' % index,
+        'svm': {'name': vserver},
+        'location': {'volume': {'name': 'vol_%d' % index}},
+        'serial_number': 'z6CcD+SK5mPb',
+        'os_type': 'linux',
+        'space': {'size': 1073741824},
+    } for index in xrange(count)])
+
+
+def rest_snapmirror_relationships(count):
+    return Collection([{
+        'uuid': 'sm_uuid_%d' % index,
+        'source': {'path': 'svm1:vol_%d' % index, 'svm': {'name': 'svm1'}},
+        'destination': {'path': 'svm2:vol_%d_dst' % index, 'svm': {'name': 'svm2'}},
+        'state': 'snapmirrored',
+        'healthy': True,
+        'policy': {'name': 'MirrorAllSnapshots', 'type': 'async'},
+        'transfer': {'state': 'success'},
+    } for index in xrange(count)], key='destination.path')
+
+
+def zapi_luns(count, vserver='svm1', volume='vol1'):
+    return Collection([{
+        'path': '/vol/%s/lun_%d' % (volume, index),
+        'vserver': vserver,
+        'volume': volume,
+        'serial-number': 'z6CcD+SK5mPb',
+        'size': 1073741824,
+        'online': 'true',
+        'multiprotocol-type': 'linux',
+        'is-space-reservation-enabled': 'true',
+        'is-space-alloc-enabled': 'false',
+    } for index in xrange(count)], key='path')
+
+
+ZAPI_VERSION = '<version>NetApp Release 9.14.1: Mon Jan 01 00:00:00 UTC 2024</version><version-tuple><system-version-tuple>'\
+               '<generation>9</generation><major>14</major><minor>1</minor></system-version-tuple></version-tuple>'
+ZAPI_ONTAPI_VERSION = '<major-version>1</major-version><minor-version>140</minor-version>'
+
+
+# scenarios: each function returns a cluster, the module main function, and the module arguments
+
+CONNECTION_ARGS = {
+    'hostname': 'cluster',
+    'username': 'admin',
+    'password': 'password',
+}
+
+
+def rest_info_volumes(count, latency):
+    """ na_ontap_rest_info - paginated GET on storage/volumes """
+    from ansible_collections.netapp.ontap.plugins.modules import na_ontap_rest_info
+    cluster = SyntheticCluster(rest_collections={'storage/volumes': rest_volumes(count)}, latency=latency)
+    args = dict(CONNECTION_ARGS, gather_subset=['storage/volumes'], fields=['name', 'uuid', 'space.size'], max_records=1000)
+    return cluster, na_ontap_rest_info.main, args
+
+
+def rest_info_luns(count, latency):
+    """ na_ontap_rest_info - paginated GET on storage/luns, with naa_id computed for each LUN """
+    from ansible_collections.netapp.ontap.plugins.modules import na_ontap_rest_info
+    cluster = SyntheticCluster(rest_collections={'storage/luns': rest_luns(count)}, latency=latency)
+    args = dict(CONNECTION_ARGS, gather_subset=['storage/luns'], fields=['name', 'serial_number'], max_records=1000)
+    return cluster, na_ontap_rest_info.main, args
+
+
+def zapi_info_luns(count, latency):
+    """ na_ontap_info - ZAPI lun-get-iter pages """
+    from ansible_collections.netapp.ontap.plugins.modules import na_ontap_info
+    cluster = SyntheticCluster(zapi_collections={'lun-get-iter': ('lun-info', zapi_luns(count))},
+                               zapi_responses={'system-get-version': ZAPI_VERSION, 'system-get-ontapi-version': ZAPI_ONTAPI_VERSION},
+                               latency=latency)
+    args = dict(CONNECTION_ARGS, gather_subset=['lun_info'], use_rest='never', max_records=1024)
+    return cluster, na_ontap_info.main, args
+
+
+def volume_bulk_idempotent(count, latency):
+    """ na_ontap_volume - volumes list, all volumes already exist """
+    from ansible_collections.netapp.ontap.plugins.modules import na_ontap_volume
+    cluster = SyntheticCluster(rest_collections={'storage/volumes': rest_volumes(count)}, latency=latency)
+    args = dict(CONNECTION_ARGS, vserver='svm1', size=1, size_unit='gb', use_rest='always',
+                volumes=[{'name': 'vol_%d' % index} for index in xrange(count)])
+    return cluster, na_ontap_volume.main, args
+
+
+def snapmirror_idempotent(count, latency):
+    """ na_ontap_snapmirror - find one relationship among count relationships """
+    from ansible_collections.netapp.ontap.plugins.modules import na_ontap_snapmirror
+    cluster = SyntheticCluster(rest_collections={'snapmirror/relationships': rest_snapmirror_relationships(count)}, latency=latency)
+    args = dict(CONNECTION_ARGS, source_endpoint={'path': 'svm1:vol_%d' % (count - 1)},
+                destination_endpoint={'path': 'svm2:vol_%d_dst' % (count - 1)}, use_rest='always')
+    return cluster, na_ontap_snapmirror.main, args
+
+
+def lun_zapi_idempotent(count, latency):
+    """ na_ontap_lun - ZAPI lun-get-iter for all LUNs in a volume, to find one LUN """
+    from ansible_collections.netapp.ontap.plugins.modules import na_ontap_lun
+    cluster = SyntheticCluster(zapi_collections={'lun-get-iter': ('lun-info', zapi_luns(count))},
+                               zapi_responses={'system-get-version': ZAPI_VERSION, 'system-get-ontapi-version': ZAPI_ONTAPI_VERSION},
+                               latency=latency)
+    args = dict(CONNECTION_ARGS, vserver='svm1', flexvol_name='vol1', name='lun_%d' % (count - 1), size=1, size_unit='gb',
+                os_type='linux', use_rest='never')
+    return cluster, na_ontap_lun.main, args
+
+
+SCENARIOS = {
+    'na_ontap_rest_info_volumes': rest_info_volumes,
+    'na_ontap_rest_info_luns': rest_info_luns,
+    'na_ontap_info_luns': zapi_info_luns,
+    'na_ontap_volume_bulk': volume_bulk_idempotent,
+    'na_ontap_snapmirror': snapmirror_idempotent,
+    'na_ontap_lun_zapi': lun_zapi_idempotent,
+}
+
+
+def call_main(cluster, main, args, send_through_requests=False):
+    """ run the module, return the result as a dict - failed is set on error
+        with send_through_requests, REST responses are serialized and sent through OntapRestAPI._send_request
+    """
+    set_module_args(args)
+    if send_through_requests:
+        rest_patch = patch('requests.Session.request', side_effect=cluster.request)
+    else:
+        rest_patch = patch('ansible_collections.netapp.ontap.plugins.module_utils.netapp.OntapRestAPI.send_request',
+                           side_effect=cluster.send_request)
+    with patch.multiple('ansible.module_utils.basic.AnsibleModule', exit_json=exit_json, fail_json=fail_json, warn=lambda *args: None):
+        with rest_patch:
+            with patch('ansible_collections.netapp.ontap.plugins.module_utils.netapp.OntapZAPICx.invoke_elem',
+                       side_effect=cluster.invoke_elem):
+                try:
+                    main()
+                except AnsibleExitJson as exc:
+                    return exc.args[0]
+                except AnsibleFailJson as exc:
+                    return exc.args[0]
+    raise AssertionError('expecting exit_json or fail_json to be called')
+
+
+def run_benchmark(scenario, count, latency=0.0, trace_memory=True):
+    """ run a scenario with count objects, return a dict of measurements
+        with trace_memory, the module is run a second time with tracemalloc, so that timings are not affected
+    """
+    cluster, main, args = SCENARIOS[scenario](count, latency)
+    start_cpu = time.process_time()
+    start = time.time()
+    result = call_main(cluster, main, args)
+    wall_seconds = time.time() - start
+    measurements = dict(
+        scenario=scenario,
+        count=count,
+        latency=latency,
+        failed=bool(result.get('failed')),
+        msg=result.get('msg'),
+        wall_seconds=round(wall_seconds, 4),
+        cpu_seconds=round(time.process_time() - start_cpu, 4),
+        harness_seconds=round(cluster.harness_seconds, 4),
+        module_seconds=round(wall_seconds - cluster.harness_seconds, 4),
+        requests=len(cluster.requests),
+        peak_rss_kb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if HAS_RESOURCE else None,
+        peak_traced_kb=None,
+    )
+    if trace_memory and HAS_TRACEMALLOC:
+        cluster.reset()
+        tracemalloc.start()
+        try:
+            call_main(cluster, main, args)
+            dummy, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        measurements['peak_traced_kb'] = peak // 1024
+    return measurements, cluster, result
+
+
+REPORT_COLUMNS = ('scenario', 'count', 'latency', 'wall_seconds', 'module_seconds', 'cpu_seconds', 'requests', 'peak_rss_kb', 'peak_traced_kb')
+
+
+def format_report(rows):
+    def format_row(values):
+        return '%-28s' % values[0] + '  '.join('%14s' % value for value in values[1:])
+
+    lines = [format_row(REPORT_COLUMNS)]
+    for row in rows:
+        lines.append(format_row([row[column] if not row['failed'] or column in ('scenario', 'count') else 'FAILED'
+                                 for column in REPORT_COLUMNS]))
+        if row['failed']:
+            lines.append('    %s' % row['msg'])
+    return '\n'.join(lines)
+
+
+def legacy_log_debug(self, status_code, content):
+    """ debug_logs before 22.15.0: every request is formatted, and every response content is kept """
+    netapp_utils.LOG.debug("%s: %s", status_code, content)
+    self.debug_logs.append((status_code, str(content) if isinstance(content, netapp_utils.LazyRepr) else content))
+
+
+def run_debug_log_benchmark(count, legacy, trace_memory=True):
+    """ na_ontap_rest_info on count volumes, with every page sent through OntapRestAPI._send_request
+        with legacy, debug_logs is unbounded, requests are formatted eagerly, and response contents are kept in full
+    """
+    cluster, main, args = rest_info_volumes(count, 0.0)
+    scenario = 'debug_logs_legacy' if legacy else 'debug_logs_bounded'
+    if legacy:
+        args = dict(args, feature_flags={'debug_log_size': None})
+    log_debug = legacy_log_debug if legacy else netapp_utils.OntapRestAPI.log_debug
+    with patch.object(netapp_utils.OntapRestAPI, 'log_debug', log_debug):
+        if trace_memory and HAS_TRACEMALLOC:
+            tracemalloc.start()
+        try:
+            start_cpu = time.process_time()
+            start = time.time()
+            result = call_main(cluster, main, args, send_through_requests=True)
+            wall_seconds = time.time() - start
+            cpu_seconds = time.process_time() - start_cpu
+            peak = tracemalloc.get_traced_memory()[1] // 1024 if trace_memory and HAS_TRACEMALLOC else None
+        finally:
+            if trace_memory and HAS_TRACEMALLOC:
+                tracemalloc.stop()
+    measurements = dict(
+        scenario=scenario,
+        count=count,
+        latency=0.0,
+        failed=bool(result.get('failed')),
+        msg=result.get('msg'),
+        wall_seconds=round(wall_seconds, 4),
+        cpu_seconds=round(cpu_seconds, 4),
+        harness_seconds=round(cluster.harness_seconds, 4),
+        module_seconds=round(wall_seconds - cluster.harness_seconds, 4),
+        requests=len(cluster.requests),
+        peak_rss_kb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if HAS_RESOURCE else None,
+        peak_traced_kb=peak,
+    )
+    return measurements, cluster, result
+
+
+def run_debug_log_benchmark_in_subprocess(count, legacy, trace_memory):
+    """ peak RSS never decreases, each variant is measured in a new process """
+    command = [sys.executable, '-m', BENCHMARK_MODULE, '--sizes', str(count),
+               '--debug-log-variant', 'legacy' if legacy else 'bounded']
+    if not trace_memory:
+        command.append('--no-memory')
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    return json.loads(subprocess.check_output(command, env=env).decode().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure how ONTAP modules scale with the number of objects.')
+    parser.add_argument('--sizes', default='100,1000,10000', help='comma separated list of object counts')
+    parser.add_argument('--latency', type=float, default=0.0, help='latency in seconds added to each request')
+    parser.add_argument('--scenarios', default=','.join(sorted(SCENARIOS)), help='comma separated list of scenarios')
+    parser.add_argument('--no-memory', action='store_true', help='skip the second run with tracemalloc')
+    parser.add_argument('--debug-logs', action='store_true', help='compare memory usage for legacy and bounded debug_logs')
+    parser.add_argument('--debug-log-variant', choices=['legacy', 'bounded'], help=argparse.SUPPRESS)
+    options = parser.parse_args()
+    if options.debug_log_variant:
+        measurements = run_debug_log_benchmark(int(options.sizes), options.debug_log_variant == 'legacy', not options.no_memory)[0]
+        print(json.dumps(measurements))
+        return
+    rows = []
+    if options.debug_logs:
+        for count in options.sizes.split(','):
+            for legacy in (True, False):
+                rows.append(run_debug_log_benchmark_in_subprocess(int(count), legacy, not options.no_memory))
+        print(format_report(rows))
+        return
+    for scenario in options.scenarios.split(','):
+        for count in options.sizes.split(','):
+            rows.append(run_benchmark(scenario, int(count), options.latency, not options.no_memory)[0])
+    print(format_report(rows))
+
+
+if __name__ == '__main__':
+    main()
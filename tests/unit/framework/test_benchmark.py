@@ -0,0 +1,124 @@
+# (c) 2025, NetApp, Inc
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+""" unit tests for the benchmark harness
+
+    Each scenario is run with 100 objects by default, and the number of requests is checked,
+    so that regressions in pagination or polling are reported.
+    Set NETAPP_ONTAP_BENCHMARK_SIZES to run with more objects, and use -s to see the report.
+"""
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import os
+import pytest
+
+import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
+from ansible_collections.netapp.ontap.tests.unit.framework import benchmark
+
+if not netapp_utils.has_netapp_lib():
+    pytestmark = pytest.mark.skip('skipping as missing required netapp_lib')
+
+SIZES = [int(size) for size in os.environ.get('NETAPP_ONTAP_BENCHMARK_SIZES', '100').split(',')]
+
+
+def ceil(count, page_size):
+    return (count + page_size - 1) // page_size
+
+
+EXPECTED_REQUESTS = {
+    # GET cluster, then pages of 1000 records
+    'na_ontap_rest_info_volumes': lambda count: 1 + ceil(count, 1000),
+    'na_ontap_rest_info_luns': lambda count: 1 + ceil(count, 1000),
+    # system-get-ontapi-version, then pages of 1024 records
+    'na_ontap_info_luns': lambda count: 1 + ceil(count, 1024),
+    # GET cluster, then one query for 100 volumes
+    'na_ontap_volume_bulk': lambda count: 1 + ceil(count, 100),
+    # does not depend on the number of relationships
+    'na_ontap_snapmirror': lambda count: 6,
+    # pages of 20 records
+    'na_ontap_lun_zapi': lambda count: ceil(count, 20),
+}
+
+
+@pytest.mark.parametrize('scenario', sorted(benchmark.SCENARIOS))
+def test_scenarios(scenario):
+    rows = []
+    for count in SIZES:
+        measurements, cluster, result = benchmark.run_benchmark(scenario, count, trace_memory=count <= 1000)
+        print(result if measurements['failed'] else '')
+        assert not measurements['failed']
+        assert measurements['requests'] == EXPECTED_REQUESTS[scenario](count), cluster.requests
+        rows.append(measurements)
+    print(benchmark.format_report(rows))
+
+
+def test_rest_pagination_and_query():
+    cluster = benchmark.SyntheticCluster(rest_collections={'storage/volumes': benchmark.rest_volumes(25)})
+    status, response, error = cluster.send_request('GET', 'storage/volumes', {'max_records': 10, 'state': 'online'})
+    assert (status, error) == (200, None)
+    assert [record['name'] for record in response['records']] == ['vol_%d' % index for index in range(10)]
+    api = response['_links']['next']['href'].replace('/api', '')
+    status, response, error = cluster.send_request('GET', api, {})
+    assert [record['name'] for record in response['records']] == ['vol_%d' % index for index in range(10, 20)]
+    status, response, error = cluster.send_request('GET', 'storage/volumes', {'name': 'vol_3|vol_1|vol_99', 'fields': 'uuid'})
+    assert [record['name'] for record in response['records']] == ['vol_1', 'vol_3']
+    assert 'next' not in response['_links']
+    status, response, error = cluster.send_request('GET', 'storage/volumes', {'name': 'vol_2*', 'svm.name': 'svm1'})
+    assert [record['name'] for record in response['records']] == ['vol_2'] + ['vol_%d' % index for index in range(20, 25)]
+    status, response, error = cluster.send_request('GET', 'storage/volumes', {'name': '!vol_2*', 'state': 'offline'})
+    assert response['num_records'] == 0
+    # records are copied
+    response['records'].append(None)
+    status, response, error = cluster.send_request('GET', 'storage/volumes', {'name': 'vol_1'})
+    response['records'][0]['name'] = 'changed'
+    assert cluster.send_request('GET', 'storage/volumes', {'name': 'vol_1'})[1]['records'][0]['name'] == 'vol_1'
+    assert len(cluster.requests) == 7
+
+
+def test_zapi_pagination_and_query():
+    cluster = benchmark.SyntheticCluster(zapi_collections={'lun-get-iter': ('lun-info', benchmark.zapi_luns(30))})
+    request = netapp_utils.zapi.NaElement.create_node_with_children('lun-get-iter', **{'max-records': '25'})
+    response = cluster.invoke_elem(request)
+    assert response.get_child_content('num-records') == '25'
+    assert response.get_child_content('next-tag') == '25'
+    request.add_new_child('tag', '25')
+    response = cluster.invoke_elem(request)
+    assert response.get_child_content('num-records') == '5'
+    assert response.get_child_content('next-tag') is None
+    request = netapp_utils.zapi.NaElement('lun-get-iter')
+    query = netapp_utils.zapi.NaElement('query')
+    query.add_child_elem(netapp_utils.zapi.NaElement.create_node_with_children('lun-info', path='/vol/vol1/lun_7'))
+    request.add_child_elem(query)
+    response = cluster.invoke_elem(request)
+    luns = response.get_child_by_name('attributes-list').get_children()
+    assert [lun.get_child_content('path') for lun in luns] == ['/vol/vol1/lun_7']
+
+
+def test_latency_and_report():
+    measurements, cluster, result = benchmark.run_benchmark('na_ontap_snapmirror', 10, latency=0.01, trace_memory=False)
+    assert not measurements['failed']
+    # 6 requests, 10ms each
+    assert measurements['wall_seconds'] >= 0.06
+    assert measurements['harness_seconds'] >= 0.06
+    assert measurements['peak_traced_kb'] is None
+    report = benchmark.format_report([measurements, dict(measurements, failed=True, msg='some error')])
+    assert 'na_ontap_snapmirror' in report
+    assert 'FAILED' in report
+    assert 'some error' in report
+
+
+def test_debug_log_memory():
+    ''' debug_logs no longer keeps every page of a large gather '''
+    legacy, cluster, result = benchmark.run_debug_log_benchmark(5000, legacy=True)
+    assert not legacy['failed'], result
+    assert result['ontap_info']['storage/volumes']['num_records'] == 5000
+    bounded, cluster, result = benchmark.run_debug_log_benchmark(5000, legacy=False)
+    assert not bounded['failed'], result
+    assert result['ontap_info']['storage/volumes']['num_records'] == 5000
+    # GET cluster, then 5 pages of 1000 records
+    assert legacy['requests'] == bounded['requests'] == 6
+    print(benchmark.format_report([legacy, bounded]))
+    if benchmark.HAS_TRACEMALLOC:
+        assert bounded['peak_traced_kb'] < legacy['peak_traced_kb']
@@ -0,0 +1,97 @@
+# Copyright (c) 2025 NetApp
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+''' unit tests for module_utils netapp_cache.py '''
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import multiprocessing
+import os
+import pytest
+import sys
+
+from ansible_collections.netapp.ontap.tests.unit.compat.mock import patch
+from ansible_collections.netapp.ontap.plugins.module_utils.netapp_cache import OntapCache
+
+
+def test_set_and_get(tmpdir):
+    cache = OntapCache(str(tmpdir), 'host1:None:user1:None', 300)
+    assert cache.get('cserver') is None
+    assert cache.set('cserver', 'cserver1')
+    assert cache.set('rest_version', {'status_code': 200, 'message': {'version': {'generation': 9}}, 'error': None})
+    assert cache.get('cserver') == 'cserver1'
+    # shared with other instances for the same key
+    assert OntapCache(str(tmpdir), 'host1:None:user1:None', 300).get('rest_version')['message'] == {'version': {'generation': 9}}
+    # but not for another host or user
+    assert OntapCache(str(tmpdir), 'host2:None:user1:None', 300).get('cserver') is None
+    assert OntapCache(str(tmpdir), 'host1:None:user2:None', 300).get('cserver') is None
+
+
+def test_ttl(tmpdir):
+    cache = OntapCache(str(tmpdir), 'host1', 300)
+    with patch('time.time', return_value=1000.0):
+        cache.set('cserver', 'cserver1')
+    with patch('time.time', return_value=1300.0):
+        assert cache.get('cserver') == 'cserver1'
+    with patch('time.time', return_value=1301.0):
+        assert cache.get('cserver') is None
+
+
+def test_creates_directory(tmpdir):
+    directory = os.path.join(str(tmpdir), 'a', 'b')
+    cache = OntapCache(directory, 'host1', 300)
+    assert cache.set('cserver', 'cserver1')
+    assert cache.get('cserver') == 'cserver1'
+    assert os.listdir(directory) == [os.path.basename(cache.get_path('cserver'))]
+
+
+def test_corrupted_file_is_ignored(tmpdir):
+    cache = OntapCache(str(tmpdir), 'host1', 300)
+    with open(cache.get_path('cserver'), 'w') as afile:
+        afile.write('{"time": ')
+    assert cache.get('cserver') is None
+    assert cache.set('cserver', 'cserver1')
+    assert cache.get('cserver') == 'cserver1'
+    with open(cache.get_path('cserver'), 'w') as afile:
+        afile.write('"not a dict"')
+    assert cache.get('cserver') is None
+
+
+def test_write_errors_are_ignored(tmpdir):
+    # directory is a file
+    directory = os.path.join(str(tmpdir), 'file')
+    with open(directory, 'w') as afile:
+        afile.write('')
+    cache = OntapCache(directory, 'host1', 300)
+    assert not cache.set('cserver', 'cserver1')
+    assert cache.get('cserver') is None
+    # not serializable, no temporary file is left behind
+    cache = OntapCache(str(tmpdir), 'host1', 300)
+    assert not cache.set('cserver', object())
+    assert os.listdir(str(tmpdir)) == ['file']
+
+
+def update_cache(directory, index):
+    cache = OntapCache(directory, 'host1', 300)
+    for count in range(50):
+        cache.set('key_%d' % index, count)
+        cache.set('shared', count)
+        # readers never see a partially written file
+        assert cache._read('key_%d' % index)
+        assert cache._read('shared')
+
+
+@pytest.mark.skipif(sys.platform.startswith('win'), reason='requires fork')
+def test_concurrent_forks(tmpdir):
+    processes = [multiprocessing.Process(target=update_cache, args=(str(tmpdir), index)) for index in range(8)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert [process.exitcode for process in processes] == [0] * 8
+    # one file per entry, no temporary file left behind
+    assert len(os.listdir(str(tmpdir))) == 9
+    # updates to other entries are not lost
+    cache = OntapCache(str(tmpdir), 'host1', 300)
+    assert [cache.get('key_%d' % index) for index in range(8)] == [49] * 8
+    assert cache.get('shared') in range(50)
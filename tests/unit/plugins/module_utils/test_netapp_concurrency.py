@@ -0,0 +1,104 @@
+# Copyright (c) 2025 NetApp
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+''' unit tests for module_utils netapp_concurrency.py '''
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import pytest
+import threading
+
+from ansible_collections.netapp.ontap.tests.unit.compat.mock import patch
+from ansible_collections.netapp.ontap.plugins.module_utils import netapp_concurrency
+
+
+def test_results_in_submission_order():
+    results = netapp_concurrency.run_concurrently(lambda x, y: x * y, [(x, 2) for x in range(20)], 5)
+    assert results == [(x * 2, None) for x in range(20)]
+
+
+def test_exceptions_are_captured():
+    def divide(x):
+        return 10 // x
+
+    results = netapp_concurrency.run_concurrently(divide, [(5,), (0,), (2,)], 3)
+    assert results[0] == (2, None)
+    assert results[1][0] is None
+    assert isinstance(results[1][1], ZeroDivisionError)
+    assert results[2] == (5, None)
+
+
+def test_bounded_concurrency():
+    lock = threading.Lock()
+    counters = {'in_flight': 0, 'max_in_flight': 0}
+    barrier = threading.Barrier(3, timeout=10)
+
+    def work(x):
+        with lock:
+            counters['in_flight'] += 1
+            counters['max_in_flight'] = max(counters['max_in_flight'], counters['in_flight'])
+        barrier.wait()
+        with lock:
+            counters['in_flight'] -= 1
+        return x
+
+    results = netapp_concurrency.run_concurrently(work, [(x,) for x in range(9)], 3)
+    assert [result for result, dummy in results] == list(range(9))
+    assert counters['max_in_flight'] == 3
+
+
+def test_sequential():
+    thread_ids = set()
+
+    def work(x):
+        thread_ids.add(threading.current_thread().ident)
+        return x
+
+    assert netapp_concurrency.run_concurrently(work, [(1,), (2,)], 1) == [(1, None), (2, None)]
+    assert netapp_concurrency.run_concurrently(work, [], 4) == []
+    assert thread_ids == set([threading.current_thread().ident])
+
+
+def test_dependency_levels():
+    dependencies = {'vol1': ['clone1', 'share1'], 'clone1': ['clone2'], 'clone2': [], 'share1': [], 'igroup1': ['map1', 'unknown'], 'map1': []}
+    levels = netapp_concurrency.dependency_levels(['vol1', 'clone1', 'clone2', 'share1', 'igroup1', 'map1'], dependencies.get)
+    assert levels == [['clone2', 'share1', 'map1'], ['clone1', 'igroup1'], ['vol1']]
+    assert netapp_concurrency.dependency_levels([], dependencies.get) == []
+    dependencies['clone2'] = ['vol1']
+    with pytest.raises(ValueError) as exc:
+        netapp_concurrency.dependency_levels(['vol1', 'clone1', 'clone2'], dependencies.get)
+    assert str(exc.value) == 'circular dependency: vol1 -> clone1 -> clone2 -> vol1'
+
+
+def test_batch_poller_single_query_per_cycle():
+    poller = None
+    fetched = []
+
+    def sleep(interval):
+        if not fetched:
+            # make sure all threads are waiting before the first poll
+            while len(poller.waiters) < 5:
+                threading.Event().wait(0.01)
+
+    def fetch(keys):
+        fetched.append(sorted(keys))
+        # resource N is ready after N + 1 polling cycles
+        return dict((key, len(fetched)) for key in keys), None
+
+    poller = netapp_concurrency.BatchPoller(fetch, 10)
+    with patch('time.sleep', side_effect=sleep):
+        results = netapp_concurrency.run_concurrently(
+            lambda key: poller.wait(key, lambda record, key=key: record > key, 10), [(key,) for key in range(5)], 5)
+    assert [result for result, dummy in results] == [(key + 1, True, None) for key in range(5)]
+    # 5 queries rather than 1 + 2 + 3 + 4 + 5, fewer keys as resources are ready
+    assert fetched == [[0, 1, 2, 3, 4], [1, 2, 3, 4], [2, 3, 4], [3, 4], [4]]
+    assert poller.polls == 5
+    assert not poller.waiters
+
+
+def test_batch_poller_max_polls_and_errors():
+    responses = [({}, None), ({'a': 'record'}, None), ({}, 'some error')]
+    poller = netapp_concurrency.BatchPoller(lambda keys: responses.pop(0), 0)
+    assert poller.wait('a', lambda record: record == 'other', 2) == ('record', False, None)
+    assert poller.wait('a', lambda record: record == 'other', 2) == (None, False, 'some error')
+    assert poller.polls == 3
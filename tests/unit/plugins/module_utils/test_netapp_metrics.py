@@ -0,0 +1,189 @@
+# Copyright (c) 2025 NetApp
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+''' unit tests for module_utils netapp_metrics.py '''
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import io
+import json
+import pytest
+
+from ansible.module_utils import basic
+from ansible_collections.netapp.ontap.tests.unit.compat.mock import patch
+# pylint: disable=unused-import
+from ansible_collections.netapp.ontap.tests.unit.plugins.module_utils.ansible_mocks import \
+    create_module, expect_and_capture_ansible_exception, patch_ansible
+import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
+from ansible_collections.netapp.ontap.plugins.module_utils.netapp_metrics import ApiMetrics, api_template, percentile
+
+DEFAULT_ARGS = {
+    'hostname': 'test',
+    'username': 'test_user',
+    'password': 'test_pass!',
+}
+
+UUID = '8a8d8b4a-ea51-11ec-8b58-005056b3f7f8'
+
+
+class MockONTAPModule:
+    def __init__(self):
+        self.module = basic.AnsibleModule(netapp_utils.na_ontap_host_argument_spec())
+
+
+class mockResponse:
+    def __init__(self, status_code, content, body=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = {}
+        self.text = content
+        self.request = type('PreparedRequest', (), dict(body=body))
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise netapp_utils.requests.exceptions.HTTPError('status_code: %s' % self.status_code, response=self)
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def create_restapi_object(feature_flags):
+    args = dict(DEFAULT_ARGS)
+    args['feature_flags'] = feature_flags
+    module = create_module(MockONTAPModule, args)
+    return netapp_utils.OntapRestAPI(module.module)
+
+
+def test_api_template():
+    assert api_template('storage/volumes') == 'storage/volumes'
+    assert api_template('storage/volumes/%s/snapshots/%s' % (UUID, UUID.upper())) == 'storage/volumes/{uuid}/snapshots/{uuid}'
+    assert api_template('/cluster/jobs/%s/' % UUID) == 'cluster/jobs/{uuid}'
+    assert api_template('protocols/nfs/export-policies/12884901890/rules/2?fields=*') == 'protocols/nfs/export-policies/{id}/rules/{id}'
+
+
+def test_percentile():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 100) == 100
+    assert percentile([7], 50) == 7
+    assert percentile([7], 95) == 7
+    assert percentile([1, 2], 0) == 1
+
+
+def test_summary_per_api():
+    metrics = ApiMetrics()
+    for latency in range(1, 21):
+        metrics.record('REST', 'GET', 'storage/volumes/%s' % UUID, 200, None, 0, 100, latency / 10.0)
+    metrics.record('REST', 'GET', 'storage/volumes/%s' % UUID, 404, 'entry not found', 0, 50, 0.05, retries=1)
+    metrics.record('ZAPI', None, 'volume-get-iter', 200, True, 300, 1000, 0.5)
+    assert metrics.summary() == {
+        'REST GET storage/volumes/{uuid}': dict(count=21, errors=1, retries=1, bytes_out=0, bytes_in=2050, total=21.05, p50=1.0, p95=1.9, max=2.0),
+        'ZAPI volume-get-iter': dict(count=1, errors=1, retries=0, bytes_out=300, bytes_in=1000, total=0.5, p50=0.5, p95=0.5, max=0.5),
+    }
+    assert ApiMetrics().summary() == {}
+
+
+def test_json_lines(tmpdir):
+    path = str(tmpdir.join('metrics.jsonl'))
+    metrics = ApiMetrics(dict(module='na_ontap_volume', hostname='cluster1'), path)
+    metrics.record('REST', 'PATCH', 'storage/volumes/%s' % UUID, 202, None, 40, 150, 0.25)
+    metrics.record('ZAPI', None, 'volume-modify-iter', None, True, 400, 0, 1.5, 1)
+    with open(path) as afile:
+        lines = [json.loads(line) for line in afile]
+    assert len(lines) == 2
+    assert lines[0]['time'] > 0
+    for line in lines:
+        del line['time']
+    assert lines == [
+        dict(module='na_ontap_volume', hostname='cluster1', kind='REST', method='PATCH', api='storage/volumes/{uuid}', status=202, error=False,
+             bytes_out=40, bytes_in=150, latency=0.25, retries=0),
+        dict(module='na_ontap_volume', hostname='cluster1', kind='ZAPI', method=None, api='volume-modify-iter', status=None, error=True,
+             bytes_out=400, bytes_in=0, latency=1.5, retries=1),
+    ]
+    # I/O errors are ignored
+    metrics = ApiMetrics(path=str(tmpdir.join('missing_dir', 'metrics.jsonl')))
+    metrics.record('REST', 'GET', 'cluster', 200, None, 0, 10, 0.1)
+    assert metrics.summary()['REST GET cluster']['count'] == 1
+
+
+def test_metrics_are_disabled_by_default():
+    rest_api = create_restapi_object({})
+    assert rest_api.api_metrics is None
+    assert not hasattr(rest_api.module, '_netapp_api_metrics')
+
+
+@patch('requests.Session.request')
+def test_rest_metrics_in_module_result(mock_request, tmpdir):
+    ''' metrics are shared by all connections, and reported when the module exits or fails '''
+    path = str(tmpdir.join('metrics.jsonl'))
+    mock_request.side_effect = [
+        mockResponse(200, '{"num_records": 0}'),
+        mockResponse(202, '{"job": {}}', b'{"name": "vol1"}'),
+        mockResponse(400, '{"error": {"message": "duplicate entry"}}', b'{"name": "vol1"}'),
+        netapp_utils.requests.exceptions.ConnectionError('connection refused'),
+    ]
+    rest_api = create_restapi_object({'api_metrics': True, 'api_metrics_file': path})
+    rest_api.get('storage/volumes/%s' % UUID)
+    # a second connection in the same module run
+    other_rest_api = netapp_utils.OntapRestAPI(rest_api.module)
+    assert other_rest_api.api_metrics is rest_api.api_metrics
+    other_rest_api.post('storage/volumes', {'name': 'vol1'})
+    assert other_rest_api.post('storage/volumes', {'name': 'vol1'})[1] == {'message': 'duplicate entry'}
+    assert rest_api.get('cluster')[1] == 'connection refused'
+    result = expect_and_capture_ansible_exception(rest_api.module.exit_json, 'exit', changed=False)
+    assert sorted(result['api_metrics']) == ['REST GET cluster', 'REST GET storage/volumes/{uuid}', 'REST POST storage/volumes']
+    assert result['api_metrics']['REST POST storage/volumes']['count'] == 2
+    assert result['api_metrics']['REST POST storage/volumes']['errors'] == 1
+    assert result['api_metrics']['REST POST storage/volumes']['bytes_out'] == 32
+    assert result['api_metrics']['REST GET storage/volumes/{uuid}']['bytes_in'] == 18
+    assert result['api_metrics']['REST GET cluster']['errors'] == 1
+    result = expect_and_capture_ansible_exception(rest_api.module.fail_json, 'fail', msg='error')
+    assert result['msg'] == 'error'
+    assert result['api_metrics']['REST GET cluster']['count'] == 1
+    with open(path) as afile:
+        lines = [json.loads(line) for line in afile]
+    assert [(line['method'], line['api'], line['status'], line['error']) for line in lines] == [
+        ('GET', 'storage/volumes/{uuid}', 200, False),
+        ('POST', 'storage/volumes', 202, False),
+        ('POST', 'storage/volumes', 400, True),
+        ('GET', 'cluster', None, True),
+    ]
+    assert all(line['hostname'] == 'test' for line in lines)
+
+
+@pytest.mark.skipif(not netapp_utils.has_netapp_lib(), reason='requires netapp_lib')
+def test_zapi_metrics():
+    args = dict(DEFAULT_ARGS)
+    args['feature_flags'] = {'api_metrics': True}
+    module = create_module(MockONTAPModule, args).module
+    server = netapp_utils.setup_na_ontap_zapi(module)
+    responses = [
+        b'<netapp version="1.1"><results status="passed"><version>9.8</version></results></netapp>',
+        b'<netapp version="1.1"><results status="failed" errno="13005" reason="not found"/></netapp>',
+    ]
+    bytes_in = sum(len(response) for response in responses)
+
+    class MockOpener:
+        def open(self, request, timeout=None):
+            if not responses:
+                raise netapp_utils.zapi.urllib.error.URLError('connection refused')
+            response = netapp_utils.zapi.urllib.response.addinfourl(io.BytesIO(responses.pop(0)), {}, request.get_full_url(), 200)
+            response.retries = 1
+            return response
+
+    server._opener = MockOpener()
+    server._refresh_conn = False
+    server.invoke_successfully(netapp_utils.zapi.NaElement('system-get-version'), True)
+    with pytest.raises(netapp_utils.zapi.NaApiError):
+        server.invoke_successfully(netapp_utils.zapi.NaElement('system-get-version'), True)
+    with pytest.raises(netapp_utils.zapi.NaApiError):
+        server.invoke_successfully(netapp_utils.zapi.NaElement('system-get-version'), True)
+    summary = module._netapp_api_metrics.summary()
+    assert list(summary) == ['ZAPI system-get-version']
+    stats = summary['ZAPI system-get-version']
+    assert stats['count'] == 3
+    assert stats['errors'] == 2
+    assert stats['retries'] == 2
+    assert stats['bytes_out'] > 0
+    assert stats['bytes_in'] == bytes_in
@@ -4,15 +4,19 @@
 """ unit tests for module_utils netapp_module.py """
 from __future__ import (absolute_import, division, print_function)
 import copy
+import gc
 __metaclass__ = type
 
 import pytest
+import random
 import sys
+import time
 
 from ansible.module_utils import basic
 from ansible_collections.netapp.ontap.tests.unit.compat.mock import patch
 import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
 from ansible_collections.netapp.ontap.plugins.module_utils.netapp_module import NetAppModule as na_helper, cmp as na_cmp
+from ansible_collections.netapp.ontap.plugins.module_utils import netapp_module
 # pylint: disable=unused-import
 from ansible_collections.netapp.ontap.tests.unit.plugins.module_utils.ansible_mocks import\
     assert_no_warnings, assert_warning_was_raised, clear_warnings, patch_ansible, create_module, expect_and_capture_ansible_exception
@@ -281,6 +285,95 @@ def test_get_modified_attributes_for_desired_list_with_duplicates_diff():
     assert result == {'schedule': ['hourly', 'daily', 'daily']}
 
 
+def test_canonical_key():
+    assert netapp_module.canonical_key('ABC') == 'ABC'
+    # dicts are compared without order, lists with order
+    assert netapp_module.canonical_key({'a': [1, 'X'], 'b': {'c': 2}}) == netapp_module.canonical_key({'b': {'c': 2}, 'a': [1, 'X']})
+    assert netapp_module.canonical_key([1, 2]) != netapp_module.canonical_key([2, 1])
+    # same as python: [1] != (1,), but 1 == 1.0 == True
+    assert netapp_module.canonical_key([1]) != netapp_module.canonical_key((1,))
+    assert netapp_module.canonical_key({'a': 1}) == netapp_module.canonical_key({'a': True})
+    assert netapp_module.canonical_key({1, 2}) == netapp_module.canonical_key(frozenset([2, 1]))
+    with pytest.raises(TypeError):
+        netapp_module.canonical_key([bytearray(b'abc')])
+
+
+class Unhashable:
+    __hash__ = None
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return isinstance(other, Unhashable) and self.value == other.value
+
+
+@pytest.mark.parametrize('current, desired', [
+    (['a', 'b', 'b', 'c'], ['b', 'd', 'b', 'b', 'a']),
+    (['A', 'b'], ['a', 'b']),
+    ([{'match': 'x', 'rw': ['any']}, {'match': 'y'}], [{'rw': ['any'], 'match': 'x'}, {'match': 'z'}]),
+    ([[1, 2], (1, 2), 1, 'x'], [(1, 2), [2, 1], True, 'x', None]),
+    ([], ['a']),
+    (['a'], []),
+    ([Unhashable(1), 'a'], ['a', Unhashable(2), Unhashable(1)]),
+])
+def test_compare_lists_matches_scan(current, desired):
+    expected = netapp_module.multiset_diff_by_scan(current, desired)
+    for get_list_diff in (True, False):
+        result = na_helper.compare_lists(current, desired, get_list_diff)
+        if expected[0] or expected[1]:
+            assert result == (expected[0] if get_list_diff else desired)
+        else:
+            assert result is None
+    if not any(isinstance(item, Unhashable) for item in current + desired):
+        assert netapp_module.multiset_diff(current, desired) == expected
+
+
+def time_compare_lists(counts, repeat=7):
+    """ return the best elapsed time for each count
+        runs for different counts are interleaved, so that they are equally affected by the load on the system
+    """
+    lists = {}
+    for count in counts:
+        current = ['iqn.1995-08.com.example:host%05d' % index for index in range(count)]
+        desired = list(reversed(current))
+        desired[0] = 'iqn.1995-08.com.example:new_host'
+        lists[count] = current, desired
+    timings = {}
+    # CPU time is not affected by other processes competing for the CPU, python 2.7 falls back to wall clock time
+    clock = getattr(time, 'process_time', time.time)
+    # keep the garbage collector from adding noise to the smaller run
+    gc.disable()
+    try:
+        for dummy in range(repeat):
+            for count in counts:
+                start = clock()
+                result = na_helper.compare_lists(lists[count][0], lists[count][1], True)
+                elapsed = clock() - start
+                timings[count] = min(timings.get(count, elapsed), elapsed)
+                assert result == ['iqn.1995-08.com.example:new_host']
+    finally:
+        gc.enable()
+    return timings
+
+
+def test_compare_lists_scales_linearly():
+    ''' benchmark: 2k and 20k initiators - the elapsed time per element should not grow with the number of elements '''
+    timings = time_compare_lists((2000, 20000))
+    for count in sorted(timings):
+        print('compare_lists: %6d elements in %.4f s - %.2f us/element' % (count, timings[count], timings[count] * 1000000 / count))
+    # linear scaling is a 10x ratio, quadratic scaling would be closer to 100x.  Allow for a lot of noise.
+    assert timings[20000] < timings[2000] * 40
+
+
+def test_compare_lists_random_equivalence():
+    rng = random.Random(42)
+    for dummy in range(50):
+        current = [rng.choice(['a', 'b', 'B', 1, 1.0, (1,), [1], {'k': 'v'}]) for dummy in range(rng.randint(0, 8))]
+        desired = [rng.choice(['a', 'b', 'B', 1, True, (1,), [1], {'k': 'v'}, {'k': 'V'}]) for dummy in range(rng.randint(0, 8))]
+        assert netapp_module.multiset_diff(current, desired) == netapp_module.multiset_diff_by_scan(current, desired)
+
+
 def test_get_modified_attributes_exceptions():
     """ validate exceptions """
     current = {'schedule': {'name': 'weekly'}, 'state': 'present'}
@@ -221,6 +221,53 @@ def test_is_rest_true_9_6():
     assert not rest_api.debug_logs
 
 
+def test_is_rest_uses_ontap_cache(tmpdir):
+    ''' the version is only read once, and shared with the next module run '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_96']),
+    ])
+    module_args = {'feature_flags': {'ontap_cache': True, 'ontap_cache_dir': str(tmpdir)}}
+    for dummy in range(3):
+        rest_api = create_restapi_object(DEFAULT_ARGS, module_args)
+        assert rest_api.is_rest()
+        assert rest_api.get_ontap_version() == (9, 6, 0)
+    # a different user needs its own probe
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_96']),
+    ], 'test_is_rest_uses_ontap_cache')
+    assert create_restapi_object(dict(DEFAULT_ARGS, username='other_user'), module_args).is_rest()
+
+
+def test_is_rest_ontap_cache_ignores_errors(tmpdir):
+    ''' errors are not cached, as they may be transient '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_zapi']),
+        ('GET', 'cluster', SRR['is_rest_96']),
+    ])
+    module_args = {'feature_flags': {'ontap_cache': True, 'ontap_cache_dir': str(tmpdir)}}
+    assert not create_restapi_object(DEFAULT_ARGS, module_args).is_rest()
+    assert create_restapi_object(DEFAULT_ARGS, module_args).is_rest()
+
+
+def test_is_rest_ontap_cache_disabled_by_default():
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_96']),
+        ('GET', 'cluster', SRR['is_rest_96']),
+    ])
+    assert create_restapi_object(DEFAULT_ARGS).ontap_cache is None
+    assert create_restapi_object(DEFAULT_ARGS).is_rest()
+    assert create_restapi_object(DEFAULT_ARGS).is_rest()
+
+
+def test_get_cserver_uses_ontap_cache(tmpdir):
+    register_responses([
+        ('GET', 'private/cli/vserver', SRR['vservers_with_admin']),
+    ])
+    module_args = {'feature_flags': {'ontap_cache': True, 'ontap_cache_dir': str(tmpdir)}}
+    assert netapp_utils.get_cserver(create_restapi_object(DEFAULT_ARGS, module_args), is_rest=True) == 'cserver'
+    assert netapp_utils.get_cserver(create_restapi_object(DEFAULT_ARGS, module_args), is_rest=True) == 'cserver'
+
+
 def test_fail_has_password_and_cert():
     ''' failure case in auth_method '''
     args = dict(DEFAULT_ARGS)
@@ -5,16 +5,26 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+import json
 import pytest
 import sys
+import threading
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+except ImportError:
+    # python 2.7
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
 
 from ansible.module_utils import basic
 from ansible_collections.netapp.ontap.tests.unit.compat.mock import patch
 
 import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
 
+# pylint: disable=unused-import
 from ansible_collections.netapp.ontap.tests.unit.plugins.module_utils.ansible_mocks import \
-    create_module, expect_and_capture_ansible_exception
+    create_module, expect_and_capture_ansible_exception, patch_ansible
+import ansible_collections.netapp.ontap.plugins.module_utils.rest_generic as rest_generic
 
 if not netapp_utils.HAS_REQUESTS and sys.version_info < (2, 7):
     pytestmark = pytest.mark.skip('Skipping Unit Tests on 2.6 as requests is not available')
@@ -73,7 +83,7 @@ class mockResponse:
         return self.json_data
 
 
-@patch('requests.request')
+@patch('requests.Session.request')
 def test_empty_get_sent_bad_json(mock_request):
     ''' get with no data '''
     mock_request.return_value = mockResponse(json_data='anything', status_code=200, raise_action='bad_json')
@@ -85,7 +95,7 @@ def test_empty_get_sent_bad_json(mock_request):
     print('debug:', rest_api.debug_logs)
 
 
-@patch('requests.request')
+@patch('requests.Session.request')
 def test_empty_get_sent_bad_but_empty_json(mock_request):
     ''' get with no data '''
     mock_request.return_value = mockResponse(json_data='', status_code=200, raise_action='bad_json')
@@ -105,7 +115,7 @@ def test_wait_on_job_bad_url():
 
 
 @patch('time.sleep')
-@patch('requests.request')
+@patch('requests.Session.request')
 def test_wait_on_job_timeout(mock_request, sleep_mock):
     ''' get with no data '''
     mock_request.return_value = mockResponse(json_data='', status_code=200, raise_action='bad_json')
@@ -118,7 +128,7 @@ def test_wait_on_job_timeout(mock_request, sleep_mock):
 
 
 @patch('time.sleep')
-@patch('requests.request')
+@patch('requests.Session.request')
 def test_wait_on_job_job_error(mock_request, sleep_mock):
     ''' get with no data '''
     mock_request.return_value = mockResponse(json_data=dict(error='Job error message'), status_code=200)
@@ -131,7 +141,7 @@ def test_wait_on_job_job_error(mock_request, sleep_mock):
 
 
 @patch('time.sleep')
-@patch('requests.request')
+@patch('requests.Session.request')
 def test_wait_on_job_job_failure(mock_request, dont_sleep):
     ''' get with no data '''
     mock_request.return_value = mockResponse(json_data=dict(error='Job error message', state='failure', message='failure message'), status_code=200)
@@ -145,7 +155,7 @@ def test_wait_on_job_job_failure(mock_request, dont_sleep):
 
 
 @patch('time.sleep')
-@patch('requests.request')
+@patch('requests.Session.request')
 def test_wait_on_job_timeout_running(mock_request, sleep_mock):
     ''' get with no data '''
     mock_request.return_value = mockResponse(json_data=dict(error='Job error message', state='running', message='any message'), status_code=200)
@@ -159,7 +169,7 @@ def test_wait_on_job_timeout_running(mock_request, sleep_mock):
 
 
 @patch('time.sleep')
-@patch('requests.request')
+@patch('requests.Session.request')
 def test_wait_on_job(mock_request, dont_sleep):
     ''' get with no data '''
     mock_request.return_value = mockResponse(json_data=dict(error='Job error message', state='other', message='any message'), status_code=200)
@@ -172,7 +182,114 @@ def test_wait_on_job(mock_request, dont_sleep):
     assert message == 'any message'
 
 
-@patch('requests.request')
+def job_response(state):
+    return mockResponse(json_data=dict(uuid='job_uuid', state=state, message='%s message' % state), status_code=200)
+
+
+@patch('time.sleep')
+@patch('requests.Session.request')
+def test_wait_on_job_adaptive_polling(mock_request, sleep_mock):
+    ''' poll fast at first, back off exponentially up to increment, and use return_timeout '''
+    mock_request.side_effect = [job_response('running')] * 5 + [job_response('success')]
+    rest_api = create_restapi_object(DEFAULT_ARGS)
+    job = dict(uuid='job_uuid', _links=dict(self=dict(href='api/cluster/jobs/job_uuid')))
+    message, error = rest_api.wait_on_job(job, increment=10)
+    assert error is None
+    assert message == 'success message'
+    assert [call[2]['params'] for call in mock_request.mock_calls] == [{'return_timeout': timeout} for timeout in (1, 2, 4, 8, 10, 10)]
+    # time spent in the GET is deducted from the delay
+    delays = [call[1][0] for call in sleep_mock.mock_calls]
+    assert len(delays) == 5
+    for delay, interval in zip(delays, (1, 2, 4, 8, 10)):
+        assert interval - 1 < delay <= interval
+    assert len(rest_api.job_stats) == 1
+    assert rest_api.job_stats[0]['uuid'] == 'job_uuid'
+    assert rest_api.job_stats[0]['state'] == 'success'
+    assert rest_api.job_stats[0]['polls'] == 6
+    assert rest_api.job_stats[0]['elapsed_seconds'] >= 0
+
+
+@patch('time.sleep')
+@patch('requests.Session.request')
+def test_wait_on_job_fixed_polling(mock_request, sleep_mock):
+    ''' feature flag to restore the fixed interval '''
+    mock_request.side_effect = [job_response('running')] * 2 + [job_response('success')]
+    rest_api = create_restapi_object(dict(DEFAULT_ARGS, feature_flags={'job_adaptive_polling': False}))
+    job = dict(uuid='job_uuid', _links=dict(self=dict(href='api/cluster/jobs/job_uuid')))
+    message, error = rest_api.wait_on_job(job, increment=10)
+    assert error is None
+    assert [call[2]['params'] for call in mock_request.mock_calls] == [None, None, None]
+    assert [call[1][0] for call in sleep_mock.mock_calls] == [10, 10]
+    assert rest_api.job_stats[0]['polls'] == 3
+
+
+@patch('time.sleep')
+@patch('requests.Session.request')
+def test_wait_on_job_long_poll_fallback(mock_request, sleep_mock):
+    ''' return_timeout is no longer used after an error '''
+    mock_request.side_effect = [mockResponse(json_data=dict(error=dict(message='unexpected argument')), status_code=400),
+                                job_response('running'), job_response('success')]
+    rest_api = create_restapi_object(DEFAULT_ARGS)
+    job = dict(uuid='job_uuid', _links=dict(self=dict(href='api/cluster/jobs/job_uuid')))
+    message, error = rest_api.wait_on_job(job, increment=10)
+    assert error is None
+    assert [call[2]['params'] for call in mock_request.mock_calls] == [{'return_timeout': 1}, None, None]
+    assert [call[1][0] for call in sleep_mock.mock_calls] == [1, 2]
+
+
+@patch('time.sleep')
+@patch('requests.Session.request')
+def test_wait_on_job_adaptive_polling_timeout(mock_request, sleep_mock):
+    ''' the timeout is still honored '''
+    mock_request.return_value = job_response('running')
+    rest_api = create_restapi_object(DEFAULT_ARGS)
+    job = dict(uuid='job_uuid', _links=dict(self=dict(href='api/cluster/jobs/job_uuid')))
+    message, error = rest_api.wait_on_job(job, timeout=30, increment=10)
+    assert 'Timeout error: Process still running' in error
+    # 1 + 2 + 4 + 8 + 10 + 10 >= 30
+    assert rest_api.job_stats[0]['polls'] == 7
+    assert rest_api.job_stats[0]['state'] == 'running'
+
+
+def jobs_response(*states):
+    records = [dict(uuid='job_%d' % index, state=state, message='%s message' % state) for index, state in enumerate(states) if state]
+    return mockResponse(json_data=dict(records=records, num_records=len(records)), status_code=200)
+
+
+@patch('time.sleep')
+@patch('requests.Session.request')
+def test_wait_on_jobs(mock_request, sleep_mock):
+    ''' all jobs are polled together, results are reported as each job completes '''
+    mock_request.side_effect = [jobs_response('running', 'running', 'running'),
+                                jobs_response('running', 'success', 'running'),
+                                jobs_response('failure', None, 'running'),
+                                jobs_response(None, None, 'success')]
+    rest_api = create_restapi_object(DEFAULT_ARGS)
+    jobs = [dict(uuid='job_%d' % index) for index in range(3)]
+    results = list(rest_api.wait_on_jobs(jobs, increment=10))
+    assert results == [('job_1', 'success message', None), ('job_0', None, 'failure message'), ('job_2', 'success message', None)]
+    assert [call[2]['params']['uuid'] for call in mock_request.mock_calls] == ['job_0|job_1|job_2', 'job_0|job_1|job_2', 'job_0|job_2', 'job_2']
+    assert [call[1][0] for call in sleep_mock.mock_calls] == [1, 2, 4]
+    assert [(stats['uuid'], stats['polls']) for stats in rest_api.job_stats] == [('job_1', 2), ('job_0', 3), ('job_2', 4)]
+
+
+@patch('time.sleep')
+@patch('requests.Session.request')
+def test_wait_on_jobs_errors(mock_request, sleep_mock):
+    ''' timeout, missing uuid, and GET errors '''
+    mock_request.return_value = jobs_response('running')
+    rest_api = create_restapi_object(DEFAULT_ARGS)
+    results = list(rest_api.wait_on_jobs([dict(uuid='job_0'), dict(_links={})], timeout=30, increment=10))
+    assert results[0] == (None, None, "Job UUID not found - Job: {'_links': {}}")
+    assert results[1][0] == 'job_0'
+    assert 'Timeout error: Process still running' in results[1][2]
+    mock_request.return_value = mockResponse(json_data=dict(error=dict(message='some error')), status_code=400)
+    results = list(rest_api.wait_on_jobs([dict(uuid='job_0'), dict(uuid='job_1')]))
+    assert [result[0] for result in results] == ['job_0', 'job_1']
+    assert results[0][2] == " - ".join(["{'message': 'some error'}"] * 4)
+
+
+@patch('requests.Session.request')
 def test_get_auth_single_cert(mock_request):
     ''' get with no data '''
     mock_request.return_value = mockResponse(json_data='', status_code=200)
@@ -185,7 +302,7 @@ def test_get_auth_single_cert(mock_request):
     assert "cert='cert_file'" in str(mock_request.mock_calls[0])
 
 
-@patch('requests.request')
+@patch('requests.Session.request')
 def test_get_auth_cert_key(mock_request):
     ''' get with no data '''
     mock_request.return_value = mockResponse(json_data='', status_code=200)
@@ -206,7 +323,7 @@ def test_get_auth_method_keyerror():
     assert expect_and_capture_ansible_exception(my_cx.send_request, KeyError, *args) == 'invalid_method'
 
 
-@patch('requests.request')
+@patch('requests.Session.request')
 def test_http_error_no_json(mock_request):
     ''' get raises HTTPError '''
     mock_request.return_value = mockResponse(json_data={}, status_code=400)
@@ -216,7 +333,7 @@ def test_http_error_no_json(mock_request):
     assert error == 'status_code: 400'
 
 
-@patch('requests.request')
+@patch('requests.Session.request')
 def test_http_error_with_json_error_field(mock_request):
     ''' get raises HTTPError '''
     mock_request.return_value = mockResponse(json_data=dict(state='other', message='any message', error='error_message'), status_code=400)
@@ -226,7 +343,7 @@ def test_http_error_with_json_error_field(mock_request):
     assert error == 'error_message'
 
 
-@patch('requests.request')
+@patch('requests.Session.request')
 def test_http_error_attribute_error(mock_request):
     ''' get raises HTTPError '''
     mock_request.return_value = mockResponse(json_data='bad_data', status_code=400)
@@ -236,7 +353,7 @@ def test_http_error_attribute_error(mock_request):
     assert error == 'status_code: 400'
 
 
-@patch('requests.request')
+@patch('requests.Session.request')
 def test_connection_error(mock_request):
     ''' get raises HTTPError '''
     mock_request.side_effect = netapp_utils.requests.exceptions.ConnectionError('connection_error')
@@ -248,7 +365,7 @@ def test_connection_error(mock_request):
     # assert False
 
 
-@patch('requests.request')
+@patch('requests.Session.request')
 def test_options_allow_in_header(mock_request):
     ''' OPTIONS returns Allow key '''
     mock_request.return_value = mockResponse(json_data={}, headers={'Allow': 'allowed'}, status_code=200)
@@ -259,7 +376,7 @@ def test_options_allow_in_header(mock_request):
     assert message == {'Allow': 'allowed'}
 
 
-@patch('requests.request')
+@patch('requests.Session.request')
 def test_formdata_in_response(mock_request):
     ''' GET return formdata '''
     mock_request.return_value = mockResponse(
@@ -269,3 +386,307 @@ def test_formdata_in_response(mock_request):
     message, error = rest_api.get(api)
     assert error is None
     assert message == {'text': 'testme'}
+
+
+@patch('requests.Session.request')
+def test_debug_logs_are_bounded(mock_request):
+    ''' debug_logs is a ring buffer, and response contents are truncated '''
+    mock_request.return_value = mockResponse(json_data={}, status_code=200)
+    mock_request.return_value.content = b'x' * 10000
+    args = dict(DEFAULT_ARGS)
+    args['feature_flags'] = {'debug_log_size': 4}
+    rest_api = create_restapi_object(args)
+    for dummy in range(5):
+        message, error = rest_api.get('api/testme')
+        assert error is None
+    assert len(rest_api.debug_logs) == 4
+    assert [status_code for status_code, content in rest_api.debug_logs] == ['sending', 200, 'sending', 200]
+    assert rest_api.debug_logs[1][1] == b'x' * netapp_utils.DEBUG_LOG_CONTENT_SIZE
+    assert "'auth_args': 'redacted'" in str(rest_api.debug_logs[0][1])
+
+
+@patch('requests.Session.request')
+def test_debug_logs_level(mock_request):
+    ''' error: only errors are kept, none: nothing is kept, errors are always reported '''
+    args = dict(DEFAULT_ARGS)
+    for level, expected in (('error', [(400, 'HTTP error: status_code: 400')]), ('none', [])):
+        args['feature_flags'] = {'debug_log_level': level}
+        rest_api = create_restapi_object(args)
+        mock_request.return_value = mockResponse(json_data={}, status_code=200)
+        assert rest_api.get('api/testme') == ({}, None)
+        mock_request.return_value = mockResponse(json_data={}, status_code=400)
+        assert rest_api.get('api/testme')[1] == 'status_code: 400'
+        assert list(rest_api.debug_logs) == expected
+        assert rest_api.errors == ['HTTP error: status_code: 400']
+
+
+@patch('requests.Session.request')
+def test_debug_logs_are_formatted_lazily(mock_request, tmp_path):
+    ''' requests are only formatted when debug_logs are written '''
+    class Body(dict):
+        formatted = 0
+
+        def __repr__(self):
+            Body.formatted += 1
+            return 'body'
+
+    mock_request.return_value = mockResponse(json_data={}, status_code=200)
+    rest_api = create_restapi_object(DEFAULT_ARGS)
+    message, error = rest_api.post('api/testme', Body(name='vol1'))
+    assert error is None
+    assert Body.formatted == 0
+    filepath = str(tmp_path / 'debug_log')
+    rest_api.write_debug_log_to_file(filepath=filepath)
+    assert Body.formatted == 1
+    with open(filepath) as afile:
+        assert "'json': body" in afile.read()
+
+
+def test_debug_logs_bad_feature_flags(patch_ansible):
+    args = dict(DEFAULT_ARGS)
+    args['feature_flags'] = {'debug_log_level': 'info'}
+    error = 'Error: expected one of debug, error, none for feature flag: debug_log_level, got: info'
+    assert expect_and_capture_ansible_exception(create_restapi_object, 'fail', args)['msg'] == error
+    args['feature_flags'] = {'debug_log_size': -1}
+    error = 'Error: expected a positive integer or None for feature flag: debug_log_size, got: -1'
+    assert expect_and_capture_ansible_exception(create_restapi_object, 'fail', args)['msg'] == error
+
+
+@patch('requests.request')
+@patch('requests.Session.request')
+def test_no_session_feature_flag(mock_session_request, mock_request):
+    ''' rest_session: false reverts to one connection per request '''
+    mock_request.return_value = mockResponse(json_data={}, status_code=200)
+    args = dict(DEFAULT_ARGS)
+    args['feature_flags'] = {'rest_session': False}
+    rest_api = create_restapi_object(args)
+    message, error = rest_api.get('api/testme')
+    assert error is None
+    assert mock_request.call_count == 1
+    assert mock_session_request.call_count == 0
+    assert rest_api.session is None
+
+
+@patch('requests.Session.request')
+def test_session_is_reused(mock_request):
+    ''' the same pooled session is used for every call '''
+    mock_request.return_value = mockResponse(json_data={}, status_code=200)
+    args = dict(DEFAULT_ARGS)
+    args['feature_flags'] = {'rest_pool_maxsize': 4, 'rest_keep_alive': False}
+    rest_api = create_restapi_object(args)
+    rest_api.get('api/testme')
+    session = rest_api.session
+    rest_api.post('api/testme', {})
+    rest_api.delete('api/testme')
+    assert rest_api.session is session
+    assert mock_request.call_count == 3
+    adapter = session.get_adapter('https://test/api/')
+    assert adapter._pool_maxsize == 4
+    assert session.headers['Connection'] == 'close'
+
+
+class CountingHandler(BaseHTTPRequestHandler):
+    ''' minimal keep-alive REST server, counting TCP connections '''
+    protocol_version = 'HTTP/1.1'
+    connections = 0
+    requests = 0
+
+    def setup(self):
+        CountingHandler.connections += 1
+        BaseHTTPRequestHandler.setup(self)
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, body):
+        CountingHandler.requests += 1
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.startswith('/api/cluster/jobs'):
+            self._reply({'state': 'success', 'message': 'done'})
+        elif self.path.startswith('/api/cluster'):
+            self._reply({'version': {'full': '9.13.1', 'generation': 9, 'major': 13, 'minor': 1}})
+        else:
+            self._reply({'num_records': 2, 'records': [{'name': 'vol1'}, {'name': 'vol2'}]})
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self._reply({'job': {'uuid': 'job1', '_links': {'self': {'href': '/api/cluster/jobs/job1'}}}})
+
+
+def run_module_against_local_server(monkeypatch, feature_flags):
+    ''' simulate a module run: version probe, a few GETs, an async POST with job polling '''
+    monkeypatch.setenv('NO_PROXY', '127.0.0.1')
+    monkeypatch.setenv('no_proxy', '127.0.0.1')
+    CountingHandler.connections = 0
+    CountingHandler.requests = 0
+    server = HTTPServer(('127.0.0.1', 0), CountingHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    try:
+        args = dict(DEFAULT_ARGS)
+        args['feature_flags'] = feature_flags
+        rest_api = create_restapi_object(args)
+        rest_api.url = 'http://127.0.0.1:%d/api/' % server.server_address[1]
+        assert rest_api.get_ontap_version_using_rest() == 200
+        for dummy in range(10):
+            records, error = rest_generic.get_0_or_more_records(rest_api, 'storage/volumes', fields='name')
+            assert error is None
+            assert len(records) == 2
+        response, error = rest_generic.post_async(rest_api, 'storage/volumes', {'name': 'vol3'})
+        assert error is None
+        assert response['job_response'] == 'done'
+        # as on process exit, so that the server is not waiting on a kept-alive connection
+        if rest_api.session is not None:
+            rest_api.session.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+    return CountingHandler.connections, CountingHandler.requests
+
+
+def test_connections_opened_per_module_run(monkeypatch):
+    ''' benchmark: count TCP connections opened for a typical module run '''
+    pooled_connections, pooled_requests = run_module_against_local_server(monkeypatch, {})
+    legacy_connections, legacy_requests = run_module_against_local_server(monkeypatch, {'rest_session': False})
+    print('pooled session: %d connections for %d requests' % (pooled_connections, pooled_requests))
+    print('no session: %d connections for %d requests' % (legacy_connections, legacy_requests))
+    assert pooled_requests == legacy_requests == 13
+    assert pooled_connections == 1
+    assert legacy_connections == legacy_requests
+
+
+class MockHttpApiConnection:
+    ''' mimic ansible.module_utils.connection.Connection with the netapp.ontap.ontap httpapi plugin, shared by all tasks '''
+    cache = {}
+    requests = []
+    responses = []
+    options = dict(host='test')
+
+    def __init__(self, socket_path):
+        self.socket_path = socket_path
+
+    def send_request(self, data, **kwargs):
+        self.requests.append(dict(data=data, **kwargs))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def get_option(self, name):
+        return self.options[name]
+
+    def get_cached(self, name):
+        return self.cache.get(name)
+
+    def set_cached(self, name, value):
+        self.cache[name] = value
+        return True
+
+
+def create_httpapi_restapi_object(module_args, responses):
+    MockHttpApiConnection.cache = {}
+    MockHttpApiConnection.requests = []
+    MockHttpApiConnection.responses = list(responses)
+    MockHttpApiConnection.options = dict(host='TEST')
+    module = create_module(MockONTAPModule, module_args).module
+    module._socket_path = '/tmp/ansible-ssh-socket'
+    return netapp_utils.OntapRestAPI(module)
+
+
+@patch('requests.Session.request')
+@patch.object(netapp_utils, 'Connection', MockHttpApiConnection)
+def test_httpapi_send_request(mock_request):
+    ''' requests are sent through the persistent connection, which is already authenticated '''
+    version = {'version': {'generation': 9, 'major': 10, 'minor': 1, 'full': 'ONTAP 9.10.1'}}
+    rest_api = create_httpapi_restapi_object({'hostname': 'test'}, [
+        (200, version, None),
+        (200, {'records': [{'name': 'vol1'}], 'num_records': 1}, None),
+        (404, None, {'message': 'not found', 'code': '4'}),
+    ])
+    assert rest_api.auth_method == 'httpapi'
+    assert rest_api.get_ontap_version_using_rest() == 200
+    assert rest_api.get_ontap_version() == (9, 10, 1)
+    assert rest_api.get('storage/volumes', {'fields': 'name'}) == ({'records': [{'name': 'vol1'}], 'num_records': 1}, None)
+    assert rest_api.send_request('DELETE', 'storage/volumes/1234', None, headers={'accept': 'application/hal+json'}) ==\
+        (404, None, {'message': 'not found', 'code': '4'})
+    requests = MockHttpApiConnection.requests
+    assert [(request['method'], request['api']) for request in requests] ==\
+        [('GET', 'cluster'), ('GET', 'storage/volumes'), ('DELETE', 'storage/volumes/1234')]
+    assert requests[1]['params'] == {'fields': 'name'}
+    assert 'X-Dot-Client-App' in requests[1]['headers']
+    assert requests[2]['headers'] == {'accept': 'application/hal+json'}
+    assert not mock_request.called
+    # the version is cached in the connection, another task does not send a request
+    rest_api = netapp_utils.OntapRestAPI(rest_api.module)
+    assert rest_api.get_ontap_version_using_rest() == 200
+    assert rest_api.get_ontap_version() == (9, 10, 1)
+    assert len(MockHttpApiConnection.requests) == 3
+
+
+@patch('requests.Session.request')
+@patch.object(netapp_utils, 'Connection', MockHttpApiConnection)
+def test_httpapi_errors(mock_request):
+    rest_api = create_httpapi_restapi_object({'hostname': 'test'}, [
+        netapp_utils.AnsibleConnectionError('socket path /tmp/ansible-ssh-socket does not exist or cannot be found.'),
+    ])
+    assert rest_api.send_request('GET', 'cluster', None) == (None, None, 'socket path /tmp/ansible-ssh-socket does not exist or cannot be found.')
+    assert rest_api.errors == ['httpapi error: socket path /tmp/ansible-ssh-socket does not exist or cannot be found.']
+    # file uploads are sent directly, and require credentials
+    assert rest_api.send_request('POST', 'support/ems/filters', None, files={'file': 'data'}) ==\
+        (None, None, 'Error: file upload requires username/password or SSL certificate file(s) with ansible_connection=httpapi.')
+    # the task cannot silently run against another cluster
+    module = create_module(MockONTAPModule, {'hostname': 'other_cluster'}).module
+    module._socket_path = '/tmp/ansible-ssh-socket'
+    msg = expect_and_capture_ansible_exception(netapp_utils.OntapRestAPI, 'fail', module)['msg']
+    assert msg == 'Error: hostname other_cluster does not match the httpapi connection host TEST.  '\
+                  'Set username and password, or SSL certificate file(s), to connect directly.'
+
+
+@patch('requests.Session.request')
+@patch.object(netapp_utils, 'Connection', MockHttpApiConnection)
+@pytest.mark.parametrize('module_args, auth_args', [
+    (DEFAULT_ARGS, dict(auth=('test_user', 'test_pass!'))),
+    (dict(DEFAULT_ARGS, hostname='other_cluster', username='vsadmin'), dict(auth=('vsadmin', 'test_pass!'))),
+    (SINGLE_CERT_ARGS, dict(cert='cert_file')),
+])
+def test_httpapi_ignored_with_module_credentials(mock_request, module_args, auth_args):
+    ''' a task with its own credentials connects directly, as its own user, to its own hostname '''
+    mock_request.return_value = mockResponse(json_data={'text': 'ok'}, status_code=200)
+    rest_api = create_httpapi_restapi_object(module_args, [])
+    assert rest_api.connection is None
+    assert rest_api.ontap_cache is None
+    assert rest_api.get('storage/volumes') == ({'text': 'ok'}, None)
+    assert rest_api.send_request('POST', 'support/ems/filters', None, files={'file': 'data'}) == (200, {'text': 'ok'}, None)
+    for args, kwargs in mock_request.call_args_list:
+        assert args[1].startswith('https://%s/api/' % module_args['hostname'])
+        assert all(kwargs[key] == value for key, value in auth_args.items())
+    assert MockHttpApiConnection.requests == []
+
+
+@patch('requests.Session.request')
+@patch.object(netapp_utils, 'Connection', MockHttpApiConnection)
+def test_httpapi_disabled(mock_request):
+    ''' with the feature flag off, or for peer options, the module connects directly '''
+    mock_request.return_value = mockResponse(json_data={'records': []}, status_code=200)
+    args = dict(DEFAULT_ARGS)
+    args['feature_flags'] = {'rest_httpapi': False}
+    rest_api = create_httpapi_restapi_object(args, [])
+    assert rest_api.connection is None
+    assert rest_api.get('storage/volumes') == ({'records': []}, None)
+    rest_api = netapp_utils.OntapRestAPI(rest_api.module, host_options=dict(DEFAULT_ARGS, use_rest='always', validate_certs=True, http_port=None))
+    assert rest_api.connection is None
+    assert rest_api.get('storage/volumes') == ({'records': []}, None)
+    assert mock_request.call_count == 2
+    assert MockHttpApiConnection.requests == []
+    # credentials are required without the connection
+    module = create_module(MockONTAPModule, {'hostname': 'test'}).module
+    msg = expect_and_capture_ansible_exception(netapp_utils.OntapRestAPI, 'fail', module)['msg']
+    assert msg == 'Error: ONTAP module requires username/password or SSL certificate file(s)'
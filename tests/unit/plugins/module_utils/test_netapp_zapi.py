@@ -14,7 +14,7 @@ from ansible_collections.netapp.ontap.tests.unit.compat.mock import patch
 from ansible_collections.netapp.ontap.tests.unit.plugins.module_utils.ansible_mocks import \
     patch_ansible, create_module, expect_and_capture_ansible_exception, assert_warning_was_raised, print_warnings
 from ansible_collections.netapp.ontap.tests.unit.framework.mock_rest_and_zapi_requests import patch_request_and_invoke, register_responses, get_mock_record
-from ansible_collections.netapp.ontap.tests.unit.framework.zapi_factory import build_raw_xml_response, build_zapi_error, zapi_responses
+from ansible_collections.netapp.ontap.tests.unit.framework.zapi_factory import build_raw_xml_response, build_zapi_error, build_zapi_response, zapi_responses
 import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
 
 if not netapp_utils.has_netapp_lib():
@@ -27,6 +27,9 @@ ZRR = zapi_responses({
     'error_no_vserver': build_zapi_error(12345, 'Vserver API missing vserver parameter.'),
     'error_connection_error': build_zapi_error(12345, 'URLError'),
     'error_other_error': build_zapi_error(12345, 'Some other error message.'),
+    'lun_page_1': build_zapi_response({'attributes-list': [{'lun-info': {'path': 'p1'}}, {'lun-info': {'path': 'p2'}}], 'next-tag': 'tag<1>'}, 2),
+    'lun_page_2': build_zapi_response({'next-tag': 'tag_2'}, 0),
+    'lun_page_3': build_zapi_response({'attributes-list': [{'lun-info': {'path': 'p3'}}]}, 1),
 })
 
 
@@ -83,6 +86,17 @@ def test_get_cserver_none():
     assert cserver is None
 
 
+def test_get_cserver_uses_ontap_cache(tmpdir):
+    ''' validate cluster vserser name is only retrieved once '''
+    register_responses([
+        ('vserver-get-iter', ZRR['cserver']),
+    ])
+    module_args = {'feature_flags': {'ontap_cache': True, 'ontap_cache_dir': str(tmpdir)}}
+    for dummy in range(2):
+        server = netapp_utils.setup_na_ontap_zapi(module=create_ontap_module(DEFAULT_ARGS, module_args))
+        assert netapp_utils.get_cserver(server) == 'cserver'
+
+
 def test_negative_get_cserver():
     ''' validate NaApiError is correctly reported '''
     register_responses([
@@ -372,3 +386,54 @@ def test_parse_response_exceptions_double(mock_parse_response):
     exc = expect_and_capture_ansible_exception(zapi_cx._parse_response, netapp_utils.zapi.etree.XMLSyntaxError, 'response')
     print(exc)
     assert str(exc.value) == 'None (filename, line 101)'
+
+
+def build_lun_get_iter(tag):
+    request = netapp_utils.zapi.NaElement('lun-get-iter')
+    if tag is not None:
+        request.add_new_child('tag', tag, True)
+    return request
+
+
+def test_zapi_get_iter_pages():
+    ''' pages are requested one at a time, following next-tag '''
+    register_responses([
+        ('lun-get-iter', ZRR['lun_page_1']),
+        ('lun-get-iter', ZRR['lun_page_2']),
+        ('lun-get-iter', ZRR['lun_page_3']),
+    ])
+    server = netapp_utils.setup_na_ontap_zapi(module=create_ontap_module(DEFAULT_ARGS))
+    pages = netapp_utils.zapi_get_iter_pages(server, build_lun_get_iter)
+    assert next(pages).get_child_content('next-tag') == 'tag<1>'
+    # the next page is only requested when needed
+    assert len(get_mock_record().requests) == 1
+    assert len(list(pages)) == 2
+    assert not get_mock_record().is_text_in_zapi_request('<tag>', 0, present=False)
+    assert get_mock_record().is_text_in_zapi_request('<tag>tag&lt;1&gt;</tag>', 1)
+    assert get_mock_record().is_text_in_zapi_request('<tag>tag_2</tag>', 2)
+
+
+def test_zapi_get_iter_records():
+    ''' records are yielded page by page, empty pages are skipped '''
+    register_responses([
+        ('lun-get-iter', ZRR['lun_page_1']),
+        ('lun-get-iter', ZRR['lun_page_2']),
+        ('lun-get-iter', ZRR['lun_page_3']),
+    ])
+    server = netapp_utils.setup_na_ontap_zapi(module=create_ontap_module(DEFAULT_ARGS))
+    records = netapp_utils.zapi_get_iter_records(server, build_lun_get_iter)
+    assert [record.get_child_content('path') for record in records] == ['p1', 'p2', 'p3']
+
+
+def test_negative_zapi_get_iter_records():
+    ''' NaApiError is not caught '''
+    register_responses([
+        ('lun-get-iter', ZRR['lun_page_1']),
+        ('lun-get-iter', ZRR['error_other_error']),
+    ])
+    server = netapp_utils.setup_na_ontap_zapi(module=create_ontap_module(DEFAULT_ARGS))
+    records = netapp_utils.zapi_get_iter_records(server, build_lun_get_iter)
+    assert next(records).get_child_content('path') == 'p1'
+    assert next(records).get_child_content('path') == 'p2'
+    error = expect_and_capture_ansible_exception(next, netapp_utils.zapi.NaApiError, records)
+    assert 'Some other error message.' in str(error.value)
@@ -154,3 +154,58 @@ def test_negative_check_for_error_and_job_results_multiple_jobs_error():
     response = {'jobs': 'job_entry', 'num_records': 3}
     response_in, error_in, response_out, error_out = response, None, response, "multiple jobs in progress, can't check status"
     assert rest_response_helpers.check_for_error_and_job_results('cluster', response_in, error_in, rest_api) == (response_out, error_out)
+
+
+class MockOntapRestAPIJobs:
+    def __init__(self, results):
+        self.results = results
+        self.waited_on = None
+
+    def wait_on_jobs(self, jobs, **kwargs):
+        self.waited_on = [job['uuid'] for job in jobs]
+        for result in self.results:
+            if result[0] in self.waited_on:
+                yield result
+
+
+def test_check_for_errors_and_jobs_results():
+    rest_api = MockOntapRestAPIJobs([('uuid2', 'response2', None), ('uuid1', 'response1', None)])
+    responses = [({'job': {'uuid': 'uuid1'}}, None), ({'no_job': 'entry'}, None), ({'jobs': [{'uuid': 'uuid2'}], 'num_records': 1}, None)]
+    results = rest_response_helpers.check_for_errors_and_jobs_results('cluster', responses, rest_api)
+    assert rest_api.waited_on == ['uuid1', 'uuid2']
+    assert results == [
+        ({'job': {'uuid': 'uuid1'}, 'job_response': 'response1'}, None),
+        ({'no_job': 'entry'}, None),
+        ({'jobs': [{'uuid': 'uuid2'}], 'num_records': 1, 'job_response': 'response2'}, None)]
+
+
+def test_negative_check_for_errors_and_jobs_results_collect_all():
+    rest_api = MockOntapRestAPIJobs([('uuid2', None, 'job_error2'), ('uuid1', 'response1', None)])
+    responses = [({'job': {'uuid': 'uuid1'}}, None), (None, 'api_error'), ({'job': {'uuid': 'uuid2'}}, None), ({'job': {'state': 'queued'}}, None)]
+    results = rest_response_helpers.check_for_errors_and_jobs_results('cluster', responses, rest_api)
+    assert results == [
+        ({'job': {'uuid': 'uuid1'}, 'job_response': 'response1'}, None),
+        (None, 'calling: cluster: got api_error.'),
+        ({'job': {'uuid': 'uuid2'}}, "job reported error: job_error2, received {'job': {'uuid': 'uuid2'}}."),
+        ({'job': {'state': 'queued'}}, "job reported error: Job UUID not found - Job: {'state': 'queued'}, received {'job': {'state': 'queued'}}.")]
+    results = rest_response_helpers.check_for_errors_and_jobs_results('cluster', responses[2:3], rest_api, raw_error=True)
+    assert results == [({'job': {'uuid': 'uuid2'}}, 'job_error2')]
+    # one api per response
+    apis = ['storage/volumes', 'storage/volumes/1234']
+    results = rest_response_helpers.check_for_errors_and_jobs_results(apis, [(None, 'error1'), (None, 'error2')], rest_api)
+    assert results == [(None, 'calling: storage/volumes: got error1.'), (None, 'calling: storage/volumes/1234: got error2.')]
+
+
+def test_negative_check_for_errors_and_jobs_results_fail_fast():
+    rest_api = MockOntapRestAPIJobs([('uuid2', None, 'job_error2'), ('uuid1', 'response1', None)])
+    responses = [({'job': {'uuid': 'uuid1'}}, None), ({'job': {'uuid': 'uuid2'}}, None)]
+    results = rest_response_helpers.check_for_errors_and_jobs_results('cluster', responses, rest_api, fail_fast=True, raw_error=True)
+    assert results == [
+        ({'job': {'uuid': 'uuid1'}}, 'not waiting for job uuid1 after an earlier error.'),
+        ({'job': {'uuid': 'uuid2'}}, 'job_error2')]
+    # no wait if an API call already failed
+    rest_api = MockOntapRestAPIJobs([])
+    responses = [({'job': {'uuid': 'uuid1'}}, None), (None, 'api_error')]
+    results = rest_response_helpers.check_for_errors_and_jobs_results('cluster', responses, rest_api, fail_fast=True, raw_error=True)
+    assert rest_api.waited_on is None
+    assert results == [({'job': {'uuid': 'uuid1'}}, 'not waiting for job uuid1 after an earlier error.'), (None, 'api_error')]
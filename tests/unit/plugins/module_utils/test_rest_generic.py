@@ -7,6 +7,7 @@ __metaclass__ = type
 
 import pytest
 import sys
+import threading
 
 from ansible.module_utils import basic
 from ansible_collections.netapp.ontap.tests.unit.compat.mock import patch
@@ -48,6 +49,9 @@ SRR = rest_responses({
             'uuid': 'a1b2c3_job',
             '_links': {'self': {'href': 'some_link'}}
         }}, None),
+    'page_1': (200, {'records': [{'name': 'r1'}], '_links': {'next': {'href': '/api/storage/volumes?start.uuid=2'}}}, None),
+    'page_2': (200, {'records': [{'name': 'r2'}], '_links': {'next': {'href': '/api/storage/volumes?start.uuid=3'}}}, None),
+    'page_3': (200, {'records': [{'name': 'r3'}], '_links': {}}, None),
     'job_failed': (200, {
         'state': 'error',
         'message': 'error_message',
@@ -490,3 +494,60 @@ def test_error_delete_async_with_job(dont_sleep):
     response, error = rest_generic.delete_async(rest_api, 'cluster', 'uuid')
     assert 'job reported error: Expected error - Expected error - Expected error - Expected error, received' in error
     assert response == SRR['accepted_response'][1]
+
+
+def test_get_next_api():
+    assert rest_generic.get_next_api(SRR['page_1'][1]) == '/storage/volumes?start.uuid=2'
+    assert rest_generic.get_next_api(SRR['page_3'][1]) is None
+    assert rest_generic.get_next_api({'records': []}) is None
+    assert rest_generic.get_next_api(None) is None
+
+
+@pytest.mark.parametrize('prefetch', [True, False])
+def test_iter_pages(prefetch):
+    register_responses([
+        ('GET', '/storage/volumes?start.uuid=2', SRR['page_2']),
+        ('GET', '/storage/volumes?start.uuid=3', SRR['page_3']),
+    ], 'test_iter_pages')
+    rest_api = create_restapi_object(DEFAULT_ARGS)
+    pages = list(rest_generic.iter_pages(rest_api, SRR['page_1'][1], prefetch))
+    assert [error for dummy, error in pages] == [None, None, None]
+    assert [page['records'][0]['name'] for page, dummy in pages] == ['r1', 'r2', 'r3']
+
+
+def test_iter_pages_no_next():
+    register_responses([
+    ])
+    rest_api = create_restapi_object(DEFAULT_ARGS)
+    assert list(rest_generic.iter_pages(rest_api, SRR['page_3'][1])) == [(SRR['page_3'][1], None)]
+
+
+def test_iter_pages_stops_on_error():
+    register_responses([
+        ('GET', '/storage/volumes?start.uuid=2', SRR['generic_error']),
+    ])
+    rest_api = create_restapi_object(DEFAULT_ARGS)
+    pages = list(rest_generic.iter_pages(rest_api, SRR['page_1'][1]))
+    assert len(pages) == 2
+    assert pages[1] == (None, 'Expected error')
+
+
+class SlowPagesRestAPI:
+    ''' signals when a GET request is received '''
+    def __init__(self):
+        self.requested = threading.Event()
+
+    def get(self, api, params):
+        self.requested.set()
+        return SRR['page_3'][1], None
+
+
+@pytest.mark.parametrize('prefetch', [True, False])
+def test_iter_pages_prefetch_overlaps_processing(prefetch):
+    ''' with prefetch, the next page is requested while the current page is being processed '''
+    rest_api = SlowPagesRestAPI()
+    pages = rest_generic.iter_pages(rest_api, SRR['page_1'][1], prefetch)
+    page, error = next(pages)
+    assert page['records'][0]['name'] == 'r1'
+    assert rest_api.requested.wait(5 if prefetch else 0.1) is prefetch
+    assert [page['records'][0]['name'] for page, dummy in pages] == ['r3']
@@ -8,13 +8,15 @@ __metaclass__ = type
 import copy
 import pytest
 import sys
+import threading
 
+from ansible_collections.netapp.ontap.tests.unit.compat.mock import patch
 import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
 # pylint: disable=unused-import
 from ansible_collections.netapp.ontap.tests.unit.plugins.module_utils.ansible_mocks import \
     call_main, patch_ansible, create_and_apply, create_module, expect_and_capture_ansible_exception
 from ansible_collections.netapp.ontap.tests.unit.framework.mock_rest_and_zapi_requests import \
-    patch_request_and_invoke, register_responses
+    get_mock_record, patch_request_and_invoke, register_responses
 from ansible_collections.netapp.ontap.tests.unit.framework.rest_factory import rest_error_message, rest_responses
 
 from ansible_collections.netapp.ontap.plugins.modules.na_ontap_export_policy_rule \
@@ -385,3 +387,246 @@ def test_rest_delete_no_index_multiple():
     assert msg in create_and_apply(policy_rule, DEFAULT_ARGS, module_args, fail=True)['msg']
     module_args['force_delete_on_first_match'] = True
     assert call_main(my_main, DEFAULT_ARGS, module_args)['changed']
+
+
+def rule_record(index, clients, ro_rule='sys', rw_rule='sys'):
+    return {
+        'index': index,
+        'clients': [{'match': client} for client in clients],
+        'ro_rule': [ro_rule],
+        'rw_rule': [rw_rule],
+        'superuser': ['any'],
+        'protocols': ['nfs'],
+        'anonymous_user': '65534',
+        'allow_suid': True,
+    }
+
+
+def rules_response(*records):
+    return (200, {'records': list(records), 'num_records': len(records)}, None)
+
+
+def created_response(index):
+    return (200, {'records': [{'index': index}], 'num_records': 1}, None)
+
+
+RULES_ARGS = {
+    'name': 'test',
+    'vserver': 'test',
+    'hostname': 'test',
+    'username': 'test_user',
+    'password': 'test_pass!',
+    'use_rest': 'always',
+    'max_concurrent_jobs': 1,
+}
+
+
+def test_rules_create_policy_and_rules():
+    ''' policy is created, then rules in order, no reindexing needed '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_9_9_1']),
+        ('GET', 'protocols/nfs/export-policies', SRR['zero_records']),
+        ('POST', 'protocols/nfs/export-policies', SRR['success']),
+        ('GET', 'protocols/nfs/export-policies', SRR['get_uuid_policy_id_export_policy']),
+        ('POST', 'protocols/nfs/export-policies/123/rules?return_records=true', created_response(1)),
+        ('POST', 'protocols/nfs/export-policies/123/rules?return_records=true', created_response(2)),
+    ])
+    module_args = {
+        'protocol': 'nfs',
+        'rules': [
+            {'client_match': '10.10.0.0/16', 'ro_rule': 'sys', 'rw_rule': 'sys'},
+            {'client_match': ['10.20.0.0/16', '10.30.0.0/16'], 'ro_rule': 'sys', 'rw_rule': 'none', 'protocol': 'any'},
+        ]
+    }
+    result = create_and_apply(policy_rule, RULES_ARGS, module_args)
+    assert result['changed']
+    assert [(rule['action'], rule['rule_index']) for rule in result['rules']] == [('create', 1), ('create', 2)]
+    assert result['reindex'] == []
+    bodies = [request['json'] for request in get_mock_record().get_requests('POST', 'protocols/nfs/export-policies/123/rules?return_records=true')]
+    assert bodies[0]['protocols'] == ['nfs']
+    assert bodies[1]['protocols'] == ['any']
+    assert bodies[1]['clients'] == [{'match': '10.20.0.0/16'}, {'match': '10.30.0.0/16'}]
+
+
+def test_rules_idempotency():
+    ''' client_match order and case do not matter, a single query is used to read the rule table '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_9_9_1']),
+        ('GET', 'protocols/nfs/export-policies', SRR['get_uuid_policy_id_export_policy']),
+        ('GET', 'protocols/nfs/export-policies/123/rules', rules_response(rule_record(1, ['host1.example.com']),
+                                                                          rule_record(2, ['10.20.0.0/16', '10.10.0.0/16']))),
+    ])
+    module_args = {
+        'rules': [
+            {'client_match': 'HOST1.example.com', 'ro_rule': 'sys', 'rw_rule': 'sys'},
+            {'client_match': '10.10.0.0/16,10.20.0.0/16', 'ro_rule': 'sys', 'rw_rule': 'sys', 'allow_suid': True},
+        ]
+    }
+    result = create_and_apply(policy_rule, RULES_ARGS, module_args)
+    assert not result['changed']
+    assert [(rule['action'], rule['modify'], rule['rule_index']) for rule in result['rules']] == [(None, None, 1), (None, None, 2)]
+    assert result['deleted_rules'] == []
+
+
+def test_rules_modify_delete_create_and_reindex():
+    ''' B is modified and moved to the top, C is deleted, D is created, A and B are swapped using a temporary index '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_9_9_1']),
+        ('GET', 'protocols/nfs/export-policies', SRR['get_uuid_policy_id_export_policy']),
+        ('GET', 'protocols/nfs/export-policies/123/rules', rules_response(rule_record(1, ['a']), rule_record(2, ['b'], rw_rule='none'),
+                                                                          rule_record(3, ['c']))),
+        ('PATCH', 'protocols/nfs/export-policies/123/rules/2', SRR['success']),
+        ('DELETE', 'protocols/nfs/export-policies/123/rules/3', SRR['success']),
+        ('POST', 'protocols/nfs/export-policies/123/rules?return_records=true', created_response(4)),
+        ('PATCH', 'protocols/nfs/export-policies/123/rules/4', SRR['success']),
+        ('PATCH', 'protocols/nfs/export-policies/123/rules/2', SRR['success']),
+        ('PATCH', 'protocols/nfs/export-policies/123/rules/1', SRR['success']),
+        ('PATCH', 'protocols/nfs/export-policies/123/rules/5', SRR['success']),
+    ])
+    module_args = {
+        'rules': [
+            {'client_match': 'b', 'ro_rule': 'sys', 'rw_rule': 'sys'},
+            {'client_match': 'a', 'ro_rule': 'sys', 'rw_rule': 'sys'},
+            {'client_match': 'd', 'ro_rule': 'sys', 'rw_rule': 'sys'},
+        ]
+    }
+    result = create_and_apply(policy_rule, RULES_ARGS, module_args)
+    assert result['changed']
+    assert [(rule['action'], rule['modify'], rule.get('from_rule_index'), rule['rule_index']) for rule in result['rules']] == [
+        (None, {'rw_rule': ['sys']}, 2, 1),
+        (None, None, 1, 2),
+        ('create', None, 4, 3),
+    ]
+    assert result['deleted_rules'] == [{'rule_index': 3, 'client_match': ['c']}]
+    moves = [(4, 3), (2, 5), (1, 2), (5, 1)]
+    assert [(move['from_rule_index'], move['rule_index']) for move in result['reindex']] == moves
+    patches = list(get_mock_record().get_requests('PATCH'))
+    assert patches[0]['json'] == {'rw_rule': ['sys']}
+    assert [request['params']['new_index'] for request in patches[1:]] == [to_index for dummy, to_index in moves]
+
+
+def test_rules_check_mode():
+    ''' the plan is reported, nothing is changed, new rules are assumed to be appended, the index of c is free once deleted '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_9_9_1']),
+        ('GET', 'protocols/nfs/export-policies', SRR['get_uuid_policy_id_export_policy']),
+        ('GET', 'protocols/nfs/export-policies/123/rules', rules_response(rule_record(1, ['a']), rule_record(2, ['c']))),
+    ])
+    module_args = {
+        '_ansible_check_mode': True,
+        'rules': [
+            {'client_match': 'd', 'ro_rule': 'sys', 'rw_rule': 'sys'},
+            {'client_match': 'a', 'ro_rule': 'sys', 'rw_rule': 'sys'},
+        ]
+    }
+    result = create_and_apply(policy_rule, RULES_ARGS, module_args)
+    assert result['changed']
+    assert [(rule['action'], rule.get('from_rule_index'), rule['rule_index']) for rule in result['rules']] == [('create', 3, 1), (None, 1, 2)]
+    assert [(move['from_rule_index'], move['rule_index']) for move in result['reindex']] == [(1, 2), (3, 1)]
+
+
+def test_rules_absent():
+    ''' only exact matches are deleted, other rules are left untouched '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_9_9_1']),
+        ('GET', 'protocols/nfs/export-policies', SRR['get_uuid_policy_id_export_policy']),
+        ('GET', 'protocols/nfs/export-policies/123/rules', rules_response(rule_record(1, ['a']), rule_record(2, ['b'], rw_rule='none'),
+                                                                          rule_record(3, ['c']))),
+        ('DELETE', 'protocols/nfs/export-policies/123/rules/3', SRR['success']),
+        # policy does not exist
+        ('GET', 'cluster', SRR['is_rest_9_9_1']),
+        ('GET', 'protocols/nfs/export-policies', SRR['zero_records']),
+    ])
+    module_args = {
+        'state': 'absent',
+        'rules': [
+            {'client_match': 'b', 'ro_rule': 'sys', 'rw_rule': 'sys'},
+            {'client_match': 'c', 'ro_rule': 'sys', 'rw_rule': 'sys'},
+        ]
+    }
+    result = create_and_apply(policy_rule, RULES_ARGS, module_args)
+    assert result['changed']
+    assert [(rule['action'], rule['rule_index']) for rule in result['rules']] == [(None, None), ('delete', 3)]
+    assert result['reindex'] == []
+    assert not create_and_apply(policy_rule, RULES_ARGS, module_args)['changed']
+
+
+def test_rules_changes_are_concurrent():
+    ''' both modifications are running at the same time '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_9_9_1']),
+        ('GET', 'protocols/nfs/export-policies', SRR['get_uuid_policy_id_export_policy']),
+        ('GET', 'protocols/nfs/export-policies/123/rules', rules_response(rule_record(1, ['a'], rw_rule='none'), rule_record(2, ['b'], rw_rule='none'))),
+    ])
+    barrier = threading.Barrier(2, timeout=10)
+
+    def modify_export_policy_rule_rest(self, params, rule_index, rename=False):
+        barrier.wait()
+
+    module_args = {
+        'max_concurrent_jobs': 2,
+        'rules': [
+            {'client_match': 'a', 'ro_rule': 'sys', 'rw_rule': 'sys'},
+            {'client_match': 'b', 'ro_rule': 'sys', 'rw_rule': 'sys'},
+        ]
+    }
+    with patch.object(policy_rule, 'modify_export_policy_rule_rest', modify_export_policy_rule_rest):
+        result = create_and_apply(policy_rule, RULES_ARGS, module_args)
+    assert [rule['modify'] for rule in result['rules']] == [{'rw_rule': ['sys']}, {'rw_rule': ['sys']}]
+
+
+@pytest.mark.parametrize('indexes', [
+    [1, 2, 3],
+    [3, 2, 1],
+    [2, 3, 1],
+    [5, 9, 1, 2],
+    [4, 3, 2, 1, 7],
+])
+def test_plan_reindex(indexes):
+    ''' each move goes to a free index, and all rules end up at their position '''
+    occupied = set(indexes)
+    current = list(indexes)
+    for from_index, to_index in policy_rule.plan_reindex(indexes):
+        assert to_index not in occupied
+        occupied.remove(from_index)
+        occupied.add(to_index)
+        current[current.index(from_index)] = to_index
+    assert current == list(range(1, len(indexes) + 1))
+    if indexes == [1, 2, 3]:
+        assert policy_rule.plan_reindex(indexes) == []
+
+
+def test_negative_rules():
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_9_9_1']),
+        ('GET', 'cluster', SRR['is_rest_9_9_1']),
+        ('GET', 'cluster', SRR['is_rest_9_8_0']),
+        ('GET', 'cluster', SRR['is_rest_9_9_1']),
+        ('GET', 'protocols/nfs/export-policies', SRR['get_uuid_policy_id_export_policy']),
+        ('GET', 'protocols/nfs/export-policies/123/rules', SRR['generic_error']),
+        ('GET', 'cluster', SRR['is_rest_9_9_1']),
+        ('GET', 'protocols/nfs/export-policies', SRR['get_uuid_policy_id_export_policy']),
+        ('GET', 'protocols/nfs/export-policies/123/rules', rules_response(rule_record(1, ['a']))),
+        ('DELETE', 'protocols/nfs/export-policies/123/rules/1', SRR['success']),
+        ('POST', 'protocols/nfs/export-policies/123/rules?return_records=true', SRR['generic_error']),
+    ])
+    rules = [{'client_match': 'b', 'ro_rule': 'sys', 'rw_rule': 'sys'}]
+    error = 'parameters are mutually exclusive: rules|client_match'
+    assert error in call_main(my_main, RULES_ARGS, {'rules': rules, 'client_match': 'b'}, fail=True)['msg']
+    error = 'Error: rules option requires REST.  use_rest: never.'
+    assert call_main(my_main, RULES_ARGS, {'rules': rules, 'use_rest': 'never'}, fail=True)['msg'] == error
+    error = 'Error: max_concurrent_jobs must be 1 or more, got: 0.'
+    assert call_main(my_main, RULES_ARGS, {'rules': rules, 'max_concurrent_jobs': 0}, fail=True)['msg'] == error
+    error = "Error: client_match, ro_rule, and rw_rule are required in each rules entry, missing rw_rule in: {'client_match': 'b', 'ro_rule': 'sys'}"
+    assert call_main(my_main, RULES_ARGS, {'rules': [{'client_match': 'b', 'ro_rule': 'sys'}]}, fail=True)['msg'] == error
+    error = "Error: chown_mode in rules entry {'client_match': 'b', 'ro_rule': 'sys', 'rw_rule': 'sys', 'chown_mode': 'restricted'} "\
+            "requires ONTAP 9.9.1 or later."
+    assert call_main(my_main, RULES_ARGS, {'rules': [dict(rules[0], chown_mode='restricted')]}, fail=True)['msg'] == error
+    error = 'Error on fetching export policy rules: calling: protocols/nfs/export-policies/123/rules: got Expected error.'
+    assert call_main(my_main, RULES_ARGS, {'rules': rules}, fail=True)['msg'] == error
+    result = call_main(my_main, RULES_ARGS, {'rules': rules}, fail=True)
+    error = 'Error managing export policy rules: creating rule b: Error on creating export policy rule: '\
+            'calling: protocols/nfs/export-policies/123/rules?return_records=true: got Expected error.'
+    assert result['msg'] == error
+    assert result['deleted_rules'] == [{'rule_index': 1, 'client_match': ['a']}]
+    assert 'Expected error' in result['rules'][0]['error']
@@ -5,8 +5,10 @@ from __future__ import (absolute_import, division, print_function)
 
 __metaclass__ = type
 
+import gc
 import pytest
 import sys
+import time
 
 import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
 # pylint: disable=unused-import
@@ -648,6 +650,90 @@ def test_match_acl_with_acls():
     assert error in expect_and_capture_ansible_exception(my_obj.match_acl_with_acls, 'fail', acl, fd_prop_acls + fd_prop_acls)['msg']
 
 
+def test_index_acls():
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_9_10_1']),
+    ])
+    my_obj = create_module(my_module, DEFAULT_ARGS)
+    acls = [
+        build_acl('user01', apply_to={'this_folder': True, 'files': False}),
+        build_acl('user01', apply_to={'this_folder': True}),
+        build_acl('user01', access='access_deny', apply_to={'this_folder': True}),
+        build_acl('user02', inherited=True),
+    ]
+    index = my_obj.index_acls(acls)
+    # inherited ACLs are not indexed
+    assert len(index) == 3
+    # apply_to is compared as a dict, the order of keys does not matter
+    assert my_obj.match_acl_in_index(build_acl('user01', apply_to={'files': False, 'this_folder': True}), index) == acls[0]
+    assert my_obj.match_acl_in_index(build_acl('user01', access='access_deny'), index) == acls[2]
+    assert my_obj.match_acl_in_index(build_acl('user02'), index) is None
+    # access_control defaults to file_directory
+    acl = build_acl('user01')
+    del acl['access_control']
+    assert my_obj.match_acl_in_index(acl, index) == acls[1]
+
+
+def build_acls_for_benchmark(count):
+    """ count current ACLs and count desired ACLs, for each group of ten users:
+        - user 0 is replaced with a new user: one POST and one DELETE,
+        - user 1 has different advanced rights: one PATCH,
+        - user 9 is inherited, and can't be matched: one POST,
+        - the other users are unchanged.
+    """
+    current, desired = [], []
+    for index in range(count):
+        current.append(build_acl('user%05d' % index, inherited=(index % 10 == 9)))
+        if index % 10 == 0:
+            desired.append(build_acl('new_user%05d' % index))
+        elif index % 10 == 1:
+            desired.append(build_acl('user%05d' % index, advanced_rights={'full_control': False}))
+        else:
+            desired.append(build_acl('user%05d' % index))
+    return current, desired
+
+
+def time_get_acl_actions_on_modify(my_obj, counts, repeat=3):
+    """ return the best CPU time for each count, and the actions for the largest count
+        runs for different counts are interleaved, so that they are equally affected by the load on the system
+    """
+    acls = dict((count, build_acls_for_benchmark(count)) for count in counts)
+    # CPU time is not affected by other processes competing for the CPU, python 2.7 falls back to wall clock time
+    clock = getattr(time, 'process_time', time.time)
+    timings = {}
+    actions = None
+    gc.disable()
+    try:
+        for dummy in range(repeat):
+            for count in counts:
+                current, desired = acls[count]
+                my_obj.parameters['acls'] = desired
+                start = clock()
+                actions = my_obj.get_acl_actions_on_modify({'acls': desired}, {'acls': current})
+                elapsed = clock() - start
+                timings[count] = min(timings.get(count, elapsed), elapsed)
+    finally:
+        gc.enable()
+    return timings, actions
+
+
+def test_get_acl_actions_on_modify_10k_aces():
+    ''' benchmark: 1k and 10k ACEs - the elapsed time per ACE should not grow with the number of ACEs '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_9_10_1']),
+    ])
+    my_obj = create_module(my_module, DEFAULT_ARGS)
+    timings, actions = time_get_acl_actions_on_modify(my_obj, (1000, 10000))
+    for count in sorted(timings):
+        print('get_acl_actions_on_modify: %6d ACEs in %.4f s - %.2f us/ACE' % (count, timings[count], timings[count] * 1000000 / count))
+    assert len(actions['post-acls']) == 2000
+    assert len(actions['patch-acls']) == 1000
+    assert len(actions['delete-acls']) == 1000
+    assert all(acl['user'].endswith('0') for acl in actions['delete-acls'])
+    # linear scaling is a 10x ratio, quadratic scaling would be closer to 100x.  Allow for a lot of noise.
+    assert timings[10000] < timings[1000] * 40
+
+
 def test_validate_changes():
     """ verify nothing needs to be changed """
     register_responses([
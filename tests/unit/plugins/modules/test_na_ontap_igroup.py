@@ -7,6 +7,7 @@ from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 import pytest
 import sys
+import threading
 import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
 # pylint: disable=unused-import
 from ansible_collections.netapp.ontap.tests.unit.plugins.module_utils.ansible_mocks import set_module_args, \
@@ -212,7 +213,15 @@ SRR = rest_responses({
              protocol='fcp',
              os_type='aix')
     ], num_records=1), None),
-    'one_record_uuid': (200, dict(records=[dict(uuid='a1b2c3')], num_records=1), None)
+    'one_record_uuid': (200, dict(records=[dict(uuid='a1b2c3')], num_records=1), None),
+    'three_initiators_record': (200, dict(records=[
+        dict(uuid='a1b2c3',
+             name='test',
+             svm=dict(name='vserver'),
+             initiators=[{'name': 'del1'}, {'name': 'del2'}, {'name': 'del3'}],
+             protocol='fcp',
+             os_type='aix')
+    ], num_records=1), None),
 })
 
 
@@ -413,3 +422,71 @@ def test_negative_igroups_require_9_9():
     }
     msg = "requires ONTAP 9.9.1 or later and REST must be enabled"
     assert msg in create_module(igroup, DEFAULT_ARGS_COPY, args, fail=True)['msg']
+
+
+def test_negative_modify_initiator_zapi():
+    ''' all initiators are removed, errors are reported together '''
+    register_responses([
+        ('igroup-get-iter', ZRR['igroup_with_initiator_info']),
+        ('igroup-remove', ZRR['error']),
+        ('igroup-remove', ZRR['success']),
+    ])
+    msg = "removing init1: Error modifying igroup initiator test: NetApp API failed. Reason - 12345:synthetic error for UT purpose"
+    assert msg in create_and_apply(igroup, DEFAULT_ARGS, {'initiator_names': ''}, fail=True)['msg']
+
+
+def test_successful_remove_initiators_rest():
+    ''' one request per initiator '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_9_9_1']),
+        ('GET', 'protocols/san/igroups', SRR['three_initiators_record']),
+        ('DELETE', 'protocols/san/igroups/a1b2c3/initiators/del1', SRR['success']),
+        ('DELETE', 'protocols/san/igroups/a1b2c3/initiators/del2', SRR['success']),
+        ('DELETE', 'protocols/san/igroups/a1b2c3/initiators/del3', SRR['success']),
+        ('POST', 'protocols/san/igroups/a1b2c3/initiators', SRR['success']),
+        ('PATCH', 'protocols/san/igroups/a1b2c3', SRR['success'])
+    ])
+    assert create_and_apply(igroup, DEFAULT_ARGS, {'use_rest': 'always', 'max_concurrent_jobs': 1})['changed']
+
+
+def test_negative_remove_initiators_rest():
+    ''' all requests are sent, errors are reported together '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_9_9_1']),
+        ('GET', 'protocols/san/igroups', SRR['three_initiators_record']),
+        ('DELETE', 'protocols/san/igroups/a1b2c3/initiators/del1', SRR['generic_error']),
+        ('DELETE', 'protocols/san/igroups/a1b2c3/initiators/del2', SRR['success']),
+        ('DELETE', 'protocols/san/igroups/a1b2c3/initiators/del3', SRR['generic_error']),
+    ])
+    msg = "Error: 2 requests failed out of 3: removing del1: calling: protocols/san/igroups/a1b2c3/initiators/del1: got Expected error. - "\
+          "removing del3: calling: protocols/san/igroups/a1b2c3/initiators/del3: got Expected error."
+    assert msg in create_and_apply(igroup, DEFAULT_ARGS, {'use_rest': 'always', 'max_concurrent_jobs': 1}, fail=True)['msg']
+
+
+def test_remove_initiators_rest_concurrently():
+    ''' requests are sent in parallel, up to max_concurrent_jobs '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_9_9_1']),
+        ('GET', 'protocols/san/igroups', SRR['three_initiators_record']),
+    ])
+    my_obj = create_module(igroup, DEFAULT_ARGS, {'use_rest': 'always', 'max_concurrent_jobs': 3})
+    barrier = threading.Barrier(3, timeout=10)
+    deleted = []
+
+    def delete(uuid, option, name):
+        # would time out if the three requests were not running at the same time
+        barrier.wait()
+        deleted.append(name)
+        return 'error' if name == 'del2' else None
+
+    my_obj.delete_initiator_or_igroup_rest = delete
+    current = my_obj.get_igroup_rest('test')
+    with pytest.raises(AnsibleFailJson) as exc:
+        my_obj.remove_initiators_or_igroups('a1b2c3', 'initiator_names', current['initiator_names'], current['name_to_uuid']['initiator_names'])
+    assert sorted(deleted) == ['del1', 'del2', 'del3']
+    assert exc.value.args[0]['msg'] == 'Error: removing del2: error'
+
+
+def test_negative_max_concurrent_jobs():
+    error = 'Error: max_concurrent_jobs must be 1 or more, got: 0.'
+    assert create_module(igroup, DEFAULT_ARGS, {'max_concurrent_jobs': 0}, fail=True)['msg'] == error
@@ -6,8 +6,12 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
+import json
 import pytest
 import sys
+import threading
+import time
+import weakref
 
 from ansible_collections.netapp.ontap.tests.unit.compat.mock import patch
 import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
@@ -17,7 +21,14 @@ from ansible_collections.netapp.ontap.tests.unit.framework.zapi_factory import b
 from ansible_collections.netapp.ontap.tests.unit.plugins.module_utils.ansible_mocks import\
     assert_warning_was_raised, expect_and_capture_ansible_exception, call_main, create_module, patch_ansible, print_warnings
 from ansible_collections.netapp.ontap.plugins.modules.na_ontap_info import NetAppONTAPGatherInfo as my_module, main as my_main
-from ansible_collections.netapp.ontap.plugins.modules.na_ontap_info import convert_keys as info_convert_keys, __finditem as info_finditem
+from ansible_collections.netapp.ontap.plugins.modules.na_ontap_info import __finditem as info_finditem
+from ansible_collections.netapp.ontap.plugins.modules.na_ontap_info import SubsetError, zapi_to_dict
+
+try:
+    import xmltodict
+    HAS_XMLTODICT = True
+except ImportError:
+    HAS_XMLTODICT = False
 
 if not netapp_utils.has_netapp_lib():
     pytestmark = pytest.mark.skip('skipping as missing required netapp_lib')
@@ -109,6 +120,7 @@ ZRR = zapi_responses({
     'aggr_efficiency_info': build_zapi_response(aggr_efficiency_info('v1')),
     'aggr_efficiency_info_no_node': build_zapi_response(aggr_efficiency_info(None)),
     'lun_info': build_zapi_response(lun_info('p1')),
+    'ontapi_version_160': build_zapi_response({'minor-version': '160'}),
     'lun_info_next_2': build_zapi_response(lun_info('p2', True)),
     'lun_info_next_3': build_zapi_response(lun_info('p3', True)),
     'lun_info_next_4': build_zapi_response(lun_info('p4', True)),
@@ -205,10 +217,16 @@ def test_ontapi_error():
     '''test ontapi will raise zapi error'''
     register_responses([
         ('ZAPI', 'system-get-ontapi-version', ZRR['error']),
+        ('ZAPI', 'system-get-ontapi-version', ZRR['error']),
     ])
     obj = create_module(my_module, DEFAULT_ARGS)
     error = zapi_error_message('Error calling API system-get-ontapi-version')
     assert error in expect_and_capture_ansible_exception(obj.ontapi, 'fail')['msg']
+    # in a worker, the error is reported to the main thread
+    obj.worker_context.active = True
+    exc = expect_and_capture_ansible_exception(obj.ontapi, SubsetError).value
+    assert error in exc.args[0]
+    assert 'Traceback' in exc.args[1]['exception']
 
 
 def test_call_api_error():
@@ -452,55 +470,13 @@ def test_check_underscore():
     assert obj.warnings == list()
 
 
-def d2us(astr):
-    return str.replace(astr, '-', '_')
-
-
-def test_convert_keys_string():
-    ''' no conversion '''
-    register_responses([
-    ])
-    key = 'a-b-c'
-    assert info_convert_keys(key) == key
-
-
-def test_convert_keys_tuple():
-    ''' no conversion '''
-    register_responses([
-    ])
-    key = 'a-b-c'
-    anobject = (key, key)
-    assert info_convert_keys(anobject) == anobject
-
-
-def test_convert_keys_list():
-    ''' no conversion '''
-    register_responses([
-    ])
-    key = 'a-b-c'
-    anobject = [key, key]
-    assert info_convert_keys(anobject) == anobject
-
-
-def test_convert_keys_simple_dict():
-    ''' conversion of keys '''
-    register_responses([
-    ])
-    key = 'a-b-c'
-    anobject = {key: 1}
-    assert list(info_convert_keys(anobject).keys())[0] == d2us(key)
-
-
-def test_convert_keys_list_of_dict():
-    ''' conversion of keys '''
-    register_responses([
-    ])
-    key = 'a-b-c'
-    anobject = [{key: 1}, {key: 2}]
-    converted = info_convert_keys(anobject)
-    for adict in converted:
-        for akey in adict:
-            assert akey == d2us(key)
+def d2us(value):
+    ''' replace hyphens with underscores in dict keys, at every level '''
+    if isinstance(value, dict):
+        return dict((key.replace('-', '_'), d2us(val)) for key, val in value.items())
+    if isinstance(value, list):
+        return [d2us(val) for val in value]
+    return value
 
 
 def test_set_error_flags_error_n():
@@ -740,3 +716,255 @@ def test_continue_on_error():
     error = {'error': zapi_error_message('Error calling API license-v2-list-info')}
     assert info is not None
     assert info['ontap_info']['license_info'] == error
+
+
+MIXED_XML = b"""<results xmlns="http://www.netapp.com/filer/admin" status="passed"><attributes-list>
+  <volume-attributes>
+    <volume-id-attributes>
+      <name>vol1</name>
+      <owning-vserver-name>svm1</owning-vserver-name>
+      <junction-path/>
+    </volume-id-attributes>
+    <volume-space-attributes><size>1024</size></volume-space-attributes>
+    <aggr-list><aggr-name>aggr1</aggr-name><aggr-name>aggr2</aggr-name><aggr-name>aggr3</aggr-name></aggr-list>
+    <!-- a comment -->
+    <comment>  some text &amp; more  </comment>
+    <mixed>text before<child>c1</child>text after</mixed>
+    <empty-list></empty-list>
+  </volume-attributes>
+</attributes-list></results>"""
+
+
+@pytest.mark.skipif(not HAS_XMLTODICT, reason='xmltodict is used as a reference')
+@pytest.mark.parametrize('translate_keys', [False, True])
+def test_zapi_to_dict_matches_xmltodict(translate_keys):
+    ''' single pass conversion reports the same data as the xmltodict + json round trip '''
+    results = netapp_utils.zapi.NaElement(netapp_utils.zapi.etree.XML(MIXED_XML))
+    for child in results.get_child_by_name('attributes-list').get_children():
+        expected = json.loads(json.dumps(xmltodict.parse(child.to_string(), xml_attribs=False)))
+        if translate_keys:
+            expected = {'volume-attributes': d2us(expected['volume-attributes'])}
+        tag, value = zapi_to_dict(child._element, translate_keys)
+        assert {tag: value} == expected
+        assert value['aggr_list' if translate_keys else 'aggr-list']['aggr_name' if translate_keys else 'aggr-name'] == ['aggr1', 'aggr2', 'aggr3']
+        assert value['mixed'] == {'child': 'c1', '#text': 'text beforetext after'}
+
+
+def lun_records(count, start=0, next_tag=None):
+    ''' synthetic lun-get-iter response with count records '''
+    record = '<lun-info><path>/vol/vol%d/lun</path><vserver>svm1</vserver><serial-number>z6CcD+SK5mPb</serial-number>'\
+             '<size>1024</size><online>true</online><qos-policy-group/></lun-info>'
+    next_tag = '' if next_tag is None else '<next-tag>%s</next-tag>' % next_tag
+    xml = '<results xmlns="http://www.netapp.com/filer/admin" status="passed"><attributes-list>%s</attributes-list>'\
+          '<num-records>%d</num-records>%s</results>' % (''.join(record % index for index in range(start, start + count)), count, next_tag)
+    return netapp_utils.zapi.NaElement(netapp_utils.zapi.etree.XML(xml.encode()))
+
+
+def time_get_generic_get_iter(obj, response, repeat=1):
+    best = None
+    for dummy in range(repeat):
+        with patch.object(obj, 'get_api_pages', return_value=iter([response])):
+            start = time.time()
+            info = obj.get_generic_get_iter('lun-get-iter', attribute='lun-info', key_fields=('vserver', 'path'))
+            elapsed = time.time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, info
+
+
+def test_get_generic_get_iter_scales_linearly():
+    ''' benchmark: 1k, 10k, 100k records - the elapsed time per record should not grow with the number of records '''
+    register_responses([
+    ])
+    obj = create_module(my_module, DEFAULT_ARGS)
+    timings = {}
+    for count in (1000, 10000, 100000):
+        elapsed, info = time_get_generic_get_iter(obj, lun_records(count), repeat=3 if count < 100000 else 1)
+        assert len(info) == count
+        assert info['svm1:/vol/vol%d/lun' % (count - 1)]['serial_number'] == 'z6CcD+SK5mPb'
+        assert info['svm1:/vol/vol0/lun']['qos_policy_group'] is None
+        timings[count] = elapsed
+        print('get_generic_get_iter: %6d records in %.3f s - %.2f us/record' % (count, elapsed, elapsed * 1000000 / count))
+    # linear scaling is a 100x ratio, quadratic scaling would be closer to 10000x.  Allow for a lot of noise.
+    assert timings[100000] < timings[1000] * 400
+
+
+class PagedServer:
+    ''' fake ZAPI server, returning fresh pages, and checking the previous page was released '''
+    def __init__(self, pages, records_per_page):
+        self.pages = pages
+        self.records_per_page = records_per_page
+        self.previous_page = None
+        self.requests = []
+
+    def invoke_successfully(self, request, enable_tunneling):
+        assert self.previous_page is None or self.previous_page() is None, 'previous page is still referenced'
+        self.requests.append(request.to_string())
+        index = len(self.requests)
+        page = lun_records(self.records_per_page, (index - 1) * self.records_per_page, 'tag_%d' % index if index < self.pages else None)
+        self.previous_page = weakref.ref(page)
+        return page
+
+
+def test_get_generic_get_iter_streams_pages():
+    ''' pages are converted as they are received, and released before the next page is requested '''
+    register_responses([
+    ])
+    obj = create_module(my_module, DEFAULT_ARGS)
+    obj.server = PagedServer(5, 100)
+    info = obj.get_generic_get_iter('lun-get-iter', attribute='lun-info', key_fields=('vserver', 'path'))
+    assert len(info) == 500
+    assert 'svm1:/vol/vol499/lun' in info
+    assert len(obj.server.requests) == 5
+    assert b'<tag>' not in obj.server.requests[0]
+    assert b'<tag>tag_4</tag>' in obj.server.requests[4]
+
+
+def test_dependency_levels():
+    ''' dependencies are gathered first, even if not requested '''
+    register_responses([
+    ])
+    obj = create_module(my_module, DEFAULT_ARGS)
+    levels = obj.get_dependency_levels(['net_ifgrp_info', 'lun_info'])
+    assert len(levels) == 2
+    assert sorted(levels[0]) == ['lun_info', 'net_port_info']
+    assert levels[1] == ['net_ifgrp_info']
+    assert obj.get_dependency_levels([]) == []
+    obj.info_subsets['net_port_info']['depends_on'] = ['net_ifgrp_info']
+    error = 'Internal error: circular dependency: net_ifgrp_info -> net_port_info -> net_ifgrp_info'
+    assert expect_and_capture_ansible_exception(obj.get_dependency_levels, 'fail', ['net_ifgrp_info'])['msg'] == error
+
+
+def test_net_ifgrp_info_uses_net_port_info():
+    ''' net_port_info is gathered once, and only reported if requested '''
+    register_responses([
+        ('ZAPI', 'system-get-ontapi-version', ZRR['success']),
+        ('ZAPI', 'net-port-get-iter', ZRR['net_port_info_with_ifgroup']),
+        ('ZAPI', 'net-port-ifgrp-get', ZRR['net_ifgrp_info_0']),
+        ('ZAPI', 'net-port-ifgrp-get', ZRR['net_ifgrp_info_1']),
+        ('ZAPI', 'system-get-ontapi-version', ZRR['success']),
+        ('ZAPI', 'net-port-get-iter', ZRR['net_port_info_with_ifgroup']),
+        ('ZAPI', 'net-port-ifgrp-get', ZRR['net_ifgrp_info_0']),
+        ('ZAPI', 'net-port-ifgrp-get', ZRR['net_ifgrp_info_1']),
+    ])
+    obj = create_module(my_module, DEFAULT_ARGS)
+    info = obj.get_all(['net_ifgrp_info', 'net_port_info'])
+    assert sorted(info['net_ifgrp_info']) == ['node_0:ifgrp_0', 'node_1:ifgrp_1']
+    assert sorted(info['net_port_info']) == ['node_0:port_0', 'node_1:port_1']
+    obj = create_module(my_module, DEFAULT_ARGS)
+    info = obj.get_all(['net_ifgrp_info'])
+    assert sorted(info['net_ifgrp_info']) == ['node_0:ifgrp_0', 'node_1:ifgrp_1']
+    assert 'net_port_info' not in info
+
+
+CONCURRENT_SUBSETS = ['net_ifgrp_info', 'lun_info', 'aggr_efficiency_info', 'net_port_info', 'cluster_node_info']
+
+
+class FakeZAPIServer:
+    ''' answer each ZAPI independently of the order of the calls, and record which connection was used '''
+    def __init__(self, responses, barrier=None):
+        self.responses = responses
+        self.barrier = barrier
+        self.servers = set()
+        self.lock = threading.Lock()
+
+    def invoke_elem(self, server, na_element, enable_tunneling=False):
+        with self.lock:
+            self.servers.add(id(server))
+        if self.barrier is not None and na_element.get_name() != 'system-get-ontapi-version':
+            # with a sequential loop, the first call would wait forever for the second one
+            self.barrier.wait()
+        return self.responses.get(na_element.get_name(), ZRR['no_records'])[0]
+
+
+def gather_with_fake_server(module_args, responses, barrier=None, fail=False):
+    fake_server = FakeZAPIServer(responses, barrier)
+
+    def invoke_elem(server, na_element, enable_tunneling=False):
+        return fake_server.invoke_elem(server, na_element, enable_tunneling)
+
+    # a plain function is bound to each server, unlike the framework mock
+    with patch.object(netapp_utils.OntapZAPICx, 'invoke_elem', invoke_elem):
+        return call_main(my_main, DEFAULT_ARGS, module_args, fail=fail), fake_server
+
+
+def test_concurrent_subsets_match_sequential_results():
+    register_responses([
+    ])
+    responses = {
+        'system-get-ontapi-version': ZRR['ontapi_version_160'],
+        'net-port-get-iter': ZRR['net_port_info_with_ifgroup'],
+        'net-port-ifgrp-get': ZRR['net_ifgrp_info_0'],
+        'lun-get-iter': ZRR['lun_info'],
+        'aggr-efficiency-get-iter': ZRR['aggr_efficiency_info'],
+    }
+    module_args = {'gather_subset': CONCURRENT_SUBSETS}
+    sequential, fake_server = gather_with_fake_server(module_args, responses)
+    assert len(fake_server.servers) == 1
+    module_args['max_concurrent_subsets'] = 3
+    concurrent, fake_server = gather_with_fake_server(module_args, responses)
+    assert concurrent['ontap_info'] == sequential['ontap_info']
+    assert sorted(concurrent['ontap_info']['net_ifgrp_info']) == ['node_0:ifgrp_0']
+    assert concurrent['ontap_info']['lun_info']['svm1:p1']['naa_id'] == 'naa.600a0980' + '7a364363442b534b356d5062'
+    # main connection, and one connection for each worker
+    assert len(fake_server.servers) == 4
+
+
+def test_concurrent_subsets_run_in_parallel():
+    register_responses([
+    ])
+    module_args = {'gather_subset': ['lun_info', 'aggr_efficiency_info'], 'max_concurrent_subsets': 2}
+    info, fake_server = gather_with_fake_server(module_args, {'system-get-ontapi-version': ZRR['ontapi_version_160']}, threading.Barrier(2, timeout=10))
+    assert info['ontap_info']['lun_info'] is None
+    assert info['ontap_info']['aggr_efficiency_info'] is None
+
+
+def test_concurrent_subsets_report_first_error_in_order():
+    register_responses([
+    ])
+    responses = {
+        'system-get-ontapi-version': ZRR['ontapi_version_160'],
+        'lun-get-iter': ZRR['error'],
+        'aggr-efficiency-get-iter': ZRR['error'],
+        'net-port-get-iter': ZRR['error'],
+    }
+    module_args = {'gather_subset': CONCURRENT_SUBSETS}
+    sequential, dummy = gather_with_fake_server(module_args, responses, fail=True)
+    module_args['max_concurrent_subsets'] = 5
+    concurrent, dummy = gather_with_fake_server(module_args, responses, fail=True)
+    assert concurrent['msg'] == sequential['msg']
+    assert concurrent['msg'].startswith('Error calling API ')
+    # the traceback is reported as in a sequential run
+    assert 'exception' in sequential
+    assert concurrent['exception'].startswith('Traceback')
+    # errors are reported with continue_on_error
+    module_args['continue_on_error'] = 'always'
+    responses['lun-get-iter'] = ZRR['lun_info']
+    responses['net-port-get-iter'] = ZRR['net_port_info']
+    info, dummy = gather_with_fake_server(module_args, responses)
+    assert info['ontap_info']['aggr_efficiency_info'] == {'error': zapi_error_message('Error calling API aggr-efficiency-get-iter')}
+    assert sorted(info['ontap_info']['lun_info']) == ['svm1:p1']
+    # unexpected exception
+    responses['lun-get-iter'] = (None, None)
+    info, dummy = gather_with_fake_server(module_args, responses, fail=True)
+    assert info['msg'].startswith('Error: unexpected exception gathering lun_info: ')
+
+
+def test_concurrent_ontapi_subsets():
+    register_responses([
+    ])
+    responses = {
+        'system-get-ontapi-version': ZRR['ontapi_version_160'],
+        'lun-get-iter': ZRR['lun_info'],
+    }
+    module_args = {'gather_subset': ['ontap_version', 'ontapi_version', 'lun_info'], 'max_concurrent_subsets': 3}
+    info, fake_server = gather_with_fake_server(module_args, responses)
+    assert info['ontap_info']['ontap_version'] == info['ontap_info']['ontapi_version'] == '160'
+    # main connection, and one connection for each worker
+    assert len(fake_server.servers) == 4
+
+
+def test_negative_max_concurrent_subsets():
+    register_responses([
+    ])
+    msg = 'Error: max_concurrent_subsets must be 1 or more, got: 0.'
+    assert call_main(my_main, DEFAULT_ARGS, {'max_concurrent_subsets': 0}, fail=True)['msg'] == msg
@@ -8,14 +8,15 @@ __metaclass__ = type
 import copy
 import pytest
 import sys
+import threading
 
 from ansible_collections.netapp.ontap.tests.unit.compat.mock import patch
 import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
 # pylint: disable=unused-import
 from ansible_collections.netapp.ontap.tests.unit.plugins.module_utils.ansible_mocks import assert_no_warnings, \
-    assert_warning_was_raised, print_warnings, call_main, create_module, expect_and_capture_ansible_exception, patch_ansible
+    assert_warning_was_raised, print_warnings, call_main, create_and_apply, create_module, expect_and_capture_ansible_exception, patch_ansible
 from ansible_collections.netapp.ontap.tests.unit.framework.mock_rest_and_zapi_requests import\
-    patch_request_and_invoke, register_responses
+    get_mock_record, patch_request_and_invoke, register_responses
 from ansible_collections.netapp.ontap.tests.unit.framework.rest_factory import rest_error_message, rest_responses
 from ansible_collections.netapp.ontap.tests.unit.framework.zapi_factory import build_zapi_error, build_zapi_response, zapi_responses
 from ansible_collections.netapp.ontap.plugins.modules.na_ontap_interface \
@@ -95,7 +96,9 @@ def test_module_fail_when_required_args_missing():
     }
     error = create_module(interface_module, module_args, fail=True)['msg']
     assert 'missing required arguments:' in error
-    assert 'interface_name' in error
+    module_args['hostname'] = 'hostname'
+    error = create_module(interface_module, module_args, fail=True)['msg']
+    assert 'one of the following is required: interface_name, interfaces' in error
 
 
 def test_create_error_missing_param():
@@ -512,6 +515,15 @@ SRR = rest_responses({
         {'name': 'node2', 'uuid': 'uuid2', 'cluster_interfaces': [{'ip': {'address': '10.10.10.2'}}]},
         {'name': 'node3', 'uuid': 'uuid2', 'cluster_interfaces': [{'ip': {'address': '10.10.10.2'}}]}
     ]}, None),
+    'ports': (200, {'records': [
+        {'name': 'e0c', 'node': {'name': 'node2'}},
+        {'name': 'e0d', 'node': {'name': 'node2'}},
+        {'name': 'e0c', 'node': {'name': 'node3'}},
+    ]}, None),
+    'broadcast_domains': (200, {'records': [
+        {'name': 'bd1', 'ipspace': {'name': 'Default'}},
+    ]}, None),
+    'ipspaces': (200, {'records': [{'name': 'Default'}, {'name': 'ips1'}]}, None),
 }, False)
 
 
@@ -1776,3 +1788,212 @@ def test_throw_warnings_modify_rename():
     # current record name is 'node2_abc_if' and interface_name does not have node name in it.
     # adjust to avoid rename attempt.
     assert_warning_was_raised('adjusting name from abc_if to node2_abc_if')
+
+
+INTERFACES_ARGS = {
+    'hostname': '10.10.10.10',
+    'username': 'admin',
+    'password': 'password',
+    'use_rest': 'always',
+    'vserver': 'vserver',
+    'interface_type': 'ip',
+    'netmask': '255.255.192.0',
+    'max_concurrent_jobs': 1,
+}
+
+
+def test_rest_interfaces_create_and_modify():
+    ''' the topology is read once, then one interface is created and another one modified '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_9_10_1']),
+        ('GET', 'cluster/nodes', SRR['nodes_two_records']),
+        ('GET', 'network/ip/interfaces', SRR['one_record_vserver']),
+        ('GET', 'network/ethernet/ports', SRR['ports']),
+        ('POST', 'network/ip/interfaces', SRR['success']),
+        ('PATCH', 'network/ip/interfaces/54321', SRR['success']),
+    ])
+    module_args = {
+        'service_policy': 'default-data-files',
+        'interfaces': [
+            {'interface_name': 'data1', 'home_node': 'node3', 'home_port': 'e0c', 'address': '10.12.12.13'},
+            {'interface_name': 'abc_if', 'home_node': 'node2', 'home_port': 'e0c', 'address': '10.11.12.13', 'netmask': '10'},
+        ]
+    }
+    result = create_and_apply(interface_module, INTERFACES_ARGS, module_args)
+    assert result['changed']
+    assert [(interface['interface_name'], interface['action'], interface['modify']) for interface in result['interfaces']] == [
+        ('data1', 'create', None),
+        ('abc_if', None, {'service_policy': 'default-data-files'}),
+    ]
+    post = next(get_mock_record().get_requests('POST', 'network/ip/interfaces'))['json']
+    assert post['name'] == 'data1'
+    assert post['location'] == {'home_port': {'name': 'e0c', 'node': {'name': 'node3'}}}
+    assert post['ip'] == {'address': '10.12.12.13', 'netmask': '18'}
+    assert next(get_mock_record().get_requests('PATCH'))['json'] == {'service_policy': 'default-data-files'}
+
+
+def test_rest_interfaces_idempotent_and_check_mode():
+    ''' FC interfaces are read too when interface_type is not known, nothing is changed in check_mode '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_9_10_1']),
+        ('GET', 'cluster/nodes', SRR['nodes']),
+        ('GET', 'network/ip/interfaces', SRR['one_record_vserver']),
+        ('GET', 'network/fc/interfaces', SRR['zero_records']),
+        ('GET', 'network/ethernet/ports', SRR['ports']),
+        ('GET', 'cluster', SRR['is_rest_9_10_1']),
+        ('GET', 'cluster/nodes', SRR['nodes']),
+        ('GET', 'network/ip/interfaces', SRR['one_record_vserver']),
+        ('GET', 'network/ethernet/broadcast-domains', SRR['broadcast_domains']),
+        ('GET', 'network/ipspaces', SRR['ipspaces']),
+    ])
+    args = dict(INTERFACES_ARGS)
+    args.pop('interface_type')
+    interfaces = [
+        {'interface_name': 'abc_if', 'home_node': 'node2', 'home_port': 'e0c', 'current_port': 'e0c'},
+        {'interface_name': 'data2', 'state': 'absent'},
+    ]
+    result = create_and_apply(interface_module, args, {'interfaces': interfaces})
+    assert not result['changed']
+    assert [(interface['action'], interface['modify']) for interface in result['interfaces']] == [(None, None), (None, None)]
+    interfaces = [
+        {'interface_name': 'data1', 'home_node': 'node2', 'broadcast_domain': 'bd1', 'address': '10.12.12.13', 'ipspace': 'Default'},
+        {'interface_name': 'abc_if', 'state': 'absent', 'home_port': 'e0x'},
+    ]
+    result = create_and_apply(interface_module, INTERFACES_ARGS, {'interfaces': interfaces, '_ansible_check_mode': True})
+    assert result['changed']
+    assert [interface['action'] for interface in result['interfaces']] == ['create', 'delete']
+
+
+@patch('time.sleep')
+def test_rest_interfaces_migrate(dont_sleep):
+    ''' the migration is confirmed with a live query '''
+    migrated = copy.deepcopy(SRR['one_record_vserver'])
+    migrated[1]['records'][0]['location']['port']['name'] = 'e0d'
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_9_10_1']),
+        ('GET', 'cluster/nodes', SRR['nodes_two_records']),
+        ('GET', 'network/ip/interfaces', SRR['one_record_vserver']),
+        ('GET', 'network/ethernet/ports', SRR['ports']),
+        ('PATCH', 'network/ip/interfaces/54321', SRR['success']),
+        ('GET', 'network/ip/interfaces', migrated),
+    ])
+    result = create_and_apply(interface_module, INTERFACES_ARGS, {'interfaces': [{'interface_name': 'abc_if', 'current_node': 'node2',
+                                                                                  'current_port': 'e0d'}]})
+    assert result['changed']
+    assert result['interfaces'][0]['modify'] == {'current_port': 'e0d'}
+    assert result['interfaces'][0]['migrate']
+    assert next(get_mock_record().get_requests('PATCH'))['json'] == {'location': {'port': {'name': 'e0d', 'node': {'name': 'node2'}}}}
+
+
+def test_rest_interfaces_validated_against_topology():
+    ''' all errors are reported before any change is made '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_9_10_1']),
+        ('GET', 'cluster/nodes', SRR['nodes_two_records']),
+        ('GET', 'network/ip/interfaces', SRR['zero_records']),
+        ('GET', 'network/ethernet/ports', SRR['ports']),
+        ('GET', 'network/ethernet/broadcast-domains', SRR['broadcast_domains']),
+        ('GET', 'network/ipspaces', SRR['ipspaces']),
+    ])
+    module_args = {
+        'interfaces': [
+            {'interface_name': 'data1', 'home_node': 'node3', 'home_port': 'e0d', 'address': '10.12.12.13'},
+            {'interface_name': 'data2', 'home_node': 'node4', 'address': '10.12.12.14'},
+            {'interface_name': 'data3', 'broadcast_domain': 'bd1', 'ipspace': 'ips2', 'address': '10.12.12.15'},
+            {'interface_name': 'data4', 'address': '10.12.12.16'},
+        ]
+    }
+    error = 'Error validating interfaces: interface data1: home_port e0d not found on node node3.  interface data2: home_node node4 not found.  '\
+            'interface data3: ipspace ips2 not found.  interface data3: broadcast_domain bd1 not found in ipspace ips2.  '\
+            "interface data4: Error: At least one of 'broadcast_domain', 'home_port', 'home_node' is required to create an IP interface."
+    assert create_and_apply(interface_module, INTERFACES_ARGS, module_args, fail=True)['msg'] == error
+
+
+def test_rest_interfaces_changes_are_concurrent():
+    ''' both interfaces are created at the same time '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_9_10_1']),
+        ('GET', 'cluster/nodes', SRR['nodes_two_records']),
+        ('GET', 'network/ip/interfaces', SRR['zero_records']),
+    ])
+    barrier = threading.Barrier(2, timeout=10)
+
+    def take_action(self, *args):
+        barrier.wait()
+
+    module_args = {
+        'max_concurrent_jobs': 2,
+        'interfaces': [
+            {'interface_name': 'data1', 'home_node': 'node2', 'address': '10.12.12.13'},
+            {'interface_name': 'data2', 'home_node': 'node3', 'address': '10.12.12.14'},
+        ]
+    }
+    with patch.object(interface_module, 'take_action', take_action):
+        result = create_and_apply(interface_module, INTERFACES_ARGS, module_args)
+    assert [interface['action'] for interface in result['interfaces']] == ['create', 'create']
+
+
+def test_rest_interfaces_error_on_action():
+    ''' errors are collected for each interface '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_9_10_1']),
+        ('GET', 'cluster/nodes', SRR['nodes_two_records']),
+        ('GET', 'network/ip/interfaces', SRR['zero_records']),
+        ('POST', 'network/ip/interfaces', SRR['generic_error']),
+        ('POST', 'network/ip/interfaces', SRR['success']),
+    ])
+    module_args = {
+        'interfaces': [
+            {'interface_name': 'data1', 'home_node': 'node2', 'address': '10.12.12.13'},
+            {'interface_name': 'data2', 'home_node': 'node3', 'address': '10.12.12.14'},
+        ]
+    }
+    result = create_and_apply(interface_module, INTERFACES_ARGS, module_args, fail=True)
+    assert result['msg'] == 'Error managing interfaces: interface data1: Error creating interface data1: calling: network/ip/interfaces: got Expected error.'
+    assert 'error' in result['interfaces'][0]
+    assert 'error' not in result['interfaces'][1]
+
+
+def test_rest_interfaces_build_parameters():
+    ''' module level values are defaults, unless the entry sets a mutually exclusive option '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_9_11_1']),
+    ])
+    args = dict(INTERFACES_ARGS)
+    args.pop('netmask')
+    my_obj = create_module(interface_module, args, {'subnet_name': 'subnet1', 'ipspace': 'Default', 'failover_policy': 'local-only', 'interfaces': []})
+    parameters = my_obj.build_interface_parameters({'interface_name': 'data1', 'address': '10.12.12.13', 'netmask': '18',
+                                                    'failover_scope': 'default'})
+    assert 'subnet_name' not in parameters
+    assert 'failover_policy' not in parameters
+    assert parameters['failover_scope'] == 'default'
+    assert parameters['ipspace'] == 'Default'
+    parameters = my_obj.build_interface_parameters({'interface_name': 'data2'})
+    assert parameters['subnet_name'] == 'subnet1'
+    assert parameters['failover_scope'] == 'home_node_only'
+
+
+def test_negative_rest_interfaces():
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_9_10_1']),
+        ('GET', 'cluster', SRR['is_rest_9_10_1']),
+        ('GET', 'cluster', SRR['is_rest_9_10_1']),
+        ('GET', 'cluster', SRR['is_rest_9_10_1']),
+        ('GET', 'cluster', SRR['is_rest_9_10_1']),
+        ('GET', 'cluster/nodes', SRR['generic_error']),
+    ])
+    interfaces = [{'interface_name': 'data1'}]
+    error = 'parameters are mutually exclusive: interface_name|interfaces'
+    assert error in call_main(my_main, INTERFACES_ARGS, {'interfaces': interfaces, 'interface_name': 'data1'}, fail=True)['msg']
+    error = 'Error: interfaces option requires REST.  use_rest: never.'
+    assert call_main(my_main, INTERFACES_ARGS, {'interfaces': interfaces, 'use_rest': 'never'}, fail=True)['msg'] == error
+    error = 'Error: max_concurrent_jobs must be 1 or more, got: 0.'
+    assert call_main(my_main, INTERFACES_ARGS, {'interfaces': interfaces, 'max_concurrent_jobs': 0}, fail=True)['msg'] == error
+    error = 'Error: duplicate entry in interfaces for interface_name: data1, vserver: vserver.'
+    assert call_main(my_main, INTERFACES_ARGS, {'interfaces': interfaces * 2}, fail=True)['msg'] == error
+    error = "Error: interface_name is required in each interfaces entry, got: {'home_node': 'node1'}"
+    assert call_main(my_main, INTERFACES_ARGS, {'interfaces': [{'home_node': 'node1'}]}, fail=True)['msg'] == error
+    error = "Error in interfaces entry {'interface_name': 'data1', 'subnet_name': 'subnet1'}: subnet_name requires ONTAP 9.11.1 or later."
+    assert call_main(my_main, INTERFACES_ARGS, {'interfaces': [dict(interfaces[0], subnet_name='subnet1')]}, fail=True)['msg'] == error
+    error = 'Error fetching cluster/nodes: calling: cluster/nodes: got Expected error.'
+    assert call_main(my_main, INTERFACES_ARGS, {'interfaces': interfaces}, fail=True)['msg'] == error
@@ -14,7 +14,7 @@ from ansible_collections.netapp.ontap.tests.unit.plugins.module_utils.ansible_mo
     call_main, create_module, create_and_apply, expect_and_capture_ansible_exception, assert_warning_was_raised, print_warnings
 from ansible_collections.netapp.ontap.tests.unit.framework.mock_rest_and_zapi_requests import patch_request_and_invoke, \
     register_responses
-from ansible_collections.netapp.ontap.tests.unit.framework.rest_factory import rest_responses
+from ansible_collections.netapp.ontap.tests.unit.framework.rest_factory import JOB_GET_API, rest_responses
 from ansible_collections.netapp.ontap.tests.unit.framework.zapi_factory import build_zapi_response, zapi_responses
 
 from ansible_collections.netapp.ontap.plugins.modules.na_ontap_qtree \
@@ -288,6 +288,20 @@ def test_successful_create_rest_job_error(sleep):
     assert_warning_was_raised('Ignoring job status, assuming success.')
 
 
+def test_successful_create_rest_with_job_stats():
+    ''' job statistics are reported by modules waiting on a job '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_9_9_1']),
+        ('GET', 'storage/qtrees', SRR['empty_records']),
+        ('POST', 'storage/qtrees', SRR['success_with_job_uuid']),
+        ('GET', JOB_GET_API, SRR['job_generic_response_success']),
+    ])
+    result = create_and_apply(qtree_module, DEFAULT_ARGS, {'use_rest': 'always'})
+    assert result['changed']
+    assert len(result['job_stats']) == 1
+    assert result['job_stats'][0]['state'] == 'success'
+
+
 def test_successful_delete_rest():
     ''' test delete qtree rest '''
     register_responses([
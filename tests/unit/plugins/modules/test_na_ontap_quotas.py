@@ -7,16 +7,19 @@ from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 
 import pytest
+import threading
 
 from ansible_collections.netapp.ontap.tests.unit.compat.mock import patch
 import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
+from ansible_collections.netapp.ontap.plugins.module_utils import netapp_concurrency
 # pylint: disable=unused-import
 from ansible_collections.netapp.ontap.tests.unit.plugins.module_utils.ansible_mocks import assert_no_warnings, \
     assert_warning_was_raised, call_main, patch_ansible, create_module, create_and_apply, expect_and_capture_ansible_exception, print_warnings
-from ansible_collections.netapp.ontap.tests.unit.framework.mock_rest_and_zapi_requests import patch_request_and_invoke, register_responses
+from ansible_collections.netapp.ontap.tests.unit.framework.mock_rest_and_zapi_requests import get_mock_record, patch_request_and_invoke, register_responses
 from ansible_collections.netapp.ontap.tests.unit.framework.zapi_factory import build_zapi_error, build_zapi_response, zapi_responses
 from ansible_collections.netapp.ontap.tests.unit.framework.rest_factory import rest_responses
 
+import ansible_collections.netapp.ontap.plugins.modules.na_ontap_quotas as quotas_module
 from ansible_collections.netapp.ontap.plugins.modules.na_ontap_quotas \
     import NetAppONTAPQuotas as my_module, main as my_main
 
@@ -376,7 +379,6 @@ def test_quota_on_warning():
     ])
     my_obj = create_module(my_module, DEFAULT_ARGS)
     my_obj.on_or_off_quota('quota-on', 'delete')
-    print_warnings()
     assert_warning_was_raised('Last rule deleted, quota is off.')
 
 
@@ -519,7 +521,6 @@ def test_rest_successful_create_job_error(sleep):
         ('GET', 'storage/volumes', SRR['volume_uuid'])
     ])
     assert create_and_apply(my_module, ARGS_REST)
-    print_warnings()
     assert_warning_was_raised('Ignoring job status, assuming success.')
 
 
@@ -905,3 +906,254 @@ def test_if_all_methods_catch_exception_rest():
     assert 'Error setting quota-on for ansible' in expect_and_capture_ansible_exception(my_obj.on_or_off_quota_rest, 'fail', 'quota-on')['msg']
     error = "Error: Qtree cannot be specified for a tree type rule"
     assert error in create_module(my_module, ARGS_REST, {'qtree': 'qtree1', 'type': 'tree'}, fail=True)['msg']
+
+
+QUOTA_RULES_ARGS = {
+    'hostname': 'test',
+    'username': 'test_user',
+    'password': 'test_pass!',
+    'use_rest': 'always',
+    'volume': 'ansible',
+    'vserver': 'ansible',
+    'max_concurrent_jobs': 1,
+}
+
+RULE_UUID = '264a9e0b-2e03-11e9-a610-005056a7b72d'
+VOLUME_UUID = '264a9e0b-2e03-11e9-a610-005056a7b72da'
+
+
+@patch('time.sleep')
+def test_quota_rules_single_reinitialize(sleep):
+    ''' one query to read the rules, and a single reinitialize for the volume '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest']),
+        ('GET', 'storage/quota/rules', SRR['quota_record']),
+        ('GET', 'storage/volumes', SRR['quota_on']),
+        ('PATCH', 'storage/quota/rules/' + RULE_UUID, SRR['success']),
+        ('DELETE', 'storage/quota/rules/' + RULE_UUID, SRR['success']),
+        ('POST', 'storage/quota/rules', SRR['empty_good']),
+        ('PATCH', 'storage/volumes/' + VOLUME_UUID, SRR['success']),
+        ('GET', 'storage/volumes', SRR['quota_on']),
+        ('GET', 'storage/volumes', SRR['quota_status']),
+        ('PATCH', 'storage/volumes/' + VOLUME_UUID, SRR['success']),
+    ])
+    module_args = {
+        'activate_quota_on_change': 'reinitialize',
+        'quota_rules': [
+            {'quota_target': 'quota_user', 'type': 'user', 'qtree': 'qt1', 'soft_file_limit': '100'},
+            {'quota_target': '757', 'type': 'user', 'qtree': 'qt1', 'state': 'absent'},
+            {'quota_target': 'user2,user3', 'type': 'user', 'disk_limit': '10'},
+        ]
+    }
+    result = create_and_apply(my_module, QUOTA_RULES_ARGS, module_args)
+    assert result['changed']
+    assert [(rule['quota_target'], rule['action'], rule['modify']) for rule in result['quota_rules']] == [
+        ('quota_user', None, {'soft_file_limit': '100'}),
+        ('757', 'delete', None),
+        ('user2,user3', 'create', None),
+    ]
+    assert result['modify_quota_status'] == {'ansible': 'reinitialize'}
+    query = next(get_mock_record().get_requests('GET', 'storage/quota/rules'))['params']
+    assert query['volume.name'] == 'ansible'
+    assert 'type' not in query
+    body = next(get_mock_record().get_requests('POST', 'storage/quota/rules'))['json']
+    assert body['users.name'] == ['user2', 'user3']
+    assert body['space.hard_limit'] == '10240'
+    assert [request['json'] for request in get_mock_record().get_requests('PATCH', 'storage/volumes/' + VOLUME_UUID)] == [
+        {'quota.enabled': False}, {'quota.enabled': True}
+    ]
+    assert sleep.call_count == 1
+
+
+def test_quota_rules_idempotency():
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest']),
+        ('GET', 'storage/quota/rules', SRR['quota_record']),
+    ])
+    module_args = {
+        'activate_quota_on_change': 'reinitialize',
+        'quota_rules': [
+            {'quota_target': 'quota_user', 'type': 'user', 'qtree': 'qt1', 'soft_file_limit': '80'},
+            {'quota_target': 'user2', 'type': 'user', 'state': 'absent'},
+        ]
+    }
+    result = create_and_apply(my_module, QUOTA_RULES_ARGS, module_args)
+    assert not result['changed']
+    assert result['modify_quota_status'] == {'ansible': None}
+
+
+def test_quota_rules_check_mode_and_set_quota_status():
+    ''' quota status is set once per volume, one query per volume '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest']),
+        ('GET', 'storage/quota/rules', SRR['quota_record']),
+        ('GET', 'storage/quota/rules', SRR['zero_records']),
+        ('GET', 'storage/volumes', SRR['quota_status']),
+        ('GET', 'storage/volumes', SRR['quota_on']),
+        ('GET', 'cluster', SRR['is_rest']),
+        ('GET', 'storage/quota/rules', SRR['quota_record']),
+        ('GET', 'storage/quota/rules', SRR['zero_records']),
+        ('GET', 'storage/volumes', SRR['quota_status']),
+        ('GET', 'storage/volumes', SRR['quota_on']),
+        ('PATCH', 'storage/volumes/' + VOLUME_UUID, SRR['success']),
+    ])
+    module_args = {
+        'set_quota_status': True,
+        'quota_rules': [
+            {'quota_target': 'quota_user', 'type': 'user', 'qtree': 'qt1'},
+            {'quota_target': 'qt2', 'type': 'tree', 'volume': 'fv2', 'state': 'absent'},
+        ]
+    }
+    result = create_and_apply(my_module, QUOTA_RULES_ARGS, dict(module_args, _ansible_check_mode=True))
+    assert result['changed']
+    assert result['modify_quota_status'] == {'ansible': 'quota-on', 'fv2': None}
+    assert not list(get_mock_record().get_requests('PATCH'))
+    result = create_and_apply(my_module, QUOTA_RULES_ARGS, module_args)
+    assert result['changed']
+    assert [rule['changed'] for rule in result['quota_rules']] == [False, False]
+
+
+@patch('time.sleep')
+def test_quota_rules_errors_are_collected(sleep):
+    ''' quota is not activated on a volume with a failed rule '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest']),
+        ('GET', 'storage/quota/rules', SRR['quota_record']),
+        ('GET', 'storage/volumes', SRR['quota_on']),
+        ('POST', 'storage/quota/rules', SRR['generic_error']),
+        ('DELETE', 'storage/quota/rules/' + RULE_UUID, SRR['success']),
+    ])
+    module_args = {
+        'activate_quota_on_change': 'reinitialize',
+        'quota_rules': [
+            {'quota_target': 'user2', 'type': 'user'},
+            {'quota_target': '757', 'type': 'user', 'qtree': 'qt1', 'state': 'absent'},
+        ]
+    }
+    result = create_and_apply(my_module, QUOTA_RULES_ARGS, module_args, fail=True)
+    error = 'Error on creating quotas rule: calling: storage/quota/rules: got Expected error.'
+    assert result['msg'] == 'Error managing quota rules: rule user user2 in volume ansible: %s' % error\
+        + '  Quota status not changed for volume with failed rules: ansible.'
+    assert result['changed']
+    assert result['quota_rules'][0]['error'] == error
+    assert 'error' not in result['quota_rules'][1]
+    assert result['skipped_volumes'] == ['ansible']
+
+
+@patch('time.sleep')
+def test_quota_rules_other_volumes_are_reinitialized(sleep):
+    ''' a failed rule only prevents quota activation for its own volume '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest']),
+        ('GET', 'storage/quota/rules', SRR['quota_record']),
+        ('GET', 'storage/quota/rules', SRR['zero_records']),
+        ('GET', 'storage/volumes', SRR['quota_on']),
+        ('GET', 'storage/volumes', SRR['quota_on']),
+        ('DELETE', 'storage/quota/rules/' + RULE_UUID, SRR['success']),
+        ('POST', 'storage/quota/rules', SRR['generic_error']),
+        ('PATCH', 'storage/volumes/' + VOLUME_UUID, SRR['success']),
+        ('GET', 'storage/volumes', SRR['quota_status']),
+        ('PATCH', 'storage/volumes/' + VOLUME_UUID, SRR['success']),
+    ])
+    module_args = {
+        'activate_quota_on_change': 'reinitialize',
+        'quota_rules': [
+            {'quota_target': '757', 'type': 'user', 'qtree': 'qt1', 'state': 'absent'},
+            {'quota_target': 'user2', 'type': 'user', 'volume': 'fv2'},
+        ]
+    }
+    result = create_and_apply(my_module, QUOTA_RULES_ARGS, module_args, fail=True)
+    error = 'Error on creating quotas rule: calling: storage/quota/rules: got Expected error.'
+    assert result['msg'] == 'Error managing quota rules: rule user user2 in volume fv2: %s' % error\
+        + '  Quota status not changed for volume with failed rules: fv2.'
+    assert result['modify_quota_status'] == {'ansible': 'reinitialize', 'fv2': 'reinitialize'}
+    assert result['skipped_volumes'] == ['fv2']
+    assert [request['json'] for request in get_mock_record().get_requests('PATCH', 'storage/volumes/' + VOLUME_UUID)] == [
+        {'quota.enabled': False}, {'quota.enabled': True}
+    ]
+
+
+@patch('time.sleep')
+def test_quota_rules_reinitialize_timeout(sleep):
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest']),
+        ('GET', 'storage/quota/rules', SRR['quota_record']),
+        ('GET', 'storage/volumes', SRR['quota_on']),
+        ('DELETE', 'storage/quota/rules/' + RULE_UUID, SRR['success']),
+        ('PATCH', 'storage/volumes/' + VOLUME_UUID, SRR['success']),
+        ('GET', 'storage/volumes', SRR['quota_on']),
+        ('GET', 'storage/volumes', SRR['quota_on']),
+    ])
+    module_args = {
+        'activate_quota_on_change': 'reinitialize',
+        'quota_rules': [{'quota_target': '757', 'type': 'user', 'qtree': 'qt1', 'state': 'absent'}],
+    }
+    with patch.object(quotas_module, 'QUOTA_STATE_MAX_POLLS', 2):
+        result = create_and_apply(my_module, QUOTA_RULES_ARGS, module_args, fail=True)
+    assert result['msg'] == 'Error managing quota status: volume ansible: Error: timeout waiting for quota state off for ansible, current state: on'
+
+
+def test_quota_rules_warning_once_per_volume():
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest']),
+        ('GET', 'storage/quota/rules', SRR['zero_records']),
+        ('GET', 'storage/volumes', SRR['quota_status']),
+        ('POST', 'storage/quota/rules', SRR['error_5308568']),
+        ('GET', 'storage/volumes', SRR['volume_uuid']),
+        ('POST', 'storage/quota/rules', SRR['error_5308568']),
+        ('GET', 'storage/volumes', SRR['volume_uuid']),
+    ])
+    module_args = {'quota_rules': [{'quota_target': 'user1', 'type': 'user'}, {'quota_target': 'group1', 'type': 'group'}]}
+    assert create_and_apply(my_module, QUOTA_RULES_ARGS, module_args)['changed']
+    msg = "Quota policy rule create opertation succeeded. However quota resize failed due to an internal error. To make quotas active, "\
+          "reinitialize(disable and enable again) the quota for volume ansible in SVM ansible."
+    assert_warning_was_raised(msg)
+
+
+@pytest.mark.skipif(not netapp_concurrency.HAS_FUTURES, reason='requires concurrent.futures')
+def test_quota_rules_changes_are_concurrent():
+    ''' the two take_quota_rule_action calls only return if they run at the same time '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest']),
+        ('GET', 'storage/quota/rules', SRR['zero_records']),
+        ('GET', 'storage/volumes', SRR['quota_status']),
+    ])
+    barrier = threading.Barrier(2, timeout=10)
+
+    def take_quota_rule_action(self, cd_action, modify):
+        barrier.wait()
+
+    module_args = {'max_concurrent_jobs': 2, 'quota_rules': [{'quota_target': 'user1', 'type': 'user'}, {'quota_target': 'group1', 'type': 'group'}]}
+    with patch.object(my_module, 'take_quota_rule_action', take_quota_rule_action):
+        result = create_and_apply(my_module, QUOTA_RULES_ARGS, module_args)
+    assert [rule['action'] for rule in result['quota_rules']] == ['create', 'create']
+
+
+def test_negative_quota_rules():
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest']),
+        ('GET', 'cluster', SRR['is_rest']),
+        ('GET', 'cluster', SRR['is_rest']),
+        ('GET', 'cluster', SRR['is_rest']),
+        ('GET', 'cluster', SRR['is_rest']),
+    ])
+    module_args = {'quota_rules': [{'quota_target': 'user1', 'type': 'user'}, {'quota_target': 'user1', 'type': 'user', 'disk_limit': '10'}]}
+    error = 'Error: duplicate entry in quota_rules for volume: ansible, type: user, qtree: , quota_target: user1.'
+    assert create_and_apply(my_module, QUOTA_RULES_ARGS, module_args, fail=True)['msg'] == error
+    module_args = {'quota_rules': [{'quota_target': 'user1'}]}
+    error = "Error: quota_target and type are required in each quota_rules entry, got: {'quota_target': 'user1'}"
+    assert create_and_apply(my_module, QUOTA_RULES_ARGS, module_args, fail=True)['msg'] == error
+    module_args = {'quota_rules': [{'quota_target': 'user1', 'type': 'user', 'policy': 'p1'}]}
+    error = "Error in quota_rules entry {'quota_target': 'user1', 'type': 'user', 'policy': 'p1'}: policy. Supported parameters include"
+    assert create_and_apply(my_module, QUOTA_RULES_ARGS, module_args, fail=True)['msg'].startswith(error)
+    module_args = {'quota_rules': [{'quota_target': 'qt1', 'type': 'tree', 'qtree': 'qt1'}]}
+    error = "Error: Qtree cannot be specified for a tree type rule, it should be ''."
+    assert create_and_apply(my_module, QUOTA_RULES_ARGS, module_args, fail=True)['msg'] == error
+    module_args = {'quota_rules': [], 'max_concurrent_jobs': 0}
+    error = 'Error: max_concurrent_jobs must be 1 or more, got: 0.'
+    assert create_module(my_module, QUOTA_RULES_ARGS, module_args, fail=True)['msg'] == error
+    module_args = {'quota_rules': [], 'use_rest': 'never'}
+    error = 'Error: quota_rules option requires REST.  use_rest: never.'
+    assert create_module(my_module, QUOTA_RULES_ARGS, module_args, fail=True)['msg'] == error
+    module_args = {'quota_rules': [], 'quota_target': 'user1', 'type': 'user'}
+    assert 'mutually exclusive' in create_module(my_module, QUOTA_RULES_ARGS, module_args, fail=True)['msg']
@@ -7,8 +7,10 @@ from __future__ import (absolute_import, division, print_function)
 
 __metaclass__ = type
 
+import copy
 import pytest
 import sys
+import threading
 
 from ansible_collections.netapp.ontap.tests.unit.compat.mock import patch
 # pylint: disable=unused-import
@@ -112,6 +114,9 @@ SRR = rest_responses({
                 {'node': 'node1', 'check_type': 'type'}],
             "num_records": 3}, None),
     'lun_info': (200, {'records': [{"serial_number": "z6CcD+SK5mPb"}]}, None),
+    'lun_info_with_next': (200, {'records': [{"serial_number": "z6CcD+SK5mPb"}],
+                                 '_links': {'next': {'href': '/api/storage/luns?start.uuid=2'}}}, None),
+    'lun_info_next': (200, {'records': [{"serial_number": "z6CcD+SK5mPc"}], '_links': {}}, None),
     'volume_info': (200, {"uuid": "7882901a-1aef-11ec-a267-005056b30cfa"}, None),
     'svm_uuid': (200, {"records": [{"uuid": "test_uuid"}], "num_records": 1}, None),
     'get_uuid_policy_id_export_policy': (
@@ -1200,6 +1205,23 @@ def test_lun_info_with_serial():
     assert lun_info['naa_id'] == 'naa.600a0980' + '7a364363442b534b356d5062'
 
 
+@pytest.mark.parametrize('prefetch', [True, False])
+def test_lun_info_with_serial_on_all_pages(prefetch):
+    args = set_default_args()
+    args['gather_subset'] = 'storage/luns'
+    args['feature_flags'] = {'rest_prefetch_next_page': prefetch}
+    register_responses([
+        ('GET', 'cluster', SRR['validate_ontap_version_pass']),
+        ('GET', 'storage/luns', SRR['lun_info_with_next']),
+        ('GET', '/storage/luns?start.uuid=2', SRR['lun_info_next']),
+    ], 'test_lun_info_with_serial_on_all_pages')
+    info = create_and_apply(ontap_rest_info_module, args)
+    records = info['ontap_info']['storage/luns']['records']
+    assert info['ontap_info']['storage/luns']['num_records'] == 2
+    assert [lun_info['naa_id'] for lun_info in records] == ['naa.600a0980' + '7a364363442b534b356d5062',
+                                                            'naa.600a0980' + '7a364363442b534b356d5063']
+
+
 def test_ignore_api_errors():
     args = set_default_args()
     args['gather_subset'] = 'storage/luns'
@@ -1233,3 +1255,92 @@ def test_private_cli_fields():
     assert my_obj.private_cli_fields('support/autosupport/check') == 'node,corrective-action,status,error-detail,check-type,check-category'
     my_obj.parameters['fields'] = ['f1', 'f2']
     assert my_obj.private_cli_fields('private/cli/vserver/security/file-directory') == 'f1,f2'
+
+
+CONCURRENT_GET_RESPONSES = {
+    'cluster/software': (SRR['get_subset_info'][1], None),
+    'svm/svms': (SRR['get_subset_info_with_next'][1], None),
+    '/next_record_api': (SRR['get_next_record'][1], None),
+    'cluster/nodes': (SRR['get_subset_info'][1], None),
+    'storage/luns': (SRR['lun_info'][1], None),
+    'storage/volumes': (None, SRR['error_no_processing'][2]),
+    'storage/aggregates': (None, SRR['error_user_is_not_authorized'][2]),
+    'storage/disks': (None, SRR['error_record'][2]),
+}
+
+
+def fake_get(api, params=None, headers=None):
+    ''' thread safe replacement for OntapRestAPI.get, as the order of calls is not deterministic '''
+    return copy.deepcopy(CONCURRENT_GET_RESPONSES[api])
+
+
+def gather_with_fake_get(function_name, module_args, fail=False):
+    register_responses([
+        ('GET', 'cluster', SRR['validate_ontap_version_pass']),
+    ], function_name)
+    with patch('ansible_collections.netapp.ontap.plugins.module_utils.netapp.OntapRestAPI.get', side_effect=fake_get):
+        return create_and_apply(ontap_rest_info_module, set_default_args(), module_args, fail=fail)
+
+
+def test_concurrent_subsets_match_sequential_results():
+    function_name = 'test_concurrent_subsets_match_sequential_results'
+    module_args = {'gather_subset': ['cluster/software', 'svm/svms', 'storage/luns', 'cluster/nodes']}
+    sequential = gather_with_fake_get(function_name, module_args)['ontap_info']
+    module_args['max_concurrent_subsets'] = 3
+    concurrent = gather_with_fake_get(function_name, module_args)['ontap_info']
+    assert concurrent == sequential
+    assert list(concurrent) == list(sequential) == ['cluster/software', 'svm/svms', 'storage/luns', 'cluster/nodes']
+    assert concurrent['svm/svms']['num_records'] == 5
+    assert concurrent['storage/luns']['records'][0]['naa_id'] == 'naa.600a0980' + '7a364363442b534b356d5062'
+
+
+def test_concurrent_subsets_run_in_parallel():
+    barrier = threading.Barrier(2, timeout=10)
+
+    def blocking_get(api, params=None, headers=None):
+        # with a sequential loop, the first call would wait forever for the second one
+        barrier.wait()
+        return fake_get(api, params, headers)
+
+    register_responses([
+        ('GET', 'cluster', SRR['validate_ontap_version_pass']),
+    ])
+    module_args = {'gather_subset': ['cluster/software', 'cluster/nodes'], 'max_concurrent_subsets': 2}
+    with patch('ansible_collections.netapp.ontap.plugins.module_utils.netapp.OntapRestAPI.get', side_effect=blocking_get):
+        info = create_and_apply(ontap_rest_info_module, set_default_args(), module_args)['ontap_info']
+    assert list(info) == ['cluster/software', 'cluster/nodes']
+
+
+def test_concurrent_subsets_report_first_error_in_order():
+    function_name = 'test_concurrent_subsets_report_first_error_in_order'
+    module_args = {'gather_subset': ['cluster/nodes', 'storage/volumes', 'storage/aggregates']}
+    sequential = gather_with_fake_get(function_name, module_args, fail=True)['msg']
+    module_args['max_concurrent_subsets'] = 3
+    assert gather_with_fake_get(function_name, module_args, fail=True)['msg'] == sequential == {'code': 123, 'message': 'error reported as is'}
+    module_args['gather_subset'] = ['cluster/nodes', 'storage/aggregates', 'storage/volumes']
+    assert 'user is not authorized to make storage/aggregates api call' in gather_with_fake_get(function_name, module_args, fail=True)['msg']
+    module_args['gather_subset'] = ['cluster/nodes', 'bad_subset', 'storage/volumes']
+    assert 'Specified subset bad_subset is not found' in gather_with_fake_get(function_name, module_args, fail=True)['msg']
+
+
+def test_concurrent_subsets_ignore_api_errors_and_version_check():
+    module_args = {
+        'gather_subset': ['storage/disks', 'cluster/nodes', 'cluster/metrocluster/diagnostics'],
+        'ignore_api_errors': ['Expected error'],
+        'max_concurrent_subsets': 2,
+    }
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_96']),
+    ])
+    with patch('ansible_collections.netapp.ontap.plugins.module_utils.netapp.OntapRestAPI.get', side_effect=fake_get):
+        info = create_and_apply(ontap_rest_info_module, set_default_args(), module_args)['ontap_info']
+    assert info['storage/disks'] == {'error': SRR['error_record'][2]}
+    assert info['cluster/nodes']['num_records'] == 3
+    assert info['cluster/metrocluster/diagnostics'] == 'cluster/metrocluster/diagnostics requires ONTAP (9, 8)'
+    assert_warning_was_raised('The following subset have been removed from your query as they are not supported on ' +
+                              'your version of ONTAP cluster/metrocluster/diagnostics requires (9, 8), ')
+
+
+def test_negative_max_concurrent_subsets():
+    msg = 'Error: max_concurrent_subsets must be 1 or more, got: 0.'
+    assert create_module(ontap_rest_info_module, set_default_args(), {'max_concurrent_subsets': 0}, fail=True)['msg'] == msg
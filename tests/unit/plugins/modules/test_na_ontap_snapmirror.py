@@ -3,6 +3,7 @@
 from __future__ import (absolute_import, division, print_function)
 __metaclass__ = type
 import pytest
+import threading
 
 from ansible_collections.netapp.ontap.tests.unit.compat.mock import patch, Mock
 import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
@@ -10,12 +11,13 @@ import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_ut
 from ansible_collections.netapp.ontap.tests.unit.plugins.module_utils.ansible_mocks import\
     assert_no_warnings, assert_warning_was_raised, expect_and_capture_ansible_exception, call_main, create_module, patch_ansible, print_warnings
 from ansible_collections.netapp.ontap.tests.unit.framework.mock_rest_and_zapi_requests import\
-    patch_request_and_invoke, register_responses
+    get_mock_record, patch_request_and_invoke, register_responses
 from ansible_collections.netapp.ontap.tests.unit.framework.rest_factory import rest_error_message, rest_responses
 from ansible_collections.netapp.ontap.tests.unit.framework.zapi_factory import build_zapi_response, zapi_responses
 
 from ansible_collections.netapp.ontap.plugins.modules.na_ontap_snapmirror \
     import NetAppONTAPSnapmirror as my_module, main as my_main
+from ansible_collections.netapp.ontap.plugins.module_utils import netapp_concurrency
 
 HAS_SF_COMMON = True
 try:
@@ -1954,3 +1956,152 @@ def test_negative_set_source_cluster_connection(mock_netapp_lib):
     my_obj.parameters['peer_options']['use_rest'] = 'auto'
     error = "Error: the python NetApp-Lib module is required.  Import error: None"
     assert error in expect_and_capture_ansible_exception(my_obj.set_source_cluster_connection, 'fail')['msg']
+
+
+FLEET_ARGS = dict((key, value) for key, value in DEFAULT_ARGS.items() if key not in ('source_path', 'destination_path'))
+FLEET_ARGS['use_rest'] = 'always'
+
+
+def fleet_relationships(count):
+    return [{'source_endpoint': {'path': 'svmsrc3:vol%d' % index}, 'destination_endpoint': {'path': 'svmdst3:vol%d_dst' % index}}
+            for index in range(count)]
+
+
+def fleet_records(*states):
+    """ one record per (index, state, transfer_state) """
+    records = []
+    for index, state, transfer_state in states:
+        records.extend(sm_rest_info(state, True, transfer_state, destination_path='svmdst3:vol%d_dst' % index)['records'])
+    return 200, {'records': records, 'num_records': len(records)}, None
+
+
+@patch('time.sleep')
+def test_rest_relationships_break_with_shared_polling(dont_sleep):
+    ''' one query to read all relationships, one query per polling cycle while waiting for quiesce '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_9_8_0']),
+        ('GET', 'snapmirror/relationships', fleet_records((0, 'snapmirrored', 'success'), (1, 'snapmirrored', 'success'),
+                                                          (2, 'broken_off', 'success'))),
+        ('PATCH', 'snapmirror/relationships/b5ee4571-5429-11ec-9779-005056b39a06', SRR['success']),      # quiesce
+        ('PATCH', 'snapmirror/relationships/b5ee4571-5429-11ec-9779-005056b39a06', SRR['success']),      # quiesce
+        ('GET', 'snapmirror/relationships', fleet_records((0, 'paused', 'success'), (1, 'snapmirrored', 'success'))),
+        ('PATCH', 'snapmirror/relationships/b5ee4571-5429-11ec-9779-005056b39a06', SRR['success']),      # break 0
+        ('GET', 'snapmirror/relationships', fleet_records((1, 'paused', 'success'))),
+        ('PATCH', 'snapmirror/relationships/b5ee4571-5429-11ec-9779-005056b39a06', SRR['success']),      # break 1
+        ('GET', 'snapmirror/relationships', fleet_records((0, 'broken_off', 'success'), (1, 'broken_off', 'success'),
+                                                          (2, 'broken_off', 'success'))),
+    ])
+    module_args = {
+        'relationship_state': 'broken',
+        'relationships': fleet_relationships(3),
+        'max_concurrent_jobs': 3,
+    }
+    original_poll = netapp_concurrency.BatchPoller.poll
+    # poll is called from a worker thread, the mock record is indexed by test name
+    test_name = 'test_rest_relationships_break_with_shared_polling'
+
+    def poll(poller):
+        # make sure the two relationships are waiting before the first poll
+        while poller.polls == 0 and len(poller.waiters) < 2:
+            threading.Event().wait(0.01)
+        # and that the first relationship is broken before the second poll
+        while poller.polls == 1 and len(list(get_mock_record(test_name).get_requests('PATCH'))) < 3:
+            threading.Event().wait(0.01)
+        return original_poll(poller)
+
+    with patch.object(netapp_concurrency.BatchPoller, 'poll', autospec=True, side_effect=poll):
+        result = call_main(my_main, FLEET_ARGS, module_args)
+    assert result['changed']
+    assert result['relationships'] == [
+        {'destination_path': 'svmdst3:vol0_dst', 'changed': True, 'actions': ['break']},
+        {'destination_path': 'svmdst3:vol1_dst', 'changed': True, 'actions': ['break']},
+        {'destination_path': 'svmdst3:vol2_dst', 'changed': False, 'actions': []},
+    ]
+    requests = list(get_mock_record().get_requests('GET', 'snapmirror/relationships'))
+    assert requests[0]['params']['destination.path'] == 'svmdst3:vol0_dst|svmdst3:vol1_dst|svmdst3:vol2_dst'
+    assert requests[1]['params']['destination.path'] == 'svmdst3:vol0_dst|svmdst3:vol1_dst'
+
+
+@patch('time.sleep')
+def test_rest_relationships_create_and_update(dont_sleep):
+    ''' create a relationship and update another one '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_9_8_0']),
+        ('GET', 'snapmirror/relationships', fleet_records((0, 'snapmirrored', 'success'))),
+        ('POST', 'snapmirror/relationships', SRR['success']),                                           # create 1
+        ('GET', 'snapmirror/relationships', fleet_records((1, 'uninitialized', None))),
+        ('PATCH', 'snapmirror/relationships/b5ee4571-5429-11ec-9779-005056b39a06', SRR['success']),      # initialize 1
+        ('GET', 'snapmirror/relationships', fleet_records((1, 'snapmirrored', 'transferring'))),         # wait for idle
+        ('GET', 'snapmirror/relationships', fleet_records((1, 'snapmirrored', 'success'))),              # wait for idle
+        ('GET', 'snapmirror/relationships', fleet_records((0, 'snapmirrored', 'success'), (1, 'snapmirrored', 'success'))),
+        ('POST', 'snapmirror/relationships/b5ee4571-5429-11ec-9779-005056b39a06/transfers', SRR['success']),    # update 0
+    ])
+    module_args = {
+        'relationships': fleet_relationships(2),
+        'max_concurrent_jobs': 1,
+    }
+    result = call_main(my_main, FLEET_ARGS, module_args)
+    assert result['changed']
+    assert result['relationships'] == [
+        {'destination_path': 'svmdst3:vol0_dst', 'changed': True, 'actions': ['check_for_update', 'update']},
+        {'destination_path': 'svmdst3:vol1_dst', 'changed': True, 'actions': ['create']},
+    ]
+
+
+@patch('time.sleep')
+def test_rest_relationships_errors_are_collected(dont_sleep):
+    ''' all relationships are processed, errors are reported together '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_9_8_0']),
+        ('GET', 'snapmirror/relationships', fleet_records((0, 'broken_off', 'success'), (1, 'broken_off', 'success'))),
+        ('PATCH', 'snapmirror/relationships/b5ee4571-5429-11ec-9779-005056b39a06', SRR['generic_error']),    # resync 0
+        ('PATCH', 'snapmirror/relationships/b5ee4571-5429-11ec-9779-005056b39a06', SRR['success']),          # resync 1
+        ('GET', 'snapmirror/relationships', fleet_records((0, 'broken_off', 'success'), (1, 'snapmirrored', 'success'))),
+        ('GET', 'snapmirror/relationships', fleet_records((0, 'broken_off', 'success'), (1, 'snapmirrored', 'success'))),
+    ])
+    module_args = {
+        'relationships': fleet_relationships(2),
+        'max_concurrent_jobs': 1,
+        'transferring_time_out': 30,
+    }
+    result = call_main(my_main, FLEET_ARGS, module_args, fail=True)
+    assert result['msg'] == "Error managing relationships: relationship svmdst3:vol0_dst: Error patching SnapMirror: "\
+                            "{'state': 'snapmirrored'}: calling: snapmirror/relationships/b5ee4571-5429-11ec-9779-005056b39a06: "\
+                            "got Expected error."
+    assert result['changed']
+    assert [relationship['changed'] for relationship in result['relationships']] == [True, True]
+    assert 'error' not in result['relationships'][1]
+
+
+def test_negative_rest_relationships():
+    ''' validation errors '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_9_8_0']),
+        ('GET', 'cluster', SRR['is_rest_9_8_0']),
+        ('GET', 'cluster', SRR['is_rest_9_8_0']),
+        ('GET', 'cluster', SRR['is_rest_9_8_0']),
+        ('GET', 'snapmirror/relationships', SRR['generic_error']),
+    ])
+    module_args = {
+        'relationships': fleet_relationships(1) * 2,
+    }
+    error = 'Error: duplicate entry in relationships for destination: svmdst3:vol0_dst.'
+    assert call_main(my_main, FLEET_ARGS, module_args, fail=True)['msg'] == error
+    module_args['relationships'] = [{'source_path': 'svmsrc3:vol0'}]
+    error = 'Missing parameters: Source path or Destination path'
+    assert call_main(my_main, FLEET_ARGS, module_args, fail=True)['msg'] == error
+    module_args['relationships'] = [{'source_path': 'svmsrc3:vol0', 'destination_path': 'svmdst3:vol0_dst', 'unknown': True}]
+    error = "Error in relationships entry {'source_path': 'svmsrc3:vol0', 'destination_path': 'svmdst3:vol0_dst', 'unknown': True}: unknown."
+    assert error in call_main(my_main, FLEET_ARGS, module_args, fail=True)['msg']
+    module_args['relationships'] = fleet_relationships(1)
+    error = 'Error getting SnapMirror relationships: Expected error'
+    assert call_main(my_main, FLEET_ARGS, module_args, fail=True)['msg'] == error
+    module_args['use_rest'] = 'never'
+    error = 'Error: relationships option requires REST.  use_rest: never.'
+    assert call_main(my_main, FLEET_ARGS, module_args, fail=True)['msg'] == error
+    module_args = {
+        'relationships': fleet_relationships(1),
+        'destination_path': 'svmdst3:vol0_dst',
+    }
+    error = 'parameters are mutually exclusive: relationships|destination_path'
+    assert error in call_main(my_main, FLEET_ARGS, module_args, fail=True)['msg']
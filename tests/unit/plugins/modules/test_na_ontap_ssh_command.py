@@ -0,0 +1,143 @@
+# (c) 2025, NetApp, Inc
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+''' unit tests for ONTAP SSH command Ansible module '''
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+
+import io
+import pytest
+import warnings
+
+from ansible_collections.netapp.ontap.tests.unit.compat.mock import MagicMock, patch
+# pylint: disable=unused-import
+from ansible_collections.netapp.ontap.tests.unit.plugins.module_utils.ansible_mocks import\
+    call_main, create_module, patch_ansible
+from ansible_collections.netapp.ontap.tests.unit.framework.mock_rest_and_zapi_requests import patch_request_and_invoke
+import ansible_collections.netapp.ontap.plugins.modules.na_ontap_ssh_command as ssh_module
+from ansible_collections.netapp.ontap.plugins.modules.na_ontap_ssh_command import NetAppONTAPSSHCommand as my_module, main as my_main
+
+if not ssh_module.HAS_PARAMIKO:
+    pytestmark = pytest.mark.skip('skipping as missing required paramiko')
+
+
+DEFAULT_ARGS = {
+    'hostname': 'hostname',
+    'username': 'username',
+    'password': 'password',
+}
+
+BANNER = b'\r\nLast login time: 10/18/2026 10:00:00\r\n'
+
+
+def mock_exec_command(outputs):
+    ''' outputs is a dict of command: (stdout, stderr) '''
+    def exec_command(command):
+        stdout, stderr = outputs[command]
+        return MagicMock(), io.BytesIO(stdout), io.BytesIO(stderr)
+    return exec_command
+
+
+def test_module_fail_when_required_args_missing():
+    ''' one of command or commands is required, but not both '''
+    error = 'one of the following is required: command, commands'
+    assert error in call_main(my_main, DEFAULT_ARGS, fail=True)['msg']
+    error = 'parameters are mutually exclusive: command|commands'
+    assert error in call_main(my_main, DEFAULT_ARGS, {'command': 'version', 'commands': ['version']}, fail=True)['msg']
+
+
+@patch('paramiko.SSHClient')
+def test_command(mock_client):
+    ''' a single command, banner is filtered out '''
+    client = mock_client.return_value
+    client.exec_command.side_effect = mock_exec_command({
+        'set -privilege advanced;version': (BANNER + b'NetApp Release 9.8\r\r\n', b''),
+    })
+    module_args = {
+        'command': 'version',
+        'privilege': 'advanced',
+        'accept_unknown_host_keys': True,
+    }
+    result = call_main(my_main, DEFAULT_ARGS, module_args)
+    assert result['changed']
+    assert not result['failed']
+    assert result['stdout'] == b'\nLast login time: 10/18/2026 10:00:00\nNetApp Release 9.8\n'
+    assert result['stdout_lines_filtered'] == ['NetApp Release 9.8']
+    assert 'results' not in result
+    client.connect.assert_called_once_with(hostname='hostname', username='username', password='password')
+    client.close.assert_called_once_with()
+
+
+@patch('paramiko.SSHClient')
+def test_commands(mock_client):
+    ''' several commands over a single connection, outputs are filtered and reported for each command '''
+    client = mock_client.return_value
+    client.exec_command.side_effect = mock_exec_command({
+        'priv set diag;version': (BANNER + b'NetApp Release 9.8\r\n', b''),
+        'priv set diag;node show': (BANNER + b'node1 ok\r\nnode2 ok\r\n', b''),
+        'priv set diag;bad command': (b'', b'Error: "bad" is not a recognized command\r\n'),
+    })
+    module_args = {
+        'commands': ['version', 'node show', 'bad command'],
+        'privilege': 'diag',
+        'sp': True,
+        'exclude_lines': 'node2',
+    }
+    result = call_main(my_main, DEFAULT_ARGS, module_args)
+    assert client.connect.call_count == 1
+    assert [call[0][0] for call in client.exec_command.call_args_list] == ['priv set diag;version', 'priv set diag;node show', 'priv set diag;bad command']
+    assert result['failed']
+    assert [(entry['command'], entry['stdout_lines_filtered']) for entry in result['results']] == [
+        ('version', ['NetApp Release 9.8']),
+        ('node show', ['node1 ok']),
+        ('bad command', []),
+    ]
+    assert result['results'][2]['stderr'] == b'Error: "bad" is not a recognized command\n'
+    assert result['stdout_lines_filtered'] == ['NetApp Release 9.8', 'node1 ok']
+    assert result['stdout'] == b''.join(entry['stdout'] for entry in result['results'])
+    assert result['stderr'] == b'Error: "bad" is not a recognized command\n'
+
+
+@patch('paramiko.SSHClient')
+def test_check_mode(mock_client):
+    ''' nothing is run '''
+    client = mock_client.return_value
+    result = call_main(my_main, DEFAULT_ARGS, {'commands': ['version'], '_ansible_check_mode': True})
+    assert result['changed']
+    assert result['stdout'] == ''
+    assert 'results' not in result
+    client.exec_command.assert_not_called()
+
+
+@patch('paramiko.SSHClient')
+def test_unknown_host_key_warning(mock_client):
+    ''' python warnings are reported '''
+    client = mock_client.return_value
+
+    def connect(**kwargs):
+        warnings.warn('Unknown ssh-ed25519 host key for hostname')
+    client.connect.side_effect = connect
+    client.exec_command.side_effect = mock_exec_command({'version': (b'NetApp Release 9.8\n', b'')})
+    result = call_main(my_main, DEFAULT_ARGS, {'command': 'version', 'accept_unknown_host_keys': True})
+    assert result['warnings'] == ['Unknown ssh-ed25519 host key for hostname']
+
+
+@patch('paramiko.SSHClient')
+def test_negative_ssh_errors(mock_client):
+    ''' connection and command errors '''
+    client = mock_client.return_value
+    client.connect.side_effect = ssh_module.paramiko.SSHException('connection refused')
+    error = "SSH connection failed: SSHException('connection refused')"
+    assert call_main(my_main, DEFAULT_ARGS, {'commands': ['version']}, fail=True)['msg'] == error
+    client.connect.side_effect = None
+    client.exec_command.side_effect = ssh_module.paramiko.SSHException('channel closed')
+    error = 'Error running command node show: channel closed'
+    assert call_main(my_main, DEFAULT_ARGS, {'commands': ['node show', 'version']}, fail=True)['msg'] == error
+    assert client.exec_command.call_count == 1
+
+
+@patch('ansible_collections.netapp.ontap.plugins.modules.na_ontap_ssh_command.HAS_PARAMIKO', False)
+def test_negative_missing_paramiko():
+    error = 'the python paramiko module is required'
+    assert call_main(my_main, DEFAULT_ARGS, {'command': 'version'}, fail=True)['msg'] == error
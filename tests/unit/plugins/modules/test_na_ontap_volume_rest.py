@@ -9,16 +9,18 @@ __metaclass__ = type
 
 import copy
 import pytest
+import threading
 
 from ansible_collections.netapp.ontap.tests.unit.compat.mock import patch
 import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
+from ansible_collections.netapp.ontap.plugins.module_utils import netapp_concurrency
 # pylint: disable=unused-import
 from ansible_collections.netapp.ontap.tests.unit.plugins.module_utils.ansible_mocks import\
     assert_no_warnings, assert_warning_was_raised, print_warnings, call_main, create_and_apply, \
     create_module, expect_and_capture_ansible_exception, patch_ansible
 from ansible_collections.netapp.ontap.tests.unit.framework.mock_rest_and_zapi_requests import\
-    patch_request_and_invoke, register_responses
-from ansible_collections.netapp.ontap.tests.unit.framework.rest_factory import rest_responses
+    get_mock_record, patch_request_and_invoke, register_responses
+from ansible_collections.netapp.ontap.tests.unit.framework.rest_factory import JOB_GET_API, rest_responses
 
 from ansible_collections.netapp.ontap.plugins.modules.na_ontap_volume \
     import NetAppOntapVolume as volume_module, main as my_main      # module under test
@@ -264,6 +266,23 @@ def test_rest_successfully_created():
     assert create_and_apply(volume_module, DEFAULT_APP_ARGS)['changed']
 
 
+def test_rest_successfully_created_with_job_stats():
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest']),
+        ('GET', 'storage/volumes', SRR['no_record']),               # Get Volume
+        ('GET', 'svm/svms', SRR['one_svm_record']),                 # GET svm
+        ('GET', 'application/applications', SRR['no_record']),      # GET application/applications
+        ('POST', 'application/applications', SRR['success_with_job_uuid']),
+        ('GET', JOB_GET_API, SRR['job_generic_response_success']),
+        ('GET', 'storage/volumes', SRR['get_volume']),
+    ])
+    result = create_and_apply(volume_module, DEFAULT_APP_ARGS)
+    assert result['changed']
+    assert len(result['job_stats']) == 1
+    assert result['job_stats'][0]['state'] == 'success'
+    assert result['job_stats'][0]['polls'] == 1
+
+
 def test_rest_create_idempotency():
     register_responses([
         ('GET', 'cluster', SRR['is_rest']),
@@ -1625,3 +1644,182 @@ def test_warn_rest_modify():
     args = {'is_online': False, 'junction_path': '/test', 'use_rest': 'always', 'snapshot_restore': 'restore1'}
     assert create_and_apply(volume_module, DEFAULT_VOLUME_ARGS, args)['changed'] is False
     assert_warning_was_raised("Cannot perform action(s): ['snapshot_restore'] and modify: ['junction_path']", partial_match=True)
+
+
+volume_info_vol1 = copy.deepcopy(volume_info)
+volume_info_vol1['name'] = 'vol1'
+volume_info_vol3 = copy.deepcopy(volume_info)
+volume_info_vol3['name'] = 'vol3'
+volume_info_vol3['uuid'] = 'vol3_uuid'
+SRR_VOLUMES = rest_responses({
+    'get_volumes': (200, {'records': [volume_info_vol1, volume_info_vol3], 'num_records': 2}, None),
+    'get_volume_vol2': (200, {'records': [dict(volume_info, name='vol2', uuid='vol2_uuid')]}, None),
+})
+
+VOLUMES_ARGS = {
+    'vserver': 'ansibleSVM',
+    'aggregate_name': 'aggr1',
+    'size': 10,
+    'size_unit': 'gb',
+    'hostname': 'test',
+    'username': 'test_user',
+    'password': 'test_pass!',
+    'use_rest': 'always',
+    'max_concurrent_jobs': 1,
+    'volumes': [
+        {'name': 'vol1', 'comment': 'new comment'},
+        {'name': 'vol2', 'size': 20},
+        {'name': 'vol3', 'state': 'absent'},
+    ]
+}
+
+
+def test_volumes_create_modify_delete():
+    ''' all volumes are read with a single GET, then changes are applied '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest']),
+        ('GET', 'storage/volumes', SRR_VOLUMES['get_volumes']),                                 # Get all volumes
+        ('GET', 'svm/svms', SRR['one_svm_record']),                                             # GET svm, only once
+        ('PATCH', 'storage/volumes/7882901a-1aef-11ec-a267-005056b30cfa', SRR['empty_good']),   # vol1 - modify
+        ('POST', 'storage/volumes', SRR['empty_good']),                                         # vol2 - create
+        ('PATCH', 'storage/volumes/vol3_uuid', SRR['empty_good']),                              # vol3 - unmount
+        ('DELETE', 'storage/volumes/vol3_uuid', SRR['empty_good']),                             # vol3 - delete
+        ('GET', 'storage/volumes', SRR_VOLUMES['get_volume_vol2']),                             # vol2 - after create
+    ])
+    result = create_and_apply(volume_module, VOLUMES_ARGS)
+    assert result['changed']
+    assert [(volume['name'], volume['actions']) for volume in result['volumes']] == [
+        ('vol1', ['modify']), ('vol2', ['create']), ('vol3', ['delete'])]
+    assert result['volumes'][0]['modify'] == {'comment': 'new comment'}
+    query = get_mock_record().get_request(1)['params']
+    assert query['name'] == 'vol1|vol2|vol3'
+    assert query['svm.name'] == 'ansibleSVM'
+    # vol2 is created with its own size, and module level aggregate
+    assert get_mock_record().is_record_in_json({'name': 'vol2', 'size': 20 * 1024 ** 3, 'aggregates': [{'name': 'aggr1'}]},
+                                               'POST', 'storage/volumes')
+
+
+def test_volumes_check_mode():
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest']),
+        ('GET', 'storage/volumes', SRR_VOLUMES['get_volumes']),     # Get all volumes
+        ('GET', 'svm/svms', SRR['one_svm_record']),                 # GET svm
+    ])
+    my_obj = create_module(volume_module, VOLUMES_ARGS)
+    my_obj.module.check_mode = True
+    result = expect_and_capture_ansible_exception(my_obj.apply, 'exit')
+    assert result['changed']
+    assert [volume['changed'] for volume in result['volumes']] == [True, True, True]
+
+
+def test_volumes_idempotency():
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest']),
+        ('GET', 'storage/volumes', SRR_VOLUMES['get_volumes']),     # Get all volumes
+    ])
+    module_args = {'volumes': [{'name': 'vol1'}, {'name': 'vol3', 'comment': 'carchi8py'}, {'name': 'vol2', 'state': 'absent'}]}
+    result = create_and_apply(volume_module, VOLUMES_ARGS, module_args)
+    assert not result['changed']
+    assert [volume['actions'] for volume in result['volumes']] == [[], [], []]
+
+
+def test_volumes_errors_are_aggregated():
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest']),
+        ('GET', 'storage/volumes', SRR_VOLUMES['get_volumes']),                                 # Get all volumes
+        ('GET', 'svm/svms', SRR['one_svm_record']),                                             # GET svm
+        ('PATCH', 'storage/volumes/7882901a-1aef-11ec-a267-005056b30cfa', SRR['generic_error']),    # vol1 - modify
+        ('POST', 'storage/volumes', SRR['empty_good']),                                         # vol2 - create
+        ('PATCH', 'storage/volumes/vol3_uuid', SRR['empty_good']),                              # vol3 - unmount
+        ('DELETE', 'storage/volumes/vol3_uuid', SRR['generic_error']),                          # vol3 - delete
+        ('GET', 'storage/volumes', SRR_VOLUMES['get_volume_vol2']),                             # vol2 - after create
+    ])
+    error = create_and_apply(volume_module, VOLUMES_ARGS, fail=True)
+    assert error['msg'].startswith('Error managing volumes: volume vol1: Error modifying volume vol1')
+    assert 'volume vol3: Error in rest_delete_volume: calling: storage/volumes/vol3_uuid: got Expected error.' in error['msg']
+    assert error['changed']
+    assert [volume.get('error') is None for volume in error['volumes']] == [False, True, False]
+
+
+def test_volumes_validation_errors():
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest']),
+        ('GET', 'cluster', SRR['is_rest']),
+        ('GET', 'cluster', SRR['is_rest']),
+        ('GET', 'cluster', SRR['is_rest']),
+        ('GET', 'storage/volumes', SRR['no_record']),
+    ])
+    module_args = {'volumes': [{'name': 'vol1'}, {'name': 'vol1'}]}
+    error = 'Error: duplicate entry in volumes for vserver: ansibleSVM, name: vol1.'
+    assert create_and_apply(volume_module, VOLUMES_ARGS, module_args, fail=True)['msg'] == error
+    module_args = {'volumes': [{'size': 5}]}
+    assert 'Error: name is required in each volumes entry' in create_and_apply(volume_module, VOLUMES_ARGS, module_args, fail=True)['msg']
+    module_args = {'volumes': [{'name': 'vol1', 'unknown': 5}]}
+    assert 'unknown' in create_and_apply(volume_module, VOLUMES_ARGS, module_args, fail=True)['msg']
+    module_args = {'volumes': [{'name': 'vol1', 'space_slo': 'none'}]}
+    error = "Error with volume vol1: REST API currently does not support 'space_slo'"
+    assert create_and_apply(volume_module, VOLUMES_ARGS, module_args, fail=True)['msg'] == error
+
+
+def test_volumes_require_rest():
+    register_responses([
+        ('GET', 'cluster', SRR['is_zapi']),
+    ])
+    module_args = {'use_rest': 'auto'}
+    error = 'Error: volumes option requires REST.  use_rest: auto.'
+    assert create_module(volume_module, VOLUMES_ARGS, module_args, fail=True)['msg'] == error
+    module_args = {'name': 'vol1'}
+    assert 'mutually exclusive' in create_module(volume_module, VOLUMES_ARGS, module_args, fail=True)['msg']
+
+
+@pytest.mark.skipif(not netapp_concurrency.HAS_FUTURES, reason='requires concurrent.futures')
+def test_volumes_changes_are_concurrent():
+    ''' the two take_actions calls only return if they run at the same time '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest']),
+        ('GET', 'storage/volumes', SRR_VOLUMES['get_volumes']),     # Get all volumes
+    ])
+    barrier = threading.Barrier(2, timeout=10)
+
+    def take_actions(self, actions, current, modify):
+        barrier.wait()
+        return actions, modify, None
+
+    module_args = {'max_concurrent_jobs': 2, 'volumes': [{'name': 'vol1', 'comment': 'one'}, {'name': 'vol3', 'comment': 'three'}]}
+    with patch.object(volume_module, 'take_actions', take_actions):
+        result = create_and_apply(volume_module, VOLUMES_ARGS, module_args)
+    assert [volume['actions'] for volume in result['volumes']] == [['modify'], ['modify']]
+
+
+JOB_VOL2 = {'job': {'uuid': 'job_vol2', '_links': {'self': {'href': '/api/cluster/jobs/job_vol2'}}}}
+JOB_VOL3 = {'job': {'uuid': 'job_vol3', '_links': {'self': {'href': '/api/cluster/jobs/job_vol3'}}}}
+SRR_VOLUMES_JOBS = rest_responses({
+    'job_vol2': (202, JOB_VOL2, None),
+    'job_vol3': (202, JOB_VOL3, None),
+    'jobs_running': (200, {'records': [{'uuid': 'job_vol2', 'state': 'running'}, {'uuid': 'job_vol3', 'state': 'success'}]}, None),
+    'jobs_done': (200, {'records': [{'uuid': 'job_vol2', 'state': 'failure', 'message': 'aggregate is full'}]}, None),
+})
+
+
+@patch('time.sleep')
+def test_volumes_jobs_are_waited_on_together(sleep_mock):
+    ''' create and delete jobs are started without waiting, then polled with a single query for all jobs '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest']),
+        ('GET', 'storage/volumes', SRR_VOLUMES['get_volumes']),                                 # Get all volumes
+        ('GET', 'svm/svms', SRR['one_svm_record']),                                             # GET svm
+        ('POST', 'storage/volumes', SRR_VOLUMES_JOBS['job_vol2']),                              # vol2 - start create
+        ('PATCH', 'storage/volumes/vol3_uuid', SRR['empty_good']),                              # vol3 - unmount
+        ('DELETE', 'storage/volumes/vol3_uuid', SRR_VOLUMES_JOBS['job_vol3']),                  # vol3 - start delete
+        ('GET', 'cluster/jobs', SRR_VOLUMES_JOBS['jobs_running']),                              # both jobs
+        ('GET', 'cluster/jobs', SRR_VOLUMES_JOBS['jobs_done']),                                 # vol2 job only
+    ])
+    module_args = {'volumes': [{'name': 'vol2', 'size': 20}, {'name': 'vol3', 'state': 'absent'}]}
+    error = create_and_apply(volume_module, VOLUMES_ARGS, module_args, fail=True)
+    assert error['msg'] == 'Error managing volumes: volume vol2: Error creating volume vol2: job reported error: aggregate is full, received %s.' % JOB_VOL2
+    assert [(volume['name'], volume['actions'], volume.get('error') is None) for volume in error['volumes']] == [
+        ('vol2', ['create'], False), ('vol3', ['delete'], True)]
+    polls = list(get_mock_record().get_requests('GET', 'cluster/jobs'))
+    assert [poll['params']['uuid'] for poll in polls] == ['job_vol2|job_vol3', 'job_vol2']
+    # jobs are started without return_timeout
+    assert 'return_timeout' not in (get_mock_record().get_request(3)['params'] or {})
@@ -0,0 +1,239 @@
+# (c) 2025, NetApp, Inc
+# GNU General Public License v3.0+ (see COPYING or https://www.gnu.org/licenses/gpl-3.0.txt)
+
+""" unit tests for Ansible module: na_ontap_vserver_teardown """
+
+from __future__ import (absolute_import, division, print_function)
+__metaclass__ = type
+import pytest
+import threading
+
+import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_utils
+from ansible_collections.netapp.ontap.tests.unit.compat.mock import patch
+# pylint: disable=unused-import
+from ansible_collections.netapp.ontap.tests.unit.plugins.module_utils.ansible_mocks import \
+    patch_ansible, call_main, create_and_apply, create_module, expect_and_capture_ansible_exception
+from ansible_collections.netapp.ontap.tests.unit.framework.mock_rest_and_zapi_requests import \
+    get_mock_record, patch_request_and_invoke, register_responses
+from ansible_collections.netapp.ontap.tests.unit.framework.rest_factory import rest_responses
+
+from ansible_collections.netapp.ontap.plugins.modules.na_ontap_vserver_teardown \
+    import NetAppOntapVserverTeardown as my_module, main as my_main     # module under test
+
+if not netapp_utils.has_netapp_lib():
+    pytestmark = pytest.mark.skip('skipping as missing required netapp_lib')
+
+
+def volume(name, junction_path=None, parent=None):
+    record = {'name': name, 'uuid': '%s_uuid' % name}
+    if junction_path:
+        record['nas'] = {'path': junction_path}
+    record['clone'] = {'is_flexclone': parent is not None}
+    if parent:
+        record['clone']['parent_volume'] = {'name': parent}
+    return record
+
+
+def records(*args):
+    return (200, {'records': list(args), 'num_records': len(args)}, None)
+
+
+SRR = rest_responses({
+    'snapmirror_destinations': records({'uuid': 'sm1_uuid', 'source': {'path': 'other:src'}, 'destination': {'path': 'svm1:dst_vol'}}),
+    'snapmirror_sources': records({'uuid': 'sm2_uuid', 'source': {'path': 'svm1:parent'}, 'destination': {'path': 'svm2:parent_dr'}}),
+    'lun_maps': records({'lun': {'name': '/vol/lunvol/lun1', 'uuid': 'lun1_uuid'}, 'igroup': {'name': 'igroup1', 'uuid': 'igroup1_uuid'}}),
+    'cifs_shares': records({'name': 'share1', 'path': '/parent/child/dir', 'svm': {'uuid': 'svm1_uuid'}},
+                           {'name': 'ipc$', 'path': '/', 'svm': {'uuid': 'svm1_uuid'}}),
+    'volumes': records(volume('parent', '/parent'), volume('clone1', parent='parent'), volume('clone2', parent='clone1'),
+                       volume('child', '/parent/child'), volume('lunvol'), volume('dst_vol')),
+    'igroups': records({'name': 'igroup1', 'uuid': 'igroup1_uuid'}),
+    'interfaces': records({'name': 'lif1', 'uuid': 'lif1_uuid'}),
+})
+
+DEFAULT_ARGS = {
+    'hostname': 'hostname',
+    'username': 'admin',
+    'password': 'password',
+    'vserver': 'svm1',
+    'max_concurrent_jobs': 1,
+}
+
+DISCOVERY = [
+    ('GET', 'cluster', SRR['is_rest_9_10_1']),
+    ('GET', 'snapmirror/relationships', SRR['snapmirror_destinations']),
+    ('GET', 'snapmirror/relationships', SRR['snapmirror_sources']),
+    ('GET', 'protocols/san/lun-maps', SRR['lun_maps']),
+    ('GET', 'protocols/cifs/shares', SRR['cifs_shares']),
+    ('GET', 'storage/volumes', SRR['volumes']),
+    ('GET', 'protocols/san/igroups', SRR['igroups']),
+    ('GET', 'network/ip/interfaces', SRR['interfaces']),
+]
+
+EXPECTED_LEVELS = [
+    [('snapmirrors', 'svm1:dst_vol'), ('snapmirrors', 'svm2:parent_dr'), ('lun_maps', 'igroup1:/vol/lunvol/lun1'),
+     ('cifs_shares', 'share1'), ('volumes', 'clone2'), ('interfaces', 'lif1')],
+    [('volumes', 'clone1'), ('volumes', 'child'), ('volumes', 'lunvol'), ('volumes', 'dst_vol'), ('igroups', 'igroup1')],
+    [('volumes', 'parent')],
+]
+
+
+def levels_as_tuples(levels):
+    return [[(node['type'], node['name']) for node in level] for level in levels]
+
+
+def test_module_fail_when_not_rest():
+    register_responses([
+    ])
+    error = 'Error: na_ontap_vserver_teardown is only supported with REST API'
+    assert create_module(my_module, DEFAULT_ARGS, {'use_rest': 'never'}, fail=True)['msg'] == error
+    error = 'Error: max_concurrent_jobs must be at least 1, got: 0'
+    assert create_module(my_module, DEFAULT_ARGS, {'max_concurrent_jobs': 0}, fail=True)['msg'] == error
+
+
+def test_check_mode_reports_levels():
+    ''' clones before parents, shares and child volumes before the volume they are mounted on '''
+    register_responses(DISCOVERY)
+    result = call_main(my_main, DEFAULT_ARGS, {'_ansible_check_mode': True})
+    assert result['changed']
+    assert levels_as_tuples(result['levels']) == EXPECTED_LEVELS
+    assert result['deleted'] == {
+        'snapmirrors': ['svm1:dst_vol', 'svm2:parent_dr'],
+        'lun_maps': ['igroup1:/vol/lunvol/lun1'],
+        'cifs_shares': ['share1'],
+        'volumes': ['parent', 'clone1', 'clone2', 'child', 'lunvol', 'dst_vol'],
+        'igroups': ['igroup1'],
+        'interfaces': ['lif1'],
+    }
+    volumes_query = next(request for request in get_mock_record().get_requests('GET', 'storage/volumes'))['params']
+    assert volumes_query['svm.name'] == 'svm1'
+    assert volumes_query['is_svm_root'] is False
+
+
+def test_delete_all_levels():
+    register_responses(DISCOVERY + [
+        # level 0
+        ('DELETE', 'snapmirror/relationships/sm1_uuid', SRR['success']),
+        ('DELETE', 'snapmirror/relationships/sm2_uuid', SRR['success']),
+        ('DELETE', 'protocols/san/lun-maps/lun1_uuid/igroup1_uuid', SRR['success']),
+        ('DELETE', 'protocols/cifs/shares/svm1_uuid/share1', SRR['success']),
+        ('DELETE', 'storage/volumes/clone2_uuid', SRR['success']),
+        ('DELETE', 'network/ip/interfaces/lif1_uuid', SRR['success']),
+        # level 1
+        ('DELETE', 'storage/volumes/clone1_uuid', SRR['success']),
+        ('PATCH', 'storage/volumes/child_uuid', SRR['success']),
+        ('DELETE', 'storage/volumes/child_uuid', SRR['success']),
+        ('DELETE', 'storage/volumes/lunvol_uuid', SRR['success']),
+        ('DELETE', 'storage/volumes/dst_vol_uuid', SRR['success']),
+        ('DELETE', 'protocols/san/igroups/igroup1_uuid', SRR['success']),
+        # level 2
+        ('PATCH', 'storage/volumes/parent_uuid', SRR['success']),
+        ('DELETE', 'storage/volumes/parent_uuid', SRR['success']),
+    ])
+    result = call_main(my_main, DEFAULT_ARGS)
+    assert result['changed']
+    assert levels_as_tuples(result['levels']) == EXPECTED_LEVELS
+    assert len(result['deleted']['volumes']) == 6
+    # the relationship is released when the vserver is the source
+    releases = list(get_mock_record().get_requests('DELETE', 'snapmirror/relationships/sm2_uuid'))
+    assert releases[0]['params']['source_only'] is True
+    assert 'source_only' not in list(get_mock_record().get_requests('DELETE', 'snapmirror/relationships/sm1_uuid'))[0]['params']
+    unmount = list(get_mock_record().get_requests('PATCH', 'storage/volumes/child_uuid'))
+    assert unmount[0]['json'] == {'nas.path': ''}
+
+
+def test_idempotent():
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_9_10_1']),
+        ('GET', 'storage/volumes', SRR['zero_records']),
+        ('GET', 'protocols/san/igroups', SRR['zero_records']),
+    ])
+    result = call_main(my_main, DEFAULT_ARGS, {'object_types': ['igroups', 'volumes']})
+    assert not result['changed']
+    assert result['deleted'] == {}
+    assert result['levels'] == []
+
+
+def test_dependents_are_skipped_on_error():
+    ''' clone1 and parent depend on clone2, other objects are still deleted '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_9_10_1']),
+        ('GET', 'storage/volumes', SRR['volumes']),
+        ('DELETE', 'storage/volumes/clone2_uuid', SRR['generic_error']),
+        ('PATCH', 'storage/volumes/child_uuid', SRR['generic_error']),
+        ('DELETE', 'storage/volumes/child_uuid', SRR['generic_error']),
+        ('DELETE', 'storage/volumes/lunvol_uuid', SRR['success']),
+        ('DELETE', 'storage/volumes/dst_vol_uuid', SRR['success']),
+    ])
+    result = call_main(my_main, DEFAULT_ARGS, {'object_types': ['volumes']}, fail=True)
+    assert result['msg'] == 'Error deleting objects in vserver svm1: volumes clone2: calling: storage/volumes/clone2_uuid: got Expected error.  '\
+                            'volumes child: calling: storage/volumes/child_uuid: got Expected error. - '\
+                            'previous error unmounting volume: calling: storage/volumes/child_uuid: got Expected error.'
+    assert result['changed']
+    assert result['deleted'] == {'volumes': ['lunvol', 'dst_vol']}
+    assert result['skipped'] == [
+        {'type': 'volumes', 'name': 'clone1', 'reason': 'depends on volumes clone2'},
+        {'type': 'volumes', 'name': 'parent', 'reason': 'depends on volumes clone1, volumes child'},
+    ]
+
+
+def test_negative_discovery_errors():
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_9_10_1']),
+        ('GET', 'snapmirror/relationships', SRR['generic_error']),
+        ('GET', 'cluster', SRR['is_rest_9_10_1']),
+        ('GET', 'snapmirror/relationships', SRR['zero_records']),
+        ('GET', 'snapmirror/relationships', SRR['generic_error']),
+        ('GET', 'cluster', SRR['is_rest_9_10_1']),
+        ('GET', 'protocols/san/lun-maps', SRR['generic_error']),
+    ])
+    error = 'Error discovering snapmirrors in vserver svm1: calling: snapmirror/relationships: got Expected error.'
+    assert call_main(my_main, DEFAULT_ARGS, {'object_types': ['snapmirrors']}, fail=True)['msg'] == error
+    assert call_main(my_main, DEFAULT_ARGS, {'object_types': ['snapmirrors']}, fail=True)['msg'] == error
+    error = 'Error discovering lun_maps in vserver svm1: calling: protocols/san/lun-maps: got Expected error.'
+    assert call_main(my_main, DEFAULT_ARGS, {'object_types': ['lun_maps']}, fail=True)['msg'] == error
+
+
+def test_negative_circular_dependency():
+    ''' clone is mounted above its parent volume '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_9_10_1']),
+        ('GET', 'storage/volumes', records(volume('vol1', '/a/b'), volume('clone1', '/a', 'vol1'))),
+    ])
+    error = "Error: cannot order the objects to delete in vserver svm1: circular dependency: "\
+            "('volumes', 'vol1') -> ('volumes', 'clone1') -> ('volumes', 'vol1')"
+    assert call_main(my_main, DEFAULT_ARGS, {'object_types': ['volumes']}, fail=True)['msg'] == error
+
+
+def test_each_level_is_deleted_in_parallel():
+    ''' discovery queries and deletes are sent concurrently, a level is started when the previous level is done '''
+    responses = {
+        'storage/volumes': SRR['volumes'][1]['records'],
+        'protocols/cifs/shares': SRR['cifs_shares'][1]['records'],
+        'network/ip/interfaces': SRR['interfaces'][1]['records'],
+    }
+    discovery_barrier = threading.Barrier(3, timeout=10)
+    level_0_barrier = threading.Barrier(3, timeout=10)
+    lock = threading.Lock()
+    deleted = []
+
+    def get_records(api, query, fields):
+        discovery_barrier.wait()
+        return responses[api], None
+
+    def delete_object(node):
+        if node['name'] in ('share1', 'clone2', 'lif1'):
+            level_0_barrier.wait()
+        with lock:
+            deleted.append(node['name'])
+
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_9_10_1']),
+    ])
+    module_args = {'object_types': ['cifs_shares', 'volumes', 'interfaces'], 'max_concurrent_jobs': 3}
+    with patch.object(my_module, 'get_records', side_effect=get_records), patch.object(my_module, 'delete_object', side_effect=delete_object):
+        result = call_main(my_main, DEFAULT_ARGS, module_args)
+    assert result['changed']
+    # share1, clone2 and lif1 were deleted at the same time, with volumes that have no dependency
+    assert sorted(deleted[:5]) == ['clone2', 'dst_vol', 'lif1', 'lunvol', 'share1']
+    assert sorted(deleted[5:7]) == ['child', 'clone1']
+    assert deleted[7:] == ['parent']
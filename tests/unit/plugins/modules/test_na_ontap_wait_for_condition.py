@@ -15,7 +15,7 @@ import ansible_collections.netapp.ontap.plugins.module_utils.netapp as netapp_ut
 from ansible_collections.netapp.ontap.tests.unit.plugins.module_utils.ansible_mocks import\
     call_main, create_module, expect_and_capture_ansible_exception, patch_ansible
 from ansible_collections.netapp.ontap.tests.unit.framework.mock_rest_and_zapi_requests import\
-    patch_request_and_invoke, register_responses
+    get_mock_record, patch_request_and_invoke, register_responses
 from ansible_collections.netapp.ontap.tests.unit.framework.rest_factory import rest_responses
 from ansible_collections.netapp.ontap.tests.unit.framework.zapi_factory import build_zapi_response, zapi_responses
 from ansible_collections.netapp.ontap.plugins.modules.na_ontap_wait_for_condition \
@@ -483,3 +483,157 @@ def test_negative_missing_netapp_lib(mock_netapp_lib):
     mock_netapp_lib.return_value = False
     error = "the python NetApp-Lib module is required"
     assert error in call_main(my_main, DEFAULT_ARGS, module_args, fail=True)['msg']
+
+
+def relationship_records(*states):
+    ''' states is a list of (destination_path, state) '''
+    return (200, {'records': [
+        {'destination': {'path': path}, 'state': state} for path, state in states
+    ], 'num_records': len(states)}, None)
+
+
+RESOURCES_ARGS = {
+    'hostname': '10.10.10.10',
+    'username': 'admin',
+    'password': 'password',
+    'use_rest': 'always',
+    'name': 'snapmirror_relationship',
+    'conditions': 'state',
+    'attributes': {'expected_state': 'snapmirrored'},
+    'resources': [{'destination_path': 'svm1:*'}, {'destination_path': 'svm2:vol1_dst'}],
+}
+
+
+@patch('time.sleep')
+def test_rest_successful_wait_for_resources(dont_sleep):
+    ''' a single query per polling cycle for all resources, including wildcards '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_97']),
+        ('GET', 'snapmirror/relationships', relationship_records(('svm1:vol1_dst', 'uninitialized'), ('svm1:vol2_dst', 'snapmirrored'),
+                                                                 ('svm2:vol1_dst', 'uninitialized'))),
+        ('GET', 'snapmirror/relationships', relationship_records(('svm1:vol1_dst', 'snapmirrored'), ('svm1:vol2_dst', 'snapmirrored'),
+                                                                 ('svm2:vol1_dst', 'uninitialized'))),
+        ('GET', 'snapmirror/relationships', relationship_records(('svm1:vol1_dst', 'snapmirrored'), ('svm1:vol2_dst', 'snapmirrored'),
+                                                                 ('svm2:vol1_dst', 'snapmirrored'))),
+    ])
+    results = call_main(my_main, RESOURCES_ARGS)
+    assert results['msg'] == 'conditions met for 3 resources'
+    resources = results['resources']
+    assert sorted(resources) == ['svm1:vol1_dst', 'svm1:vol2_dst', 'svm2:vol1_dst']
+    # transfer_state is absent when not transferring, and reported as idle
+    assert resources['svm1:vol2_dst']['states'] == 'snapmirrored'
+    assert resources['svm1:vol1_dst']['states'] == 'uninitialized,idle,snapmirrored'
+    assert resources['svm2:vol1_dst']['states'] == 'uninitialized,idle,uninitialized,idle,snapmirrored'
+    assert all(resource['msg'] == 'matched condition: state' for resource in resources.values())
+    assert all(isinstance(resource['match_time'], float) for resource in resources.values())
+    assert resources['svm1:vol2_dst']['match_time'] <= resources['svm1:vol1_dst']['match_time'] <= resources['svm2:vol1_dst']['match_time']
+    requests = list(get_mock_record().get_requests('GET', 'snapmirror/relationships'))
+    assert len(requests) == 3
+    assert requests[0]['params']['destination.path'] == 'svm1:*|svm2:vol1_dst'
+    assert requests[0]['params']['fields'] == 'state,transfer.state,destination.path'
+
+
+@patch('time.sleep')
+def test_rest_successful_wait_for_resources_absent(dont_sleep):
+    ''' sp_upgrade for all nodes, a resource is done once its conditions are met '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_97']),
+        ('GET', 'cluster/nodes', (200, {'records': [
+            {'name': 'node1', 'service_processor': {'state': 'online'}},
+            {'name': 'node2', 'service_processor': {'state': 'updating'}},
+        ]}, None)),
+        ('GET', 'cluster/nodes', (200, {'records': [
+            {'name': 'node1', 'service_processor': {'state': 'updating'}},
+            {'name': 'node2', 'service_processor': {'state': 'online'}},
+        ]}, None)),
+    ])
+    module_args = {
+        'use_rest': 'always',
+        'name': 'sp_upgrade',
+        'conditions': 'is_in_progress',
+        'state': 'absent',
+        'resources': [{'node': '*'}],
+    }
+    args = dict(DEFAULT_ARGS)
+    del args['attributes']
+    results = call_main(my_main, args, module_args)
+    assert results['msg'] == 'conditions met for 2 resources'
+    assert results['resources']['node1']['states'] == 'online'
+    assert results['resources']['node2']['states'] == 'updating,online'
+    assert results['resources']['node2']['msg'] == 'conditions not matched'
+    assert results['states'] == 'online,updating,online'
+    requests = list(get_mock_record().get_requests('GET', 'cluster/nodes'))
+    assert requests[0]['params']['name'] == '*'
+
+
+@patch('time.sleep')
+def test_rest_negative_wait_for_resources(dont_sleep):
+    ''' timeout and errors '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_97']),
+        ('GET', 'snapmirror/relationships', relationship_records(('svm1:vol1_dst', 'uninitialized'), ('svm2:vol1_dst', 'snapmirrored'))),
+        ('GET', 'snapmirror/relationships', relationship_records(('svm1:vol1_dst', 'uninitialized'), ('svm2:vol1_dst', 'snapmirrored'))),
+        ('GET', 'cluster', SRR['is_rest_97']),
+        ('GET', 'snapmirror/relationships', relationship_records(('svm1:vol1_dst', 'uninitialized'))),
+        ('GET', 'snapmirror/relationships', SRR['generic_error']),
+        ('GET', 'snapmirror/relationships', relationship_records(('svm1:vol1_dst', 'uninitialized'), ('svm2:vol1_dst', None))),
+    ])
+    module_args = {
+        'polling_interval': 5,
+        'timeout': 10,
+    }
+    results = call_main(my_main, RESOURCES_ARGS, module_args, fail=True)
+    assert results['msg'] == 'Error: timeout waiting for condition: state==snapmirrored.  Pending resources: svm1:vol1_dst.'
+    assert results['resources']['svm1:vol1_dst'] == {'msg': None, 'match_time': None, 'states': 'uninitialized,idle,uninitialized,idle', 'last_state': 'idle'}
+    assert results['resources']['svm2:vol1_dst']['msg'] == 'matched condition: state'
+    # 3 consecutive errors: svm2:vol1_dst not found, REST error, state not found
+    error = "Error: Cannot find element with name: state in results: {'destination': {'path': 'svm2:vol1_dst'}, 'state': None} - count: 3"
+    assert call_main(my_main, RESOURCES_ARGS, fail=True)['msg'] == error
+
+
+def test_negative_validate_resources():
+    ''' resources requires REST, and a single selector per resource '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_zapi']),
+        ('GET', 'cluster', SRR['is_rest_97']),
+    ])
+    module_args = {'use_rest': 'auto'}
+    assert call_main(my_main, RESOURCES_ARGS, module_args, fail=True)['msg'] == 'Error: resources requires REST.'
+    module_args = {
+        'attributes': {'expected_state': 'snapmirrored', 'destination_path': 'svm1:vol1_dst'},
+        'resources': [{'destination_path': 'svm1:*'}, {'node': 'node1'}],
+    }
+    error = call_main(my_main, RESOURCES_ARGS, module_args, fail=True)['msg']
+    assert error == "Error: attributes: destination_path cannot be used with resources, "\
+                    "resources: expecting a single key: destination_path for resource name: snapmirror_relationship, got: {'node': 'node1'}"
+
+
+def test_key_extractors():
+    ''' keys are parsed once, with ZAPI the path to the element is reused '''
+    register_responses([
+        ('GET', 'cluster', SRR['is_rest_97']),
+    ])
+    module_args = {
+        'use_rest': 'always',
+        'name': 'sp_version',
+        'conditions': 'firmware_version',
+    }
+    my_obj = create_module(my_module, DEFAULT_ARGS, module_args)
+    record = {'service_processor': {'firmware_version': '3.10'}}
+    assert my_obj.get_key_value(record, 'service_processor.firmware_version') == '3.10'
+    assert my_obj.get_key_value(record, 'service_processor.state') is None
+    assert my_obj.get_key_value({'service_processor': None}, 'service_processor.firmware_version') is None
+    module_args['use_rest'] = 'never'
+    my_obj = create_module(my_module, DEFAULT_ARGS, module_args)
+    xml_309 = build_zapi_response(sp_info('3.09'), 1)[0]
+    xml_310 = build_zapi_response(sp_info('3.10'), 1)[0]
+    with patch.object(my_obj, 'find_path_zapi', wraps=my_obj.find_path_zapi) as mock_find_path:
+        assert my_obj.get_key_value(xml_309, 'firmware-version') == '3.09'
+        assert my_obj.get_key_value(xml_310, 'firmware-version') == '3.10'
+        # ignore recursive calls
+        assert len([call for call in mock_find_path.call_args_list if call[0][0] in (xml_309, xml_310)]) == 1
+        # the record layout changed, search again
+        xml_in_progress = build_zapi_response(sp_image_update_progress_info(True), 1)[0]
+        assert my_obj.get_key_value(xml_in_progress, 'firmware-version') is None
+        assert my_obj.get_key_value(xml_in_progress, 'is-in-progress') == 'true'
+        assert len([call for call in mock_find_path.call_args_list if call[0][0] is xml_in_progress]) == 2